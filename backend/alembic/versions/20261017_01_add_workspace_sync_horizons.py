@@ -0,0 +1,24 @@
+"""add workspace sync horizons (tombstone compaction)"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261017_01"
+down_revision = "20260618_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "workspace_sync_horizons",
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("min_valid_cursor", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("workspace_sync_horizons")
@@ -0,0 +1,47 @@
+"""add workspace change log and sequence counters"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261017_02"
+down_revision = "20261017_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "workspace_change_log",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("sequence", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "sequence",
+            name="uq_workspace_change_log_user_sequence",
+        ),
+    )
+    op.create_table(
+        "workspace_change_sequences",
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("last_sequence", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.add_column(
+        "workspace_sync_horizons",
+        sa.Column(
+            "min_valid_sequence", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("workspace_sync_horizons", "min_valid_sequence")
+    op.drop_table("workspace_change_sequences")
+    op.drop_table("workspace_change_log")
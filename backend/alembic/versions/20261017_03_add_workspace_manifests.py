@@ -0,0 +1,34 @@
+"""turn workspace change sequences into workspace manifests"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261017_03"
+down_revision = "20261017_02"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.rename_table("workspace_change_sequences", "workspace_manifests")
+    op.alter_column("workspace_manifests", "last_sequence", new_column_name="version")
+    # 既存行の集計は NULL（未確定）とし、初回読み取り時に実テーブルから算出する
+    op.add_column(
+        "workspace_manifests", sa.Column("folder_count", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "workspace_manifests", sa.Column("note_count", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "workspace_manifests",
+        sa.Column("content_bytes", sa.BigInteger(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("workspace_manifests", "content_bytes")
+    op.drop_column("workspace_manifests", "note_count")
+    op.drop_column("workspace_manifests", "folder_count")
+    op.alter_column("workspace_manifests", "version", new_column_name="last_sequence")
+    op.rename_table("workspace_manifests", "workspace_change_sequences")
@@ -0,0 +1,49 @@
+"""add note full-text search index tables"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261017_06"
+down_revision = "20261017_05"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "note_search_postings",
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("token", sa.String(length=64), nullable=False),
+        sa.Column("note_id", sa.Uuid(), nullable=False),
+        sa.Column("term_frequency", sa.Integer(), nullable=False),
+        sa.Column("document_length", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "token", "note_id"),
+    )
+    op.create_table(
+        "note_search_documents",
+        sa.Column("note_id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("length", sa.Integer(), nullable=False),
+        sa.Column("terms", sa.Text(), nullable=True),
+        sa.Column("indexed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("note_id"),
+    )
+    # 既存ノートは初回検索時にノート ID 順の走査で索引する（scan_after_id から再開）
+    op.create_table(
+        "note_search_states",
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("indexed_sequence", sa.Integer(), nullable=False),
+        sa.Column("scan_pending", sa.Boolean(), nullable=False),
+        sa.Column("scan_after_id", sa.Uuid(), nullable=True),
+        sa.Column("document_count", sa.Integer(), nullable=False),
+        sa.Column("total_length", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("note_search_states")
+    op.drop_table("note_search_documents")
+    op.drop_table("note_search_postings")
@@ -2,7 +2,7 @@
 
 責務: APIキーのライフサイクル全体を管理し、平文トークンをハッシュ化して安全に保存する。
 主要なエクスポート: UserApiKeyService
-呼び出し関係: 認証ルーターから呼ばれ、DB操作に commit_with_error_handling を使用する。
+呼び出し関係: 認証ルーターから呼ばれ、書き込みを UnitOfWork.run で実行する。
 """
 
 import hashlib
@@ -12,7 +12,7 @@ from uuid import UUID
 
 from sqlmodel import Session, select
 
-from app.db_commit import commit_with_error_handling
+from app.core.unit_of_work import commit_or_stage, get_unit_of_work
 from app.models import UserApiKey, UserApiKeyCreate
 from app.shared import NotFound, ValidationFailed
 
@@ -29,6 +29,7 @@ class UserApiKeyService:
 
     def __init__(self, session: Session):
         self.session = session
+        self.unit_of_work = get_unit_of_work(session)
 
     def list_active_keys(self, user_id: str) -> list[UserApiKey]:
         """指定ユーザーの有効なAPIキー一覧を作成日降順で返す。"""
@@ -50,23 +51,30 @@ class UserApiKeyService:
         if not name:
             raise ValidationFailed("API key name is required")
 
-        token_plain = self._generate_plain_token()
-        api_key = UserApiKey(
-            user_id=user_id,
-            name=name,
-            token_hash=self._hash_token(token_plain),
-            token_prefix=token_plain[:API_KEY_PREFIX_LENGTH],
-        )
-        self.session.add(api_key)
-        commit_with_error_handling(self.session, "UserApiKey", max_retries=3)
-        self.session.refresh(api_key)
-        return api_key, token_plain
+        def create() -> tuple[UserApiKey, str]:
+            # 再実行時はトークンも生成し直す
+            token_plain = self._generate_plain_token()
+            api_key = UserApiKey(
+                user_id=user_id,
+                name=name,
+                token_hash=self._hash_token(token_plain),
+                token_prefix=token_plain[:API_KEY_PREFIX_LENGTH],
+            )
+            self.session.add(api_key)
+            commit_or_stage(self.session, resource_name="UserApiKey")
+            return api_key, token_plain
+
+        return self.unit_of_work.run(create, "UserApiKey")
 
     def revoke_key(self, user_id: str, key_id: UUID) -> None:
         """指定されたAPIキーを失効させる。所有者以外のキーは NotFound を送出する。"""
-        api_key = self._get_owned_active_key(user_id, key_id)
-        api_key.revoked_at = datetime.now(UTC)
-        commit_with_error_handling(self.session, "UserApiKey", max_retries=3)
+
+        def revoke() -> None:
+            api_key = self._get_owned_active_key(user_id, key_id)
+            api_key.revoked_at = datetime.now(UTC)
+            commit_or_stage(self.session, resource_name="UserApiKey")
+
+        self.unit_of_work.run(revoke, "UserApiKey")
 
     def authenticate(self, token_plain: str) -> UserApiKey | None:
         """平文トークンを検証し、有効なAPIキーレコードを返す。無効なら None を返す。"""
@@ -82,7 +90,7 @@ class UserApiKeyService:
         if api_key is None:
             return None
 
-        self._touch_last_used(api_key)
+        self.unit_of_work.run(lambda: self._touch_last_used(api_key), "UserApiKey")
         return api_key
 
     def _get_owned_active_key(self, user_id: str, key_id: UUID) -> UserApiKey:
@@ -108,7 +116,7 @@ class UserApiKeyService:
             return
 
         api_key.last_used_at = now
-        commit_with_error_handling(self.session, "UserApiKey", max_retries=3)
+        commit_or_stage(self.session, resource_name="UserApiKey")
 
     @staticmethod
     def _generate_plain_token() -> str:
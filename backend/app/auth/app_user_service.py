@@ -2,7 +2,8 @@
 
 責務: JWTクレームを元に AppUser レコードを作成・更新する。
 主要なエクスポート: AppUserService
-呼び出し関係: 認証ミドルウェアから呼ばれ、DBセッションおよび commit_with_retry を呼ぶ。
+呼び出し関係: 認証ミドルウェアから呼ばれ、UnitOfWork.run で取得・作成・更新を
+    1 トランザクションとして実行する。
 """
 
 from datetime import UTC, datetime
@@ -10,12 +11,21 @@ from datetime import UTC, datetime
 from sqlmodel import Session
 
 from app.config import Settings, get_settings
-from app.db_commit import commit_with_retry
+from app.core.unit_of_work import commit_or_stage, get_unit_of_work
+from app.db_retry import RetryPolicy
 from app.models import AppUser
 from app.models.app_user import APP_USER_TOUCH_INTERVAL
 
-# コミット競合時の最大リトライ回数
-APP_USER_COMMIT_MAX_RETRIES = 3
+# AppUser の取得・作成・更新のリトライ予算。同じユーザーの並行リクエストが
+# 初回作成や last_seen_at の更新で同じ行に書き込むため、競合時は読み直して
+# 再実行する（読み直した行が最新なら書き込み自体が不要になる）
+APP_USER_RETRY_POLICY = RetryPolicy(
+    "app_user.ensure",
+    max_attempts=5,
+    base_delay=0.01,
+    max_delay=0.2,
+    retry_unique_violations=True,
+)
 
 
 class AppUserService:
@@ -26,7 +36,19 @@ class AppUserService:
         self.settings = settings or get_settings()
 
     def ensure_app_user(self, claims: dict) -> AppUser:
-        """JWTクレームを元に AppUser を取得または新規作成し、属性を最新化して返す。"""
+        """JWTクレームを元に AppUser を取得または新規作成し、属性を最新化して返す。
+
+        同時リクエストとの競合時は APP_USER_RETRY_POLICY の予算内で読み直して
+        再実行する。
+        """
+        return get_unit_of_work(self.session).run(
+            lambda: self._ensure_app_user(claims),
+            "AppUser",
+            policy=APP_USER_RETRY_POLICY,
+        )
+
+    def _ensure_app_user(self, claims: dict) -> AppUser:
+        """AppUser を取得または作成し、変更があれば書き込む。"""
         user_id = claims["sub"]
         email = claims.get("email")
         display_name = claims.get("name") or claims.get("username")
@@ -81,14 +103,7 @@ class AppUserService:
         }
 
     def _commit_app_user(self, app_user: AppUser) -> AppUser:
-        """AppUser をDBに保存し、競合時は既存レコードを返す。"""
+        """AppUser をDBに保存して返す。"""
         self.session.add(app_user)
-        existing_user = commit_with_retry(
-            self.session,
-            max_retries=APP_USER_COMMIT_MAX_RETRIES,
-            recovery=lambda: self.session.get(AppUser, app_user.user_id),
-        )
-        if existing_user is not None:
-            return existing_user
-        self.session.refresh(app_user)
+        commit_or_stage(self.session, resource_name="AppUser")
         return app_user
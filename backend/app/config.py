@@ -55,9 +55,31 @@ class Settings(BaseSettings):
     # CORS 設定
     cors_origins: list[str] = ["http://localhost:3000"]
 
+    # レスポンス圧縮設定（このバイト数未満の一括レスポンスは圧縮しない）
+    response_compression_min_bytes: int = 1024
+
+    # ウォームコンテナ内のワークスペースメタデータキャッシュの上限（おおよそのバイト数）
+    workspace_metadata_cache_max_bytes: int = 16 * 1024 * 1024
+
+    # ワークスペースコンパクションの保持期間（日数）。
+    # soft delete 済みのノート・フォルダとミューテーションの冪等性記録は、
+    # それぞれこの期間を過ぎると物理削除される。
+    tombstone_retention_days: int = 90
+    applied_mutation_retention_days: int = 30
+
     # S3 キャッシュバケット設定
     cache_bucket_name: str = "notes-app-cache-local"
 
+    # 非同期ノートエクスポートの保存先。バケット名が空の場合は S3 の代わりに
+    # export_local_dir（空ならシステムの一時ディレクトリ配下）へ保存する。
+    export_bucket_name: str = ""
+    export_local_dir: str = ""
+    export_download_url_ttl_seconds: int = 3600
+
+    # 一括インポートで受け付けるリクエスト本文の上限（バイト）。Lambda の同期呼び出し
+    # ペイロード上限（6 MB、バイナリは base64 で約 4/3 倍）に収まる値にする。
+    import_max_bytes: int = 4 * 1024 * 1024
+
     # 画像・CDN 設定
     image_bucket_name: str = ""
     cdn_domain: str = "localhost:8000"
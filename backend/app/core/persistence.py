@@ -3,22 +3,60 @@
 責務: updated_at・version フィールドの管理と、ユーザー所有リソースの
     CRUD 基盤を提供する。
 主要なエクスポート: UserScopedRepository, utc_now, touch_updated_at,
-    bump_version, normalize_version
+    bump_version, normalize_version, staged_writes, writes_are_staged,
+    byte_length, BULK_WRITE_CHUNK_SIZE
 呼び出し関係: NoteRepository・FolderRepository から継承され、
-    app.db_commit を介してデータベースに書き込む。
+    app.db_commit を介してデータベースに書き込む。staged_writes /
+    writes_are_staged は app.core.unit_of_work の定義を再エクスポートする。
 """
 
+from collections.abc import Mapping, Sequence
 from datetime import UTC, datetime
-from typing import TypeVar
+from typing import Any, NoReturn, TypeVar
 from uuid import UUID
 
-from sqlmodel import Session, SQLModel
+from sqlalchemy import Integer, and_, delete, func, inspect, or_, update
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import defer
+from sqlalchemy.sql.functions import GenericFunction
+from sqlmodel import Session, SQLModel, select
 
-from app.db_commit import commit_with_error_handling
-from app.shared import NotFound
+from app.core.unit_of_work import commit_or_stage, staged_writes, writes_are_staged
+from app.db_commit import commit_with_error_handling, flush_with_error_handling
+from app.shared import ConflictDetected, NotFound
+
+__all__ = [
+    "BULK_WRITE_CHUNK_SIZE",
+    "UserScopedRepository",
+    "bump_version",
+    "byte_length",
+    "normalize_version",
+    "staged_writes",
+    "touch_updated_at",
+    "utc_now",
+    "writes_are_staged",
+]
 
 TModel = TypeVar("TModel", bound=SQLModel)
 
+# set-based UPDATE 1 文（= 1 トランザクション）で更新する行数の上限。
+# DSQL のトランザクションあたりの行数制限より十分小さくする。
+BULK_WRITE_CHUNK_SIZE = 500
+
+
+class byte_length(GenericFunction):
+    """文字列列の UTF-8 バイト長を返す SQL 関数（PostgreSQL の octet_length）。"""
+
+    type = Integer()
+    name = "octet_length"
+    inherit_cache = True
+
+
+@compiles(byte_length, "sqlite")
+def _compile_byte_length_sqlite(element, compiler, **kw) -> str:
+    """octet_length を持たない SQLite では BLOB 変換後の length で代替する。"""
+    return f"length(CAST({compiler.process(element.clauses, **kw)} AS BLOB))"
+
 
 def utc_now() -> datetime:
     """タイムゾーン付き UTC タイムスタンプを返す。"""
@@ -49,6 +87,10 @@ class UserScopedRepository[TModel: SQLModel]:
 
     model: type[TModel]
     resource_name: str
+    # metadata_only 指定時に読み込みを遅延させる大きな列（ノート本文など）
+    deferred_columns: tuple[str, ...] = ()
+    # record_changes に UTF-8 バイト数の増分を渡す文字列列（ノート本文など）
+    size_column: str | None = None
 
     def __init__(self, session: Session, user_id: str):
         self.session = session
@@ -67,6 +109,131 @@ class UserScopedRepository[TModel: SQLModel]:
         normalize_version(resource)
         return resource
 
+    def list_page(
+        self,
+        *,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        include_deleted: bool = False,
+        updated_after: datetime | None = None,
+        resource_ids: Sequence[UUID] | None = None,
+        metadata_only: bool = False,
+        descending: bool = False,
+        filters: Mapping[str, Any] | None = None,
+    ) -> list[TModel]:
+        """(updated_at, id) の昇順でキーセットページングした 1 ページ分を返す。
+
+        after には直前ページ末尾の (updated_at, id) を渡す。並び替えと絞り込みは
+        SQL 側で行うため、取得件数は limit に比例する。昇順で走査するため、
+        ページング中に更新された行は後続ページに現れ、取りこぼしが発生しない。
+        resource_ids を指定した場合はその ID の行のみを対象にする。
+        metadata_only=True の場合は deferred_columns を SELECT から除外する。
+        descending=True の場合は降順（新しい順）に走査する。filters は列名 → 値の
+        等価条件で、値が None の場合は IS NULL として扱う。
+        """
+        model = self.model
+        updated_at_column = getattr(model, "updated_at")
+        id_column = getattr(model, "id")
+        statement = select(model).where(getattr(model, "user_id") == self.user_id)
+        if metadata_only:
+            statement = statement.options(*self.metadata_only_options())
+        if not include_deleted:
+            statement = statement.where(getattr(model, "deleted_at").is_(None))
+        if updated_after is not None:
+            statement = statement.where(updated_at_column > updated_after)
+        if resource_ids is not None:
+            statement = statement.where(id_column.in_(resource_ids))
+        for column_name, value in (filters or {}).items():
+            column = getattr(model, column_name)
+            statement = statement.where(
+                column.is_(None) if value is None else column == value
+            )
+        if after is not None:
+            after_updated_at, after_id = after
+            if descending:
+                statement = statement.where(
+                    or_(
+                        updated_at_column < after_updated_at,
+                        and_(
+                            updated_at_column == after_updated_at, id_column < after_id
+                        ),
+                    )
+                )
+            else:
+                statement = statement.where(
+                    or_(
+                        updated_at_column > after_updated_at,
+                        and_(
+                            updated_at_column == after_updated_at, id_column > after_id
+                        ),
+                    )
+                )
+        if descending:
+            order_by = (updated_at_column.desc(), id_column.desc())
+        else:
+            order_by = (updated_at_column.asc(), id_column.asc())
+        statement = statement.order_by(*order_by).limit(limit)
+        resources = self.session.exec(statement).all()
+        for resource in resources:
+            normalize_version(resource)
+        return list(resources)
+
+    def list_by_ids(
+        self, resource_ids: Sequence[UUID], *, metadata_only: bool = False
+    ) -> list[TModel]:
+        """指定 ID の所有リソース（削除済み含む）を (updated_at, id) の降順で返す。
+
+        IN 句は BULK_WRITE_CHUNK_SIZE 件ずつに分割して発行する。存在しない ID は
+        無視する。metadata_only=True の場合は deferred_columns を SELECT から除外する。
+        """
+        model = self.model
+        id_column = getattr(model, "id")
+        unique_ids = list(dict.fromkeys(resource_ids))
+        resources: list[TModel] = []
+        for start in range(0, len(unique_ids), BULK_WRITE_CHUNK_SIZE):
+            statement = select(model).where(
+                getattr(model, "user_id") == self.user_id,
+                id_column.in_(unique_ids[start : start + BULK_WRITE_CHUNK_SIZE]),
+            )
+            if metadata_only:
+                statement = statement.options(*self.metadata_only_options())
+            resources.extend(self.session.exec(statement).all())
+        for resource in resources:
+            normalize_version(resource)
+        resources.sort(
+            key=lambda resource: (
+                getattr(resource, "updated_at"),
+                getattr(resource, "id"),
+            ),
+            reverse=True,
+        )
+        return resources
+
+    def metadata_only_options(self) -> list:
+        """deferred_columns を遅延ロードにするローダーオプションを返す。"""
+        return [defer(getattr(self.model, column)) for column in self.deferred_columns]
+
+    def get_version_marker(self, resource_id: UUID) -> tuple[int, datetime]:
+        """所有リソースの (version, updated_at) のみを取得する。
+
+        本文などの大きな列を読み込まずに条件付きリクエストを判定するために使う。
+        存在しない・他ユーザー所有・削除済みの場合は NotFound を送出する。
+        """
+        model = self.model
+        statement = select(
+            getattr(model, "version"), getattr(model, "updated_at")
+        ).where(
+            getattr(model, "id") == resource_id,
+            getattr(model, "user_id") == self.user_id,
+        )
+        if hasattr(model, "deleted_at"):
+            statement = statement.where(getattr(model, "deleted_at").is_(None))
+        row = self.session.exec(statement).first()
+        if row is None:
+            raise NotFound(f"{self.resource_name} not found")
+        version, updated_at = row
+        return (1 if version is None else version), updated_at
+
     def save(
         self,
         resource: TModel,
@@ -80,12 +247,310 @@ class UserScopedRepository[TModel: SQLModel]:
             touch_updated_at(resource)
         if bump:
             bump_version(resource)
+        count_delta, size_delta = self._write_delta(resource)
         self.session.add(resource)
-        commit_with_error_handling(self.session, resource_name or self.resource_name)
-        self.session.refresh(resource)
+        self.record_changes(
+            [getattr(resource, "id")], count_delta=count_delta, size_delta=size_delta
+        )
+        self.after_write()
+        commit_or_stage(self.session, resource_name=resource_name or self.resource_name)
+        return resource
+
+    def update_versioned(
+        self,
+        resource_id: UUID,
+        values: Mapping[str, Any],
+        *,
+        expected_version: int,
+    ) -> TModel:
+        """version が expected_version の場合のみ 1 文の条件付き UPDATE で更新する。
+
+        ``UPDATE ... SET ..., version = version + 1 WHERE id = :id AND
+        user_id = :uid AND version = :expected RETURNING *`` で照合と書き込みを
+        同時に行うため、事前の SELECT が不要で、照合から書き込みまでの間に
+        他の書き込みが割り込む余地もない。未削除の行のみを対象とし、updated_at は
+        現在時刻に更新する。更新行がなかった場合のみ version を読み直し、行が
+        存在しなければ NotFound、version が異なれば ConflictDetected を送出する。
+        values で size_column を更新する場合は変更前のバイト数が必要になるため、
+        PostgreSQL では同じ文の UPDATE ... FROM で取得し、RETURNING から結合先を
+        参照できない SQLite では事前に SELECT する。
+        """
+        model = self.model
+        id_column = getattr(model, "id")
+        version_column = func.coalesce(getattr(model, "version"), 1)
+        criteria = [
+            id_column == resource_id,
+            getattr(model, "user_id") == self.user_id,
+            version_column == expected_version,
+        ]
+        if hasattr(model, "deleted_at"):
+            criteria.append(getattr(model, "deleted_at").is_(None))
+        removes = values.get("deleted_at") is not None
+        returning: list[Any] = [model]
+        previous_size: int | None = None
+        if self.size_column is not None and (removes or self.size_column in values):
+            size = func.coalesce(byte_length(getattr(model, self.size_column)), 0)
+            if self.size_column not in values:
+                # 論理削除では本文が変わらないため、更新後の行からバイト数を返す
+                returning.append(size)
+            elif self.session.get_bind().dialect.name == "postgresql":
+                previous = (
+                    select(id_column.label("id"), size.label("previous_size"))
+                    .where(*criteria)
+                    .subquery()
+                )
+                criteria.append(id_column == previous.c.id)
+                returning.append(previous.c.previous_size)
+            else:
+                previous_size = self.session.exec(select(size).where(*criteria)).first()
+                if previous_size is None:
+                    self._raise_version_mismatch(resource_id, expected_version)
+
+        statement = (
+            update(model)
+            .where(*criteria)
+            .values({**values, "version": version_column + 1, "updated_at": utc_now()})
+            .returning(*returning)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        row = self.session.exec(statement).first()
+        if row is None:
+            self._raise_version_mismatch(resource_id, expected_version)
+        resource, *extra = row
+        size_delta = 0
+        if removes and extra:
+            size_delta = -extra[0]
+        elif self.size_column is not None and self.size_column in values:
+            if previous_size is None:
+                previous_size = extra[0]
+            size_delta = _byte_size(values[self.size_column]) - previous_size
+        self.record_changes(
+            [resource_id], count_delta=-1 if removes else 0, size_delta=size_delta
+        )
+        self.after_write()
+        commit_or_stage(self.session, resource_name=self.resource_name)
         return resource
 
+    def _raise_version_mismatch(
+        self, resource_id: UUID, expected_version: int
+    ) -> NoReturn:
+        """条件付き UPDATE が行を更新しなかった理由を判定して例外を送出する。"""
+        version, _ = self.get_version_marker(resource_id)
+        raise ConflictDetected(
+            f"{self.resource_name} version mismatch: "
+            f"expected {expected_version}, found {version}"
+        )
+
     def delete_owned(self, resource_id: UUID) -> None:
         resource = self.get_owned(resource_id)
+        count_delta, size_delta = self._write_delta(resource, removed=True)
         self.session.delete(resource)
+        self.record_changes(
+            [resource_id], count_delta=count_delta, size_delta=size_delta
+        )
+        self.after_write()
+        if writes_are_staged(self.session):
+            flush_with_error_handling(self.session, self.resource_name)
+            return
         commit_with_error_handling(self.session, self.resource_name)
+
+    def insert_many(self, resources: Sequence[TModel]) -> int:
+        """新規リソースをまとめて追加し、変更ログへ 1 回で追記して件数を返す。
+
+        1 回のコミット（ステージングモードでは flush）で書き込むため、呼び出し元は
+        DSQL のトランザクションあたりの行数・データ量の上限に収まる件数に分割する。
+        """
+        if not resources:
+            return 0
+        self.session.add_all(resources)
+        self.record_changes(
+            [getattr(resource, "id") for resource in resources],
+            count_delta=len(resources),
+            size_delta=sum(
+                _byte_size(getattr(resource, self.size_column))
+                for resource in resources
+            )
+            if self.size_column is not None
+            else 0,
+        )
+        self.after_write()
+        if writes_are_staged(self.session):
+            flush_with_error_handling(self.session, self.resource_name)
+        else:
+            commit_with_error_handling(self.session, self.resource_name)
+        return len(resources)
+
+    def bulk_update_owned(
+        self,
+        values: Mapping[str, Any],
+        *,
+        resource_ids: Sequence[UUID] | None = None,
+        where: Sequence[Any] = (),
+        chunk_size: int | None = None,
+    ) -> int:
+        """未削除の所有リソースを set-based UPDATE でまとめて更新し、更新件数を返す。
+
+        values に加えて version を 1 インクリメントし、updated_at を現在時刻に
+        更新する。行を ORM に読み込まず、chunk_size 件ごとに 1 文の UPDATE を
+        発行してコミットする（ステージングモードではコミットしない）。
+        resource_ids を指定した場合はその ID を chunk_size 件ずつ更新する。
+        省略した場合は where 条件に一致する行を chunk_size 件ずつ更新するため、
+        where は更新後の行が一致しなくなる条件でなければならない。
+        chunk_size の既定値は BULK_WRITE_CHUNK_SIZE。values で deleted_at を
+        設定する（論理削除する）場合は、size_column のバイト数も RETURNING で
+        取得して record_changes に減算分を渡す。
+        """
+        chunk_size = chunk_size or BULK_WRITE_CHUNK_SIZE
+        model = self.model
+        id_column = getattr(model, "id")
+        criteria = [getattr(model, "user_id") == self.user_id, *where]
+        if hasattr(model, "deleted_at"):
+            criteria.append(getattr(model, "deleted_at").is_(None))
+        assignments = {
+            **values,
+            "version": func.coalesce(getattr(model, "version"), 1) + 1,
+            "updated_at": utc_now(),
+        }
+        removes = values.get("deleted_at") is not None
+        returning = [id_column]
+        if removes and self.size_column is not None:
+            returning.append(
+                func.coalesce(byte_length(getattr(model, self.size_column)), 0)
+            )
+
+        if resource_ids is not None:
+            unique_ids = list(dict.fromkeys(resource_ids))
+            chunks = (
+                [id_column.in_(unique_ids[start : start + chunk_size])]
+                for start in range(0, len(unique_ids), chunk_size)
+            )
+        else:
+            target_ids = select(id_column).where(*criteria).limit(chunk_size)
+            chunks = iter(lambda: [id_column.in_(target_ids)], None)
+
+        total = 0
+        for chunk_criteria in chunks:
+            statement = (
+                update(model)
+                .where(*criteria, *chunk_criteria)
+                .values(assignments)
+                .returning(*returning)
+                .execution_options(synchronize_session="fetch")
+            )
+            rows = self.session.exec(statement).all()
+            updated = len(rows)
+            total += updated
+            if updated:
+                self.record_changes(
+                    [row[0] for row in rows],
+                    count_delta=-updated if removes else 0,
+                    size_delta=-sum(row[1] for row in rows)
+                    if len(returning) > 1
+                    else 0,
+                )
+                self.after_write()
+                if not writes_are_staged(self.session):
+                    commit_with_error_handling(self.session, self.resource_name)
+            if resource_ids is None and updated < chunk_size:
+                break
+        return total
+
+    def list_expired_tombstones(
+        self, deleted_before: datetime, *, limit: int
+    ) -> list[tuple[UUID, datetime]]:
+        """deleted_before より前に論理削除されたリソースの (id, updated_at) を返す。
+
+        コンパクションで物理削除する対象を limit 件ずつ取り出すために使う。
+        """
+        model = self.model
+        statement = (
+            select(getattr(model, "id"), getattr(model, "updated_at"))
+            .where(
+                getattr(model, "user_id") == self.user_id,
+                getattr(model, "deleted_at").is_not(None),
+                getattr(model, "deleted_at") < deleted_before,
+            )
+            .limit(limit)
+        )
+        return [tuple(row) for row in self.session.exec(statement).all()]
+
+    def purge_owned(self, resource_ids: Sequence[UUID]) -> int:
+        """所有リソースを物理削除し、削除件数を返す。
+
+        ORM インスタンスを読み込まずに 1 回の DELETE で削除する。コミットは
+        呼び出し元が行う。
+        """
+        if not resource_ids:
+            return 0
+        model = self.model
+        result = self.session.exec(
+            delete(model).where(
+                getattr(model, "user_id") == self.user_id,
+                getattr(model, "id").in_(resource_ids),
+            )
+        )
+        self.after_write()
+        return result.rowcount
+
+    def record_changes(
+        self,
+        resource_ids: Sequence[UUID],
+        *,
+        count_delta: int = 0,
+        size_delta: int = 0,
+    ) -> None:
+        """書き込んだリソースの ID を受け取るフック。派生クラスで変更ログの追記に使う。
+
+        count_delta は未削除リソース数の増分、size_delta は未削除リソースの
+        size_column のバイト数の増分。書き込みと同じトランザクションで呼ばれ、
+        コミット（またはロールバック）は書き込み本体と共に行われる。
+        物理削除（purge_owned）は tombstone のみを対象とするため呼ばれない。
+        """
+
+    def _write_delta(
+        self, resource: TModel, *, removed: bool = False
+    ) -> tuple[int, int]:
+        """flush 前の属性履歴から (未削除件数, size_column バイト数) の増分を求める。
+
+        removed=True は物理削除を表す。size_column が未変更で削除状態も変わらない
+        場合は、遅延ロードの列を読み込まずに 0 を返す。
+        """
+        state = inspect(resource)
+        was_live = (
+            state.has_identity and _previous_value(resource, "deleted_at") is None
+        )
+        is_live = not removed and getattr(resource, "deleted_at", None) is None
+        count_delta = int(is_live) - int(was_live)
+        if self.size_column is None or (
+            was_live and is_live and not state.attrs[self.size_column].history.added
+        ):
+            return count_delta, 0
+        before = (
+            _byte_size(_previous_value(resource, self.size_column)) if was_live else 0
+        )
+        after = _byte_size(getattr(resource, self.size_column)) if is_live else 0
+        return count_delta, after - before
+
+    def after_write(self) -> None:
+        """書き込みのたびに呼ばれるフック。派生クラスでキャッシュ破棄などに使う。
+
+        コミット前に呼ばれるため、書き込みが失敗しても破棄だけが行われる
+        （次回の読み取りで再構築されるだけで整合性は崩れない）。
+        """
+
+
+def _previous_value(resource: object, key: str) -> Any:
+    """最後の flush（または読み込み）時点の属性値を返す。属性がなければ None。"""
+    if not hasattr(resource, key):
+        return None
+    history = inspect(resource).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(resource, key)
+
+
+def _byte_size(value: str | None) -> int:
+    """文字列の UTF-8 バイト長を返す。None は 0 とする。"""
+    return len(value.encode()) if value else 0
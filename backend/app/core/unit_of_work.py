@@ -0,0 +1,142 @@
+"""リクエスト単位の unit of work（書き込みの 1 トランザクション化）。
+
+責務: 1 つのユースケース呼び出しで行う複数の書き込みをステージングし、
+    最後に 1 回だけコミットする。コミット時の OCC 競合では unit 全体を
+    最初から再実行する（再実行とバックオフは app.db_retry が担う）。
+    リポジトリがコミットせず flush のみに留めるステージングモードも
+    ここで管理する。
+主要なエクスポート: UnitOfWork, get_unit_of_work, commit_or_stage,
+    staged_writes, writes_are_staged, UNIT_OF_WORK_RETRY_POLICY
+呼び出し関係: get_session がリクエストごとのセッションに unit を紐づけ、
+    workspace / settings / assistant のユースケースが書き込みを
+    UnitOfWork.run で包む。リポジトリと書き込みヘルパーは commit_or_stage で
+    unit の内側か外側かに応じて flush またはコミットを行う。
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from sqlmodel import Session
+
+from app.db_commit import commit_with_error_handling, flush_with_error_handling
+from app.db_retry import RetryPolicy, run_transaction, wrote_in_transaction
+
+# Session.info 上で「書き込みを保留中」であることを示すキー
+_STAGED_WRITES_KEY = "persistence.staged_writes"
+# Session.info 上でセッションに紐づく UnitOfWork を保持するキー
+_UNIT_OF_WORK_KEY = "persistence.unit_of_work"
+
+# unit 全体の既定のリトライ予算。取得または作成の競合（一意制約違反）も
+# 再実行で既存行を読み直せば解消するため再試行の対象とする
+UNIT_OF_WORK_RETRY_POLICY = RetryPolicy(
+    "unit_of_work", max_attempts=3, retry_unique_violations=True
+)
+
+
+def writes_are_staged(session: Session) -> bool:
+    """セッションがコミットを保留するステージングモードかどうかを返す。"""
+    return bool(session.info.get(_STAGED_WRITES_KEY, False))
+
+
+@contextmanager
+def staged_writes(session: Session) -> Iterator[None]:
+    """ブロック内のリポジトリ書き込みをコミットせず flush のみに留める。
+
+    複数の書き込みを 1 トランザクションにまとめたい呼び出し元が使用し、
+    ブロックを抜けた後のコミット（またはロールバック）は呼び出し元が担う。
+    """
+    previous = session.info.get(_STAGED_WRITES_KEY, False)
+    session.info[_STAGED_WRITES_KEY] = True
+    try:
+        yield
+    finally:
+        session.info[_STAGED_WRITES_KEY] = previous
+
+
+def commit_or_stage(session: Session, resource_name: str = "Resource") -> None:
+    """書き込みを確定する。ステージングモードでは flush のみ行う。
+
+    unit of work の内側では書き込みがあったことを unit に記録し、コミットは
+    unit の最後に 1 回だけ行う。
+    """
+    if not writes_are_staged(session):
+        commit_with_error_handling(session, resource_name)
+        return
+    flush_with_error_handling(session, resource_name)
+    unit = session.info.get(_UNIT_OF_WORK_KEY)
+    if unit is not None and unit.active:
+        unit.record_write()
+
+
+def get_unit_of_work(session: Session) -> "UnitOfWork":
+    """セッションに紐づく UnitOfWork を返す。未作成なら作成して紐づける。"""
+    unit = session.info.get(_UNIT_OF_WORK_KEY)
+    if unit is None:
+        unit = UnitOfWork(session)
+        session.info[_UNIT_OF_WORK_KEY] = unit
+    return unit
+
+
+class UnitOfWork:
+    """1 セッション上の書き込みを 1 トランザクションにまとめる unit of work。
+
+    run に渡した処理の書き込みはすべて flush のみ行い、処理が正常に終わった
+    時点で 1 回だけコミットする。処理中の例外ではロールバックして再送出し、
+    OCC 競合と一意制約違反では処理全体を最初から再実行する。
+    run の内側で呼ばれた run や、staged_writes ブロックの内側で呼ばれた run は
+    外側のトランザクションに参加し、コミットは外側が行う。
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._depth = 0
+        self._wrote = False
+
+    @property
+    def active(self) -> bool:
+        """run の実行中かどうかを返す。"""
+        return self._depth > 0
+
+    def record_write(self) -> None:
+        """実行中の試行で書き込みがあったことを記録する。"""
+        self._wrote = True
+
+    def run[T](
+        self,
+        operation: Callable[[], T],
+        resource_name: str = "Resource",
+        *,
+        policy: RetryPolicy = UNIT_OF_WORK_RETRY_POLICY,
+    ) -> T:
+        """operation を 1 トランザクションで実行し、結果を返す。
+
+        コミット時の OCC 競合や一意制約違反では、policy のリトライ予算の範囲で
+        operation を最初から再実行する（app.db_retry.run_transaction）。
+        operation は再実行されるため、外部への副作用を持たせないこと
+        （DB の読み直しから始まる処理であること）。
+        """
+        if self.active or writes_are_staged(self.session):
+            return operation()
+        return run_transaction(
+            self.session,
+            lambda: self._run_once(operation, resource_name),
+            policy=policy,
+        )
+
+    def _run_once[T](self, operation: Callable[[], T], resource_name: str) -> T:
+        """operation の書き込みをステージングし、最後に 1 回だけコミットする。
+
+        書き込みのなかった試行（読み込みのみ）はコミットを省略する。
+        """
+        self._wrote = False
+        self._depth += 1
+        try:
+            with staged_writes(self.session):
+                result = operation()
+        finally:
+            self._depth -= 1
+
+        if not (self._wrote or wrote_in_transaction(self.session)):
+            return result
+        commit_with_error_handling(self.session, resource_name)
+        return result
@@ -1,7 +1,8 @@
 """Aurora DSQL およびローカル開発向けのデータベース接続設定モジュール。
 
-責務: SQLModel エンジンの生成とセッション提供。
-主要なエクスポート: get_dsql_engine, create_db_and_tables, get_session。
+責務: SQLModel エンジンの生成とセッション提供。DSQL 接続の IAM 認証トークンは
+    app.dsql_auth の DsqlAuthTokenProvider でキャッシュする。
+主要なエクスポート: get_dsql_engine, create_session, create_db_and_tables, get_session。
 呼び出し関係: lambda_handler / worker_lambda_handler から初期化時に呼ばれ、
     各ルーターでは FastAPI の Depends(get_session) 経由で使用される。
 """
@@ -11,12 +12,14 @@ import os
 import time
 from collections.abc import Generator
 
-import boto3
 import psycopg2
+from sqlalchemy.engine import Engine
 from sqlmodel import Session, create_engine
 
 from app.bootstrap.database_bootstrap import create_database_schema
 from app.config import get_settings
+from app.core.unit_of_work import get_unit_of_work
+from app.dsql_auth import DsqlAuthTokenProvider
 from app.logging_utils import log_event
 
 logger = logging.getLogger(__name__)
@@ -56,25 +59,28 @@ def get_dsql_engine():
             outcome="running",
         )
 
+        hostname = f"{dsql_endpoint}.dsql.{region}.on.aws"
+        token_provider = DsqlAuthTokenProvider(hostname, region)
+
         def get_connection():
             """DSQL への psycopg2 接続を生成して返す。
 
-            署名期限切れや時刻ズレによる OperationalError は
-            max_retries 回まで指数バックオフで再試行する。
+            IAM 認証トークンは token_provider のキャッシュから取得する。
+            署名期限切れや時刻ズレによる OperationalError はキャッシュを破棄して
+            max_retries 回まで再試行する。トークン取得と接続確立（TCP/TLS と
+            認証）の所要時間を分けて ops.db.connection.opened に出力する。
             """
             max_retries = 3
             base_delay = 0.5
 
             for attempt in range(max_retries):
                 try:
-                    client = boto3.client("dsql", region_name=region)
-                    token = client.generate_db_connect_admin_auth_token(
-                        Hostname=f"{dsql_endpoint}.dsql.{region}.on.aws",
-                        Region=region,
-                    )
+                    started = time.perf_counter()
+                    token, token_cache_hit = token_provider.get_token()
+                    token_acquired = time.perf_counter()
 
-                    return psycopg2.connect(
-                        host=f"{dsql_endpoint}.dsql.{region}.on.aws",
+                    connection = psycopg2.connect(
+                        host=hostname,
                         port=5432,
                         database="postgres",
                         user="admin",
@@ -82,6 +88,20 @@ def get_dsql_engine():
                         sslmode="require",
                         connect_timeout=5,
                     )
+                    connected = time.perf_counter()
+                    log_event(
+                        logger,
+                        logging.INFO,
+                        "ops.db.connection.opened",
+                        database_mode="dsql",
+                        attempt=attempt + 1,
+                        token_cache_hit=token_cache_hit,
+                        token_ms=round((token_acquired - started) * 1000, 2),
+                        connect_ms=round((connected - token_acquired) * 1000, 2),
+                        total_ms=round((connected - started) * 1000, 2),
+                        outcome="success",
+                    )
+                    return connection
                 except psycopg2.OperationalError as exc:
                     error_message = str(exc)
                     if (
@@ -89,6 +109,7 @@ def get_dsql_engine():
                         or "Signature not yet current" in error_message
                         # Lambda の時刻とAWS認証基盤の時刻がズレた場合に発生する
                     ):
+                        token_provider.invalidate()
                         log_event(
                             logger,
                             logging.WARNING,
@@ -186,8 +207,26 @@ def create_db_and_tables() -> None:
     create_database_schema(get_dsql_engine, logger=logger)
 
 
+def create_session(engine: Engine | None = None) -> Session:
+    """コミット後も読み込み済みの属性を expire しないセッションを生成して返す。
+
+    ID やタイムスタンプはアプリケーション側で生成しており、server default を
+    持つ列もないため、flush 済みのインスタンスはコミット後もそのまま DB の値と
+    一致する。コミット後の refresh（書き込んだ行を読み直す SELECT）を不要にする。
+    ロールバック時は通常どおり全インスタンスが expire される。
+    engine を省略した場合は get_dsql_engine のエンジンを使う。
+    """
+    return Session(engine or get_dsql_engine(), expire_on_commit=False)
+
+
 def get_session() -> Generator[Session, None, None]:
-    """FastAPI の Depends で使用するデータベースセッションを提供するジェネレータ。"""
-    engine = get_dsql_engine()
-    with Session(engine) as session:
+    """FastAPI の Depends で使用するデータベースセッションを提供するジェネレータ。
+
+    セッションにはリクエスト単位の UnitOfWork を紐づける。yield 依存の後処理は
+    レスポンス送信後に実行され、そこで起きた競合をクライアントへ返せないため、
+    コミットは後処理ではなくユースケースを包む UnitOfWork.run の終わりで行う。
+    後処理ではコミットされずに残った書き込みをセッションのクローズで破棄する。
+    """
+    with create_session() as session:
+        get_unit_of_work(session)
         yield session
@@ -1,87 +1,110 @@
 """ルーター・サービス・認証依存関係全体で共有するデータベースコミットヘルパー。
 
-責務: SQLAlchemy セッションのコミットにリトライと例外変換を付与する。
+責務: SQLAlchemy セッションのコミット・flush に例外変換を付与する。
+    エラーの分類は app.db_retry の classify_db_error が担う。
 主要なエクスポート: commit_with_retry, commit_with_error_handling,
-    is_retryable_commit_error
+    flush_with_error_handling, is_retryable_commit_error
 呼び出し関係: リポジトリおよびユースケース層から呼ばれ、
-    app.shared のドメインエラーを送出する。
+    app.shared のドメインエラーを送出する。競合時の再実行は
+    app.db_retry.run_transaction が行う。
 """
 
-import time
 from collections.abc import Callable
 
 from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlmodel import Session
 
+from app.db_retry import (
+    FOREIGN_KEY_VIOLATION,
+    SERIALIZATION_FAILURE,
+    UNIQUE_VIOLATION,
+    classify_db_error,
+)
 from app.shared import ConflictDetected, ValidationFailed
 
 
 def is_retryable_commit_error(error: Exception) -> bool:
-    """コミットエラーがリトライ・リカバリ可能かを返す。"""
-    message = str(error).lower()
-    return (
-        "change conflicts with another transaction" in message
-        or "serializationfailure" in message
-        or "oc000" in message
-        or "duplicate" in message
-        or "unique" in message
-    )
+    """コミットエラーが OCC 競合（再実行すれば成功し得るエラー）かを返す。
+
+    SQLSTATE 40001 と DSQL の OC000 / OC001 を対象とし、一意制約違反は含めない。
+    """
+    return classify_db_error(error) == SERIALIZATION_FAILURE
 
 
 def commit_with_retry[T](
     session: Session,
     *,
-    max_retries: int = 1,
     recovery: Callable[[], T | None] | None = None,
 ) -> T | None:
-    """一時的な書き込み競合に対して限定的なリトライを行いつつセッションをコミットする。"""
-    for attempt in range(max_retries):
-        try:
-            session.commit()
-            return None
-        except (IntegrityError, OperationalError) as error:
-            session.rollback()
-            if not is_retryable_commit_error(error):
-                raise
-
-            if recovery is not None:
-                recovered = recovery()
-                if recovered is not None:
-                    return recovered
-
-            if attempt == max_retries - 1:
-                raise
+    """セッションをコミットし、OCC 競合時はロールバックしてリカバリを試みる。
 
-            # 指数的バックオフ（最大リトライ数が少ないため線形で十分）
-            time.sleep(0.05 * (attempt + 1))
-
-    raise RuntimeError("Commit retries exhausted without returning or raising")
+    ロールバックしたセッションには書き込みが残らないため、ここではコミットを
+    繰り返さない。競合時にトランザクションを再実行したい場合は
+    app.db_retry.run_transaction（または UnitOfWork.run）で処理全体を包む。
+    recovery が値を返した場合はそれを返し、返さなければ元のエラーを再送出する。
+    """
+    try:
+        session.commit()
+        return None
+    except (IntegrityError, OperationalError) as error:
+        session.rollback()
+        if recovery is None or not is_retryable_commit_error(error):
+            raise
+        recovered = recovery()
+        if recovered is not None:
+            return recovered
+        raise
 
 
 def commit_with_error_handling(
     session: Session,
     resource_name: str = "Resource",
-    *,
-    max_retries: int = 1,
 ) -> None:
     """セッションをコミットし、データベースエラーをドメインエラーへ変換する。"""
     try:
-        commit_with_retry(session, max_retries=max_retries)
-    except IntegrityError as e:
-        session.rollback()
-        error_message = str(e.orig).lower() if e.orig else str(e).lower()
-
-        if "foreign key" in error_message or "fk_" in error_message:
-            raise ValidationFailed(
-                f"{resource_name} references a non-existent resource"
-            )
-        if "unique" in error_message or "duplicate" in error_message:
-            raise ConflictDetected(f"{resource_name} already exists")
-        raise ValidationFailed(f"Database constraint violation for {resource_name}")
-    except OperationalError as e:
-        session.rollback()
-        if is_retryable_commit_error(e):
-            raise ConflictDetected(
-                f"Concurrent update conflict for {resource_name}. Please retry."
-            )
-        raise
+        commit_with_retry(session)
+    except (IntegrityError, OperationalError) as e:
+        _raise_domain_error(session, e, resource_name)
+
+
+def flush_with_error_handling(
+    session: Session, resource_name: str = "Resource"
+) -> None:
+    """コミットせずにセッションを flush し、データベースエラーをドメインエラーへ変換する。
+
+    バッチ適用などで複数の書き込みを 1 トランザクションにまとめる場合に使う。
+    失敗時はトランザクション全体をロールバックする。
+    """
+    try:
+        session.flush()
+    except (IntegrityError, OperationalError) as e:
+        _raise_domain_error(session, e, resource_name)
+
+
+def _raise_domain_error(
+    session: Session,
+    error: IntegrityError | OperationalError,
+    resource_name: str,
+) -> None:
+    """ロールバックしたうえで DB エラーを対応するドメインエラーとして送出する。
+
+    変換後のエラーは元のエラーを __cause__ に持ち、run_transaction が
+    リトライ可否を判定できるようにする。
+    """
+    session.rollback()
+    kind = classify_db_error(error)
+    if kind == FOREIGN_KEY_VIOLATION:
+        raise ValidationFailed(
+            f"{resource_name} references a non-existent resource"
+        ) from error
+    if kind == UNIQUE_VIOLATION:
+        raise ConflictDetected(f"{resource_name} already exists") from error
+    if kind == SERIALIZATION_FAILURE:
+        raise ConflictDetected(
+            f"Concurrent update conflict for {resource_name}. Please retry."
+        ) from error
+    if isinstance(error, IntegrityError):
+        raise ValidationFailed(
+            f"Database constraint violation for {resource_name}"
+        ) from error
+    raise error
@@ -0,0 +1,283 @@
+"""Aurora DSQL の楽観的同時実行制御（OCC）競合に対するリトライエンジン。
+
+責務: データベースエラーを SQLSTATE・DSQL のエラーコードで分類し、
+    OCC 競合（OC000 / OC001 / 40001）となったトランザクションを、
+    上限付き指数バックオフ（フルジッター）と操作ごとのリトライ予算に従って
+    丸ごと再実行する。試行回数とテーブルごとの競合率を log_event で出力する。
+主要なエクスポート: RetryPolicy, DEFAULT_RETRY_POLICY, run_transaction,
+    classify_db_error, backoff_delay, wrote_in_transaction, occ_table_stats,
+    reset_occ_table_stats,
+    SERIALIZATION_FAILURE, UNIQUE_VIOLATION, FOREIGN_KEY_VIOLATION
+呼び出し関係: app.core.unit_of_work の UnitOfWork.run から呼ばれ、
+    app.db_commit はエラーの分類に classify_db_error を使う。
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.logging_utils import log_event
+from app.shared import ConflictDetected
+
+logger = logging.getLogger(__name__)
+
+# classify_db_error が返すエラー種別
+SERIALIZATION_FAILURE = "serialization_failure"
+UNIQUE_VIOLATION = "unique_violation"
+FOREIGN_KEY_VIOLATION = "foreign_key_violation"
+
+# PostgreSQL / DSQL の SQLSTATE。DSQL の OCC 競合は 40001 で返る
+_SQLSTATE_KINDS = {
+    "40001": SERIALIZATION_FAILURE,
+    "40P01": SERIALIZATION_FAILURE,
+    "23505": UNIQUE_VIOLATION,
+    "23503": FOREIGN_KEY_VIOLATION,
+}
+# SQLite（ローカル・テスト）の拡張エラーコード名
+_SQLITE_KINDS = {
+    "SQLITE_CONSTRAINT_UNIQUE": UNIQUE_VIOLATION,
+    "SQLITE_CONSTRAINT_PRIMARYKEY": UNIQUE_VIOLATION,
+    "SQLITE_CONSTRAINT_FOREIGNKEY": FOREIGN_KEY_VIOLATION,
+}
+# DSQL の OCC エラーコード（OC000: データ競合、OC001: スキーマ競合）は
+# SQLSTATE ではなくメッセージ末尾にのみ含まれる
+_DSQL_OCC_CODE = re.compile(r"\(OC00[01]\)")
+
+# Session.info 上で、トランザクション中に書き込んだテーブル名を保持するキー
+_WRITTEN_TABLES_KEY = "db_retry.written_tables"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """1 つの操作に割り当てるリトライ予算。
+
+    max_attempts は初回を含む最大実行回数。n 回目の再試行前には
+    [0, min(max_delay, base_delay * 2**(n-1))] の一様乱数だけ待機し、
+    待機時間の合計が max_total_delay を超える場合はそれ以上再試行しない。
+    retry_unique_violations を有効にすると一意制約違反も再試行する
+    （取得または作成のように、再実行で既存行を読み直せば解消する操作向け）。
+    """
+
+    name: str
+    max_attempts: int = 3
+    base_delay: float = 0.02
+    max_delay: float = 0.5
+    max_total_delay: float = 2.0
+    retry_unique_violations: bool = False
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy("default")
+
+
+def classify_db_error(error: BaseException) -> str | None:
+    """データベースエラーの種別を返す。分類できない場合は None。
+
+    ConflictDetected などドメインエラーへ変換済みの場合は、変換元
+    （__cause__）のエラーを分類する。
+    """
+    while isinstance(error, ConflictDetected) and error.__cause__ is not None:
+        error = error.__cause__
+    original = error.orig if isinstance(error, DBAPIError) else error
+    if original is None:
+        return None
+
+    sqlstate = getattr(original, "pgcode", None) or getattr(original, "sqlstate", None)
+    if sqlstate in _SQLSTATE_KINDS:
+        return _SQLSTATE_KINDS[sqlstate]
+    sqlite_error = getattr(original, "sqlite_errorname", None)
+    if sqlite_error in _SQLITE_KINDS:
+        return _SQLITE_KINDS[sqlite_error]
+    if _DSQL_OCC_CODE.search(str(original)):
+        return SERIALIZATION_FAILURE
+    return None
+
+
+def wrote_in_transaction(session: Session) -> bool:
+    """run_transaction で実行中の試行が、ここまでに書き込みを行ったかを返す。"""
+    return bool(session.info.get(_WRITTEN_TABLES_KEY))
+
+
+def backoff_delay(attempt: int, policy: RetryPolicy) -> float:
+    """attempt 回目の失敗後、再試行までの待機秒数を返す（フルジッター）。"""
+    ceiling = min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1))
+    # 競合した試行の再実行時刻を分散させるだけで、セキュリティ上の用途はない
+    return random.uniform(0, ceiling)  # noqa: S311
+
+
+def run_transaction[T](
+    session: Session,
+    transaction: Callable[[], T],
+    *,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+) -> T:
+    """transaction（コミットまでを含む処理）を実行し、OCC 競合時は丸ごと再実行する。
+
+    例外時はセッションをロールバックする。OCC 競合（policy によっては一意制約
+    違反も）であればリトライ予算の範囲で待機して再実行し、それ以外の例外や
+    予算を使い切った場合は最後の例外を再送出する。transaction は再実行される
+    ため、データベースの読み直しから始まる処理とし、外部への副作用を持たせないこと。
+    """
+    total_delay = 0.0
+    attempt = 1
+    while True:
+        session.info[_WRITTEN_TABLES_KEY] = set()
+        try:
+            result = transaction()
+        except Exception as error:
+            tables = sorted(session.info.pop(_WRITTEN_TABLES_KEY, ()))
+            session.rollback()
+            kind = classify_db_error(error)
+            retryable = kind == SERIALIZATION_FAILURE or (
+                kind == UNIQUE_VIOLATION and policy.retry_unique_violations
+            )
+            if not retryable:
+                raise
+            _stats.record(tables, conflict=True)
+            delay = backoff_delay(attempt, policy)
+            if (
+                attempt >= policy.max_attempts
+                or total_delay + delay > policy.max_total_delay
+            ):
+                _log_outcome(
+                    logging.ERROR, "ops.db.occ.exhausted", policy, attempt, tables, kind
+                )
+                raise
+            log_event(
+                logger,
+                logging.WARNING,
+                "ops.db.occ.retrying",
+                operation=policy.name,
+                attempt=attempt,
+                max_attempts=policy.max_attempts,
+                reason=kind,
+                delay_ms=round(delay * 1000, 1),
+                tables=tables,
+                conflict_rate=_stats.conflict_rates(tables),
+                outcome="retry",
+            )
+            time.sleep(delay)
+            total_delay += delay
+            attempt += 1
+            continue
+
+        tables = sorted(session.info.pop(_WRITTEN_TABLES_KEY, ()))
+        _stats.record(tables, conflict=False)
+        if attempt > 1:
+            _log_outcome(logging.INFO, "ops.db.occ.resolved", policy, attempt, tables)
+        return result
+
+
+def _log_outcome(
+    level: int,
+    event_name: str,
+    policy: RetryPolicy,
+    attempts: int,
+    tables: list[str],
+    reason: str | None = None,
+) -> None:
+    """リトライを伴ったトランザクションの最終結果を出力する。"""
+    log_event(
+        logger,
+        level,
+        event_name,
+        operation=policy.name,
+        attempts=attempts,
+        reason=reason,
+        tables=tables,
+        conflict_rate=_stats.conflict_rates(tables),
+        outcome="success" if level < logging.ERROR else "failure",
+    )
+
+
+class _TableConflictStats:
+    """プロセス内で集計するテーブルごとのトランザクション数と競合数。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._transactions: dict[str, int] = {}
+        self._conflicts: dict[str, int] = {}
+
+    def record(self, tables: list[str], *, conflict: bool) -> None:
+        with self._lock:
+            for table in tables:
+                self._transactions[table] = self._transactions.get(table, 0) + 1
+                if conflict:
+                    self._conflicts[table] = self._conflicts.get(table, 0) + 1
+
+    def conflict_rates(self, tables: list[str]) -> dict[str, float]:
+        with self._lock:
+            return {
+                table: round(
+                    self._conflicts.get(table, 0) / self._transactions[table], 4
+                )
+                for table in tables
+                if self._transactions.get(table)
+            }
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                table: {
+                    "transactions": count,
+                    "conflicts": self._conflicts.get(table, 0),
+                }
+                for table, count in self._transactions.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._transactions.clear()
+            self._conflicts.clear()
+
+
+_stats = _TableConflictStats()
+
+
+def occ_table_stats() -> dict[str, dict[str, int]]:
+    """テーブルごとの試行トランザクション数と OCC 競合数を返す。"""
+    return _stats.snapshot()
+
+
+def reset_occ_table_stats() -> None:
+    """テーブルごとの集計をリセットする（テスト用）。"""
+    _stats.reset()
+
+
+@event.listens_for(Session, "before_flush")
+def _track_flushed_tables(session: Session, flush_context, instances) -> None:
+    """run_transaction の実行中に flush で書き込むテーブルを記録する。
+
+    flush 自体が一意制約違反などで失敗した場合も対象テーブルを集計できるよう、
+    flush の前に記録する。
+    """
+    tables = session.info.get(_WRITTEN_TABLES_KEY)
+    if tables is None:
+        return
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(type(instance), "__tablename__", None)
+        if table is not None:
+            tables.add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statement_tables(orm_execute_state) -> None:
+    """run_transaction の実行中に INSERT / UPDATE / DELETE 文で書き込んだテーブルを記録する。"""
+    tables = orm_execute_state.session.info.get(_WRITTEN_TABLES_KEY)
+    if tables is None:
+        return
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            tables.add(table.name)
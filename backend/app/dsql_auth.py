@@ -0,0 +1,154 @@
+"""Aurora DSQL の IAM 認証トークンを生成・キャッシュするプロバイダー。
+
+責務: boto3 の DSQL クライアントをプロセス内で 1 つだけ生成して再利用し、
+    署名済みの認証トークンを有効期限の少し前までキャッシュする。期限が
+    近づいたトークンはバックグラウンドスレッドで更新し、接続処理が
+    トークン生成を待たないようにする。
+主要なエクスポート: DsqlAuthTokenProvider, TokenLookup,
+    DSQL_TOKEN_TTL_SECONDS, DSQL_TOKEN_REFRESH_BEFORE_SECONDS
+呼び出し関係: app.database の get_dsql_engine が生成し、
+    プールの接続生成（get_connection）ごとに get_token を呼ぶ。
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+import boto3
+
+from app.logging_utils import log_event
+
+logger = logging.getLogger(__name__)
+
+# 生成するトークンの有効期間（秒）。DSQL の既定値と同じ 15 分
+DSQL_TOKEN_TTL_SECONDS = 900
+# 期限のこの秒数前からバックグラウンドで更新を始める
+DSQL_TOKEN_REFRESH_BEFORE_SECONDS = 120
+# 期限のこの秒数前を過ぎたトークンは使わず、同期的に生成し直す
+DSQL_TOKEN_MIN_REMAINING_SECONDS = 30
+
+
+class TokenLookup(NamedTuple):
+    """get_token の結果。cache_hit はキャッシュ済みトークンを返したかどうか。"""
+
+    token: str
+    cache_hit: bool
+
+
+class DsqlAuthTokenProvider:
+    """DSQL の admin 接続用 IAM 認証トークンをキャッシュして返す。
+
+    トークンは生成から ttl_seconds 有効とみなす。期限まで refresh_before_seconds
+    を切ったら、キャッシュ済みのトークンを返しつつバックグラウンドで 1 回だけ
+    更新する。期限まで min_remaining_seconds を切った場合、またはキャッシュが
+    ない場合は呼び出し元のスレッドで生成する。
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        region: str,
+        *,
+        ttl_seconds: int = DSQL_TOKEN_TTL_SECONDS,
+        refresh_before_seconds: int = DSQL_TOKEN_REFRESH_BEFORE_SECONDS,
+        min_remaining_seconds: int = DSQL_TOKEN_MIN_REMAINING_SECONDS,
+        client_factory: Callable[[], Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.hostname = hostname
+        self.region = region
+        self.ttl_seconds = ttl_seconds
+        self.refresh_before_seconds = refresh_before_seconds
+        self.min_remaining_seconds = min_remaining_seconds
+        self._client_factory = client_factory or (
+            lambda: boto3.client("dsql", region_name=region)
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._client: Any = None
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._refreshing = False
+
+    def get_token(self) -> TokenLookup:
+        """接続に使うトークンを返す。必要に応じて生成・更新する。"""
+        with self._lock:
+            token = self._token
+            remaining = self._expires_at - self._clock()
+            usable = token is not None and remaining > self.min_remaining_seconds
+            refresh_in_background = (
+                usable
+                and remaining <= self.refresh_before_seconds
+                and not self._refreshing
+            )
+            if refresh_in_background:
+                self._refreshing = True
+
+        if token is not None and usable:
+            if refresh_in_background:
+                threading.Thread(
+                    target=self._refresh_in_background,
+                    name="dsql-token-refresh",
+                    daemon=True,
+                ).start()
+            return TokenLookup(token, cache_hit=True)
+
+        with self._lock:
+            # 待機中に他のスレッドが生成していればそれを使う
+            if (
+                self._token is not None
+                and self._expires_at - self._clock() > self.min_remaining_seconds
+            ):
+                return TokenLookup(self._token, cache_hit=True)
+            return TokenLookup(self._generate_locked("sync"), cache_hit=False)
+
+    def invalidate(self) -> None:
+        """キャッシュ済みトークンを破棄する。署名期限切れで接続が拒否された場合に使う。"""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+
+    def _refresh_in_background(self) -> None:
+        """バックグラウンドスレッドでトークンを生成し直す。失敗時は次回の同期生成に任せる。"""
+        try:
+            with self._lock:
+                self._generate_locked("background")
+        except Exception:
+            log_event(
+                logger,
+                logging.WARNING,
+                "ops.db.auth_token.refresh_failed",
+                exc_info=True,
+                outcome="failure",
+            )
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _generate_locked(self, source: str) -> str:
+        """トークンを生成してキャッシュする。self._lock を保持した状態で呼ぶ。"""
+        started = time.perf_counter()
+        client_created = self._client is None
+        if client_created:
+            self._client = self._client_factory()
+        issued_at = self._clock()
+        token = self._client.generate_db_connect_admin_auth_token(
+            Hostname=self.hostname,
+            Region=self.region,
+            ExpiresIn=self.ttl_seconds,
+        )
+        self._token = token
+        self._expires_at = issued_at + self.ttl_seconds
+        log_event(
+            logger,
+            logging.INFO,
+            "ops.db.auth_token.generated",
+            source=source,
+            client_created=client_created,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            ttl_seconds=self.ttl_seconds,
+            outcome="success",
+        )
+        return token
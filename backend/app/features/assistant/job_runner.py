@@ -2,11 +2,13 @@
 
 責務: AI 編集ジョブを SNS/SQS またはローカルバックグラウンドタスクで
     実行し、結果をデータベースに永続化する。
-主要なエクスポート: dispatch_edit_job, process_edit_job,
+主要なエクスポート: dispatch_ai_job, dispatch_edit_job, process_edit_job,
     run_edit_job_from_event, run_edit_job_queue_records,
     process_edit_job_queue_records
 呼び出し関係: FastAPI ルーターおよび Lambda ハンドラから呼ばれ、
     AIInteractionUseCases を通じて AI ゲートウェイを実行する。
+    同じキューでノートのエクスポート・インポートジョブ（workspace の
+    export_job_runner / import_job_runner）も振り分ける。
 """
 
 import asyncio
@@ -20,7 +22,7 @@ import boto3
 from fastapi import BackgroundTasks
 from sqlmodel import Session
 
-from app.database import get_dsql_engine
+from app.database import create_session
 from app.features.assistant.errors import (
     AI_EDIT_JOB_TIMEOUT_MESSAGE,
     AIApplicationTimeoutError,
@@ -29,6 +31,8 @@ from app.features.assistant.errors import (
 from app.features.assistant.gateway import AIGateway, get_ai_gateway
 from app.features.assistant.schemas import BedrockMessage
 from app.features.assistant.use_cases import AIInteractionUseCases
+from app.features.workspace.export_job_runner import process_note_export_job
+from app.features.workspace.import_job_runner import process_note_import_job
 from app.features.workspace.use_cases import WorkspaceQueryUseCases
 from app.logging_utils import log_event
 from app.models import AIEditJob, AIJob
@@ -39,13 +43,15 @@ logger = logging.getLogger(__name__)
 PROCESS_EDIT_JOB_TASK = "process_ai_edit_job"
 PROCESS_SUMMARIZE_JOB_TASK = "process_ai_summarize_job"
 PROCESS_CHAT_JOB_TASK = "process_ai_chat_job"
+PROCESS_NOTE_EXPORT_JOB_TASK = "process_note_export_job"
+PROCESS_NOTE_IMPORT_JOB_TASK = "process_note_import_job"
 # 全ジョブ種別が共有する SNS トピック（編集ジョブ用に作成済みのものを再利用）
 EDIT_JOB_TOPIC_ARN_ENV = "AI_EDIT_JOB_TOPIC_ARN"
 
 
 def _get_session() -> Session:
     """DSQL エンジンから新しいデータベースセッションを生成して返す。"""
-    return Session(get_dsql_engine())
+    return create_session()
 
 
 def _task_handlers() -> dict:
@@ -54,6 +60,8 @@ def _task_handlers() -> dict:
         PROCESS_EDIT_JOB_TASK: process_edit_job,
         PROCESS_SUMMARIZE_JOB_TASK: process_summarize_job,
         PROCESS_CHAT_JOB_TASK: process_chat_job,
+        PROCESS_NOTE_EXPORT_JOB_TASK: process_note_export_job,
+        PROCESS_NOTE_IMPORT_JOB_TASK: process_note_import_job,
     }
 
 
@@ -62,7 +70,7 @@ async def dispatch_ai_job(
     task: str,
     background_tasks: BackgroundTasks | None = None,
 ) -> None:
-    """AI ジョブ（編集・要約・チャット）を SNS/SQS またはローカル実行へキューイングする。
+    """非同期ジョブ（AI 編集・要約・チャット、ノートのエクスポート・インポート）をキューイングする。
 
     全ジョブ種別は共有 SNS トピックを使い、task でワーカー側の処理を振り分ける。
     トピック未設定（ローカル開発）時は BackgroundTasks かインライン実行にフォールバックする。
@@ -403,7 +411,7 @@ async def process_edit_job_queue_records(
 ) -> dict[str, list[dict[str, str]]]:
     """SQS レコード群を task で振り分けて処理し、失敗アイテムのみ再試行対象として返す。
 
-    編集・要約・チャットの全ジョブ種別を同一キュー/ワーカーで処理する。
+    編集・要約・チャット・エクスポート・インポートの全ジョブ種別を同一キュー/ワーカーで処理する。
     """
     handlers = handlers or _task_handlers()
     failures: list[dict[str, str]] = []
@@ -2,17 +2,20 @@
 
 責務: 月次トークン使用量の記録・照合・制限チェックを行う。
 主要なエクスポート: check_limit, record_usage, get_usage_info,
-    get_usage_snapshot, get_or_create_current_period
+    get_usage_snapshot, get_or_create_current_period, TOKEN_USAGE_RETRY_POLICY
 呼び出し関係: assistant ユースケース層から呼ばれ、
-    TokenUsage モデルを通じてデータベースに読み書きする。
+    TokenUsage モデルを通じてデータベースに読み書きする。unit of work の
+    内側で呼ばれた場合はコミットせず、外側の unit のコミットに含める。
 """
 
 import logging
 from datetime import UTC, datetime
 
+from sqlalchemy import update
 from sqlmodel import Session, select
 
-from app.db_commit import commit_with_error_handling
+from app.core.unit_of_work import commit_or_stage, get_unit_of_work
+from app.db_retry import RetryPolicy
 from app.logging_utils import log_event
 from app.models.token_usage import (
     MONTHLY_TOKEN_LIMIT,
@@ -25,6 +28,16 @@ from app.models.user_settings import UserSettings
 
 logger = logging.getLogger(__name__)
 
+# トークン使用量の加算のリトライ予算。ユーザーごとに 1 行へ加算が集中する
+# ホットな行のため、短い待機で多めに再試行して 409 を返さないようにする
+TOKEN_USAGE_RETRY_POLICY = RetryPolicy(
+    "token_usage.record",
+    max_attempts=8,
+    base_delay=0.01,
+    max_delay=0.2,
+    retry_unique_violations=True,
+)
+
 
 def get_or_create_current_period(session: Session, user_id: str) -> TokenUsage:
     """当月期間のトークン使用量レコードを取得する。存在しない場合は新規作成する。"""
@@ -43,8 +56,7 @@ def get_or_create_current_period(session: Session, user_id: str) -> TokenUsage:
             period_end=_get_period_end(),
         )
         session.add(usage)
-        commit_with_error_handling(session, "TokenUsage")
-        session.refresh(usage)
+        commit_or_stage(session, resource_name="TokenUsage")
         log_event(
             logger,
             logging.INFO,
@@ -81,13 +93,25 @@ def check_limit(session: Session, user_id: str) -> bool:
 
 
 def record_usage(session: Session, user_id: str, tokens: int) -> TokenUsage:
-    """当月期間のトークン使用量を加算して永続化する。"""
-    usage = get_or_create_current_period(session, user_id)
-    usage.tokens_used += tokens
-    usage.updated_at = datetime.now(UTC)
-    session.add(usage)
-    commit_with_error_handling(session, "TokenUsage")
-    session.refresh(usage)
+    """当月期間のトークン使用量を加算して永続化する。
+
+    読み込み・加算・書き戻しではなく ``UPDATE ... SET tokens_used =
+    tokens_used + :tokens RETURNING *`` の 1 文で加算する。期間レコードが
+    未作成の場合のみ作成してから加算する。同時実行による OCC 競合では
+    TOKEN_USAGE_RETRY_POLICY の予算内で加算を再実行する。
+    """
+
+    def increment() -> TokenUsage:
+        usage = _increment_current_period(session, user_id, tokens)
+        if usage is None:
+            get_or_create_current_period(session, user_id)
+            usage = _increment_current_period(session, user_id, tokens)
+        commit_or_stage(session, resource_name="TokenUsage")
+        return usage
+
+    usage = get_unit_of_work(session).run(
+        increment, "TokenUsage", policy=TOKEN_USAGE_RETRY_POLICY
+    )
     log_event(
         logger,
         logging.INFO,
@@ -100,6 +124,27 @@ def record_usage(session: Session, user_id: str, tokens: int) -> TokenUsage:
     return usage
 
 
+def _increment_current_period(
+    session: Session, user_id: str, tokens: int
+) -> TokenUsage | None:
+    """当月期間の tokens_used を加算し、更新後のレコードを返す。未作成なら None。"""
+    statement = (
+        update(TokenUsage)
+        .where(
+            TokenUsage.user_id == user_id,
+            TokenUsage.period_start == _get_period_start(),
+        )
+        .values(
+            tokens_used=TokenUsage.tokens_used + tokens,
+            updated_at=datetime.now(UTC),
+        )
+        .returning(TokenUsage)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    row = session.exec(statement).first()
+    return row[0] if row is not None else None
+
+
 def get_usage_info(session: Session, user_id: str) -> TokenUsageRead:
     """ユーザーの現在のトークン使用状況を取得する。期間レコードがなければ作成する。"""
     usage = get_or_create_current_period(session, user_id)
@@ -4,6 +4,7 @@
     pending 状態で作成・参照する。実行は job_runner が非同期に行う。
 主要なエクスポート: AIJobUseCases
 呼び出し関係: assistant/router.py から呼ばれ、job_runner.py が処理する。
+    使用量レコードの作成とジョブの作成は UnitOfWork.run でまとめてコミットする。
     既存の EditJobUseCases（編集専用）を要約・チャット向けに一般化したもの。
 """
 
@@ -12,7 +13,7 @@ from uuid import UUID
 
 from sqlmodel import Session
 
-from app.db_commit import commit_with_error_handling
+from app.core.unit_of_work import commit_or_stage, get_unit_of_work
 from app.features.assistant.use_cases.common import (
     ensure_token_limit,
     require_non_empty,
@@ -35,20 +36,24 @@ class AIJobUseCases:
         self.session = session
         self.user_id = user_id
         self.workspace_queries = workspace_queries
+        self.unit_of_work = get_unit_of_work(session)
 
     def _create(self, kind: str, payload: dict) -> AIJob:
         """トークン制限チェック後に pending ジョブを永続化する共通処理。"""
-        ensure_token_limit(self.session, self.user_id)
-        job = AIJob(
-            user_id=self.user_id,
-            kind=kind,
-            status="pending",
-            input=json.dumps(payload),
-        )
-        self.session.add(job)
-        commit_with_error_handling(self.session, "AIJob")
-        self.session.refresh(job)
-        return job
+
+        def create() -> AIJob:
+            ensure_token_limit(self.session, self.user_id)
+            job = AIJob(
+                user_id=self.user_id,
+                kind=kind,
+                status="pending",
+                input=json.dumps(payload),
+            )
+            self.session.add(job)
+            commit_or_stage(self.session, resource_name="AIJob")
+            return job
+
+        return self.unit_of_work.run(create, "AIJob")
 
     def create_summarize_job(self, note_id: UUID) -> AIJob:
         """要約ジョブを作成する。ノートの所有権・存在を作成時に検証する。"""
@@ -5,13 +5,14 @@
 主要なエクスポート: EditJobUseCases
 呼び出し関係: assistant/router.py から呼ばれ、
     job_runner.py によってジョブがバックグラウンド処理される。
+    使用量レコードの作成とジョブの作成は UnitOfWork.run でまとめてコミットする。
 """
 
 from uuid import UUID
 
 from sqlmodel import Session
 
-from app.db_commit import commit_with_error_handling
+from app.core.unit_of_work import commit_or_stage, get_unit_of_work
 from app.features.assistant.use_cases.common import (
     ensure_token_limit,
     require_non_empty,
@@ -33,6 +34,7 @@ class EditJobUseCases:
         self.session = session
         self.user_id = user_id
         self.workspace_queries = workspace_queries
+        self.unit_of_work = get_unit_of_work(session)
 
     def create_job(self, job_in: AIEditJobCreate) -> AIEditJob:
         """入力検証とトークン制限チェックを行い、pending 状態の AI 編集ジョブを作成する。"""
@@ -41,19 +43,20 @@ class EditJobUseCases:
         if job_in.note_id is not None:
             self.workspace_queries.get_owned_note(job_in.note_id)
 
-        ensure_token_limit(self.session, self.user_id)
-
-        job = AIEditJob(
-            user_id=self.user_id,
-            note_id=job_in.note_id,
-            content=job_in.content,
-            instruction=job_in.instruction,
-            status="pending",
-        )
-        self.session.add(job)
-        commit_with_error_handling(self.session, "AIEditJob")
-        self.session.refresh(job)
-        return job
+        def create() -> AIEditJob:
+            ensure_token_limit(self.session, self.user_id)
+            job = AIEditJob(
+                user_id=self.user_id,
+                note_id=job_in.note_id,
+                content=job_in.content,
+                instruction=job_in.instruction,
+                status="pending",
+            )
+            self.session.add(job)
+            commit_or_stage(self.session, resource_name="AIEditJob")
+            return job
+
+        return self.unit_of_work.run(create, "AIEditJob")
 
     def get_job(self, job_id: UUID) -> AIEditJob:
         """指定 ID の AI 編集ジョブを取得する。所有者でない場合は NotFound を送出。"""
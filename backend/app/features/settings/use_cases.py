@@ -3,6 +3,8 @@
 責務: 設定の取得・作成・更新と API キーの一覧・作成・失効のビジネスロジックを担う。
 主要なエクスポート: SettingsUseCases, ApiKeyUseCases
 呼び出し関係: settings/router.py から呼ばれ、UserApiKeyService・usage_policy を利用する。
+    設定と当月のトークン使用量レコードの作成・更新は UnitOfWork.run で
+    1 トランザクションにまとめる。
 """
 
 import logging
@@ -12,7 +14,7 @@ from uuid import UUID
 from sqlmodel import Session
 
 from app.auth import UserApiKeyService
-from app.db_commit import commit_with_error_handling
+from app.core.unit_of_work import commit_or_stage, get_unit_of_work
 from app.features.assistant.usage_policy import get_usage_info
 from app.features.settings.schemas import SettingsResponse
 from app.logging_utils import log_event
@@ -42,22 +44,26 @@ class SettingsUseCases:
     def __init__(self, session: Session, user_id: str):
         self.session = session
         self.user_id = user_id
+        self.unit_of_work = get_unit_of_work(session)
 
     def get_settings_response(self) -> SettingsResponse:
-        """設定を取得して SettingsResponse を返す。設定が未作成の場合はデフォルト値で作成する。"""
-        settings = self._get_or_create_settings()
-        return SettingsResponse(
-            settings=self._to_settings_read(settings),
-            available_models=self.available_models(),
-            available_languages=self.available_languages(),
-            token_usage=get_usage_info(self.session, self.user_id),
+        """設定を取得して SettingsResponse を返す。設定が未作成の場合はデフォルト値で作成する。
+
+        設定と当月の使用量レコードの作成は 1 回のコミットで行う。
+        """
+        return self.unit_of_work.run(
+            lambda: self._to_response(self._get_or_create_settings()),
+            "UserSettings",
         )
 
     def update_settings_response(
         self, settings_in: UserSettingsUpdate
     ) -> SettingsResponse:
         """設定を更新して SettingsResponse を返す。更新内容を監査ログに記録する。"""
-        settings = self._update_settings(settings_in)
+        response = self.unit_of_work.run(
+            lambda: self._to_response(self._update_settings(settings_in)),
+            "UserSettings",
+        )
         log_event(
             logger,
             logging.INFO,
@@ -65,6 +71,10 @@ class SettingsUseCases:
             changed_fields=sorted(settings_in.model_dump(exclude_unset=True).keys()),
             outcome="success",
         )
+        return response
+
+    def _to_response(self, settings: UserSettings) -> SettingsResponse:
+        """設定と当月のトークン使用状況から SettingsResponse を組み立てる。"""
         return SettingsResponse(
             settings=self._to_settings_read(settings),
             available_models=self.available_models(),
@@ -83,12 +93,11 @@ class SettingsUseCases:
             llm_model_id=DEFAULT_LLM_MODEL_ID,
         )
         self.session.add(settings)
-        commit_with_error_handling(self.session, "UserSettings")
-        self.session.refresh(settings)
+        commit_or_stage(self.session, resource_name="UserSettings")
         return settings
 
     def _update_settings(self, settings_in: UserSettingsUpdate) -> UserSettings:
-        """設定を更新（未作成なら新規作成）してコミット済みの UserSettings を返す。"""
+        """設定を更新（未作成なら新規作成）して書き込み済みの UserSettings を返す。"""
         settings = self.session.get(UserSettings, self.user_id)
 
         if settings is None:
@@ -117,8 +126,7 @@ class SettingsUseCases:
 
             settings.updated_at = datetime.now(UTC)
 
-        commit_with_error_handling(self.session, "UserSettings")
-        self.session.refresh(settings)
+        commit_or_stage(self.session, resource_name="UserSettings")
         return settings
 
     def _to_settings_read(self, settings: UserSettings) -> UserSettingsRead:
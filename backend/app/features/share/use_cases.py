@@ -53,7 +53,6 @@ class ShareUseCases:
         share = NoteShare(note_id=note_id)
         self.session.add(share)
         commit_with_error_handling(self.session, "NoteShare")
-        self.session.refresh(share)
         log_event(
             logger,
             logging.INFO,
@@ -11,27 +11,41 @@ if TYPE_CHECKING:
     from app.features.workspace.schemas import WorkspaceSnapshotResponse
     from app.features.workspace.use_cases import (
         FolderUseCases,
+        NoteExportJobUseCases,
         NoteExportUseCase,
+        NoteImportJobUseCases,
+        NoteImportUseCase,
+        NoteSearchUseCase,
         NoteUseCases,
         WorkspaceChangesUseCase,
+        WorkspaceCompactionUseCase,
+        WorkspaceManifestUseCase,
         WorkspaceQueryUseCases,
         WorkspaceSnapshotUseCase,
+        refresh_stale_search_indexes,
     )
 
 __all__ = [
     "AppliedMutationRepository",
     "FolderRepository",
     "FolderUseCases",
+    "NoteExportJobUseCases",
     "NoteExportUseCase",
+    "NoteImportJobUseCases",
+    "NoteImportUseCase",
     "NoteRepository",
+    "NoteSearchUseCase",
     "NoteUseCases",
     "WorkspaceChangesUseCase",
+    "WorkspaceCompactionUseCase",
+    "WorkspaceManifestUseCase",
     "WorkspaceSnapshotResponse",
     "WorkspaceQueryUseCases",
     "WorkspaceSnapshotUseCase",
     "changes_router",
     "folders_router",
     "notes_router",
+    "refresh_stale_search_indexes",
     "snapshot_router",
 ]
 
@@ -63,11 +77,18 @@ def __getattr__(name: str) -> Any:
         return getattr(repositories, name)
     if name in {
         "WorkspaceChangesUseCase",
+        "WorkspaceCompactionUseCase",
+        "WorkspaceManifestUseCase",
         "FolderUseCases",
+        "NoteExportJobUseCases",
         "NoteExportUseCase",
+        "NoteImportJobUseCases",
+        "NoteImportUseCase",
+        "NoteSearchUseCase",
         "NoteUseCases",
         "WorkspaceQueryUseCases",
         "WorkspaceSnapshotUseCase",
+        "refresh_stale_search_indexes",
     }:
         from app.features.workspace import use_cases
 
@@ -1,7 +1,7 @@
 """ワークスペース変更適用エンドポイント。
 
 責務: クライアントから受け取ったバッチミューテーションをサーバーに適用し、
-    適用結果と最新スナップショットを返す。
+    適用結果と base_cursor 以降の差分スナップショットを返す。
 主要なエクスポート: router (POST /changes)
 呼び出し関係: workspace ルーターからマウントされ、
     WorkspaceChangesUseCase を呼び出す。
@@ -9,9 +9,16 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, status
 
 from app.features.workspace.dependencies import get_workspace_changes_use_case
+from app.features.workspace.encoding import (
+    COLUMNAR_MEDIA_TYPE,
+    columnar_response,
+    encode_changes_columns,
+    wants_columnar,
+)
+from app.features.workspace.fast_json import FastJSONResponse, encode_changes_json
 from app.features.workspace.schemas import (
     WorkspaceChangesRequest,
     WorkspaceChangesResponse,
@@ -22,13 +29,24 @@ router = APIRouter()
 
 
 @router.post(
-    "/changes", response_model=WorkspaceChangesResponse, status_code=status.HTTP_200_OK
+    "/changes",
+    response_model=WorkspaceChangesResponse,
+    status_code=status.HTTP_200_OK,
+    responses={200: {"content": {COLUMNAR_MEDIA_TYPE: {}}}},
 )
 def apply_workspace_changes(
     request: WorkspaceChangesRequest,
     use_case: Annotated[
         WorkspaceChangesUseCase, Depends(get_workspace_changes_use_case)
     ],
+    accept: Annotated[str | None, Header()] = None,
 ):
-    """バッチミューテーションを適用し、更新済みスナップショットを返す。"""
-    return use_case.apply_changes(request)
+    """バッチミューテーションを適用し、差分（または全件）スナップショットを返す。
+
+    Accept: application/vnd.notes.columnar+json を指定するとスナップショットを
+    列指向形式で返す。
+    """
+    applied, rows = use_case.apply_changes_with_rows(request)
+    if wants_columnar(accept):
+        return columnar_response(encode_changes_columns(applied, rows))
+    return FastJSONResponse(encode_changes_json(applied, rows))
@@ -0,0 +1,56 @@
+"""ノート本文への差分パッチ適用。
+
+責務: WorkspaceChangeRequest.content_patch の置換操作を基準本文に適用し、
+    更新後の本文を組み立てる。位置は JavaScript の文字列インデックスと同じ
+    UTF-16 コード単位で解釈する。
+主要なエクスポート: apply_content_patch
+呼び出し関係: WorkspaceChangesUseCase がノート update の適用時に呼び出す。
+"""
+
+from collections.abc import Sequence
+
+from app.features.workspace.schemas import ContentPatchOperation
+from app.shared import ValidationFailed
+
+_UTF16 = "utf-16-le"
+
+
+def apply_content_patch(base: str, operations: Sequence[ContentPatchOperation]) -> str:
+    """基準本文に置換操作を順に適用した本文を返す。
+
+    operations は基準本文上の位置で昇順かつ重ならないこと（スキーマで検証済み）。
+    範囲外の操作やサロゲートペアを分断する操作は ValidationFailed を送出する。
+    """
+    if base.isascii():
+        return _splice(base, operations, unit_size=1, empty="")
+    units = base.encode(_UTF16)
+    if len(units) == 2 * len(base):
+        # BMP 外の文字がなければ UTF-16 コード単位と str のインデックスが一致する
+        return _splice(base, operations, unit_size=1, empty="")
+    patched = _splice(units, operations, unit_size=2, empty=b"")
+    try:
+        return patched.decode(_UTF16)
+    except UnicodeDecodeError as exc:
+        raise ValidationFailed("content_patch splits a surrogate pair") from exc
+
+
+def _splice(base, operations, *, unit_size: int, empty):
+    """base（str または UTF-16 バイト列）の指定範囲を置換して連結する。
+
+    unit_size は UTF-16 の 1 コード単位が base 上で占める長さ（str なら 1、
+    バイト列なら 2）。
+    """
+    length = len(base) // unit_size
+    parts = []
+    position = 0
+    for operation in operations:
+        end = operation.offset + operation.delete
+        if end > length:
+            raise ValidationFailed("content_patch is out of range for the base content")
+        parts.append(base[position * unit_size : operation.offset * unit_size])
+        parts.append(
+            operation.insert if unit_size == 1 else operation.insert.encode(_UTF16)
+        )
+        position = end
+    parts.append(base[position * unit_size :])
+    return empty.join(parts)
@@ -2,8 +2,11 @@
 
 責務: 各 UseCase に Session と user_id を注入して返す。
 主要なエクスポート: get_folder_use_cases, get_note_use_cases,
-    get_note_export_use_case, get_workspace_query_use_cases,
-    get_workspace_snapshot_use_case, get_workspace_changes_use_case
+    get_note_export_use_case, get_note_export_job_use_cases,
+    get_note_import_job_use_cases, get_note_search_use_case,
+    get_workspace_query_use_cases,
+    get_workspace_snapshot_use_case, get_workspace_manifest_use_case,
+    get_workspace_changes_use_case
 呼び出し関係: ルーターのエンドポイントから Depends() 経由で呼ばれる。
 """
 
@@ -14,11 +17,16 @@ from sqlmodel import Session
 
 from app.auth import FolderNoteUserId, UserId
 from app.database import get_session
+from app.features.workspace.export_storage import ExportStorage, get_export_storage
 from app.features.workspace.use_cases import (
     FolderUseCases,
+    NoteExportJobUseCases,
     NoteExportUseCase,
+    NoteImportJobUseCases,
+    NoteSearchUseCase,
     NoteUseCases,
     WorkspaceChangesUseCase,
+    WorkspaceManifestUseCase,
     WorkspaceQueryUseCases,
     WorkspaceSnapshotUseCase,
 )
@@ -48,6 +56,32 @@ def get_note_export_use_case(
     return NoteExportUseCase(session, user_id)
 
 
+def get_note_export_job_use_cases(
+    session: Annotated[Session, Depends(get_session)],
+    user_id: UserId,
+    storage: Annotated[ExportStorage, Depends(get_export_storage)],
+) -> NoteExportJobUseCases:
+    """非同期ノートエクスポートジョブのユースケースを生成して返す。"""
+    return NoteExportJobUseCases(session, user_id, storage)
+
+
+def get_note_import_job_use_cases(
+    session: Annotated[Session, Depends(get_session)],
+    user_id: UserId,
+    storage: Annotated[ExportStorage, Depends(get_export_storage)],
+) -> NoteImportJobUseCases:
+    """非同期ノートインポートジョブのユースケースを生成して返す。"""
+    return NoteImportJobUseCases(session, user_id, storage)
+
+
+def get_note_search_use_case(
+    session: Annotated[Session, Depends(get_session)],
+    user_id: UserId,
+) -> NoteSearchUseCase:
+    """ノート全文検索ユースケースを生成して返す。"""
+    return NoteSearchUseCase(session, user_id)
+
+
 def get_workspace_query_use_cases(
     session: Annotated[Session, Depends(get_session)],
     user_id: UserId,
@@ -64,6 +98,14 @@ def get_workspace_snapshot_use_case(
     return WorkspaceSnapshotUseCase(session, user_id)
 
 
+def get_workspace_manifest_use_case(
+    session: Annotated[Session, Depends(get_session)],
+    user_id: UserId,
+) -> WorkspaceManifestUseCase:
+    """マニフェスト取得ユースケースを生成して返す。"""
+    return WorkspaceManifestUseCase(session, user_id)
+
+
 def get_workspace_changes_use_case(
     session: Annotated[Session, Depends(get_session)],
     user_id: UserId,
@@ -0,0 +1,119 @@
+"""非同期ノートエクスポートジョブの処理ランナー。
+
+責務: ワーカー上で全ノートの ZIP アーカイブを逐次生成しながら
+    オブジェクトストレージへマルチパートアップロードし、結果をジョブに永続化する。
+主要なエクスポート: process_note_export_job, EXPORT_KEY_PREFIX
+呼び出し関係: assistant の job_runner のディスパッチ表に登録され、AI ジョブと
+    同じ SNS/SQS キューまたはローカルバックグラウンドタスクから呼ばれる。
+    アーカイブの生成は NoteExportUseCase に委譲する。
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlmodel import Session
+
+from app.database import create_session
+from app.features.workspace.export_storage import ExportStorage, get_export_storage
+from app.features.workspace.use_cases.note_exports import NoteExportUseCase
+from app.logging_utils import log_event
+from app.models import NoteExportJob
+
+logger = logging.getLogger(__name__)
+
+# 保存先キーの接頭辞（ストレージのライフサイクルルールで期限切れにする）
+EXPORT_KEY_PREFIX = "exports/"
+
+
+def _get_session() -> Session:
+    """DSQL エンジンから新しいデータベースセッションを生成して返す。"""
+    return create_session()
+
+
+async def process_note_export_job(
+    job_id: UUID | str,
+    *,
+    session_factory=_get_session,
+    storage: ExportStorage | None = None,
+) -> None:
+    """キュー済みのエクスポートジョブを処理する。
+
+    アーカイブの生成とアップロードは同期 I/O のため、イベントループを
+    塞がないようワーカースレッドで実行する。
+    """
+    storage = storage or get_export_storage()
+    await asyncio.to_thread(_run_note_export_job, job_id, session_factory, storage)
+
+
+def _run_note_export_job(
+    job_id: UUID | str, session_factory, storage: ExportStorage
+) -> None:
+    """エクスポートジョブを実行し、ポーリングクライアント向けに結果を永続化する。"""
+    with session_factory() as session:
+        job = session.get(NoteExportJob, UUID(str(job_id)))
+        if job is None:
+            log_event(
+                logger,
+                logging.WARNING,
+                "ops.note_export_job.not_found",
+                job_id=job_id,
+                outcome="failure",
+            )
+            return
+
+        # 二重実行を防ぐ冪等ガード
+        if job.status in {"running", "completed"}:
+            return
+
+        job.status = "running"
+        job.started_at = datetime.now(UTC)
+        job.updated_at = job.started_at
+        session.add(job)
+        session.commit()
+        log_event(
+            logger,
+            logging.INFO,
+            "ops.note_export_job.started",
+            job_id=job.id,
+            outcome="running",
+        )
+
+        try:
+            object_key = f"{EXPORT_KEY_PREFIX}{job.user_id}/{job.id}.zip"
+            archive = NoteExportUseCase(session, job.user_id).export_archive()
+            size_bytes = storage.upload(object_key, archive.chunks)
+
+            job.status = "completed"
+            job.object_key = object_key
+            job.size_bytes = size_bytes
+            job.error_message = None
+            log_event(
+                logger,
+                logging.INFO,
+                "ops.note_export_job.completed",
+                job_id=job.id,
+                size_bytes=size_bytes,
+                outcome="success",
+            )
+        except Exception as exc:
+            log_event(
+                logger,
+                logging.ERROR,
+                "ops.note_export_job.failed",
+                job_id=job_id,
+                outcome="error",
+                reason=exc.__class__.__name__,
+                exc_info=True,
+            )
+            # 読み取り中の失敗でセッションが無効になっている場合に備えて巻き戻す
+            session.rollback()
+            job.status = "failed"
+            job.error_message = str(exc)
+        finally:
+            now = datetime.now(UTC)
+            job.completed_at = now if job.status in {"completed", "failed"} else None
+            job.updated_at = now
+            session.add(job)
+            session.commit()
@@ -0,0 +1,201 @@
+"""非同期エクスポート・インポートで扱うアーカイブのオブジェクトストレージ。
+
+責務: 逐次生成される ZIP のバイト列を S3 マルチパートアップロードで保存し、
+    有効期限付きのダウンロード URL を発行する。インポート用にアップロードされた
+    アーカイブをワーカーへ受け渡すための保存・読み出しも行う。バケット未設定時
+    （ローカル開発・テスト）は同じ S3 API をローカルディレクトリで模倣する
+    クライアントを使う。
+主要なエクスポート: ExportStorage, LocalObjectStorageClient, get_export_storage,
+    EXPORT_PART_BYTES
+呼び出し関係: export_job_runner がアーカイブの保存に、NoteExportJobUseCases が
+    ダウンロード URL の発行に使用する。NoteImportJobUseCases がアップロードされた
+    アーカイブを保存し、import_job_runner が読み出す。
+"""
+
+import hashlib
+import io
+import shutil
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import boto3
+
+from app.config import get_settings
+
+# マルチパートアップロードの 1 パートのサイズ。S3 は最終パート以外に
+# 5 MiB 以上を要求するため、これ以上溜まるまでチャンクを結合してから送る。
+EXPORT_PART_BYTES = 8 * 1024 * 1024
+# ローカル保存時のバケット名（ディレクトリ名）
+LOCAL_EXPORT_BUCKET = "notes-exports-local"
+
+
+class LocalObjectStorageClient:
+    """エクスポート・インポートで使う S3 クライアントの操作だけをローカルディレクトリで模倣する。
+
+    boto3 の S3 クライアントと同じキーワード引数を受け取るため、ExportStorage は
+    保存先を意識せずに同じ手順でアップロードできる。署名付き URL の代わりに
+    保存したファイルの file:// URI を返す。
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _object_path(self, bucket: str, key: str) -> Path:
+        return self.root / bucket / key
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        return self.root / ".multipart" / upload_id
+
+    def put_object(self, *, Bucket: str, Key: str, Body: bytes, **_: Any) -> dict:
+        target = self._object_path(Bucket, Key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(Body)
+        return {}
+
+    def get_object(self, *, Bucket: str, Key: str) -> dict:
+        return {"Body": io.BytesIO(self._object_path(Bucket, Key).read_bytes())}
+
+    def create_multipart_upload(self, *, Bucket: str, Key: str, **_: Any) -> dict:
+        upload_id = uuid4().hex
+        self._upload_dir(upload_id).mkdir(parents=True)
+        return {"Bucket": Bucket, "Key": Key, "UploadId": upload_id}
+
+    def upload_part(
+        self,
+        *,
+        Bucket: str,
+        Key: str,
+        UploadId: str,
+        PartNumber: int,
+        Body: bytes,
+    ) -> dict:
+        (self._upload_dir(UploadId) / f"{PartNumber:05d}").write_bytes(Body)
+        return {"ETag": f'"{hashlib.md5(Body, usedforsecurity=False).hexdigest()}"'}
+
+    def complete_multipart_upload(
+        self,
+        *,
+        Bucket: str,
+        Key: str,
+        UploadId: str,
+        MultipartUpload: dict,
+    ) -> dict:
+        upload_dir = self._upload_dir(UploadId)
+        target = self._object_path(Bucket, Key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("wb") as output:
+            for part in MultipartUpload["Parts"]:
+                with (upload_dir / f"{part['PartNumber']:05d}").open("rb") as source:
+                    shutil.copyfileobj(source, output)
+        shutil.rmtree(upload_dir)
+        return {"Bucket": Bucket, "Key": Key}
+
+    def abort_multipart_upload(self, *, Bucket: str, Key: str, UploadId: str) -> dict:
+        shutil.rmtree(self._upload_dir(UploadId), ignore_errors=True)
+        return {}
+
+    def generate_presigned_url(
+        self, ClientMethod: str, Params: dict, ExpiresIn: int
+    ) -> str:
+        return self._object_path(Params["Bucket"], Params["Key"]).as_uri()
+
+
+class ExportStorage:
+    """エクスポート・インポートのアーカイブを保存し、ダウンロード URL を発行するストレージ。"""
+
+    def __init__(self, client: Any, bucket: str, url_ttl_seconds: int):
+        self.client = client
+        self.bucket = bucket
+        self.url_ttl_seconds = url_ttl_seconds
+
+    def upload(self, key: str, chunks: Iterable[bytes]) -> int:
+        """チャンク列をマルチパートアップロードで保存し、総バイト数を返す。
+
+        メモリに保持するのは EXPORT_PART_BYTES 程度の 1 パート分のみ。
+        途中で失敗した場合はアップロードを中止し、未完了のパートを残さない。
+        """
+        upload_id = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=key, ContentType="application/zip"
+        )["UploadId"]
+        parts: list[dict] = []
+        pending: list[bytes] = []
+        pending_size = 0
+        total_size = 0
+
+        def flush() -> None:
+            nonlocal pending_size
+            part_number = len(parts) + 1
+            response = self.client.upload_part(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=b"".join(pending),
+            )
+            parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+            pending.clear()
+            pending_size = 0
+
+        try:
+            for chunk in chunks:
+                pending.append(chunk)
+                pending_size += len(chunk)
+                total_size += len(chunk)
+                if pending_size >= EXPORT_PART_BYTES:
+                    flush()
+            # ZIP は空でも終端レコードを持つため、最終パートは必ず 1 つ以上ある
+            if pending or not parts:
+                flush()
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id
+            )
+            raise
+        return total_size
+
+    def put(self, key: str, body: bytes) -> None:
+        """1 回の PUT でオブジェクトを保存する（アップロード済みのインポート用アーカイブ）。"""
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=body)
+
+    def read(self, key: str) -> bytes:
+        """保存済みオブジェクトの内容を返す。"""
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+
+    def download_url(self, key: str, filename: str) -> str:
+        """保存済みアーカイブの有効期限付きダウンロード URL を返す。"""
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentDisposition": f"attachment; filename={filename}",
+            },
+            ExpiresIn=self.url_ttl_seconds,
+        )
+
+
+def get_export_storage() -> ExportStorage:
+    """設定に応じて S3 またはローカルディレクトリのエクスポートストレージを返す。"""
+    settings = get_settings()
+    if settings.export_bucket_name:
+        return ExportStorage(
+            boto3.client("s3", region_name=settings.aws_region),
+            settings.export_bucket_name,
+            settings.export_download_url_ttl_seconds,
+        )
+
+    root = Path(settings.export_local_dir or tempfile.gettempdir()) / "notes-exports"
+    return ExportStorage(
+        LocalObjectStorageClient(root),
+        LOCAL_EXPORT_BUCKET,
+        settings.export_download_url_ttl_seconds,
+    )
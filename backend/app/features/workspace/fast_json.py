@@ -0,0 +1,124 @@
+"""ワークスペースのホットパス向け JSON シリアライザ。
+
+責務: スナップショット・一覧・バッチミューテーションのレスポンスを、行ごとの
+    Pydantic 検証（FolderRead / NoteRead の model_validate と FastAPI の
+    response_model による再検証）を経由せずに JSON バイト列へ変換する。
+    ORM 行、Core の select が返す Row、メタデータキャッシュ上の読み取りモデルの
+    いずれも属性名で読み取るため、同じ関数で扱える。出力は各 Read スキーマの
+    JSON 表現と同一で、OpenAPI 上のレスポンススキーマは変わらない。
+主要なエクスポート: FastJSONResponse, dumps, folder_json, note_json,
+    encode_snapshot_json, encode_changes_json
+呼び出し関係: snapshot / changes / notes / folders エンドポイントが JSON 形式の
+    レスポンスを返す際に利用する。直列化は orjson に委譲する。
+"""
+
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.features.workspace.schemas import WorkspaceAppliedChange
+from app.features.workspace.use_cases.snapshot import SnapshotRows
+
+
+def dumps(payload: Any) -> bytes:
+    """JSON 互換の値を空白を含まないコンパクトな UTF-8 JSON に変換する。"""
+    return orjson.dumps(payload)
+
+
+class FastJSONResponse(JSONResponse):
+    """dumps で直列化する JSONResponse。content は JSON 互換の値に変換済みであること。"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _datetime_json(value: datetime | None) -> str | None:
+    """datetime を Pydantic の JSON 表現と同じ ISO 8601 文字列に変換する。
+
+    tzinfo が欠落している場合は Read スキーマの検証と同様に UTC とみなし、
+    UTC オフセットは "Z" で表す。
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def folder_json(folder: Any) -> dict[str, Any]:
+    """フォルダ行を FolderRead の JSON 表現と同じ dict に変換する。"""
+    return {
+        "name": folder.name,
+        "id": str(folder.id),
+        "user_id": folder.user_id,
+        "version": 1 if folder.version is None else folder.version,
+        "created_at": _datetime_json(folder.created_at),
+        "updated_at": _datetime_json(folder.updated_at),
+        "deleted_at": _datetime_json(folder.deleted_at),
+    }
+
+
+def note_json(note: Any, *, include_content: bool = True) -> dict[str, Any]:
+    """ノート行を NoteRead（include_content=False なら NoteMetadataRead）の JSON 表現と同じ dict に変換する。
+
+    include_content=False の場合は content 属性に触れないため、本文を遅延ロード
+    対象にした ORM 行から本文を読み込まずに変換できる。
+    """
+    data: dict[str, Any] = {"title": note.title}
+    if include_content:
+        data["content"] = note.content
+    data.update(
+        {
+            "id": str(note.id),
+            "user_id": note.user_id,
+            "version": 1 if note.version is None else note.version,
+            "folder_id": None if note.folder_id is None else str(note.folder_id),
+            "created_at": _datetime_json(note.created_at),
+            "updated_at": _datetime_json(note.updated_at),
+            "deleted_at": _datetime_json(note.deleted_at),
+        }
+    )
+    return data
+
+
+def folders_json(folders: Iterable[Any]) -> list[dict[str, Any]]:
+    """フォルダ行の列を FolderRead の JSON 表現のリストに変換する。"""
+    return [folder_json(folder) for folder in folders]
+
+
+def notes_json(
+    notes: Iterable[Any], *, include_content: bool = True
+) -> list[dict[str, Any]]:
+    """ノート行の列を NoteRead（または NoteMetadataRead）の JSON 表現のリストに変換する。"""
+    return [note_json(note, include_content=include_content) for note in notes]
+
+
+def encode_snapshot_json(rows: SnapshotRows) -> dict[str, Any]:
+    """スナップショットの行を WorkspaceSnapshotResponse（metadata_only なら
+    WorkspaceSnapshotMetadataResponse）の JSON 表現と同じ dict に変換する。"""
+    return {
+        "folders": folders_json(rows.folders),
+        "notes": notes_json(rows.notes, include_content=not rows.metadata_only),
+        "cursor": rows.cursor,
+        "server_time": _datetime_json(rows.server_time),
+        "next_page_token": rows.next_page_token,
+        "resync_required": rows.resync_required,
+    }
+
+
+def encode_changes_json(
+    applied: list[WorkspaceAppliedChange], rows: SnapshotRows
+) -> dict[str, Any]:
+    """バッチミューテーション結果を WorkspaceChangesResponse の JSON 表現と同じ dict に変換する。
+
+    applied はバッチ内の件数に比例するだけなので Pydantic で直列化し、件数が
+    ワークスペース規模に比例する snapshot のみ高速経路で変換する。
+    """
+    return {
+        "applied": [change.model_dump(mode="json") for change in applied],
+        "snapshot": encode_snapshot_json(rows),
+    }
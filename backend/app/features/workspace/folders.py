@@ -9,9 +9,16 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
 from app.features.workspace.dependencies import get_folder_use_cases
+from app.features.workspace.fast_json import FastJSONResponse, folders_json
+from app.features.workspace.list_paging import (
+    DEFAULT_LIST_PAGE_SIZE,
+    MAX_LIST_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    parse_fields,
+)
 from app.features.workspace.use_cases import FolderUseCases
 from app.models import FolderCreate, FolderRead, FolderUpdate
 
@@ -21,9 +28,29 @@ router = APIRouter()
 @router.get("", response_model=list[FolderRead])
 def list_folders(
     use_cases: Annotated[FolderUseCases, Depends(get_folder_use_cases)],
+    limit: int | None = Query(default=None, ge=1, le=MAX_LIST_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(
+        default=None,
+        description="返すフィールドのカンマ区切り（例: id,name,updated_at）。",
+    ),
 ):
-    """現在のユーザーの全フォルダ一覧を返す。"""
-    return use_cases.list_folders()
+    """現在のユーザーのフォルダ一覧を更新日時の降順で返す。
+
+    limit を指定するとページ単位で返し、続きがあれば X-Next-Cursor ヘッダーに
+    次ページの cursor を返す。fields を指定すると指定したフィールドのみを返す。
+    レスポンスは FolderRead の検証を経由せずに行から直接 JSON へ変換する。
+    """
+    field_names = parse_fields(fields, FolderRead)
+    if limit is None and cursor is None and field_names is None:
+        return FastJSONResponse(folders_json(use_cases.list_folders()))
+    if cursor is not None and limit is None:
+        limit = DEFAULT_LIST_PAGE_SIZE
+    page = use_cases.list_folders_page(limit=limit, cursor=cursor, fields=field_names)
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    if field_names is not None:
+        return FastJSONResponse(page.items, headers=headers)
+    return FastJSONResponse(folders_json(page.items), headers=headers)
 
 
 @router.post("", response_model=FolderRead, status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,153 @@
+"""非同期ノートインポートジョブの処理ランナー。
+
+責務: ワーカー上でアップロード済みのアーカイブを読み出して解析し、
+    フォルダとノートをバッチ単位で作成しながら進捗をジョブに永続化する。
+主要なエクスポート: process_note_import_job
+呼び出し関係: assistant の job_runner のディスパッチ表に登録され、AI ジョブと
+    同じ SNS/SQS キューまたはローカルバックグラウンドタスクから呼ばれる。
+    解析と作成は note_imports の parse_import_archive / NoteImportUseCase に、
+    取り込み後の検索インデックスの追従は NoteSearchUseCase に委譲する。
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlmodel import Session
+
+from app.database import create_session
+from app.features.workspace.export_storage import ExportStorage, get_export_storage
+from app.features.workspace.use_cases.note_imports import (
+    NoteImportUseCase,
+    parse_import_archive,
+)
+from app.features.workspace.use_cases.search import NoteSearchUseCase
+from app.logging_utils import log_event
+from app.models import NoteImportJob
+from app.shared import ValidationFailed
+
+logger = logging.getLogger(__name__)
+
+
+def _get_session() -> Session:
+    """DSQL エンジンから新しいデータベースセッションを生成して返す。"""
+    return create_session()
+
+
+async def process_note_import_job(
+    job_id: UUID | str,
+    *,
+    session_factory=_get_session,
+    storage: ExportStorage | None = None,
+) -> None:
+    """キュー済みのインポートジョブを処理する。
+
+    解析と書き込みは同期 I/O のため、イベントループを塞がないよう
+    ワーカースレッドで実行する。
+    """
+    storage = storage or get_export_storage()
+    await asyncio.to_thread(_run_note_import_job, job_id, session_factory, storage)
+
+
+def _run_note_import_job(
+    job_id: UUID | str, session_factory, storage: ExportStorage
+) -> None:
+    """インポートジョブを実行し、ポーリングクライアント向けに進捗と結果を永続化する。"""
+    with session_factory() as session:
+        job = session.get(NoteImportJob, UUID(str(job_id)))
+        if job is None:
+            log_event(
+                logger,
+                logging.WARNING,
+                "ops.note_import_job.not_found",
+                job_id=job_id,
+                outcome="failure",
+            )
+            return
+
+        # 二重実行を防ぐ冪等ガード
+        if job.status in {"running", "completed"}:
+            return
+
+        job.status = "running"
+        job.started_at = datetime.now(UTC)
+        job.updated_at = job.started_at
+        session.add(job)
+        session.commit()
+        log_event(
+            logger,
+            logging.INFO,
+            "ops.note_import_job.started",
+            job_id=job.id,
+            format=job.format,
+            outcome="running",
+        )
+
+        def record_progress(folder_count: int, imported_count: int) -> None:
+            # バッチの書き込みと同じトランザクションでコミットされる
+            job.folder_count = folder_count
+            job.imported_count = imported_count
+            job.updated_at = datetime.now(UTC)
+            session.add(job)
+
+        try:
+            parsed = parse_import_archive(storage.read(job.object_key), job.format)
+            job.total_count = len(parsed.notes)
+            job.skipped_count = parsed.skipped_count
+            job.updated_at = datetime.now(UTC)
+            session.add(job)
+            session.commit()
+
+            NoteImportUseCase(session, job.user_id).import_notes(
+                parsed.notes, on_progress=record_progress
+            )
+            # 取り込んだノートをワーカー上で検索インデックスへ反映し、
+            # 取り込み直後の検索リクエストで大量の索引を行わないようにする
+            NoteSearchUseCase(session, job.user_id).refresh_index()
+
+            job.status = "completed"
+            job.error_message = None
+            log_event(
+                logger,
+                logging.INFO,
+                "ops.note_import_job.completed",
+                job_id=job.id,
+                imported_count=job.imported_count,
+                folder_count=job.folder_count,
+                skipped_count=job.skipped_count,
+                outcome="success",
+            )
+        except ValidationFailed as exc:
+            session.rollback()
+            job.status = "failed"
+            job.error_message = exc.detail
+            log_event(
+                logger,
+                logging.WARNING,
+                "ops.note_import_job.failed",
+                job_id=job_id,
+                outcome="failure",
+                reason="invalid_archive",
+            )
+        except Exception as exc:
+            log_event(
+                logger,
+                logging.ERROR,
+                "ops.note_import_job.failed",
+                job_id=job_id,
+                outcome="error",
+                reason=exc.__class__.__name__,
+                exc_info=True,
+            )
+            # 書き込み中の失敗でセッションが無効になっている場合に備えて巻き戻す。
+            # コミット済みのバッチと進捗はそのまま残る。
+            session.rollback()
+            job.status = "failed"
+            job.error_message = str(exc)
+        finally:
+            now = datetime.now(UTC)
+            job.completed_at = now if job.status in {"completed", "failed"} else None
+            job.updated_at = now
+            session.add(job)
+            session.commit()
@@ -0,0 +1,92 @@
+"""REST 一覧エンドポイントのキーセットページングとフィールド射影。
+
+責務: GET /api/notes・GET /api/folders のページカーソル（直前ページ末尾の
+    (updated_at, id) を不透明な文字列にしたもの）のエンコード・デコードと、
+    fields= で指定された列だけを返す射影を提供する。
+主要なエクスポート: ListPage, encode_list_cursor, decode_list_cursor,
+    parse_fields, project_rows, DEFAULT_LIST_PAGE_SIZE, MAX_LIST_PAGE_SIZE,
+    NEXT_CURSOR_HEADER
+呼び出し関係: NoteUseCases / FolderUseCases のページ取得と、notes / folders
+    ルーターから使用される。
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.shared import ValidationFailed
+
+# cursor のみ指定された場合に使用するページサイズ
+DEFAULT_LIST_PAGE_SIZE = 100
+# 1 ページで返す件数の上限
+MAX_LIST_PAGE_SIZE = 1000
+# 続きのページがある場合に次の cursor を返すレスポンスヘッダー
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class ListPage[T]:
+    """一覧の 1 ページ分。next_cursor は最終ページでは None。"""
+
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def encode_list_cursor(updated_at: datetime, resource_id: UUID) -> str:
+    """ページ末尾の (updated_at, id) を URL セーフな不透明カーソル文字列にする。"""
+    payload = {"updated_at": updated_at.isoformat(), "id": str(resource_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_list_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """カーソル文字列を (updated_at, id) に復元する。不正な値は ValidationFailed を送出する。"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(payload["updated_at"]), UUID(payload["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise ValidationFailed("Invalid cursor") from exc
+
+
+def parse_fields(
+    fields: str | None, read_model: type[BaseModel]
+) -> tuple[str, ...] | None:
+    """カンマ区切りの fields 指定を検証し、フィールド名のタプルを返す。
+
+    未指定なら None を返す。read_model に存在しない名前は ValidationFailed を
+    送出する。
+    """
+    if fields is None:
+        return None
+    names = tuple(
+        dict.fromkeys(name.strip() for name in fields.split(",") if name.strip())
+    )
+    if not names:
+        raise ValidationFailed("fields must name at least one field")
+    unknown = [name for name in names if name not in read_model.model_fields]
+    if unknown:
+        raise ValidationFailed(f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def project_rows(
+    rows: Iterable[Any], read_model: type[BaseModel], fields: Sequence[str]
+) -> list[dict[str, Any]]:
+    """行を read_model で変換し、fields の列だけを JSON 互換の dict で返す。
+
+    read_model に含まれない列（遅延ロード対象の本文など）には触れないため、
+    metadata_only で読み込んだ ORM 行から本文を読み込まずに射影できる。
+    """
+    include = set(fields)
+    return [
+        read_model.model_validate(row).model_dump(mode="json", include=include)
+        for row in rows
+    ]
@@ -0,0 +1,146 @@
+"""ウォームコンテナ内で共有するユーザー単位のワークスペースメタデータキャッシュ。
+
+責務: ユーザーごとのフォルダ・ノートメタデータ（本文を除く）をプロセス内に
+    LRU で保持し、ワークスペースのバージョンマーカーが一致する間は DB の全件
+    読み込みを省略できるようにする。総量はおおよそのバイト数で上限を設ける。
+主要なエクスポート: WorkspaceMetadataCache, CachedWorkspace,
+    workspace_metadata_cache
+呼び出し関係: WorkspaceQueryUseCases が読み取りに使用し、NoteRepository /
+    FolderRepository が書き込みのたびに invalidate を呼び出す。
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.config import get_settings
+from app.models import FolderRead, NoteMetadataRead
+
+# 1 行あたりの固定オーバーヘッドの概算（UUID・日時・Pydantic インスタンス分）
+_ROW_OVERHEAD_BYTES = 512
+
+
+@dataclass(frozen=True)
+class CachedWorkspace:
+    """1 ユーザー分のキャッシュエントリ。
+
+    marker: 取得時点のワークスペースバージョンマーカー。
+    folders / notes: 削除済みを含む全件を updated_at, id の降順で保持する。
+        複数リクエストで共有されるため、呼び出し元は変更してはならない。
+    size_bytes: 上限判定に使うおおよそのメモリ使用量。
+    """
+
+    marker: tuple
+    folders: tuple[FolderRead, ...]
+    notes: tuple[NoteMetadataRead, ...]
+    size_bytes: int
+
+
+class WorkspaceMetadataCache:
+    """バージョンマーカーで検証するユーザー単位のプロセス内 LRU キャッシュ。
+
+    Lambda のウォームコンテナではモジュールスコープの状態が呼び出し間で
+    保持されるため、同一ユーザーからの繰り返しの一覧・スナップショット取得を
+    DB の全件読み込みなしで返せる。他のコンテナからの書き込みはマーカーの
+    不一致で検出し、同一コンテナ内の書き込みは invalidate で即座に破棄する。
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CachedWorkspace] = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str, marker: tuple) -> CachedWorkspace | None:
+        """マーカーが一致するエントリを返す。不一致・未登録の場合は None を返す。"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry.marker == marker:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+            else:
+                if entry is not None:
+                    # 他コンテナからの書き込みで古くなったエントリは破棄する
+                    self._remove(user_id)
+                    entry = None
+                self.misses += 1
+        return entry
+
+    def put(
+        self,
+        user_id: str,
+        marker: tuple,
+        folders: list[FolderRead],
+        notes: list[NoteMetadataRead],
+    ) -> CachedWorkspace:
+        """エントリを登録し、上限を超えた分を古い順に追い出す。
+
+        1 ユーザー分だけで上限を超える場合は登録せずにそのまま返す。
+        """
+        size_bytes = sum(
+            _ROW_OVERHEAD_BYTES + len(folder.name.encode()) for folder in folders
+        ) + sum(_ROW_OVERHEAD_BYTES + len(note.title.encode()) for note in notes)
+        entry = CachedWorkspace(
+            marker=marker,
+            folders=tuple(folders),
+            notes=tuple(notes),
+            size_bytes=size_bytes,
+        )
+        if size_bytes > self.max_bytes:
+            return entry
+        with self._lock:
+            self._remove(user_id)
+            self._entries[user_id] = entry
+            self._total_bytes += size_bytes
+            while self._total_bytes > self.max_bytes:
+                evicted_user_id = next(iter(self._entries))
+                self._remove(evicted_user_id)
+                self.evictions += 1
+        return entry
+
+    def invalidate(self, user_id: str) -> None:
+        """ユーザーのエントリを破棄する。書き込み経路から呼び出す。"""
+        with self._lock:
+            if self._remove(user_id):
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """全エントリと統計値をリセットする。"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict[str, int]:
+        """ヒット・ミス数などの累積統計を返す。"""
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> dict[str, int]:
+        """ロック取得済みの状態で統計値を組み立てる。"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "cached_bytes": self._total_bytes,
+        }
+
+    def _remove(self, user_id: str) -> bool:
+        """ロック取得済みの状態でエントリを削除し、削除したかどうかを返す。"""
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry.size_bytes
+        return True
+
+
+# プロセス（ウォームコンテナ）内で共有するシングルトン
+workspace_metadata_cache = WorkspaceMetadataCache(
+    max_bytes=get_settings().workspace_metadata_cache_max_bytes
+)
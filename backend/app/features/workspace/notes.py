@@ -1,23 +1,78 @@
 """ノートの REST APIルーターモジュール。
 
-責務: ノートに関する CRUD エンドポイントおよびエクスポートエンドポイントを提供する。
+責務: ノートに関する CRUD エンドポイント・本文一括取得エンドポイント・
+    一括移動/削除エンドポイント、全文検索エンドポイント、エクスポート（同期・非同期ジョブ）および
+    一括インポートジョブのエンドポイントを提供する。
 主要なエクスポート: router (APIRouter)
 呼び出し関係: workspace のルーターから include_router で登録され、
-    NoteUseCases / NoteExportUseCase に処理を委譲する。
+    NoteUseCases / NoteSearchUseCase / NoteExportUseCase /
+    NoteExportJobUseCases / NoteImportJobUseCases に処理を委譲する。非同期のエクスポート・インポート
+    ジョブは AI ジョブと同じ dispatch_ai_job でキューイングする。
 """
 
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from fastapi.responses import StreamingResponse
 
+from app.features.assistant.job_runner import (
+    PROCESS_NOTE_EXPORT_JOB_TASK,
+    PROCESS_NOTE_IMPORT_JOB_TASK,
+    dispatch_ai_job,
+)
 from app.features.workspace.dependencies import (
+    get_note_export_job_use_cases,
     get_note_export_use_case,
+    get_note_import_job_use_cases,
+    get_note_search_use_case,
     get_note_use_cases,
 )
-from app.features.workspace.use_cases import NoteExportUseCase, NoteUseCases
-from app.models import NoteCreate, NoteRead, NoteUpdate
+from app.features.workspace.fast_json import FastJSONResponse, notes_json
+from app.features.workspace.list_paging import (
+    DEFAULT_LIST_PAGE_SIZE,
+    MAX_LIST_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    parse_fields,
+)
+from app.features.workspace.schemas import (
+    MAX_NOTE_SEARCH_RESULTS,
+    NoteBodiesRequest,
+    NoteBodiesResponse,
+    NoteBulkDeleteRequest,
+    NoteBulkMoveRequest,
+    NoteBulkResponse,
+    NoteSearchResponse,
+)
+from app.features.workspace.use_cases import (
+    NoteExportJobUseCases,
+    NoteExportUseCase,
+    NoteImportJobUseCases,
+    NoteSearchUseCase,
+    NoteUseCases,
+)
+from app.http_caching import (
+    CACHE_CONTROL_REVALIDATE,
+    etag_matches,
+    make_etag,
+    not_modified_response,
+)
+from app.models import (
+    NoteCreate,
+    NoteExportJobRead,
+    NoteImportJobRead,
+    NoteRead,
+    NoteUpdate,
+)
 
 router = APIRouter()
 
@@ -26,9 +81,32 @@ router = APIRouter()
 def list_notes(
     use_cases: Annotated[NoteUseCases, Depends(get_note_use_cases)],
     folder_id: UUID | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=MAX_LIST_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(
+        default=None,
+        description="返すフィールドのカンマ区切り（例: id,title,updated_at）。",
+    ),
 ):
-    """現在のユーザーのノート一覧を返す。folder_id 指定でフォルダ絞り込みも可能。"""
-    return use_cases.list_notes(folder_id)
+    """現在のユーザーのノート一覧を更新日時の降順で返す。folder_id 指定でフォルダ絞り込みも可能。
+
+    limit を指定するとページ単位で返し、続きがあれば X-Next-Cursor ヘッダーに
+    次ページの cursor を返す。fields を指定すると指定したフィールドのみを返し、
+    content を含まない場合は本文を読み込まない。
+    レスポンスは NoteRead の検証を経由せずに行から直接 JSON へ変換する。
+    """
+    field_names = parse_fields(fields, NoteRead)
+    if limit is None and cursor is None and field_names is None:
+        return FastJSONResponse(notes_json(use_cases.list_notes(folder_id)))
+    if cursor is not None and limit is None:
+        limit = DEFAULT_LIST_PAGE_SIZE
+    page = use_cases.list_notes_page(
+        folder_id, limit=limit, cursor=cursor, fields=field_names
+    )
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    if field_names is not None:
+        return FastJSONResponse(page.items, headers=headers)
+    return FastJSONResponse(notes_json(page.items), headers=headers)
 
 
 @router.post("", response_model=NoteRead, status_code=status.HTTP_201_CREATED)
@@ -40,12 +118,69 @@ def create_note(
     return use_cases.create_note(note_in)
 
 
+@router.post("/bodies", response_model=NoteBodiesResponse)
+def get_note_bodies(
+    request: NoteBodiesRequest,
+    use_cases: Annotated[NoteUseCases, Depends(get_note_use_cases)],
+):
+    """指定ノートの本文を一括取得する。known_version と一致する本文は返さない。"""
+    return use_cases.get_note_bodies(request)
+
+
+@router.post("/bulk/move", response_model=NoteBulkResponse)
+def bulk_move_notes(
+    request: NoteBulkMoveRequest,
+    use_cases: Annotated[NoteUseCases, Depends(get_note_use_cases)],
+):
+    """指定ノートをまとめて folder_id のフォルダ（null はフォルダ外）へ移動する。
+
+    各ノートの version と updated_at を更新するため、同期クライアントには
+    差分として届く。ノートを 1 件ずつ読み込まずに set-based UPDATE で処理する。
+    """
+    return use_cases.bulk_move_notes(request)
+
+
+@router.post("/bulk/delete", response_model=NoteBulkResponse)
+def bulk_delete_notes(
+    request: NoteBulkDeleteRequest,
+    use_cases: Annotated[NoteUseCases, Depends(get_note_use_cases)],
+):
+    """指定ノートをまとめて soft delete する (deleted_at を設定)。"""
+    return use_cases.bulk_delete_notes(request)
+
+
+@router.get("/search", response_model=NoteSearchResponse)
+def search_notes(
+    use_case: Annotated[NoteSearchUseCase, Depends(get_note_search_use_case)],
+    q: str = Query(min_length=1, max_length=256),
+    limit: int = Query(default=20, ge=1, le=MAX_NOTE_SEARCH_RESULTS),
+):
+    """タイトル・本文を全文検索し、関連度の高い順にスニペット付きで返す。
+
+    q を空白などで区切ったすべての語を含むノートを BM25 で順位付けする。
+    インデックスはユーザーごとに DSQL へ永続化され、ノートの書き込み側で変更された
+    ノートだけを反映する。検索はインデックスを読み取るだけで書き込まない。
+    """
+    return use_case.search(q, limit=limit)
+
+
 @router.get("/{note_id}", response_model=NoteRead)
 def get_note(
     note_id: UUID,
     use_cases: Annotated[NoteUseCases, Depends(get_note_use_cases)],
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    """指定した note_id のノートを取得して返す。"""
+    """指定した note_id のノートを取得して返す。
+
+    ETag はノートの version と updated_at から算出し、If-None-Match が一致する
+    場合は本文を読み込まずに 304 Not Modified を返す。
+    """
+    etag = make_etag("note", note_id, *use_cases.get_note_version_marker(note_id))
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL_REVALIDATE
     return use_cases.get_note(note_id)
 
 
@@ -72,11 +207,77 @@ def delete_note(
 def export_notes(
     use_case: Annotated[NoteExportUseCase, Depends(get_note_export_use_case)],
 ):
-    """全ノートをフォルダ構造を維持したまま ZIP アーカイブとしてエクスポートする。"""
+    """全ノートをフォルダ構造を維持したまま ZIP アーカイブとしてエクスポートする。
+
+    アーカイブは送信しながら逐次生成するため、全体をメモリに保持しない。
+    """
     archive = use_case.export_archive()
 
     return StreamingResponse(
-        iter([archive.data]),
+        archive.chunks,
         media_type="application/x-zip-compressed",
         headers={"Content-Disposition": f"attachment; filename={archive.filename}"},
     )
+
+
+@router.post(
+    "/export-jobs",
+    response_model=NoteExportJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_export_job(
+    background_tasks: BackgroundTasks,
+    use_cases: Annotated[NoteExportJobUseCases, Depends(get_note_export_job_use_cases)],
+):
+    """全ノートの ZIP アーカイブを非同期に生成するジョブを作成する（202 Accepted）。
+
+    アーカイブはワーカーが生成してオブジェクトストレージへ保存するため、
+    API Gateway のタイムアウトやレスポンスサイズの上限を受けない。
+    クライアントは GET /export-jobs/{job_id} をポーリングして download_url を得る。
+    """
+    job = use_cases.create_job()
+    await dispatch_ai_job(
+        job.id, PROCESS_NOTE_EXPORT_JOB_TASK, background_tasks=background_tasks
+    )
+    return use_cases.to_read(job)
+
+
+@router.get("/export-jobs/{job_id}", response_model=NoteExportJobRead)
+def get_export_job(
+    job_id: UUID,
+    use_cases: Annotated[NoteExportJobUseCases, Depends(get_note_export_job_use_cases)],
+):
+    """エクスポートジョブの現在ステータスをポーリングする。完了後は download_url を返す。"""
+    return use_cases.to_read(use_cases.get_job(job_id))
+
+
+@router.post(
+    "/import-jobs",
+    response_model=NoteImportJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_import_job(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    use_cases: Annotated[NoteImportJobUseCases, Depends(get_note_import_job_use_cases)],
+):
+    """リクエスト本文のアーカイブからノートを一括作成するジョブを作成する（202 Accepted）。
+
+    本文はエクスポートと同じ構成の ZIP、または {"title", "content", "folder"} を
+    1 行 1 件で並べた NDJSON（gzip 圧縮可）。形式は先頭バイト列から判定する。
+    クライアントは GET /import-jobs/{job_id} をポーリングして進捗を得る。
+    """
+    job = use_cases.create_job(await request.body())
+    await dispatch_ai_job(
+        job.id, PROCESS_NOTE_IMPORT_JOB_TASK, background_tasks=background_tasks
+    )
+    return NoteImportJobRead.model_validate(job)
+
+
+@router.get("/import-jobs/{job_id}", response_model=NoteImportJobRead)
+def get_import_job(
+    job_id: UUID,
+    use_cases: Annotated[NoteImportJobUseCases, Depends(get_note_import_job_use_cases)],
+):
+    """インポートジョブの現在ステータスと取り込み件数をポーリングする。"""
+    return NoteImportJobRead.model_validate(use_cases.get_job(job_id))
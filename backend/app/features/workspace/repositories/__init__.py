@@ -1,7 +1,29 @@
 from app.features.workspace.repositories.applied_mutations import (
     AppliedMutationRepository,
 )
+from app.features.workspace.repositories.change_log import (
+    ChangedEntityIds,
+    WorkspaceChangeLogRepository,
+    encode_sequence_cursor,
+    parse_sequence_cursor,
+)
 from app.features.workspace.repositories.folders import FolderRepository
+from app.features.workspace.repositories.manifest import WorkspaceManifestRepository
 from app.features.workspace.repositories.notes import NoteRepository
+from app.features.workspace.repositories.search_index import NoteSearchIndexRepository
+from app.features.workspace.repositories.sync_horizons import (
+    WorkspaceSyncHorizonRepository,
+)
 
-__all__ = ["AppliedMutationRepository", "FolderRepository", "NoteRepository"]
+__all__ = [
+    "AppliedMutationRepository",
+    "ChangedEntityIds",
+    "FolderRepository",
+    "NoteRepository",
+    "NoteSearchIndexRepository",
+    "WorkspaceChangeLogRepository",
+    "WorkspaceManifestRepository",
+    "WorkspaceSyncHorizonRepository",
+    "encode_sequence_cursor",
+    "parse_sequence_cursor",
+]
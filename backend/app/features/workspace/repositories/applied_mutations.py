@@ -5,17 +5,25 @@
 主要なエクスポート: AppliedMutationRepository
 呼び出し関係: workspace のミューテーション系ユースケースから呼ばれ、
     ConflictDetected 発生時はリカバリとして既存レコードを返す。
+    保持期間を過ぎたレコードは WorkspaceCompactionUseCase が削除する。
 """
 
 import json
+from collections.abc import Iterable
+from datetime import datetime
 
-from sqlmodel import select
+from sqlalchemy import delete
+from sqlmodel import col, select
 
-from app.db_commit import commit_with_error_handling
+from app.core.unit_of_work import writes_are_staged
+from app.db_commit import commit_with_error_handling, flush_with_error_handling
 from app.features.workspace.schemas import WorkspaceAppliedChange
 from app.models import AppliedMutation
 from app.shared import ConflictDetected
 
+# 1 回の IN クエリに含める client_mutation_id の最大件数
+LOOKUP_CHUNK_SIZE = 500
+
 
 class AppliedMutationRepository:
     """クライアントミューテーションの冪等性を追跡するリポジトリ。"""
@@ -34,16 +42,43 @@ class AppliedMutationRepository:
         )
         return self.session.exec(statement).first()
 
+    def get_many_by_client_mutation_ids(
+        self, client_mutation_ids: Iterable[str]
+    ) -> dict[str, AppliedMutation]:
+        """複数の client_mutation_id に対応する既適用ミューテーションをまとめて返す。
+
+        バッチ内の ID を IN クエリで一括照会し、client_mutation_id をキーとする
+        辞書で返す。件数が多い場合は LOOKUP_CHUNK_SIZE 件ずつに分割して照会する。
+        """
+        unique_ids = list(dict.fromkeys(client_mutation_ids))
+        found: dict[str, AppliedMutation] = {}
+        for start in range(0, len(unique_ids), LOOKUP_CHUNK_SIZE):
+            chunk = unique_ids[start : start + LOOKUP_CHUNK_SIZE]
+            statement = select(AppliedMutation).where(
+                AppliedMutation.user_id == self.user_id,
+                col(AppliedMutation.client_mutation_id).in_(chunk),
+            )
+            for mutation in self.session.exec(statement):
+                found[mutation.client_mutation_id] = mutation
+        return found
+
     def record(
         self,
         *,
         client_mutation_id: str,
         applied_change: WorkspaceAppliedChange,
+        checked: bool = False,
     ) -> AppliedMutation:
-        """ミューテーションを記録する。既に適用済みの場合は既存レコードを返す (冪等)。"""
-        existing = self.get_by_client_mutation_id(client_mutation_id)
-        if existing is not None:
-            return existing
+        """ミューテーションを記録する。既に適用済みの場合は既存レコードを返す (冪等)。
+
+        呼び出し元が事前に未適用であることを確認済みの場合は checked=True を渡すと
+        挿入前の SELECT を省略する。その間に同時書き込みがあった場合も
+        一意制約違反からのリカバリで既存レコードを返す。
+        """
+        if not checked:
+            existing = self.get_by_client_mutation_id(client_mutation_id)
+            if existing is not None:
+                return existing
 
         mutation = AppliedMutation(
             user_id=self.user_id,
@@ -58,6 +93,10 @@ class AppliedMutationRepository:
             ),
         )
         self.session.add(mutation)
+        if writes_are_staged(self.session):
+            # 一意制約違反はバッチ全体のコミット時に競合として扱われる
+            flush_with_error_handling(self.session, "AppliedMutation")
+            return mutation
         try:
             commit_with_error_handling(self.session, "AppliedMutation")
         except ConflictDetected:
@@ -66,5 +105,29 @@ class AppliedMutationRepository:
             if existing is not None:
                 return existing
             raise
-        self.session.refresh(mutation)
         return mutation
+
+    def purge_created_before(self, created_before: datetime, *, limit: int) -> int:
+        """created_before より前に記録されたミューテーションを最大 limit 件削除する。
+
+        削除件数を返す。コミットは呼び出し元が行う。保持期間を過ぎた
+        client_mutation_id の再送は、新しいミューテーションとして扱われる。
+        """
+        statement = (
+            select(AppliedMutation.id)
+            .where(
+                AppliedMutation.user_id == self.user_id,
+                AppliedMutation.created_at < created_before,
+            )
+            .limit(limit)
+        )
+        mutation_ids = list(self.session.exec(statement).all())
+        if not mutation_ids:
+            return 0
+        result = self.session.exec(
+            delete(AppliedMutation).where(
+                AppliedMutation.user_id == self.user_id,
+                col(AppliedMutation.id).in_(mutation_ids),
+            )
+        )
+        return result.rowcount
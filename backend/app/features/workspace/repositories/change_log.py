@@ -0,0 +1,153 @@
+"""ワークスペース変更ログリポジトリ。
+
+責務: フォルダ・ノートの書き込みをユーザー内で単調増加するシーケンス番号付きで
+    追記し、シーケンス範囲で変更されたエンティティ ID を読み取る。
+主要なエクスポート: WorkspaceChangeLogRepository, ChangedEntityIds,
+    encode_sequence_cursor, parse_sequence_cursor
+呼び出し関係: NoteRepository / FolderRepository の書き込み経路から追記され、
+    WorkspaceSnapshotUseCase が差分の読み取りに、WorkspaceCompactionUseCase が
+    保持期間を過ぎた行の削除に使用する。
+"""
+
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete, func
+from sqlmodel import col, select
+
+from app.features.workspace.repositories.manifest import WorkspaceManifestRepository
+from app.models import WorkspaceChangeLogEntry
+
+# シーケンスカーソルの文字列表現。桁数を揃えて文字列比較でも順序が保たれるようにする
+_SEQUENCE_CURSOR_FORMAT = "seq:{:012d}"
+_SEQUENCE_CURSOR_PATTERN = re.compile(r"seq:(\d{1,18})")
+
+
+def encode_sequence_cursor(sequence: int) -> str:
+    """シーケンス番号をスナップショットカーソル文字列に変換する。"""
+    return _SEQUENCE_CURSOR_FORMAT.format(sequence)
+
+
+def parse_sequence_cursor(cursor: str | None) -> int | None:
+    """シーケンスカーソル文字列を番号に変換する。形式が異なる場合は None を返す。"""
+    if not cursor:
+        return None
+    match = _SEQUENCE_CURSOR_PATTERN.fullmatch(cursor)
+    return int(match.group(1)) if match else None
+
+
+@dataclass(frozen=True)
+class ChangedEntityIds:
+    """シーケンス範囲内で変更されたエンティティ ID（重複なし）。"""
+
+    folder_ids: list[UUID] = field(default_factory=list)
+    note_ids: list[UUID] = field(default_factory=list)
+
+
+class WorkspaceChangeLogRepository:
+    """ユーザースコープの追記専用変更ログリポジトリ。"""
+
+    def __init__(self, session, user_id: str):
+        self.session = session
+        self.user_id = user_id
+        self.manifest_repository = WorkspaceManifestRepository(session, user_id)
+
+    def append(
+        self,
+        entity: str,
+        entity_ids: Sequence[UUID],
+        *,
+        count_delta: int = 0,
+        size_delta: int = 0,
+    ) -> int:
+        """entity_ids の変更を追記し、払い出した最後のシーケンス番号を返す。
+
+        マニフェスト行の version を件数分加算（集計値も同時に更新）してから
+        同数のログ行を追加する。コミットは呼び出し元が行い、書き込み本体と同じ
+        トランザクションで確定させる。同時書き込みはマニフェスト行の更新競合
+        （または初回作成時の主キー重複）としてコミット時に検出される。
+        """
+        if not entity_ids:
+            return self.current_sequence()
+        count = len(entity_ids)
+        last_sequence = self.manifest_repository.record_write(
+            entity, count, count_delta=count_delta, size_delta=size_delta
+        )
+        first_sequence = last_sequence - count + 1
+        self.session.add_all(
+            WorkspaceChangeLogEntry(
+                user_id=self.user_id,
+                sequence=first_sequence + offset,
+                entity=entity,
+                entity_id=entity_id,
+            )
+            for offset, entity_id in enumerate(entity_ids)
+        )
+        return last_sequence
+
+    def current_sequence(self) -> int:
+        """最後に払い出したシーケンス番号を返す。書き込みがなければ 0 を返す。"""
+        return self.manifest_repository.current_version()
+
+    def list_changed_ids(self, *, after: int, up_to: int) -> ChangedEntityIds:
+        """シーケンスが after より大きく up_to 以下の範囲で変更されたエンティティ ID を返す。
+
+        読み取り量は範囲内の変更件数に比例し、ワークスペース全体の規模に依存しない。
+        """
+        if up_to <= after:
+            return ChangedEntityIds()
+        statement = (
+            select(WorkspaceChangeLogEntry.entity, WorkspaceChangeLogEntry.entity_id)
+            .where(
+                WorkspaceChangeLogEntry.user_id == self.user_id,
+                WorkspaceChangeLogEntry.sequence > after,
+                WorkspaceChangeLogEntry.sequence <= up_to,
+            )
+            .order_by(col(WorkspaceChangeLogEntry.sequence))
+        )
+        changed: dict[str, dict[UUID, None]] = {"folder": {}, "note": {}}
+        for entity, entity_id in self.session.exec(statement):
+            changed.setdefault(entity, {})[entity_id] = None
+        return ChangedEntityIds(
+            folder_ids=list(changed["folder"]), note_ids=list(changed["note"])
+        )
+
+    def max_sequence_for(self, entity_ids: Sequence[UUID]) -> int | None:
+        """entity_ids に対する変更の最大シーケンスを返す。記録がなければ None を返す。"""
+        if not entity_ids:
+            return None
+        statement = select(func.max(WorkspaceChangeLogEntry.sequence)).where(
+            WorkspaceChangeLogEntry.user_id == self.user_id,
+            col(WorkspaceChangeLogEntry.entity_id).in_(entity_ids),
+        )
+        return self.session.exec(statement).one()
+
+    def purge_created_before(
+        self, created_before: datetime, *, limit: int
+    ) -> tuple[int, int | None]:
+        """created_before より前のログ行を最大 limit 件削除する。
+
+        (削除件数, 削除した行の最大シーケンス) を返す。コミットは呼び出し元が行う。
+        """
+        statement = (
+            select(WorkspaceChangeLogEntry.id, WorkspaceChangeLogEntry.sequence)
+            .where(
+                WorkspaceChangeLogEntry.user_id == self.user_id,
+                WorkspaceChangeLogEntry.created_at < created_before,
+            )
+            .order_by(col(WorkspaceChangeLogEntry.sequence))
+            .limit(limit)
+        )
+        rows = self.session.exec(statement).all()
+        if not rows:
+            return 0, None
+        self.session.exec(
+            delete(WorkspaceChangeLogEntry).where(
+                WorkspaceChangeLogEntry.user_id == self.user_id,
+                col(WorkspaceChangeLogEntry.id).in_([row_id for row_id, _ in rows]),
+            )
+        )
+        return len(rows), max(sequence for _, sequence in rows)
@@ -6,12 +6,15 @@
     UserScopedRepository の共通 CRUD ヘルパーを継承する。
 """
 
+from collections.abc import Sequence
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlmodel import select
+from sqlmodel import col, select
 
 from app.core.persistence import UserScopedRepository, normalize_version
+from app.features.workspace.metadata_cache import workspace_metadata_cache
+from app.features.workspace.repositories.change_log import WorkspaceChangeLogRepository
 from app.models import Folder, FolderCreate, FolderUpdate
 
 
@@ -37,29 +40,71 @@ class FolderRepository(UserScopedRepository[Folder]):
             statement = statement.where(Folder.deleted_at.is_(None))
         if updated_after is not None:
             statement = statement.where(Folder.updated_at > updated_after)
+        statement = statement.order_by(
+            col(Folder.updated_at).desc(), col(Folder.id).desc()
+        )
         folders = self.session.exec(statement).all()
         for folder in folders:
             normalize_version(folder)
-        return sorted(
-            folders,
-            key=lambda folder: (folder.updated_at, str(folder.id)),
-            reverse=True,
+        return list(folders)
+
+    def record_changes(
+        self,
+        resource_ids: Sequence[UUID],
+        *,
+        count_delta: int = 0,
+        size_delta: int = 0,
+    ) -> None:
+        """書き込んだフォルダの ID を変更ログに追記し、マニフェストを更新する。"""
+        WorkspaceChangeLogRepository(self.session, self.user_id).append(
+            "folder", resource_ids, count_delta=count_delta, size_delta=size_delta
         )
 
+    def after_write(self) -> None:
+        """ユーザーのワークスペースメタデータキャッシュを破棄する。"""
+        workspace_metadata_cache.invalidate(self.user_id)
+
     def create(self, folder_in: FolderCreate) -> Folder:
         """新規フォルダを作成して保存し、永続化済みのインスタンスを返す。"""
         folder = Folder(**folder_in.model_dump(), user_id=self.user_id)
         return self.save(folder)
 
-    def update(self, folder_id: UUID, folder_in: FolderUpdate) -> Folder:
-        """指定フォルダの差分フィールドを更新し、updated_at とバージョンをインクリメントする。"""
+    def update(
+        self,
+        folder_id: UUID,
+        folder_in: FolderUpdate,
+        *,
+        expected_version: int | None = None,
+    ) -> Folder:
+        """指定フォルダの差分フィールドを更新し、updated_at とバージョンをインクリメントする。
+
+        expected_version を指定した場合は、行を読み込まずに 1 文の条件付き UPDATE で
+        バージョン照合と更新を行う。
+        """
+        if expected_version is not None:
+            return self.update_versioned(
+                folder_id,
+                folder_in.model_dump(exclude_unset=True),
+                expected_version=expected_version,
+            )
         folder = self.get_owned(folder_id)
         for key, value in folder_in.model_dump(exclude_unset=True).items():
             setattr(folder, key, value)
         return self.save(folder, touch=True, bump=True)
 
-    def soft_delete(self, folder_id: UUID) -> Folder:
-        """deleted_at を現在時刻に設定してフォルダを論理削除する。"""
+    def soft_delete(
+        self, folder_id: UUID, *, expected_version: int | None = None
+    ) -> Folder:
+        """deleted_at を現在時刻に設定してフォルダを論理削除する。
+
+        expected_version を指定した場合は 1 文の条件付き UPDATE で照合と削除を行う。
+        """
+        if expected_version is not None:
+            return self.update_versioned(
+                folder_id,
+                {"deleted_at": datetime.now(UTC)},
+                expected_version=expected_version,
+            )
         folder = self.get_owned(folder_id)
         folder.deleted_at = datetime.now(UTC)
         return self.save(folder, touch=True, bump=True)
@@ -0,0 +1,134 @@
+"""ワークスペースマニフェストリポジトリ。
+
+責務: ユーザーごとのマニフェスト行（件数・本文バイト数・最終変更時刻・
+    バージョン）を書き込みと同じトランザクションで加算更新し、読み取りを
+    提供する。集計が未確定の行は実テーブルから再計算する。
+主要なエクスポート: WorkspaceManifestRepository
+呼び出し関係: WorkspaceChangeLogRepository が書き込みのたびに record_write を、
+    WorkspaceCompactionUseCase が物理削除のたびに record_purge を呼び出し、
+    WorkspaceManifestUseCase が読み取りに使用する。
+"""
+
+from typing import Any
+
+from sqlalchemy import func, update
+from sqlmodel import col, select
+
+from app.core.persistence import byte_length, utc_now
+from app.models import Folder, Note, WorkspaceManifest
+
+# エンティティ種別ごとに加算する件数列・バイト数列
+_COUNT_COLUMNS = {"folder": "folder_count", "note": "note_count"}
+_SIZE_COLUMNS = {"note": "content_bytes"}
+
+
+class WorkspaceManifestRepository:
+    """ユーザースコープのワークスペースマニフェストリポジトリ。"""
+
+    def __init__(self, session, user_id: str):
+        self.session = session
+        self.user_id = user_id
+
+    def get(self) -> WorkspaceManifest | None:
+        """マニフェスト行を主キーで取得する。未作成なら None を返す。"""
+        return self.session.get(WorkspaceManifest, self.user_id)
+
+    def current_version(self) -> int:
+        """現在の version を返す。書き込みがなければ 0 を返す。"""
+        statement = select(WorkspaceManifest.version).where(
+            WorkspaceManifest.user_id == self.user_id
+        )
+        return self.session.exec(statement).first() or 0
+
+    def record_write(
+        self,
+        entity: str,
+        changes: int,
+        *,
+        count_delta: int = 0,
+        size_delta: int = 0,
+    ) -> int:
+        """version を changes 分加算して集計値を更新し、加算後の version を返す。
+
+        1 文の UPDATE ... RETURNING で行う。集計が未確定（NULL）の列は NULL の
+        まま残る。行が未作成の場合は、書き込み後の実テーブルから集計して作成する。
+        コミットは呼び出し元が行う。
+        """
+        values: dict[str, Any] = {
+            "version": WorkspaceManifest.version + changes,
+            "updated_at": utc_now(),
+        }
+        for column_name, delta in (
+            (_COUNT_COLUMNS.get(entity), count_delta),
+            (_SIZE_COLUMNS.get(entity), size_delta),
+        ):
+            if column_name is not None and delta:
+                values[column_name] = getattr(WorkspaceManifest, column_name) + delta
+        version = self.session.exec(
+            update(WorkspaceManifest)
+            .where(col(WorkspaceManifest.user_id) == self.user_id)
+            .values(values)
+            .returning(WorkspaceManifest.version)
+        ).scalar_one_or_none()
+        if version is not None:
+            return version
+        self.session.add(
+            WorkspaceManifest(user_id=self.user_id, version=changes, **self._totals())
+        )
+        return changes
+
+    def record_purge(self) -> int:
+        """コンパクションの物理削除で version を 1 加算し、加算後の version を返す。
+
+        削除するのは tombstone と変更ログのみで、削除済みを除く集計値は変わらない
+        ため version だけを更新する。コミットは呼び出し元が行う。
+        """
+        return self.record_write("purge", 1)
+
+    def get_or_initialize(self) -> WorkspaceManifest:
+        """集計が確定したマニフェストを返す。
+
+        行が未作成、または集計が未確定の場合は実テーブルから集計してセッションに
+        追加する（コミットは呼び出し元が行う）。
+        """
+        manifest = self.get()
+        if manifest is None:
+            manifest = WorkspaceManifest(user_id=self.user_id, **self._totals())
+        elif None in (
+            manifest.folder_count,
+            manifest.note_count,
+            manifest.content_bytes,
+        ):
+            for name, value in self._totals().items():
+                setattr(manifest, name, value)
+        else:
+            return manifest
+        self.session.add(manifest)
+        return manifest
+
+    def _totals(self) -> dict[str, int]:
+        """削除済みを除くフォルダ数・ノート数・本文バイト数を 1 回のクエリで集計する。"""
+        live_folders = (
+            col(Folder.user_id) == self.user_id,
+            col(Folder.deleted_at).is_(None),
+        )
+        live_notes = (
+            col(Note.user_id) == self.user_id,
+            col(Note.deleted_at).is_(None),
+        )
+        statement = select(
+            select(func.count())
+            .select_from(Folder)
+            .where(*live_folders)
+            .scalar_subquery(),
+            select(func.count()).select_from(Note).where(*live_notes).scalar_subquery(),
+            select(func.coalesce(func.sum(byte_length(Note.content)), 0))
+            .where(*live_notes)
+            .scalar_subquery(),
+        )
+        folder_count, note_count, content_bytes = self.session.exec(statement).one()
+        return {
+            "folder_count": folder_count,
+            "note_count": note_count,
+            "content_bytes": content_bytes,
+        }
@@ -1,6 +1,7 @@
 """ユーザースコープのノート永続化リポジトリ。
 
-責務: ノートの一覧取得・作成・更新・ソフトデリートを提供する。
+責務: ノートの一覧取得・作成・更新・ソフトデリートと、フォルダ解除・一括移動・
+    一括削除の set-based 更新を提供する。
 主要なエクスポート: NoteRepository
 呼び出し関係: WorkspaceQueryUseCases および NoteExportUseCase から利用され、
     UserScopedRepository の共通 CRUD ヘルパーを継承する。
@@ -10,13 +11,17 @@
 # 後続メソッドの `list[Note]` 注釈を遅延評価（文字列化）して解決する。
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlmodel import select
+from sqlalchemy import and_, func, or_
+from sqlmodel import col, select
 
 from app.core.persistence import UserScopedRepository, normalize_version
-from app.models import Note, NoteCreate, NoteUpdate
+from app.features.workspace.metadata_cache import workspace_metadata_cache
+from app.features.workspace.repositories.change_log import WorkspaceChangeLogRepository
+from app.models import Folder, Note, NoteCreate, NoteUpdate
 
 
 class NoteRepository(UserScopedRepository[Note]):
@@ -24,6 +29,8 @@ class NoteRepository(UserScopedRepository[Note]):
 
     model = Note
     resource_name = "Note"
+    deferred_columns = ("content",)
+    size_column = "content"
 
     def list(
         self,
@@ -31,63 +38,230 @@ class NoteRepository(UserScopedRepository[Note]):
         *,
         include_deleted: bool = False,
         updated_after: datetime | None = None,
+        metadata_only: bool = False,
     ) -> list[Note]:
         """ユーザーのノート一覧を更新日時の降順で返す。
 
         フォルダ絞り込み・削除済み除外に加え、updated_after を指定すると
         その時刻より後に更新されたノートのみを返す（差分同期用）。
+        metadata_only=True の場合は本文（content）を DB から読み込まない。
         """
         statement = select(Note).where(Note.user_id == self.user_id)
+        if metadata_only:
+            statement = statement.options(*self.metadata_only_options())
         if not include_deleted:
             statement = statement.where(Note.deleted_at.is_(None))
         if folder_id is not None:
             statement = statement.where(Note.folder_id == folder_id)
         if updated_after is not None:
             statement = statement.where(Note.updated_at > updated_after)
+        statement = statement.order_by(col(Note.updated_at).desc(), col(Note.id).desc())
         notes = self.session.exec(statement).all()
         for note in notes:
             normalize_version(note)
-        return sorted(
-            notes,
-            key=lambda note: (note.updated_at, str(note.id)),
-            reverse=True,
+        return list(notes)
+
+    def list_changed_bodies(
+        self, known_versions: Mapping[UUID, int | None]
+    ) -> list[Note]:
+        """指定ノートのうち、クライアントの既知バージョンから変化したものを返す。
+
+        known_versions は note_id -> クライアントが保持するバージョン（未保持なら
+        None）の対応。バージョンが一致するノートは SQL 側で除外するため、
+        変化のない本文は DB から読み込まれない。削除済みノートは返さない。
+        """
+        if not known_versions:
+            return []
+        unknown_ids = [
+            note_id for note_id, version in known_versions.items() if version is None
+        ]
+        version_column = func.coalesce(Note.version, 1)
+        conditions = [col(Note.id).in_(unknown_ids)] if unknown_ids else []
+        conditions.extend(
+            and_(Note.id == note_id, version_column != version)
+            for note_id, version in known_versions.items()
+            if version is not None
+        )
+        statement = select(Note).where(
+            Note.user_id == self.user_id,
+            col(Note.deleted_at).is_(None),
+            or_(*conditions),
+        )
+        notes = self.session.exec(statement).all()
+        for note in notes:
+            normalize_version(note)
+        return list(notes)
+
+    def list_export_order(self) -> list[UUID]:
+        """エクスポート順に並べた未削除ノートの ID を返す。
+
+        所属フォルダ名（未所属・削除済みフォルダは空文字）、タイトル、作成日時、
+        ID の昇順。本文を読み込まずに並び替えを 1 回の SQL で済ませる。
+        """
+        statement = (
+            select(Note.id)
+            .outerjoin(Folder, self._export_folder_join())
+            .where(Note.user_id == self.user_id, col(Note.deleted_at).is_(None))
+            .order_by(
+                func.coalesce(Folder.name, ""),
+                func.coalesce(Note.title, ""),
+                col(Note.created_at),
+                col(Note.id),
+            )
+        )
+        return list(self.session.exec(statement))
+
+    def list_export_rows(
+        self, note_ids: Sequence[UUID]
+    ) -> dict[UUID, tuple[str, str, str]]:
+        """指定ノートの ID → (フォルダ名, タイトル, 本文) を返す。
+
+        ORM インスタンスを生成せずに必要な列だけを読み込む。削除済みのノートは
+        含めない。
+        """
+        if not note_ids:
+            return {}
+        statement = (
+            select(
+                Note.id,
+                func.coalesce(Folder.name, ""),
+                func.coalesce(Note.title, ""),
+                Note.content,
+            )
+            .outerjoin(Folder, self._export_folder_join())
+            .where(
+                Note.user_id == self.user_id,
+                col(Note.deleted_at).is_(None),
+                col(Note.id).in_(note_ids),
+            )
+        )
+        return {
+            note_id: (folder_name, title, content)
+            for note_id, folder_name, title, content in self.session.exec(statement)
+        }
+
+    def list_search_rows(
+        self,
+        *,
+        note_ids: Sequence[UUID] | None = None,
+        after_id: UUID | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[UUID, str, str]]:
+        """未削除ノートの (ID, タイトル, 本文) を ID の昇順で返す。
+
+        検索インデックスの構築用に、ORM インスタンスを生成せず必要な列だけを
+        読み込む。note_ids で対象を絞り込むか、after_id と limit で ID 順に走査する。
+        """
+        statement = select(Note.id, func.coalesce(Note.title, ""), Note.content).where(
+            Note.user_id == self.user_id, col(Note.deleted_at).is_(None)
+        )
+        if note_ids is not None:
+            statement = statement.where(col(Note.id).in_(note_ids))
+        if after_id is not None:
+            statement = statement.where(col(Note.id) > after_id)
+        statement = statement.order_by(col(Note.id))
+        if limit is not None:
+            statement = statement.limit(limit)
+        return [tuple(row) for row in self.session.exec(statement)]
+
+    def _export_folder_join(self):
+        """ノートと所属フォルダ（未削除のもののみ）の結合条件を返す。"""
+        return and_(
+            col(Folder.id) == col(Note.folder_id),
+            Folder.user_id == self.user_id,
+            col(Folder.deleted_at).is_(None),
         )
 
+    def record_changes(
+        self,
+        resource_ids: Sequence[UUID],
+        *,
+        count_delta: int = 0,
+        size_delta: int = 0,
+    ) -> None:
+        """書き込んだノートの ID を変更ログに追記し、マニフェストを更新する。"""
+        WorkspaceChangeLogRepository(self.session, self.user_id).append(
+            "note", resource_ids, count_delta=count_delta, size_delta=size_delta
+        )
+
+    def after_write(self) -> None:
+        """ユーザーのワークスペースメタデータキャッシュを破棄する。"""
+        workspace_metadata_cache.invalidate(self.user_id)
+
     def create(self, note_in: NoteCreate) -> Note:
         """新規ノートを作成して保存し、永続化済みのインスタンスを返す。"""
         note = Note(**note_in.model_dump(), user_id=self.user_id)
         return self.save(note)
 
-    def update(self, note_id: UUID, note_in: NoteUpdate) -> Note:
+    def update(
+        self,
+        note_id: UUID,
+        note_in: NoteUpdate,
+        *,
+        expected_version: int | None = None,
+    ) -> Note:
         """指定ノートの差分フィールドを更新し、updated_at とバージョンをインクリメントする。
 
         クライアントが明示的に送ったフィールドのみを適用する。model_fields_set を
         用いることで、`folder_id` を `null` に明示設定して「フォルダ外（全ノート）」へ
         移動するケースも正しく反映できる（exclude_unset の dump では既定値 None と
         区別できず、明示的な null が握り潰されていた）。
+        expected_version を指定した場合は、行を読み込まずに 1 文の条件付き UPDATE で
+        バージョン照合と更新を行う。
         """
+        if expected_version is not None:
+            return self.update_versioned(
+                note_id,
+                {key: getattr(note_in, key) for key in note_in.model_fields_set},
+                expected_version=expected_version,
+            )
         note = self.get_owned(note_id)
         for key in note_in.model_fields_set:
             setattr(note, key, getattr(note_in, key))
         return self.save(note, touch=True, bump=True)
 
-    def soft_delete(self, note_id: UUID) -> Note:
-        """deleted_at を現在時刻に設定してノートを論理削除する。"""
+    def soft_delete(
+        self, note_id: UUID, *, expected_version: int | None = None
+    ) -> Note:
+        """deleted_at を現在時刻に設定してノートを論理削除する。
+
+        expected_version を指定した場合は 1 文の条件付き UPDATE で照合と削除を行う。
+        """
+        if expected_version is not None:
+            return self.update_versioned(
+                note_id,
+                {"deleted_at": datetime.now(UTC)},
+                expected_version=expected_version,
+            )
         note = self.get_owned(note_id)
         note.deleted_at = datetime.now(UTC)
         return self.save(note, touch=True, bump=True)
 
-    def clear_folder(self, folder_id: UUID) -> list[Note]:
-        """指定フォルダに属する未削除ノートの folder_id を解除する。
+    def clear_folder(self, folder_id: UUID) -> int:
+        """指定フォルダに属する未削除ノートの folder_id を解除し、件数を返す。
 
         フォルダの論理削除時に呼び出し、子ノートが存在しないフォルダを参照し続ける
         「孤立」状態を防ぐ。Aurora DSQL には外部キー制約がないため、この整合性は
         アプリケーション層で明示的に担保する必要がある。
         更新したノートは version / updated_at をインクリメントしてクライアントへ
-        同期されるようにする。
+        同期されるようにする。ノートを読み込まずにチャンク単位の UPDATE で更新する。
         """
-        notes = self.list(folder_id=folder_id)
-        for note in notes:
-            note.folder_id = None
-            self.save(note, touch=True, bump=True)
-        return notes
+        return self.bulk_update_owned(
+            {"folder_id": None}, where=[col(Note.folder_id) == folder_id]
+        )
+
+    def bulk_move(self, note_ids: Sequence[UUID], folder_id: UUID | None) -> int:
+        """指定ノートを folder_id（None はフォルダ外）へ移動し、更新件数を返す。
+
+        他ユーザー所有・削除済み・存在しない ID は無視する。
+        """
+        return self.bulk_update_owned({"folder_id": folder_id}, resource_ids=note_ids)
+
+    def bulk_soft_delete(self, note_ids: Sequence[UUID]) -> int:
+        """指定ノートをまとめて論理削除し、削除件数を返す。
+
+        他ユーザー所有・削除済み・存在しない ID は無視する。
+        """
+        return self.bulk_update_owned(
+            {"deleted_at": datetime.now(UTC)}, resource_ids=note_ids
+        )
@@ -0,0 +1,127 @@
+"""ノート全文検索インデックスリポジトリ。
+
+責務: ユーザーごとの転置インデックス（ポスティング・索引済み文書・状態行）の
+    読み書きを提供する。ポスティングはノート単位で差し替え、クエリのトークンに
+    対するポスティングリストを主キーの範囲読み取りで返す。
+主要なエクスポート: NoteSearchIndexRepository
+呼び出し関係: NoteSearchUseCase がインデックスの追従と検索に使用する。
+    コミットは呼び出し元が行う。
+"""
+
+from collections.abc import Mapping, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete
+from sqlmodel import col, select
+
+from app.core.persistence import BULK_WRITE_CHUNK_SIZE, utc_now
+from app.models import NoteSearchDocument, NoteSearchPosting, NoteSearchState
+
+
+class NoteSearchIndexRepository:
+    """ユーザースコープの全文検索インデックスリポジトリ。"""
+
+    def __init__(self, session, user_id: str):
+        self.session = session
+        self.user_id = user_id
+
+    def get_state(self) -> NoteSearchState | None:
+        """状態行を主キーで取得する。インデックスが未作成なら None を返す。"""
+        return self.session.get(NoteSearchState, self.user_id)
+
+    def get_documents(self, note_ids: Sequence[UUID]) -> dict[UUID, NoteSearchDocument]:
+        """指定ノートの索引済み文書を note_id → 文書で返す。未索引のノートは含まない。"""
+        documents: dict[UUID, NoteSearchDocument] = {}
+        unique_ids = list(dict.fromkeys(note_ids))
+        for start in range(0, len(unique_ids), BULK_WRITE_CHUNK_SIZE):
+            statement = select(NoteSearchDocument).where(
+                NoteSearchDocument.user_id == self.user_id,
+                col(NoteSearchDocument.note_id).in_(
+                    unique_ids[start : start + BULK_WRITE_CHUNK_SIZE]
+                ),
+            )
+            documents.update(
+                (document.note_id, document)
+                for document in self.session.exec(statement)
+            )
+        return documents
+
+    def list_document_ids(
+        self, *, after_id: UUID | None, up_to_id: UUID | None
+    ) -> list[UUID]:
+        """note_id が after_id より大きく up_to_id 以下の索引済み文書の ID を返す。
+
+        None の境界は無制限として扱う。全ノートの走査で、削除・物理削除された
+        ノートの文書を見つけるために使う。
+        """
+        statement = select(NoteSearchDocument.note_id).where(
+            NoteSearchDocument.user_id == self.user_id
+        )
+        if after_id is not None:
+            statement = statement.where(col(NoteSearchDocument.note_id) > after_id)
+        if up_to_id is not None:
+            statement = statement.where(col(NoteSearchDocument.note_id) <= up_to_id)
+        return list(self.session.exec(statement))
+
+    def write_document(
+        self,
+        note_id: UUID,
+        terms: Mapping[str, int],
+        length: int,
+        previous: NoteSearchDocument | None,
+    ) -> NoteSearchDocument:
+        """ノートのポスティングを差し替え、索引済み文書を返す。
+
+        previous の索引済みトークンのポスティングを主キー指定で削除してから、
+        新しいポスティングを追加する。
+        """
+        if previous is not None:
+            self._delete_postings(note_id, previous.terms.split())
+        self.session.add_all(
+            NoteSearchPosting(
+                user_id=self.user_id,
+                token=token,
+                note_id=note_id,
+                term_frequency=frequency,
+                document_length=length,
+            )
+            for token, frequency in terms.items()
+        )
+        document = previous or NoteSearchDocument(note_id=note_id, user_id=self.user_id)
+        document.terms = " ".join(terms)
+        document.length = length
+        document.indexed_at = utc_now()
+        self.session.add(document)
+        return document
+
+    def delete_document(self, document: NoteSearchDocument) -> None:
+        """索引済み文書とそのポスティングを削除する。"""
+        self._delete_postings(document.note_id, document.terms.split())
+        self.session.delete(document)
+
+    def list_postings(self, tokens: Sequence[str]) -> list[tuple[str, UUID, int, int]]:
+        """トークンのポスティングを (トークン, note_id, 出現回数, 文書長) で返す。"""
+        if not tokens:
+            return []
+        statement = select(
+            NoteSearchPosting.token,
+            NoteSearchPosting.note_id,
+            NoteSearchPosting.term_frequency,
+            NoteSearchPosting.document_length,
+        ).where(
+            NoteSearchPosting.user_id == self.user_id,
+            col(NoteSearchPosting.token).in_(tokens),
+        )
+        return [tuple(row) for row in self.session.exec(statement)]
+
+    def _delete_postings(self, note_id: UUID, tokens: Sequence[str]) -> None:
+        """指定ノートの指定トークンのポスティングを削除する。"""
+        if not tokens:
+            return
+        self.session.exec(
+            delete(NoteSearchPosting).where(
+                NoteSearchPosting.user_id == self.user_id,
+                col(NoteSearchPosting.token).in_(tokens),
+                NoteSearchPosting.note_id == note_id,
+            )
+        )
@@ -0,0 +1,76 @@
+"""ワークスペース差分同期の有効範囲リポジトリ。
+
+責務: ユーザーごとの min_valid_cursor（旧形式の時刻カーソル）と
+    min_valid_sequence（シーケンスカーソル）の取得と前進を提供する。
+主要なエクスポート: WorkspaceSyncHorizonRepository
+呼び出し関係: WorkspaceCompactionUseCase が物理削除と同じトランザクションで
+    前進させ、WorkspaceSnapshotUseCase が参照する。
+"""
+
+from datetime import UTC, datetime
+
+from app.core.persistence import utc_now
+from app.models import WorkspaceSyncHorizon
+
+# min_valid_cursor が未確定の行に設定する値（どの時刻カーソルも無効にしない）
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+class WorkspaceSyncHorizonRepository:
+    """ユーザースコープの差分同期有効範囲リポジトリ。"""
+
+    def __init__(self, session, user_id: str):
+        self.session = session
+        self.user_id = user_id
+
+    def get_min_valid_cursor(self) -> datetime | None:
+        """min_valid_cursor を tz-aware な datetime で返す。未設定なら None を返す。"""
+        horizon = self.session.get(WorkspaceSyncHorizon, self.user_id)
+        if horizon is None:
+            return None
+        cursor = horizon.min_valid_cursor
+        if cursor.tzinfo is None:
+            cursor = cursor.replace(tzinfo=UTC)
+        return cursor
+
+    def get_min_valid_sequence(self) -> int:
+        """min_valid_sequence を返す。未設定なら 0 を返す。"""
+        horizon = self.session.get(WorkspaceSyncHorizon, self.user_id)
+        return 0 if horizon is None else horizon.min_valid_sequence
+
+    def advance(self, cursor: datetime) -> None:
+        """min_valid_cursor を cursor まで前進させる。後退はさせない。
+
+        コミットは呼び出し元が行う。物理削除と同じトランザクションで更新し、
+        削除済みの tombstone を差分で取りこぼすクライアントが生じないようにする。
+        """
+        if cursor.tzinfo is None:
+            cursor = cursor.replace(tzinfo=UTC)
+        current = self.get_min_valid_cursor()
+        if current is not None and current >= cursor:
+            return
+        horizon = self._get_or_create()
+        horizon.min_valid_cursor = cursor
+        horizon.updated_at = utc_now()
+        self.session.add(horizon)
+
+    def advance_sequence(self, sequence: int) -> None:
+        """min_valid_sequence を sequence まで前進させる。後退はさせない。
+
+        コミットは呼び出し元が行う。変更ログの削除と同じトランザクションで更新する。
+        """
+        if self.get_min_valid_sequence() >= sequence:
+            return
+        horizon = self._get_or_create()
+        horizon.min_valid_sequence = sequence
+        horizon.updated_at = utc_now()
+        self.session.add(horizon)
+
+    def _get_or_create(self) -> WorkspaceSyncHorizon:
+        """ユーザーの行を返す。未作成の場合はどのカーソルも無効にしない行を作る。"""
+        horizon = self.session.get(WorkspaceSyncHorizon, self.user_id)
+        if horizon is None:
+            horizon = WorkspaceSyncHorizon(
+                user_id=self.user_id, min_valid_cursor=_EPOCH, min_valid_sequence=0
+            )
+        return horizon
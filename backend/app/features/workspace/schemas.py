@@ -2,8 +2,12 @@
 
 責務: クライアント↔サーバー間のスナップショット・バッチミューテーション
     リクエスト/レスポンスの形状を定義する。
-主要なエクスポート: WorkspaceSnapshotResponse, WorkspaceChangesRequest,
-    WorkspaceChangesResponse, WorkspaceAppliedChange, WorkspaceChangeRequest
+主要なエクスポート: WorkspaceSnapshotResponse, WorkspaceSnapshotMetadataResponse,
+    WorkspaceManifestResponse,
+    WorkspaceChangesRequest, WorkspaceChangesResponse, WorkspaceAppliedChange,
+    WorkspaceChangeRequest, ContentPatchOperation, NoteBodiesRequest,
+    NoteBodiesResponse, NoteBulkMoveRequest, NoteBulkDeleteRequest,
+    NoteBulkResponse, NoteSearchHit, NoteSearchResponse
 呼び出し関係: changes/snapshot エンドポイントおよび各 UseCase から参照される。
 """
 
@@ -13,7 +17,16 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
-from app.models import FolderRead, NoteRead
+from app.models import FolderRead, NoteMetadataRead, NoteRead
+
+# POST /api/notes/bodies で 1 リクエストに指定できるノート数の上限
+MAX_NOTE_BODIES_PER_REQUEST = 100
+# POST /api/notes/bulk/* で 1 リクエストに指定できるノート数の上限
+MAX_BULK_NOTE_IDS = 5000
+# 1 件の content_patch に含められる編集操作数の上限
+MAX_CONTENT_PATCH_OPERATIONS = 1000
+# GET /api/notes/search の 1 回で返す検索結果数の上限
+MAX_NOTE_SEARCH_RESULTS = 100
 
 
 class WorkspaceSnapshotResponse(BaseModel):
@@ -21,13 +34,24 @@ class WorkspaceSnapshotResponse(BaseModel):
 
     folders / notes には soft delete 済み（deleted_at が非 null）の
     エントリも含まれる。クライアントはこれを用いてローカルDBとの
-    差分を解消する。cursor は最新 updated_at の ISO 8601 文字列。
+    差分を解消する。cursor は変更ログのシーケンス番号を表す不透明な文字列
+    （"seq:" + 12 桁ゼロ埋め）で、次回の since にそのまま渡す。旧形式の
+    ISO 8601 カーソルも since として引き続き受け付ける。
+
+    ページング取得時は next_page_token が null になるまで続きのページを
+    取得する。cursor は全ページ共通の値で、最終ページを受信した後に保存する。
+
+    resync_required が true の場合、要求した since が古すぎて差分を返せないため
+    全件を返している。クライアントはローカルデータを置き換える（スナップショットに
+    含まれないエンティティはサーバーで物理削除済み）。
     """
 
     folders: list[FolderRead]
     notes: list[NoteRead]
     cursor: str
     server_time: datetime
+    next_page_token: str | None = None
+    resync_required: bool = False
 
     @field_validator("server_time", mode="before")
     @classmethod
@@ -38,12 +62,139 @@ class WorkspaceSnapshotResponse(BaseModel):
         return value
 
 
+class WorkspaceSnapshotMetadataResponse(BaseModel):
+    """ノート本文を含まないメタデータのみのスナップショット。
+
+    サイドバー描画に必要なタイトル・フォルダ・バージョン・タイムスタンプのみを
+    返し、本文は POST /api/notes/bodies で必要なノート分だけ取得する。
+    cursor・next_page_token・resync_required の意味は WorkspaceSnapshotResponse と同じ。
+    """
+
+    folders: list[FolderRead]
+    notes: list[NoteMetadataRead]
+    cursor: str
+    server_time: datetime
+    next_page_token: str | None = None
+    resync_required: bool = False
+
+    @field_validator("server_time", mode="before")
+    @classmethod
+    def ensure_utc_timezone(cls, value: datetime) -> datetime:
+        """tzinfo が None の datetime を UTC に補完する。"""
+        if isinstance(value, datetime) and value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value
+
+
+class WorkspaceManifestResponse(BaseModel):
+    """ワークスペースの変更有無を 1 回の主キー読み取りで判定するためのマニフェスト。
+
+    version はフォルダ・ノートの書き込みのたびに増加し、cursor は同じ時点の
+    スナップショットカーソル。クライアントは保存済みのカーソルと一致すれば
+    スナップショットの取得を省略できる。件数・content_bytes は削除済みを除く。
+    last_changed_at は書き込みが一度もなければ null。
+    """
+
+    version: int
+    cursor: str
+    folder_count: int
+    note_count: int
+    content_bytes: int
+    last_changed_at: datetime | None = None
+
+
+class NoteBodyRequest(BaseModel):
+    """本文を取得したいノート 1 件分の指定。
+
+    known_version: クライアントが保持している本文のバージョン。一致する場合は
+        本文を返さない。未保持なら省略する。
+    """
+
+    id: UUID
+    known_version: int | None = Field(default=None, ge=1)
+
+
+class NoteBodiesRequest(BaseModel):
+    """ノート本文の一括取得リクエスト。"""
+
+    notes: list[NoteBodyRequest] = Field(
+        min_length=1, max_length=MAX_NOTE_BODIES_PER_REQUEST
+    )
+
+
+class NoteBody(BaseModel):
+    """ノート 1 件分の本文とそのバージョン。"""
+
+    id: UUID
+    version: int
+    content: str
+    updated_at: datetime
+
+    @field_validator("updated_at", mode="before")
+    @classmethod
+    def ensure_utc_timezone(cls, value: datetime) -> datetime:
+        """tzinfo が None の datetime を UTC に補完する。"""
+        if isinstance(value, datetime) and value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value
+
+
+class NoteBodiesResponse(BaseModel):
+    """known_version から変化したノート本文のみを返すレスポンス。
+
+    バージョンが一致するノート、削除済み・存在しないノートは含まれない。
+    """
+
+    bodies: list[NoteBody]
+
+
+class NoteBulkMoveRequest(BaseModel):
+    """ノートの一括移動リクエスト。folder_id が null の場合はフォルダ外へ移動する。"""
+
+    note_ids: list[UUID] = Field(min_length=1, max_length=MAX_BULK_NOTE_IDS)
+    folder_id: UUID | None
+
+
+class NoteBulkDeleteRequest(BaseModel):
+    """ノートの一括論理削除リクエスト。"""
+
+    note_ids: list[UUID] = Field(min_length=1, max_length=MAX_BULK_NOTE_IDS)
+
+
+class NoteBulkResponse(BaseModel):
+    """一括操作の結果。
+
+    updated は実際に更新したノート数。他ユーザー所有・削除済み・存在しない ID は
+    無視されるため、指定件数より少なくなることがある。
+    """
+
+    updated: int
+
+
+class ContentPatchOperation(BaseModel):
+    """ノート本文に対する 1 件の置換操作。
+
+    offset: 基準本文（expected_version 時点）上の開始位置。UTF-16 コード単位
+        （JavaScript の文字列インデックスと同じ単位）で数える。
+    delete: offset から削除する長さ（UTF-16 コード単位）。
+    insert: 削除した位置に挿入する文字列。
+    """
+
+    offset: int = Field(ge=0)
+    delete: int = Field(default=0, ge=0)
+    insert: str = ""
+
+
 class WorkspaceChangeRequest(BaseModel):
     """クライアントが送信する1件分のワークスペースミューテーション。
 
     - create: payload 必須、entity_id 不要。
     - update/delete: entity_id 必須。delete は payload 禁止。
     - expected_version: 楽観的ロック用バージョン番号（省略可）。
+    - content_patch: ノート update 専用。本文全体の代わりに expected_version 時点の
+      本文に対する置換操作を送る。操作は基準本文上の位置で昇順かつ重ならない
+      ように並べる。expected_version が必須で、サーバー側の本文がそのバージョン
+      から進んでいる場合は競合として拒否される。payload の content とは併用不可。
     """
 
     entity: Literal["folder", "note"]
@@ -52,6 +203,9 @@ class WorkspaceChangeRequest(BaseModel):
     client_mutation_id: str | None = None
     expected_version: int | None = Field(default=None, ge=1)
     payload: dict[str, object] = Field(default_factory=dict)
+    content_patch: list[ContentPatchOperation] | None = Field(
+        default=None, max_length=MAX_CONTENT_PATCH_OPERATIONS
+    )
 
     @model_validator(mode="after")
     def validate_shape(self) -> "WorkspaceChangeRequest":
@@ -60,6 +214,21 @@ class WorkspaceChangeRequest(BaseModel):
             raise ValueError("entity_id is required for update and delete operations")
         if self.operation == "delete" and self.payload:
             raise ValueError("delete operations do not accept payload")
+        if self.content_patch is not None:
+            if self.entity != "note" or self.operation != "update":
+                raise ValueError("content_patch is only supported for note updates")
+            if self.expected_version is None:
+                raise ValueError("content_patch requires expected_version")
+            if "content" in self.payload:
+                raise ValueError("content_patch cannot be combined with content")
+            position = 0
+            for operation in self.content_patch:
+                if operation.offset < position:
+                    raise ValueError(
+                        "content_patch operations must be sorted and non-overlapping"
+                    )
+                position = operation.offset + operation.delete
+            return self
         if self.operation in {"create", "update"} and not self.payload:
             raise ValueError("create and update operations require payload")
         return self
@@ -70,11 +239,25 @@ class WorkspaceChangesRequest(BaseModel):
 
     device_id: 送信元デバイス識別子（省略可）。
     base_cursor: クライアントが保持する直前のカーソル（省略可）。
+    response_mode: レスポンスに含めるスナップショットの範囲。
+        "delta"（既定）は base_cursor 以降に変更されたエンティティのみを返し、
+        クライアントはそれをローカル状態へマージする。"full" は全件スナップショットを
+        返す。base_cursor が未指定・解析不能な場合は "delta" でも全件を返す。
+    apply_mode: ミューテーションの適用方式。
+        "sequential"（既定）は 1 件ずつコミットするため、途中で失敗すると
+        それ以前のミューテーションは適用済みのまま残る。
+        "atomic" は全ミューテーションと冪等性レコードを 1 トランザクションで
+        コミットし、いずれかが失敗した場合は何も適用しない。コミット時の
+        DSQL 楽観的同時実行制御（OCC）競合はバッチ全体を再実行してリトライする。
+        フォルダの削除は配下ノートの件数によって 1 トランザクションの行数制限を
+        超え得るため、"atomic" では 400 で拒否する。
     changes: 適用するミューテーションのリスト。
     """
 
     device_id: str | None = None
     base_cursor: str | None = None
+    response_mode: Literal["delta", "full"] = "delta"
+    apply_mode: Literal["sequential", "atomic"] = "sequential"
     changes: list[WorkspaceChangeRequest]
 
 
@@ -98,8 +281,48 @@ class WorkspaceChangesResponse(BaseModel):
     """バッチミューテーション結果と更新済みスナップショットをまとめて返す。
 
     applied: 各ミューテーションの適用結果リスト。
-    snapshot: 全ミューテーション適用後の最新ワークスペーススナップショット。
+    snapshot: 全ミューテーション適用後のワークスペーススナップショット。
+        response_mode が "delta" の場合は base_cursor 以降の差分のみを含む。
     """
 
     applied: list[WorkspaceAppliedChange]
     snapshot: WorkspaceSnapshotResponse
+
+
+class NoteSearchHit(BaseModel):
+    """全文検索の 1 件分の結果。
+
+    snippet は本文の最初の一致箇所周辺の抜粋。highlights は snippet 内の
+    一致範囲 [開始, 終了) を UTF-16 コード単位（JavaScript の文字列
+    インデックス）で表す。
+    """
+
+    id: UUID
+    title: str
+    folder_id: UUID | None = None
+    updated_at: datetime
+    score: float
+    snippet: str
+    highlights: list[tuple[int, int]]
+
+    @field_validator("updated_at", mode="before")
+    @classmethod
+    def ensure_utc_timezone(cls, value: datetime) -> datetime:
+        """tzinfo が None の datetime を UTC に補完する。"""
+        if isinstance(value, datetime) and value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value
+
+
+class NoteSearchResponse(BaseModel):
+    """全文検索の結果をスコアの降順で返す。
+
+    total はクエリのすべてのトークンを含むノート数。index_complete が false の
+    場合はインデックスの追従が途中で、直近の変更が結果に反映されていない
+    ことがある（続きは以降の書き込みやスケジュール実行で反映する）。
+    """
+
+    query: str
+    total: int
+    items: list[NoteSearchHit]
+    index_complete: bool
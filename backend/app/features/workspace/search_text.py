@@ -0,0 +1,126 @@
+"""ノート全文検索のトークン化とスニペット生成。
+
+責務: ノートのタイトル・本文と検索クエリを同じ規則でトークンに分割し、
+    検索結果に表示するスニペットとハイライト位置を組み立てる。
+    英数字などは単語単位、日本語などの分かち書きしない文字列は文字 bigram で
+    トークン化する。
+主要なエクスポート: tokenize, document_terms, build_snippet,
+    MAX_TERMS_PER_DOCUMENT, MAX_TOKEN_LENGTH
+呼び出し関係: NoteSearchUseCase が索引時と検索時に呼び出す。
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from collections.abc import Sequence
+
+# トークンの最大長（ポスティングの token 列の max_length と一致させる）
+MAX_TOKEN_LENGTH = 64
+# 1 ノートあたりに索引する異なりトークン数の上限。出現回数の多いものを残す。
+# 再索引時の削除と追加を合わせた書き込み行数を DSQL の上限内に収めるため。
+MAX_TERMS_PER_DOCUMENT = 1000
+# タイトルのトークンを本文より重く扱うための出現回数の倍率
+TITLE_WEIGHT = 2
+# スニペットの長さと、最初の一致箇所より前に含める文字数
+SNIPPET_LENGTH = 160
+SNIPPET_CONTEXT = 40
+_ELLIPSIS = "…"
+
+# 分かち書きしない文字（ひらがな・カタカナ・CJK 統合漢字・ハングル）
+_CJK = "぀-ヿ㐀-䶿一-鿿豈-﫿가-힯"
+_TOKEN_PATTERN = re.compile(f"([{_CJK}]+)|([^\\W{_CJK}]+)")
+
+
+def _normalize(text: str) -> str:
+    """全角・半角の揺れと大文字小文字を吸収する。"""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    """テキストを検索用トークンの列に分割する。
+
+    分かち書きしない文字の連続は文字 bigram（1 文字だけならその文字）にする。
+    そのため 1 文字のクエリは 1 文字だけの語にしか一致しない。
+    """
+    tokens: list[str] = []
+    for match in _TOKEN_PATTERN.finditer(_normalize(text)):
+        cjk_run, word = match.groups()
+        if word is not None:
+            tokens.append(word[:MAX_TOKEN_LENGTH])
+        elif len(cjk_run) == 1:
+            tokens.append(cjk_run)
+        else:
+            tokens.extend(
+                cjk_run[index : index + 2] for index in range(len(cjk_run) - 1)
+            )
+    return tokens
+
+
+def document_terms(title: str, content: str) -> tuple[Counter[str], int]:
+    """ノートの (トークン → 出現回数, 文書長) を返す。
+
+    タイトルのトークンは TITLE_WEIGHT 回出現したものとして数える。
+    異なりトークン数は MAX_TERMS_PER_DOCUMENT に切り詰めるが、文書長には
+    切り詰め前のトークン数を使う。
+    """
+    counts = Counter(tokenize(content))
+    for token in tokenize(title):
+        counts[token] += TITLE_WEIGHT
+    length = sum(counts.values())
+    if len(counts) > MAX_TERMS_PER_DOCUMENT:
+        counts = Counter(dict(counts.most_common(MAX_TERMS_PER_DOCUMENT)))
+    return counts, length
+
+
+def build_snippet(
+    content: str, terms: Sequence[str]
+) -> tuple[str, list[tuple[int, int]]]:
+    """本文から最初の一致箇所周辺のスニペットと、その中のハイライト範囲を返す。
+
+    ハイライトは [開始, 終了) の組で、フロントエンドの文字列インデックスと
+    揃えるため UTF-16 コード単位で表す。本文に一致がない（タイトルのみ一致）
+    場合は本文の先頭をハイライトなしで返す。
+    """
+    pattern = _highlight_pattern(terms)
+    first = pattern.search(content) if pattern is not None else None
+    start = max(0, first.start() - SNIPPET_CONTEXT) if first is not None else 0
+    end = min(len(content), start + SNIPPET_LENGTH)
+    prefix = _ELLIPSIS if start > 0 else ""
+    suffix = _ELLIPSIS if end < len(content) else ""
+    snippet = prefix + content[start:end] + suffix
+    if first is None:
+        return snippet, []
+
+    spans: list[tuple[int, int]] = []
+    for match in pattern.finditer(content, start, end):
+        begin = match.start() - start + len(prefix)
+        span = (begin, begin + len(match.group(1)))
+        # bigram 同士の重なりは 1 つの範囲にまとめる
+        if spans and span[0] <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], span[1]))
+        else:
+            spans.append(span)
+    return snippet, [
+        (_utf16_offset(snippet, begin), _utf16_offset(snippet, finish))
+        for begin, finish in spans
+    ]
+
+
+def _highlight_pattern(terms: Sequence[str]) -> re.Pattern[str] | None:
+    """クエリのトークンのいずれかに大文字小文字を区別せず一致する正規表現を返す。
+
+    重なり合う bigram も拾えるよう先読みで位置だけを判定し、一致長は
+    トークン長とする。
+    """
+    unique = sorted(set(terms), key=len, reverse=True)
+    if not unique:
+        return None
+    alternatives = "|".join(re.escape(term) for term in unique)
+    return re.compile(f"(?=({alternatives}))", re.IGNORECASE)
+
+
+def _utf16_offset(text: str, index: int) -> int:
+    """str のインデックスを UTF-16 コード単位の位置に変換する。"""
+    if text.isascii():
+        return index
+    return len(text[:index].encode("utf-16-le")) // 2
@@ -1,40 +1,209 @@
 """ワークスペーススナップショット取得エンドポイント。
 
 責務: クライアントの初回起動または再同期時に、全フォルダ・ノートを
-    含む統合スナップショットを返す。
-主要なエクスポート: router (GET /snapshot)
+    含む統合スナップショットを返す。page_size 指定時はページ単位で返す。
+    本文を含まないメタデータのみのスナップショットも提供する。
+    ETag / If-None-Match による条件付き取得と、Accept による列指向
+    エンコードに対応する。変更有無のポーリング用にマニフェストも返す。
+主要なエクスポート: router (GET /snapshot, GET /snapshot/metadata, GET /manifest)
 呼び出し関係: workspace ルーターからマウントされ、
-    WorkspaceSnapshotUseCase を呼び出す。
+    WorkspaceSnapshotUseCase / WorkspaceManifestUseCase を呼び出す。
 """
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Response
 
-from app.features.workspace.dependencies import get_workspace_snapshot_use_case
-from app.features.workspace.schemas import WorkspaceSnapshotResponse
-from app.features.workspace.use_cases import WorkspaceSnapshotUseCase
+from app.features.workspace.dependencies import (
+    get_workspace_manifest_use_case,
+    get_workspace_snapshot_use_case,
+)
+from app.features.workspace.encoding import (
+    COLUMNAR_FORMAT,
+    COLUMNAR_MEDIA_TYPE,
+    columnar_response,
+    encode_snapshot_columns,
+    wants_columnar,
+)
+from app.features.workspace.fast_json import FastJSONResponse, encode_snapshot_json
+from app.features.workspace.schemas import (
+    WorkspaceManifestResponse,
+    WorkspaceSnapshotMetadataResponse,
+    WorkspaceSnapshotResponse,
+)
+from app.features.workspace.use_cases import (
+    WorkspaceManifestUseCase,
+    WorkspaceSnapshotUseCase,
+)
+from app.features.workspace.use_cases.snapshot import (
+    DEFAULT_SNAPSHOT_PAGE_SIZE,
+    MAX_SNAPSHOT_PAGE_SIZE,
+)
+from app.http_caching import (
+    CACHE_CONTROL_REVALIDATE,
+    etag_matches,
+    make_etag,
+    not_modified_response,
+)
 
 router = APIRouter()
 
+SinceQuery = Annotated[
+    str | None,
+    Query(
+        description=(
+            "差分同期用カーソル。指定するとこのカーソル以降に変更された"
+            "エンティティ（削除済み tombstone を含む）のみを返す。"
+        )
+    ),
+]
+PageSizeQuery = Annotated[
+    int | None,
+    Query(
+        ge=1,
+        le=MAX_SNAPSHOT_PAGE_SIZE,
+        description=(
+            "1 ページに含めるフォルダ・ノートの合計件数。指定すると "
+            "(updated_at, id) 昇順のページ単位で返す。"
+        ),
+    ),
+]
+PageTokenQuery = Annotated[
+    str | None,
+    Query(description="前ページの next_page_token。続きのページを取得する。"),
+]
+IfNoneMatchHeader = Annotated[str | None, Header()]
+AcceptHeader = Annotated[str | None, Header()]
+# 列指向エンコードを OpenAPI 上の代替レスポンス形式として公開する
+COLUMNAR_RESPONSES: dict[int | str, dict] = {
+    200: {"content": {COLUMNAR_MEDIA_TYPE: {}}},
+}
+
+
+def _load_snapshot(
+    use_case: WorkspaceSnapshotUseCase,
+    *,
+    since: str | None,
+    page_size: int | None,
+    page_token: str | None,
+    metadata_only: bool,
+    if_none_match: str | None,
+    accept: str | None,
+):
+    """条件付きリクエストを判定し、ページング指定に応じてスナップショットを返す。
+
+    ETag はユーザー ID とマニフェストの version・クエリパラメータ・エンコードから
+    算出する。If-None-Match が一致した場合は行を読み込まずに 304 を返す。
+    Accept が列指向メディアタイプを含む場合は列指向で、それ以外は行ごとの
+    Pydantic 変換を省いた高速経路の JSON で返す。
+    """
+    columnar = wants_columnar(accept)
+    etag = make_etag(
+        "snapshot",
+        "metadata" if metadata_only else "full",
+        COLUMNAR_FORMAT if columnar else "json",
+        since,
+        page_size,
+        page_token,
+        *use_case.get_version_marker(),
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL_REVALIDATE,
+        "Vary": "Accept",
+    }
 
-@router.get("/snapshot", response_model=WorkspaceSnapshotResponse)
+    if page_size is None and page_token is None:
+        rows = use_case.load_snapshot_rows(since, metadata_only=metadata_only)
+    else:
+        rows = use_case.load_snapshot_page_rows(
+            page_size=page_size or DEFAULT_SNAPSHOT_PAGE_SIZE,
+            page_token=page_token,
+            since_cursor=since,
+            metadata_only=metadata_only,
+        )
+    if columnar:
+        return columnar_response(encode_snapshot_columns(rows), headers=headers)
+    return FastJSONResponse(encode_snapshot_json(rows), headers=headers)
+
+
+@router.get(
+    "/snapshot",
+    response_model=WorkspaceSnapshotResponse,
+    responses=COLUMNAR_RESPONSES,
+)
 def get_workspace_snapshot(
     use_case: Annotated[
         WorkspaceSnapshotUseCase, Depends(get_workspace_snapshot_use_case)
     ],
-    since: Annotated[
-        str | None,
-        Query(
-            description=(
-                "差分同期用カーソル。指定するとこの時刻より後に更新された"
-                "エンティティ（削除済み tombstone を含む）のみを返す。"
-            )
-        ),
-    ] = None,
+    since: SinceQuery = None,
+    page_size: PageSizeQuery = None,
+    page_token: PageTokenQuery = None,
+    if_none_match: IfNoneMatchHeader = None,
+    accept: AcceptHeader = None,
 ):
     """ブートストラップおよび同期用のワークスペーススナップショットを返す。
 
-    since を指定すると差分のみ、未指定だと全件を返す。
+    since を指定すると差分のみ、未指定だと全件を返す。page_size または
+    page_token を指定するとページ単位で返し、続きがあれば next_page_token を含める。
+    If-None-Match が現在の ETag と一致する場合は 304 Not Modified を返す。
+    Accept: application/vnd.notes.columnar+json を指定すると列指向形式で返す。
+    """
+    return _load_snapshot(
+        use_case,
+        since=since,
+        page_size=page_size,
+        page_token=page_token,
+        metadata_only=False,
+        if_none_match=if_none_match,
+        accept=accept,
+    )
+
+
+@router.get(
+    "/snapshot/metadata",
+    response_model=WorkspaceSnapshotMetadataResponse,
+    responses=COLUMNAR_RESPONSES,
+)
+def get_workspace_snapshot_metadata(
+    use_case: Annotated[
+        WorkspaceSnapshotUseCase, Depends(get_workspace_snapshot_use_case)
+    ],
+    since: SinceQuery = None,
+    page_size: PageSizeQuery = None,
+    page_token: PageTokenQuery = None,
+    if_none_match: IfNoneMatchHeader = None,
+    accept: AcceptHeader = None,
+):
+    """ノート本文を含まないメタデータのみのスナップショットを返す。
+
+    パラメータの意味は GET /snapshot と同じ。本文は DB から読み込まれないため、
+    大規模ワークスペースのコールドスタートでも転送量が本文サイズに依存しない。
+    """
+    return _load_snapshot(
+        use_case,
+        since=since,
+        page_size=page_size,
+        page_token=page_token,
+        metadata_only=True,
+        if_none_match=if_none_match,
+        accept=accept,
+    )
+
+
+@router.get("/manifest", response_model=WorkspaceManifestResponse)
+def get_workspace_manifest(
+    use_case: Annotated[
+        WorkspaceManifestUseCase, Depends(get_workspace_manifest_use_case)
+    ],
+    response: Response,
+):
+    """ワークスペースの件数・本文バイト数・最終変更時刻・バージョンを返す。
+
+    1 回の主キー読み取りで返すため、同期前の変更有無のポーリングに使う。
+    cursor が保存済みのカーソルと一致すればスナップショットの取得は不要。
     """
-    return use_case.get_snapshot(since_cursor=since)
+    response.headers["Cache-Control"] = CACHE_CONTROL_REVALIDATE
+    return use_case.get_manifest()
@@ -1,17 +1,37 @@
 """Workspace feature use cases."""
 
 from app.features.workspace.use_cases.changes import WorkspaceChangesUseCase
+from app.features.workspace.use_cases.compaction import (
+    WorkspaceCompactionResult,
+    WorkspaceCompactionUseCase,
+)
+from app.features.workspace.use_cases.export_jobs import NoteExportJobUseCases
 from app.features.workspace.use_cases.folders import FolderUseCases
+from app.features.workspace.use_cases.import_jobs import NoteImportJobUseCases
+from app.features.workspace.use_cases.manifest import WorkspaceManifestUseCase
 from app.features.workspace.use_cases.note_exports import NoteExportUseCase
+from app.features.workspace.use_cases.note_imports import NoteImportUseCase
 from app.features.workspace.use_cases.notes import NoteUseCases
 from app.features.workspace.use_cases.queries import WorkspaceQueryUseCases
+from app.features.workspace.use_cases.search import (
+    NoteSearchUseCase,
+    refresh_stale_search_indexes,
+)
 from app.features.workspace.use_cases.snapshot import WorkspaceSnapshotUseCase
 
 __all__ = [
     "WorkspaceChangesUseCase",
+    "WorkspaceCompactionResult",
+    "WorkspaceCompactionUseCase",
     "FolderUseCases",
+    "NoteExportJobUseCases",
     "NoteExportUseCase",
+    "NoteImportJobUseCases",
+    "NoteImportUseCase",
+    "NoteSearchUseCase",
     "NoteUseCases",
+    "WorkspaceManifestUseCase",
     "WorkspaceQueryUseCases",
     "WorkspaceSnapshotUseCase",
+    "refresh_stale_search_indexes",
 ]
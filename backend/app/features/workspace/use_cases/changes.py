@@ -1,17 +1,21 @@
 """バッチワークスペースミューテーション適用ユースケース。
 
 責務: クライアントから送られたミューテーションリストを順に適用し、
-    冪等性チェック・楽観的ロック検証を行ったうえで最新スナップショットを返す。
+    冪等性チェック・楽観的ロック検証を行ったうえで base_cursor 以降の
+    差分スナップショット（または明示指定時は全件スナップショット）を返す。
 主要なエクスポート: WorkspaceChangesUseCase
 呼び出し関係: changes エンドポイントから呼ばれ、FolderUseCases /
     NoteUseCases / WorkspaceSnapshotUseCase / AppliedMutationRepository
-    を組み合わせて処理する。
+    を組み合わせて処理する。書き込みは UnitOfWork.run でまとめてコミットし、
+    ノートの変更を含むバッチはコミット後に検索インデックスを追従させる。
 """
 
 import logging
 
 from sqlmodel import Session
 
+from app.core.unit_of_work import get_unit_of_work
+from app.features.workspace.content_patch import apply_content_patch
 from app.features.workspace.repositories import AppliedMutationRepository
 from app.features.workspace.schemas import (
     WorkspaceAppliedChange,
@@ -20,7 +24,10 @@ from app.features.workspace.schemas import (
 )
 from app.features.workspace.use_cases.folders import FolderUseCases
 from app.features.workspace.use_cases.notes import NoteUseCases
-from app.features.workspace.use_cases.snapshot import WorkspaceSnapshotUseCase
+from app.features.workspace.use_cases.snapshot import (
+    SnapshotRows,
+    WorkspaceSnapshotUseCase,
+)
 from app.logging_utils import log_event
 from app.models import (
     FolderCreate,
@@ -39,7 +46,12 @@ class WorkspaceChangesUseCase:
     """バッチワークスペースミューテーションを適用し、更新済みスナップショットを返す。"""
 
     def __init__(self, session: Session, user_id: str):
+        self.session = session
+        self.unit_of_work = get_unit_of_work(session)
         self.mutation_repository = AppliedMutationRepository(session, user_id)
+        # client_mutation_id -> 適用結果。バッチ開始時に一括取得した既適用分と、
+        # バッチ内で新たに適用した分を保持し、冪等性チェックをメモリ上で行う。
+        self._applied_by_mutation_id: dict[str, WorkspaceAppliedChange] = {}
         self.folder_use_cases = FolderUseCases(session, user_id)
         self.note_use_cases = NoteUseCases(session, user_id)
         self.snapshot_use_case = WorkspaceSnapshotUseCase(session, user_id)
@@ -47,38 +59,134 @@ class WorkspaceChangesUseCase:
     def apply_changes(
         self, request: WorkspaceChangesRequest
     ) -> WorkspaceChangesResponse:
-        """リクエスト内の全ミューテーションを適用し、スナップショットと共に返す。"""
-        applied = [self._apply_change(change) for change in request.changes]
+        """リクエスト内の全ミューテーションを適用し、スナップショットと共に返す。
+
+        response_mode が "delta" の場合は base_cursor 以降に更新されたエンティティ
+        のみを返し、自動保存のたびに全件を読み直すコストを避ける。"full" を
+        明示した場合や、base_cursor が未指定・解析不能な場合は全件を返す。
+        """
+        applied, rows = self.apply_changes_with_rows(request)
+        return WorkspaceChangesResponse(
+            applied=applied,
+            snapshot=self.snapshot_use_case.to_response(rows),
+        )
+
+    def apply_changes_with_rows(
+        self, request: WorkspaceChangesRequest
+    ) -> tuple[list[WorkspaceAppliedChange], SnapshotRows]:
+        """apply_changes と同じ処理を行い、スナップショットをスキーマ変換前の行で返す。
+
+        列指向エンコードのレスポンスから利用する。
+        """
+        if request.apply_mode == "atomic":
+            applied = self._apply_atomically(request.changes)
+        else:
+            self._prefetch_applied_mutations(request.changes)
+            applied = [self._apply_sequentially(change) for change in request.changes]
+        if any(change.entity == "note" for change in request.changes):
+            self.note_use_cases.refresh_search_index()
+        since_cursor = request.base_cursor if request.response_mode == "delta" else None
         log_event(
             logger,
             logging.INFO,
             "audit.workspace.changes.applied",
             change_count=len(request.changes),
+            apply_mode=request.apply_mode,
+            response_mode=request.response_mode,
             outcome="success",
         )
-        return WorkspaceChangesResponse(
-            applied=applied,
-            snapshot=self.snapshot_use_case.get_snapshot(),
+        return applied, self.snapshot_use_case.load_snapshot_rows(
+            since_cursor=since_cursor
+        )
+
+    def _apply_atomically(self, changes) -> list[WorkspaceAppliedChange]:
+        """全ミューテーションと冪等性レコードを 1 つの unit of work で適用する。
+
+        ミューテーションの適用中にエラーが発生した場合はトランザクション全体を
+        ロールバックして例外を再送出する（部分適用は発生しない）。コミット時の
+        OCC 競合では unit of work がバッチ全体を最初から再実行する。
+        フォルダの削除は配下ノートの件数に比例して書き込み行数が増え、
+        DSQL のトランザクションあたりの行数制限を超え得るため、何も適用する前に
+        ValidationFailed で拒否する。
+        """
+        if any(
+            change.entity == "folder" and change.operation == "delete"
+            for change in changes
+        ):
+            raise ValidationFailed(
+                "Folder deletes cannot be applied atomically; "
+                'send them with apply_mode "sequential"'
+            )
+
+        def apply_all() -> list[WorkspaceAppliedChange]:
+            # リトライ時は同時リクエストの記録も反映するため毎回取得し直す
+            self._prefetch_applied_mutations(changes)
+            return [self._apply_change(change) for change in changes]
+
+        return self.unit_of_work.run(apply_all, "Workspace changes")
+
+    def _apply_sequentially(self, change) -> WorkspaceAppliedChange:
+        """1 件のミューテーションと冪等性レコードを 1 つの unit of work で適用する。
+
+        フォルダの削除は配下ノートの解除をチャンク単位でコミットするため、
+        unit of work に含めずに適用する。コミット競合で再実行する場合は、
+        ロールバックされた適用結果を捨て、同時リクエストが記録した結果を
+        読み直してから適用する。
+        """
+        if change.entity == "folder" and change.operation == "delete":
+            return self._apply_change(change)
+
+        attempts = 0
+
+        def apply_one() -> WorkspaceAppliedChange:
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1 and change.client_mutation_id is not None:
+                self._applied_by_mutation_id.pop(change.client_mutation_id, None)
+                existing = self.mutation_repository.get_by_client_mutation_id(
+                    change.client_mutation_id
+                )
+                if existing is not None:
+                    return WorkspaceAppliedChange.model_validate(
+                        existing.get_response_payload()
+                    )
+            return self._apply_change(change)
+
+        return self.unit_of_work.run(apply_one, "Workspace changes")
+
+    def _prefetch_applied_mutations(self, changes) -> None:
+        """バッチ内の client_mutation_id に対応する適用済み結果を一括取得する。
+
+        1 回の IN クエリで取得し、以降の冪等性チェックはメモリ上の辞書で行う。
+        """
+        client_mutation_ids = [
+            change.client_mutation_id
+            for change in changes
+            if change.client_mutation_id is not None
+        ]
+        existing = self.mutation_repository.get_many_by_client_mutation_ids(
+            client_mutation_ids
         )
+        self._applied_by_mutation_id = {
+            client_mutation_id: WorkspaceAppliedChange.model_validate(
+                applied_mutation.get_response_payload()
+            )
+            for client_mutation_id, applied_mutation in existing.items()
+        }
 
     def _apply_change(self, change) -> WorkspaceAppliedChange:
         """1件のミューテーションを適用する。
 
-        client_mutation_id が指定されている場合、まず AppliedMutation テーブルを
-        照会して冪等性チェックを行う。既存レコードがあれば再実行せずに
-        キャッシュされたレスポンスを返す。
+        client_mutation_id が指定されている場合、バッチ開始時に一括取得した
+        適用済み結果を参照して冪等性チェックを行う。既存結果があれば再実行せずに
+        保存済みのレスポンスを返す。
         適用後、client_mutation_id が存在すれば結果をテーブルに記録する。
         """
         if change.client_mutation_id is not None:
-            # 冪等性確認: 同じ client_mutation_id が既に処理済みか照会する
-            applied_mutation = self.mutation_repository.get_by_client_mutation_id(
-                change.client_mutation_id
-            )
-            if applied_mutation is not None:
+            replayed = self._applied_by_mutation_id.get(change.client_mutation_id)
+            if replayed is not None:
                 # 既に適用済みのミューテーション: 保存済みレスポンスを返して終了
-                return WorkspaceAppliedChange.model_validate(
-                    applied_mutation.get_response_payload()
-                )
+                return replayed
 
         if change.entity == "folder":
             applied_change = self._apply_folder_change(change)
@@ -88,17 +196,21 @@ class WorkspaceChangesUseCase:
             raise ValidationFailed(f"Unsupported workspace entity: {change.entity}")
 
         if change.client_mutation_id is not None:
-            # 適用結果を AppliedMutation テーブルに記録して次回の冪等性に備える
+            # 適用結果を AppliedMutation テーブルに記録して次回の冪等性に備える。
+            # 未適用であることは一括取得で確認済みのため挿入前の SELECT は省略する。
             self.mutation_repository.record(
                 client_mutation_id=change.client_mutation_id,
                 applied_change=applied_change,
+                checked=True,
             )
+            self._applied_by_mutation_id[change.client_mutation_id] = applied_change
         return applied_change
 
     def _apply_folder_change(self, change) -> WorkspaceAppliedChange:
         """フォルダへのミューテーション（create / update / delete）を適用する。
 
-        update / delete 時は expected_version が指定されていれば楽観的ロックを検証する。
+        update / delete 時は expected_version が指定されていれば、バージョン照合と
+        書き込みを 1 文の条件付き UPDATE で行う。
         """
         if change.operation == "create":
             folder = self.folder_use_cases.create_folder(
@@ -113,11 +225,10 @@ class WorkspaceChangesUseCase:
             )
 
         if change.operation == "update":
-            # 楽観的ロック: クライアントが期待するバージョンとサーバーの現在バージョンを照合
-            self._ensure_expected_version(folder_id=change.entity_id, change=change)
             folder = self.folder_use_cases.update_folder(
                 change.entity_id,
                 FolderUpdate.model_validate(change.payload),
+                expected_version=change.expected_version,
             )
             return WorkspaceAppliedChange(
                 entity="folder",
@@ -127,9 +238,10 @@ class WorkspaceChangesUseCase:
                 folder=FolderRead.model_validate(folder),
             )
 
-        # delete 操作: バージョン照合後に soft delete を実行
-        self._ensure_expected_version(folder_id=change.entity_id, change=change)
-        self.folder_use_cases.delete_folder(change.entity_id)
+        # delete 操作: バージョン照合と soft delete を同時に実行
+        self.folder_use_cases.delete_folder(
+            change.entity_id, expected_version=change.expected_version
+        )
         return WorkspaceAppliedChange(
             entity="folder",
             operation="delete",
@@ -140,7 +252,10 @@ class WorkspaceChangesUseCase:
     def _apply_note_change(self, change) -> WorkspaceAppliedChange:
         """ノートへのミューテーション（create / update / delete）を適用する。
 
-        update / delete 時は expected_version が指定されていれば楽観的ロックを検証する。
+        update / delete 時は expected_version が指定されていれば、バージョン照合と
+        書き込みを 1 文の条件付き UPDATE で行う。update に content_patch が
+        指定された場合は、現在の本文を読み込んでバージョンを照合したうえで差分を
+        適用し、得た本文を同じく条件付き UPDATE で書き込む。
         """
         if change.operation == "create":
             note = self.note_use_cases.create_note(
@@ -155,11 +270,21 @@ class WorkspaceChangesUseCase:
             )
 
         if change.operation == "update":
-            # 楽観的ロック: クライアントが期待するバージョンとサーバーの現在バージョンを照合
-            self._ensure_expected_version(note_id=change.entity_id, change=change)
+            payload = change.payload
+            if change.content_patch is not None:
+                # 差分パッチは expected_version 時点の本文（= 照合済みの現在の本文）に適用する
+                current = self.note_use_cases.get_note(change.entity_id)
+                self._ensure_expected_version(current, change)
+                payload = {
+                    **payload,
+                    "content": apply_content_patch(
+                        current.content, change.content_patch
+                    ),
+                }
             note = self.note_use_cases.update_note(
                 change.entity_id,
-                NoteUpdate.model_validate(change.payload),
+                NoteUpdate.model_validate(payload),
+                expected_version=change.expected_version,
             )
             return WorkspaceAppliedChange(
                 entity="note",
@@ -169,9 +294,10 @@ class WorkspaceChangesUseCase:
                 note=NoteRead.model_validate(note),
             )
 
-        # delete 操作: バージョン照合後に soft delete を実行
-        self._ensure_expected_version(note_id=change.entity_id, change=change)
-        self.note_use_cases.delete_note(change.entity_id)
+        # delete 操作: バージョン照合と soft delete を同時に実行
+        self.note_use_cases.delete_note(
+            change.entity_id, expected_version=change.expected_version
+        )
         return WorkspaceAppliedChange(
             entity="note",
             operation="delete",
@@ -179,31 +305,17 @@ class WorkspaceChangesUseCase:
             client_mutation_id=change.client_mutation_id,
         )
 
-    def _ensure_expected_version(
-        self,
-        change,
-        *,
-        folder_id=None,
-        note_id=None,
-    ) -> None:
-        """楽観的ロックの検証を行う。
+    @staticmethod
+    def _ensure_expected_version(resource, change) -> None:
+        """読み込み済みのリソースに対して楽観的ロックの検証を行う。
 
-        change.expected_version が None の場合は何もしない。
+        content_patch の適用前に、パッチの基準となる本文のバージョンを照合する
+        ために使う。change.expected_version が None の場合は何もしない。
         サーバーのリソースバージョンとクライアントの期待値が一致しない場合は
-        ConflictDetected を送出する。
-        Aurora DSQL には外部キー制約がないため、バージョン管理は
-        アプリケーション層でこのメソッドが担う。
+        ConflictDetected を送出する。書き込み時の照合は条件付き UPDATE が担う。
         """
         if change.expected_version is None:
             return
-
-        if folder_id is not None:
-            resource = self.folder_use_cases.get_folder(folder_id)
-        elif note_id is not None:
-            resource = self.note_use_cases.get_note(note_id)
-        else:
-            raise ValidationFailed("expected_version check requires a target resource")
-
         if resource.version != change.expected_version:
             raise ConflictDetected(
                 f"{change.entity.capitalize()} version mismatch: "
@@ -0,0 +1,263 @@
+"""ワークスペースの tombstone・冪等性記録のコンパクションユースケース。
+
+責務: 保持期間を過ぎた soft delete 済みのノート・フォルダと変更ログを物理削除し、
+    期限切れの applied_mutations を削除する。tombstone・変更ログを削除した
+    ユーザーは min_valid_cursor / min_valid_sequence を前進させ、それより古い
+    カーソルのクライアントに全件再同期を要求できるようにする。
+主要なエクスポート: WorkspaceCompactionUseCase, WorkspaceCompactionResult,
+    COMPACTION_BATCH_SIZE, main
+呼び出し関係: worker_lambda_handler の EventBridge スケジュール起動、または
+    `python -m app.features.workspace.use_cases.compaction` から呼ばれる。
+"""
+
+import argparse
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from time import perf_counter
+from uuid import UUID
+
+from sqlalchemy import delete, union
+from sqlmodel import Session, col, select
+
+from app.config import get_settings
+from app.core.persistence import UserScopedRepository, utc_now
+from app.db_commit import commit_with_error_handling
+from app.features.workspace.repositories import (
+    AppliedMutationRepository,
+    FolderRepository,
+    NoteRepository,
+    WorkspaceChangeLogRepository,
+    WorkspaceManifestRepository,
+    WorkspaceSyncHorizonRepository,
+)
+from app.logging_utils import log_event
+from app.models import (
+    AppliedMutation,
+    Folder,
+    Note,
+    NoteShare,
+    WorkspaceChangeLogEntry,
+)
+from app.shared import ConflictDetected
+
+logger = logging.getLogger(__name__)
+
+# 1 トランザクションで削除する行数の上限（DSQL のトランザクション行数制限より十分小さくする）
+COMPACTION_BATCH_SIZE = 500
+
+
+@dataclass
+class WorkspaceCompactionResult:
+    """1 回のコンパクション実行で削除した件数の集計。"""
+
+    users: int = 0
+    notes_deleted: int = 0
+    folders_deleted: int = 0
+    note_shares_deleted: int = 0
+    change_log_entries_deleted: int = 0
+    applied_mutations_deleted: int = 0
+    users_failed: int = 0
+
+
+class WorkspaceCompactionUseCase:
+    """保持期間を過ぎた tombstone と冪等性記録を削除する。
+
+    削除はユーザー単位・COMPACTION_BATCH_SIZE 件単位でコミットする。tombstone・
+    変更ログの物理削除と min_valid_cursor / min_valid_sequence の前進、
+    マニフェストの version の加算は同じトランザクションで行うため、削除を
+    取りこぼしたまま差分同期を続けるクライアントや、version で検証する
+    キャッシュ・ETag が古い内容を返すことは生じない。変更ログは tombstone と同じ保持期間で削除する。
+    同時書き込みとの競合で失敗したユーザーはスキップし、次回実行で再処理する。
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        *,
+        tombstone_retention: timedelta | None = None,
+        applied_mutation_retention: timedelta | None = None,
+        batch_size: int = COMPACTION_BATCH_SIZE,
+    ):
+        settings = get_settings()
+        self.session = session
+        if tombstone_retention is None:
+            tombstone_retention = timedelta(days=settings.tombstone_retention_days)
+        if applied_mutation_retention is None:
+            applied_mutation_retention = timedelta(
+                days=settings.applied_mutation_retention_days
+            )
+        self.tombstone_retention = tombstone_retention
+        self.applied_mutation_retention = applied_mutation_retention
+        self.batch_size = batch_size
+
+    def run(self, *, now: datetime | None = None) -> WorkspaceCompactionResult:
+        """全ユーザーを対象にコンパクションを実行し、削除件数を返す。"""
+        now = now or utc_now()
+        tombstone_cutoff = now - self.tombstone_retention
+        mutation_cutoff = now - self.applied_mutation_retention
+        started = perf_counter()
+        result = WorkspaceCompactionResult()
+
+        for user_id in self._users_to_compact(tombstone_cutoff, mutation_cutoff):
+            result.users += 1
+            try:
+                self._compact_user(user_id, tombstone_cutoff, mutation_cutoff, result)
+            except ConflictDetected:
+                result.users_failed += 1
+                log_event(
+                    logger,
+                    logging.WARNING,
+                    "ops.workspace.compaction.user_skipped",
+                    user_id=user_id,
+                )
+
+        log_event(
+            logger,
+            logging.INFO,
+            "ops.workspace.compaction.completed",
+            tombstone_cutoff=tombstone_cutoff.isoformat(),
+            applied_mutation_cutoff=mutation_cutoff.isoformat(),
+            duration_ms=round((perf_counter() - started) * 1000, 2),
+            **asdict(result),
+        )
+        return result
+
+    def _users_to_compact(
+        self, tombstone_cutoff: datetime, mutation_cutoff: datetime
+    ) -> list[str]:
+        """削除対象の行を持つユーザー ID を返す。"""
+        statement = union(
+            select(Note.user_id).where(
+                col(Note.deleted_at).is_not(None), Note.deleted_at < tombstone_cutoff
+            ),
+            select(Folder.user_id).where(
+                col(Folder.deleted_at).is_not(None),
+                Folder.deleted_at < tombstone_cutoff,
+            ),
+            select(AppliedMutation.user_id).where(
+                AppliedMutation.created_at < mutation_cutoff
+            ),
+            select(WorkspaceChangeLogEntry.user_id).where(
+                WorkspaceChangeLogEntry.created_at < tombstone_cutoff
+            ),
+        )
+        return sorted(self.session.exec(statement).scalars().all())
+
+    def _compact_user(
+        self,
+        user_id: str,
+        tombstone_cutoff: datetime,
+        mutation_cutoff: datetime,
+        result: WorkspaceCompactionResult,
+    ) -> None:
+        """1 ユーザー分の変更ログ・tombstone と期限切れミューテーションを削除する。"""
+        horizon_repository = WorkspaceSyncHorizonRepository(self.session, user_id)
+        change_log_repository = WorkspaceChangeLogRepository(self.session, user_id)
+        manifest_repository = WorkspaceManifestRepository(self.session, user_id)
+        while True:
+            deleted, max_sequence = change_log_repository.purge_created_before(
+                tombstone_cutoff, limit=self.batch_size
+            )
+            if not deleted:
+                break
+            horizon_repository.advance_sequence(max_sequence)
+            manifest_repository.record_purge()
+            result.change_log_entries_deleted += deleted
+            commit_with_error_handling(self.session, "WorkspaceCompaction")
+
+        note_repository = NoteRepository(self.session, user_id)
+        while purged := self._purge_tombstones(
+            note_repository, tombstone_cutoff, horizon_repository
+        ):
+            result.notes_deleted += len(purged)
+            result.note_shares_deleted += self._purge_note_shares(purged)
+            manifest_repository.record_purge()
+            commit_with_error_handling(self.session, "WorkspaceCompaction")
+
+        folder_repository = FolderRepository(self.session, user_id)
+        while purged := self._purge_tombstones(
+            folder_repository, tombstone_cutoff, horizon_repository
+        ):
+            result.folders_deleted += len(purged)
+            manifest_repository.record_purge()
+            commit_with_error_handling(self.session, "WorkspaceCompaction")
+
+        mutation_repository = AppliedMutationRepository(self.session, user_id)
+        while deleted := mutation_repository.purge_created_before(
+            mutation_cutoff, limit=self.batch_size
+        ):
+            result.applied_mutations_deleted += deleted
+            commit_with_error_handling(self.session, "WorkspaceCompaction")
+
+    def _purge_tombstones(
+        self,
+        repository: UserScopedRepository,
+        tombstone_cutoff: datetime,
+        horizon_repository: WorkspaceSyncHorizonRepository,
+    ) -> list[UUID]:
+        """tombstone を最大 batch_size 件物理削除し、同期の有効範囲を前進させる。
+
+        変更ログに残っている削除記録（保持期間の境界付近で記録されたもの）も
+        有効範囲外とし、行のない変更を差分で返さないようにする。
+        削除した ID を返す。コミットは呼び出し元が行う。
+        """
+        tombstones = repository.list_expired_tombstones(
+            tombstone_cutoff, limit=self.batch_size
+        )
+        if not tombstones:
+            return []
+        resource_ids = [resource_id for resource_id, _ in tombstones]
+        repository.purge_owned(resource_ids)
+        horizon_repository.advance(max(updated_at for _, updated_at in tombstones))
+        max_sequence = WorkspaceChangeLogRepository(
+            self.session, repository.user_id
+        ).max_sequence_for(resource_ids)
+        if max_sequence is not None:
+            horizon_repository.advance_sequence(max_sequence)
+        return resource_ids
+
+    def _purge_note_shares(self, note_ids: list[UUID]) -> int:
+        """物理削除したノートに紐づく共有トークンを削除し、削除件数を返す。"""
+        result = self.session.exec(
+            delete(NoteShare).where(col(NoteShare.note_id).in_(note_ids))
+        )
+        return result.rowcount
+
+
+def main(argv: list[str] | None = None) -> WorkspaceCompactionResult:
+    """CLI エントリーポイント。保持期間は設定値を既定とし、引数で上書きできる。"""
+    from app.database import create_session
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description="Purge expired workspace tombstones and idempotency records."
+    )
+    parser.add_argument(
+        "--tombstone-retention-days",
+        type=int,
+        default=settings.tombstone_retention_days,
+    )
+    parser.add_argument(
+        "--applied-mutation-retention-days",
+        type=int,
+        default=settings.applied_mutation_retention_days,
+    )
+    parser.add_argument("--batch-size", type=int, default=COMPACTION_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    with create_session() as session:
+        result = WorkspaceCompactionUseCase(
+            session,
+            tombstone_retention=timedelta(days=args.tombstone_retention_days),
+            applied_mutation_retention=timedelta(
+                days=args.applied_mutation_retention_days
+            ),
+            batch_size=args.batch_size,
+        ).run()
+    print(asdict(result))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""非同期ノートエクスポートジョブの作成と取得ユースケース。
+
+責務: NoteExportJob を pending 状態で作成・参照し、完了済みジョブには
+    有効期限付きのダウンロード URL を付けて返す。アーカイブの生成は
+    export_job_runner がワーカー側で行う。
+主要なエクスポート: NoteExportJobUseCases
+呼び出し関係: workspace の notes ルーターから呼ばれ、ExportStorage で
+    ダウンロード URL を発行する。
+"""
+
+from uuid import UUID
+
+from sqlmodel import Session
+
+from app.db_commit import commit_with_error_handling
+from app.features.workspace.export_storage import ExportStorage
+from app.features.workspace.use_cases.note_exports import build_export_filename
+from app.models import NoteExportJob, NoteExportJobRead
+from app.shared import NotFound
+
+
+class NoteExportJobUseCases:
+    """全ノートエクスポートの非同期ジョブの作成と取得を担うユースケース。"""
+
+    def __init__(self, session: Session, user_id: str, storage: ExportStorage):
+        self.session = session
+        self.user_id = user_id
+        self.storage = storage
+
+    def create_job(self) -> NoteExportJob:
+        """pending 状態のエクスポートジョブを永続化して返す。"""
+        job = NoteExportJob(
+            user_id=self.user_id,
+            status="pending",
+            filename=build_export_filename(),
+        )
+        self.session.add(job)
+        commit_with_error_handling(self.session, "NoteExportJob")
+        return job
+
+    def get_job(self, job_id: UUID) -> NoteExportJob:
+        """指定 ID のエクスポートジョブを取得する。所有者でない場合は NotFound を送出。"""
+        job = self.session.get(NoteExportJob, job_id)
+        if job is None or job.user_id != self.user_id:
+            raise NotFound("Export job not found")
+        return job
+
+    def to_read(self, job: NoteExportJob) -> NoteExportJobRead:
+        """ジョブをレスポンススキーマに変換する。完了済みならダウンロード URL を付与する。
+
+        URL はポーリングのたびに発行し直すため、有効期限切れを気にせず再取得できる。
+        """
+        download_url = (
+            self.storage.download_url(job.object_key, job.filename)
+            if job.status == "completed" and job.object_key
+            else None
+        )
+        return NoteExportJobRead.model_validate(
+            job, update={"download_url": download_url}
+        )
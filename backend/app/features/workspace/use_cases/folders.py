@@ -3,7 +3,8 @@
 責務: フォルダの一覧取得・作成・取得・更新・soft delete を担う。
 主要なエクスポート: FolderUseCases
 呼び出し関係: WorkspaceChangesUseCase および直接 REST エンドポイントから
-    呼ばれ、FolderRepository に処理を委譲する。
+    呼ばれ、FolderRepository に処理を委譲する。単一フォルダの書き込みは
+    UnitOfWork.run で 1 トランザクションにまとめる。
 """
 
 import logging
@@ -11,9 +12,17 @@ from uuid import UUID
 
 from sqlmodel import Session
 
+from app.core.unit_of_work import get_unit_of_work
+from app.features.workspace.list_paging import (
+    ListPage,
+    decode_list_cursor,
+    encode_list_cursor,
+    project_rows,
+)
 from app.features.workspace.repositories import FolderRepository, NoteRepository
+from app.features.workspace.use_cases.queries import WorkspaceQueryUseCases
 from app.logging_utils import log_event
-from app.models import Folder, FolderCreate, FolderUpdate
+from app.models import Folder, FolderCreate, FolderRead, FolderUpdate
 
 logger = logging.getLogger(__name__)
 
@@ -24,14 +33,17 @@ class FolderUseCases:
     def __init__(self, session: Session, user_id: str):
         self.repository = FolderRepository(session, user_id)
         self.note_repository = NoteRepository(session, user_id)
+        self.workspace_queries = WorkspaceQueryUseCases(session, user_id)
+        self.unit_of_work = get_unit_of_work(session)
 
-    def list_folders(self) -> list[Folder]:
+    def list_folders(self) -> list[FolderRead]:
         """ユーザーが所有するフォルダを一覧取得する。
 
+        ウォームコンテナ内のメタデータキャッシュ経由で取得する。
         失敗時はエラーログを記録して例外を再送出する。
         """
         try:
-            return self.repository.list()
+            return self.workspace_queries.list_folder_metadata()
         except Exception:
             log_event(
                 logger,
@@ -41,9 +53,42 @@ class FolderUseCases:
             )
             raise
 
+    def list_folders_page(
+        self,
+        *,
+        limit: int | None,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> ListPage:
+        """フォルダ一覧を更新日時の降順でページ単位、または fields の列だけで返す。
+
+        limit を指定した場合は (updated_at, id) のキーセットで 1 ページ分だけを
+        SQL で取得し、続きがあれば next_cursor を返す。limit なしの場合は
+        list_folders と同じくメタデータキャッシュ経由で全件を返す。
+        """
+        next_cursor = None
+        if limit is None:
+            folders = self.workspace_queries.list_folder_metadata()
+        else:
+            folders = self.repository.list_page(
+                limit=limit + 1,
+                after=decode_list_cursor(cursor) if cursor else None,
+                descending=True,
+            )
+            if len(folders) > limit:
+                folders = folders[:limit]
+                next_cursor = encode_list_cursor(folders[-1].updated_at, folders[-1].id)
+        if fields is None:
+            return ListPage(items=folders, next_cursor=next_cursor)
+        return ListPage(
+            items=project_rows(folders, FolderRead, fields), next_cursor=next_cursor
+        )
+
     def create_folder(self, folder_in: FolderCreate) -> Folder:
         """フォルダを新規作成し、監査ログを記録して返す。"""
-        folder = self.repository.create(folder_in)
+        folder = self.unit_of_work.run(
+            lambda: self.repository.create(folder_in), "Folder"
+        )
         log_event(
             logger,
             logging.INFO,
@@ -57,9 +102,24 @@ class FolderUseCases:
         """指定 ID のフォルダを所有者確認付きで取得する。"""
         return self.repository.get_owned(folder_id)
 
-    def update_folder(self, folder_id: UUID, folder_in: FolderUpdate) -> Folder:
-        """フォルダを更新し、変更フィールドを監査ログに記録して返す。"""
-        folder = self.repository.update(folder_id, folder_in)
+    def update_folder(
+        self,
+        folder_id: UUID,
+        folder_in: FolderUpdate,
+        *,
+        expected_version: int | None = None,
+    ) -> Folder:
+        """フォルダを更新し、変更フィールドを監査ログに記録して返す。
+
+        expected_version を指定した場合、現在のバージョンと一致しなければ
+        ConflictDetected を送出する。
+        """
+        folder = self.unit_of_work.run(
+            lambda: self.repository.update(
+                folder_id, folder_in, expected_version=expected_version
+            ),
+            "Folder",
+        )
         log_event(
             logger,
             logging.INFO,
@@ -70,20 +130,31 @@ class FolderUseCases:
         )
         return folder
 
-    def delete_folder(self, folder_id: UUID) -> None:
+    def delete_folder(
+        self, folder_id: UUID, *, expected_version: int | None = None
+    ) -> None:
         """フォルダを soft delete（deleted_at を現在時刻に設定）し、監査ログを記録する。
 
         物理削除は行わず、スナップショット取得時に削除済みとして返される。
         所有者確認のためまずフォルダを soft delete し、その後フォルダに属する
-        未削除ノートの folder_id を解除して「孤立ノート」を防ぐ。
+        未削除ノートの folder_id を解除して「孤立ノート」を防ぐ。ノートの解除は
+        件数が多くなり得るため unit of work に含めず、チャンク単位でコミットする
+        （このため atomic バッチではフォルダの削除を受け付けない）。
+        expected_version を指定した場合、現在のバージョンと一致しなければ
+        ConflictDetected を送出する。
         """
-        self.repository.soft_delete(folder_id)
-        orphaned = self.note_repository.clear_folder(folder_id)
+        self.unit_of_work.run(
+            lambda: self.repository.soft_delete(
+                folder_id, expected_version=expected_version
+            ),
+            "Folder",
+        )
+        orphaned_note_count = self.note_repository.clear_folder(folder_id)
         log_event(
             logger,
             logging.INFO,
             "audit.folder.deleted",
             folder_id=folder_id,
-            orphaned_note_count=len(orphaned),
+            orphaned_note_count=orphaned_note_count,
             outcome="success",
         )
@@ -0,0 +1,66 @@
+"""非同期ノートインポートジョブの作成と取得ユースケース。
+
+責務: アップロードされたアーカイブを検証してオブジェクトストレージへ保存し、
+    NoteImportJob を pending 状態で作成・参照する。取り込み自体は
+    import_job_runner がワーカー側で行う。
+主要なエクスポート: NoteImportJobUseCases
+呼び出し関係: workspace の notes ルーターから呼ばれ、ExportStorage に
+    アーカイブを保存する。
+"""
+
+from uuid import UUID, uuid4
+
+from sqlmodel import Session
+
+from app.config import get_settings
+from app.db_commit import commit_with_error_handling
+from app.features.workspace.export_storage import ExportStorage
+from app.features.workspace.use_cases.note_imports import detect_import_format
+from app.models import NoteImportJob
+from app.shared import NotFound, ValidationFailed
+
+# アップロードされたアーカイブの保存先キーの接頭辞
+IMPORT_KEY_PREFIX = "imports/"
+
+
+class NoteImportJobUseCases:
+    """一括インポートの非同期ジョブの作成と取得を担うユースケース。"""
+
+    def __init__(self, session: Session, user_id: str, storage: ExportStorage):
+        self.session = session
+        self.user_id = user_id
+        self.storage = storage
+
+    def create_job(self, data: bytes) -> NoteImportJob:
+        """アーカイブを保存し、pending 状態のインポートジョブを永続化して返す。
+
+        形式（ZIP / NDJSON）は先頭バイト列から判定する。空の入力や
+        import_max_bytes を超える入力は ValidationFailed を送出する。
+        """
+        max_bytes = get_settings().import_max_bytes
+        if not data:
+            raise ValidationFailed("Import file is empty")
+        if len(data) > max_bytes:
+            raise ValidationFailed(
+                f"Import file size {len(data)} bytes exceeds the maximum of {max_bytes} bytes."
+            )
+
+        import_format = detect_import_format(data)
+        job_id = uuid4()
+        job = NoteImportJob(
+            id=job_id,
+            user_id=self.user_id,
+            format=import_format,
+            object_key=f"{IMPORT_KEY_PREFIX}{self.user_id}/{job_id}.{import_format}",
+        )
+        self.storage.put(job.object_key, data)
+        self.session.add(job)
+        commit_with_error_handling(self.session, "NoteImportJob")
+        return job
+
+    def get_job(self, job_id: UUID) -> NoteImportJob:
+        """指定 ID のインポートジョブを取得する。所有者でない場合は NotFound を送出。"""
+        job = self.session.get(NoteImportJob, job_id)
+        if job is None or job.user_id != self.user_id:
+            raise NotFound("Import job not found")
+        return job
@@ -0,0 +1,62 @@
+"""ワークスペースマニフェスト取得ユースケース。
+
+責務: ユーザーのマニフェスト行を 1 回の主キー読み取りで取得し、
+    WorkspaceManifestResponse を組み立てる。集計が未確定の行はその場で
+    実テーブルから集計して保存する。
+主要なエクスポート: WorkspaceManifestUseCase
+呼び出し関係: manifest エンドポイントから呼ばれ、WorkspaceManifestRepository に
+    読み取りを委譲する。
+"""
+
+import logging
+
+from sqlmodel import Session
+
+from app.db_commit import commit_with_error_handling
+from app.features.workspace.repositories import (
+    WorkspaceManifestRepository,
+    encode_sequence_cursor,
+)
+from app.features.workspace.schemas import WorkspaceManifestResponse
+from app.logging_utils import log_event
+from app.shared import ConflictDetected
+
+logger = logging.getLogger(__name__)
+
+
+class WorkspaceManifestUseCase:
+    """ポーリング用のワークスペースマニフェストを返す。"""
+
+    def __init__(self, session: Session, user_id: str):
+        self.session = session
+        self.user_id = user_id
+        self.manifest_repository = WorkspaceManifestRepository(session, user_id)
+
+    def get_manifest(self) -> WorkspaceManifestResponse:
+        """件数・本文バイト数・最終変更時刻・バージョンを返す。
+
+        cursor はスナップショットと同じシーケンスカーソルで、クライアントが
+        保存済みのカーソルと比較するだけで差分同期の要否を判定できる。
+        集計の保存が同時書き込みと競合した場合は、保存せずに集計値を返す
+        （次回の読み取りで再度集計する）。
+        """
+        manifest = self.manifest_repository.get_or_initialize()
+        response = WorkspaceManifestResponse(
+            version=manifest.version,
+            cursor=encode_sequence_cursor(manifest.version),
+            folder_count=manifest.folder_count or 0,
+            note_count=manifest.note_count or 0,
+            content_bytes=manifest.content_bytes or 0,
+            last_changed_at=manifest.updated_at if manifest.version else None,
+        )
+        if self.session.new or self.session.dirty:
+            try:
+                commit_with_error_handling(self.session, "WorkspaceManifest")
+            except ConflictDetected:
+                log_event(
+                    logger,
+                    logging.WARNING,
+                    "workspace.manifest.initialize_conflict",
+                    user_id=self.user_id,
+                )
+        return response
@@ -1,97 +1,162 @@
 """ノートを ZIP アーカイブとしてエクスポートするユースケース。
 
 責務: ユーザーの全ノートをフォルダ構造を保ったまま Markdown ファイルの
-    ZIP アーカイブとして生成する。
-主要なエクスポート: NoteExportUseCase, NoteExportArchive
-呼び出し関係: workspace ルーターのエクスポートエンドポイントから呼ばれ、
-    NoteRepository および FolderRepository を使用する。
+    ZIP アーカイブとして、送信しながら逐次生成する。
+主要なエクスポート: NoteExportUseCase, NoteExportArchive, build_export_filename,
+    EXPORT_BATCH_SIZE, EXPORT_CHUNK_BYTES
+呼び出し関係: workspace ルーターのエクスポートエンドポイントと非同期エクスポート
+    ジョブのランナーから呼ばれ、NoteRepository を使用する。
 """
 
 import io
 import logging
 import zipfile
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime
 
 from sqlmodel import Session
 
-from app.features.workspace.repositories import FolderRepository, NoteRepository
+from app.features.workspace.repositories import NoteRepository
 from app.logging_utils import log_event
 
 logger = logging.getLogger(__name__)
 
+# 1 回の読み取りで取得するノート数（メモリに同時に載る本文の上限）
+EXPORT_BATCH_SIZE = 500
+# 生成済みの圧縮データをこのサイズ以上溜めたらレスポンスへ送り出す
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def build_export_filename() -> str:
+    """現在時刻入りのエクスポートアーカイブのファイル名を返す。"""
+    return f"notes_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+
 
 @dataclass(frozen=True)
 class NoteExportArchive:
-    """エクスポートした ZIP アーカイブのファイル名とバイナリデータを保持する不変データクラス。"""
+    """エクスポートする ZIP アーカイブのファイル名と、逐次生成されるバイト列。
+
+    chunks は反復したときに初めて DB を読み、ZIP を生成する。
+    """
 
     filename: str
-    data: bytes
+    chunks: Iterator[bytes]
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """ZipFile の書き込み先となるシーク不可の追記バッファ。
+
+    シークできない書き込み先では ZipFile がデータディスクリプタ形式で書き出すため、
+    書き込み済みのデータを取り出して先に送信できる。
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self.size += len(chunk)
+        return len(chunk)
+
+    def drain(self) -> bytes:
+        """溜まっているデータを連結して返し、バッファを空にする。"""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
 
 
 class NoteExportUseCase:
     """現在のユーザーが所有する全ノートの ZIP アーカイブを構築するユースケース。"""
 
     def __init__(self, session: Session, user_id: str):
+        self.session = session
         self.note_repository = NoteRepository(session, user_id)
-        self.folder_repository = FolderRepository(session, user_id)
 
     def export_archive(self) -> NoteExportArchive:
-        """全ノートをフォルダ構造付きの ZIP アーカイブに書き出して返す。"""
-        folders = self.folder_repository.list()
-        folder_map = {folder.id: folder.name for folder in folders}
-        notes = sorted(
-            self.note_repository.list(),
-            key=lambda note: (
-                folder_map.get(note.folder_id, ""),
-                note.title,
-                note.created_at,
-                str(note.id),
-            ),
+        """全ノートをフォルダ構造付きの ZIP アーカイブとして逐次生成する。
+
+        並び順は ID のみを読む 1 回の SQL で決め、本文は EXPORT_BATCH_SIZE 件ずつ
+        主キーで読み込む。圧縮データは EXPORT_CHUNK_BYTES 程度ずつ返すため、
+        本文と圧縮データのメモリ使用量はワークスペースの規模に依存しない
+        （ノート ID と ZIP の中央ディレクトリ用のエントリごとのメタデータのみを保持する）。
+        """
+        return NoteExportArchive(
+            filename=build_export_filename(), chunks=self._generate_archive()
         )
 
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            used_paths: set[str] = set()
-
-            for note in notes:
-                folder_name = folder_map.get(note.folder_id) if note.folder_id else None
-                folder_path = (
-                    self._sanitize_export_segment(folder_name) if folder_name else ""
-                )
-
-                title = note.title.strip() if note.title else "Untitled"
-                base_filename = self._sanitize_export_segment(title) or "Untitled"
-
-                rel_path = (
-                    f"{folder_path}/{base_filename}.md"
-                    if folder_path
-                    else f"{base_filename}.md"
-                )
-                counter = 1
-                # 同名ファイルの衝突を連番サフィックスで回避する
-                while rel_path in used_paths:
-                    new_filename = f"{base_filename} ({counter})"
-                    rel_path = (
-                        f"{folder_path}/{new_filename}.md"
-                        if folder_path
-                        else f"{new_filename}.md"
-                    )
-                    counter += 1
-
-                used_paths.add(rel_path)
-                zip_file.writestr(rel_path, note.content)
-
-        filename = f"notes_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    def _generate_archive(self) -> Iterator[bytes]:
+        """ZIP アーカイブのバイト列をチャンク単位で生成する。"""
+        buffer = _ZipStreamBuffer()
+        used_paths: set[str] = set()
+        folder_names: set[str] = set()
+        note_count = 0
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for folder_name, title, content in self._iter_notes():
+                if folder_name:
+                    folder_names.add(folder_name)
+                rel_path = self._unique_path(folder_name, title, used_paths)
+                zip_file.writestr(rel_path, content or "")
+                note_count += 1
+                if buffer.size >= EXPORT_CHUNK_BYTES:
+                    yield buffer.drain()
+        yield buffer.drain()
         log_event(
             logger,
             logging.INFO,
             "audit.notes.exported",
-            note_count=len(notes),
-            folder_count=len(folders),
+            note_count=note_count,
+            folder_count=len(folder_names),
             outcome="success",
         )
-        return NoteExportArchive(filename=filename, data=zip_buffer.getvalue())
+
+    def _iter_notes(self) -> Iterator[tuple[str, str, str]]:
+        """(フォルダ名, タイトル, 本文) をフォルダ名・タイトル順に返す。
+
+        バッチごとに読み取りトランザクションを終了し、ダウンロードが長引いても
+        DSQL のトランザクション最大継続時間に達しないようにする。並び順の取得後に
+        削除されたノートは含めない。
+        """
+        note_ids = self.note_repository.list_export_order()
+        self.session.rollback()
+        for start in range(0, len(note_ids), EXPORT_BATCH_SIZE):
+            batch = note_ids[start : start + EXPORT_BATCH_SIZE]
+            rows = self.note_repository.list_export_rows(batch)
+            self.session.rollback()
+            for note_id in batch:
+                if note_id in rows:
+                    yield rows[note_id]
+
+    def _unique_path(self, folder_name: str, title: str, used_paths: set[str]) -> str:
+        """ノートの ZIP 内パスを返す。同名ファイルの衝突は連番サフィックスで回避する。"""
+        folder_path = self._sanitize_export_segment(folder_name) if folder_name else ""
+        title = title.strip() if title else "Untitled"
+        base_filename = self._sanitize_export_segment(title) or "Untitled"
+
+        rel_path = (
+            f"{folder_path}/{base_filename}.md"
+            if folder_path
+            else f"{base_filename}.md"
+        )
+        counter = 1
+        while rel_path in used_paths:
+            new_filename = f"{base_filename} ({counter})"
+            rel_path = (
+                f"{folder_path}/{new_filename}.md"
+                if folder_path
+                else f"{new_filename}.md"
+            )
+            counter += 1
+
+        used_paths.add(rel_path)
+        return rel_path
 
     @staticmethod
     def _sanitize_export_segment(value: str) -> str:
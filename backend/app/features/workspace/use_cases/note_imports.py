@@ -0,0 +1,264 @@
+"""ノートを ZIP アーカイブ / NDJSON から一括インポートするユースケース。
+
+責務: NoteExportUseCase が生成するのと同じ構成の Markdown ZIP アーカイブ、
+    または 1 行 1 ノートの NDJSON（gzip 圧縮可）を解析し、フォルダとノートを
+    DSQL のトランザクション上限に収まるバッチ単位でまとめて作成する。
+主要なエクスポート: NoteImportUseCase, ImportedNote, ParsedImport,
+    parse_import_archive, detect_import_format, IMPORT_BATCH_SIZE,
+    IMPORT_BATCH_MAX_BYTES, IMPORT_MAX_UNCOMPRESSED_BYTES
+呼び出し関係: 非同期インポートジョブのランナーから呼ばれ、NoteRepository /
+    FolderRepository の insert_many を使用する。
+"""
+
+import gzip
+import io
+import json
+import logging
+import zipfile
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+
+from sqlmodel import Session
+
+from app.core.persistence import BULK_WRITE_CHUNK_SIZE, staged_writes
+from app.db_commit import commit_with_error_handling
+from app.features.workspace.repositories import FolderRepository, NoteRepository
+from app.logging_utils import log_event
+from app.models import Folder, Note
+from app.shared import ValidationFailed
+
+logger = logging.getLogger(__name__)
+
+# 1 トランザクションで作成する行数の上限。変更ログも同数追記されるため、
+# DSQL のトランザクションあたりの行数制限に対して余裕を持たせる。
+IMPORT_BATCH_SIZE = BULK_WRITE_CHUNK_SIZE
+# 1 トランザクションで書き込む本文の合計バイト数の上限（DSQL の上限は 10 MiB）
+IMPORT_BATCH_MAX_BYTES = 4 * 1024 * 1024
+# 展開後の合計サイズの上限（圧縮爆弾でワーカーのメモリを使い切らないため）
+IMPORT_MAX_UNCOMPRESSED_BYTES = 100 * 1024 * 1024
+# ZIP 内でノートとして取り込むファイルの拡張子
+IMPORT_NOTE_SUFFIXES = (".md", ".markdown", ".txt")
+# タイトル・フォルダ名の最大長（モデルの max_length と一致させる）
+_NAME_MAX_LENGTH = 255
+
+
+@dataclass(frozen=True)
+class ImportedNote:
+    """取り込むノート 1 件分。folder_name が None のノートはフォルダに属さない。"""
+
+    folder_name: str | None
+    title: str
+    content: str
+
+
+@dataclass(frozen=True)
+class ParsedImport:
+    """解析済みの取り込み対象ノートと、取り込み対象外として読み飛ばしたファイル数。"""
+
+    notes: list[ImportedNote]
+    skipped_count: int = 0
+
+
+def detect_import_format(data: bytes) -> str:
+    """先頭バイト列から入力形式を判定する。ZIP 以外は NDJSON として扱う。"""
+    if data[:4] in (b"PK\x03\x04", b"PK\x05\x06"):
+        return "zip"
+    return "ndjson"
+
+
+def parse_import_archive(data: bytes, import_format: str) -> ParsedImport:
+    """アップロードされたアーカイブを解析する。不正な入力は ValidationFailed を送出する。
+
+    すべての行・エントリを書き込み前に検証するため、不正な入力では何も作成しない。
+    """
+    if import_format == "zip":
+        return _parse_zip(data)
+    return _parse_ndjson(data)
+
+
+def _parse_zip(data: bytes) -> ParsedImport:
+    """エクスポートと同じ「フォルダ名/タイトル.md」構成の ZIP を解析する。
+
+    ルート直下のファイルはフォルダなし、より深い階層はディレクトリパスを
+    そのままフォルダ名とする。Markdown/テキスト以外と隠しファイルは読み飛ばす。
+    """
+    try:
+        zip_file = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile as exc:
+        raise ValidationFailed("Import archive is not a valid ZIP file") from exc
+
+    notes: list[ImportedNote] = []
+    skipped_count = 0
+    with zip_file:
+        entries = [info for info in zip_file.infolist() if not info.is_dir()]
+        if sum(info.file_size for info in entries) > IMPORT_MAX_UNCOMPRESSED_BYTES:
+            raise ValidationFailed("Import archive is too large when uncompressed")
+        for info in entries:
+            path = PurePosixPath(info.filename)
+            if path.suffix.lower() not in IMPORT_NOTE_SUFFIXES or any(
+                part.startswith(".") or part == "__MACOSX" for part in path.parts
+            ):
+                skipped_count += 1
+                continue
+            notes.append(
+                ImportedNote(
+                    folder_name=_normalize_name("/".join(path.parts[:-1])) or None,
+                    title=_normalize_name(path.stem),
+                    content=zip_file.read(info).decode("utf-8-sig", errors="replace"),
+                )
+            )
+    return ParsedImport(notes=notes, skipped_count=skipped_count)
+
+
+def _parse_ndjson(data: bytes) -> ParsedImport:
+    """{"title", "content", "folder"} を 1 行 1 件で並べた NDJSON を解析する。"""
+    if data[:2] == b"\x1f\x8b":
+        with gzip.GzipFile(fileobj=io.BytesIO(data)) as stream:
+            try:
+                data = stream.read(IMPORT_MAX_UNCOMPRESSED_BYTES + 1)
+            except (OSError, EOFError) as exc:
+                raise ValidationFailed("Import file is not valid gzip") from exc
+        if len(data) > IMPORT_MAX_UNCOMPRESSED_BYTES:
+            raise ValidationFailed("Import file is too large when uncompressed")
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise ValidationFailed("Import file must be UTF-8 encoded NDJSON") from exc
+
+    notes: list[ImportedNote] = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValidationFailed(f"Line {line_number}: invalid JSON") from exc
+        if not isinstance(record, dict):
+            raise ValidationFailed(f"Line {line_number}: expected a JSON object")
+        title = record.get("title") or ""
+        content = record.get("content") or ""
+        folder_name = record.get("folder") or ""
+        if not all(isinstance(value, str) for value in (title, content, folder_name)):
+            raise ValidationFailed(
+                f"Line {line_number}: title, content and folder must be strings"
+            )
+        notes.append(
+            ImportedNote(
+                folder_name=_normalize_name(folder_name) or None,
+                title=_normalize_name(title),
+                content=content,
+            )
+        )
+    return ParsedImport(notes=notes)
+
+
+def _normalize_name(value: str) -> str:
+    """前後の空白を除き、モデルの最大長に切り詰める。"""
+    return value.strip()[:_NAME_MAX_LENGTH]
+
+
+class NoteImportUseCase:
+    """解析済みのノートを現在のユーザーのワークスペースへ一括作成するユースケース。"""
+
+    def __init__(self, session: Session, user_id: str):
+        self.session = session
+        self.user_id = user_id
+        self.note_repository = NoteRepository(session, user_id)
+        self.folder_repository = FolderRepository(session, user_id)
+
+    def import_notes(
+        self,
+        notes: Sequence[ImportedNote],
+        *,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> tuple[int, int]:
+        """フォルダとノートをバッチ単位で作成し、(作成フォルダ数, 作成ノート数) を返す。
+
+        同名の未削除フォルダがあれば再利用する。1 バッチを 1 トランザクションとして
+        コミットし、その直前に on_progress(作成フォルダ数, 作成ノート数) を呼ぶ。
+        呼び出し元は同じセッションで進捗を書き込むことで、作成済みの件数と
+        原子的に一致させられる。
+        """
+        folder_ids = {
+            folder.name: folder.id for folder in reversed(self.folder_repository.list())
+        }
+        new_folders = [
+            Folder(name=name, user_id=self.user_id)
+            for name in dict.fromkeys(
+                note.folder_name for note in notes if note.folder_name
+            )
+            if name not in folder_ids
+        ]
+        folder_ids.update((folder.name, folder.id) for folder in new_folders)
+
+        folder_count = 0
+        for start in range(0, len(new_folders), IMPORT_BATCH_SIZE):
+            batch = new_folders[start : start + IMPORT_BATCH_SIZE]
+            with staged_writes(self.session):
+                folder_count += self.folder_repository.insert_many(batch)
+            self._commit_batch(on_progress, folder_count, 0, "Folder")
+
+        note_count = 0
+        for batch in self._note_batches(notes):
+            with staged_writes(self.session):
+                note_count += self.note_repository.insert_many(
+                    [
+                        Note(
+                            title=note.title,
+                            content=note.content,
+                            folder_id=folder_ids.get(note.folder_name)
+                            if note.folder_name
+                            else None,
+                            user_id=self.user_id,
+                        )
+                        for note in batch
+                    ]
+                )
+            self._commit_batch(on_progress, folder_count, note_count, "Note")
+
+        log_event(
+            logger,
+            logging.INFO,
+            "audit.notes.imported",
+            note_count=note_count,
+            folder_count=folder_count,
+            outcome="success",
+        )
+        return folder_count, note_count
+
+    def _commit_batch(
+        self,
+        on_progress: Callable[[int, int], None] | None,
+        folder_count: int,
+        note_count: int,
+        resource_name: str,
+    ) -> None:
+        """進捗を通知してから 1 バッチ分の書き込みをコミットする。"""
+        if on_progress is not None:
+            on_progress(folder_count, note_count)
+        commit_with_error_handling(self.session, resource_name)
+
+    @staticmethod
+    def _note_batches(
+        notes: Sequence[ImportedNote],
+    ) -> Iterator[Sequence[ImportedNote]]:
+        """件数 IMPORT_BATCH_SIZE・本文 IMPORT_BATCH_MAX_BYTES を超えないバッチに分ける。
+
+        1 件で上限を超える本文は単独のバッチにする。
+        """
+        batch: list[ImportedNote] = []
+        batch_bytes = 0
+        for note in notes:
+            size = len(note.content.encode())
+            if batch and (
+                len(batch) >= IMPORT_BATCH_SIZE
+                or batch_bytes + size > IMPORT_BATCH_MAX_BYTES
+            ):
+                yield batch
+                batch = []
+                batch_bytes = 0
+            batch.append(note)
+            batch_bytes += size
+        if batch:
+            yield batch
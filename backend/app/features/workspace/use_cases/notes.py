@@ -1,19 +1,41 @@
 """ノートの CRUD アプリケーションユースケース。
 
-責務: ノートの一覧取得・作成・取得・更新・soft delete を担う。
+責務: ノートの一覧取得・作成・取得・更新・soft delete と、一括移動・一括削除を担う。
 主要なエクスポート: NoteUseCases
 呼び出し関係: WorkspaceChangesUseCase および直接 REST エンドポイントから
-    呼ばれ、NoteRepository に処理を委譲する。
+    呼ばれ、NoteRepository に処理を委譲する。単一ノートの書き込みは
+    UnitOfWork.run で 1 トランザクションにまとめ、コミット後に
+    NoteSearchUseCase で検索インデックスを追従させる。
 """
 
 import logging
+from datetime import datetime
 from uuid import UUID
 
 from sqlmodel import Session
 
-from app.features.workspace.repositories import NoteRepository
+from app.core.unit_of_work import get_unit_of_work, writes_are_staged
+from app.features.workspace.list_paging import (
+    ListPage,
+    decode_list_cursor,
+    encode_list_cursor,
+    project_rows,
+)
+from app.features.workspace.repositories import FolderRepository, NoteRepository
+from app.features.workspace.schemas import (
+    NoteBodiesRequest,
+    NoteBodiesResponse,
+    NoteBody,
+    NoteBulkDeleteRequest,
+    NoteBulkMoveRequest,
+    NoteBulkResponse,
+)
+from app.features.workspace.use_cases.search import (
+    SEARCH_REFRESH_MAX_NOTES,
+    NoteSearchUseCase,
+)
 from app.logging_utils import log_event
-from app.models import Note, NoteCreate, NoteUpdate
+from app.models import Note, NoteCreate, NoteMetadataRead, NoteRead, NoteUpdate
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +45,9 @@ class NoteUseCases:
 
     def __init__(self, session: Session, user_id: str):
         self.repository = NoteRepository(session, user_id)
+        self.folder_repository = FolderRepository(session, user_id)
+        self.unit_of_work = get_unit_of_work(session)
+        self.search_use_case = NoteSearchUseCase(session, user_id)
 
     def list_notes(self, folder_id: UUID | None = None) -> list[Note]:
         """ユーザーが所有するノートを一覧取得する。
@@ -42,9 +67,46 @@ class NoteUseCases:
             )
             raise
 
+    def list_notes_page(
+        self,
+        folder_id: UUID | None = None,
+        *,
+        limit: int | None,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> ListPage:
+        """ノート一覧を更新日時の降順でページ単位、または fields の列だけで返す。
+
+        limit を指定した場合は (updated_at, id) のキーセットで 1 ページ分だけを
+        SQL で取得し、続きがあれば next_cursor を返す。fields を指定した場合は
+        その列だけの dict を返し、content を含まなければ本文を DB から読み込まない。
+        """
+        metadata_only = fields is not None and "content" not in fields
+        if limit is None:
+            notes = self.repository.list(folder_id, metadata_only=metadata_only)
+            next_cursor = None
+        else:
+            notes = self.repository.list_page(
+                limit=limit + 1,
+                after=decode_list_cursor(cursor) if cursor else None,
+                metadata_only=metadata_only,
+                descending=True,
+                filters={"folder_id": folder_id} if folder_id is not None else None,
+            )
+            next_cursor = None
+            if len(notes) > limit:
+                notes = notes[:limit]
+                next_cursor = encode_list_cursor(notes[-1].updated_at, notes[-1].id)
+        if fields is None:
+            return ListPage(items=notes, next_cursor=next_cursor)
+        read_model = NoteMetadataRead if metadata_only else NoteRead
+        return ListPage(
+            items=project_rows(notes, read_model, fields), next_cursor=next_cursor
+        )
+
     def create_note(self, note_in: NoteCreate) -> Note:
         """ノートを新規作成し、監査ログを記録して返す。"""
-        note = self.repository.create(note_in)
+        note = self.unit_of_work.run(lambda: self.repository.create(note_in), "Note")
         log_event(
             logger,
             logging.INFO,
@@ -53,15 +115,48 @@ class NoteUseCases:
             folder_id=note.folder_id,
             outcome="success",
         )
+        self.refresh_search_index()
         return note
 
     def get_note(self, note_id: UUID) -> Note:
         """指定 ID のノートを所有者確認付きで取得する。"""
         return self.repository.get_owned(note_id)
 
-    def update_note(self, note_id: UUID, note_in: NoteUpdate) -> Note:
-        """ノートを更新し、変更フィールドを監査ログに記録して返す。"""
-        note = self.repository.update(note_id, note_in)
+    def get_note_version_marker(self, note_id: UUID) -> tuple[int, datetime]:
+        """本文を読み込まずにノートの (version, updated_at) を返す。"""
+        return self.repository.get_version_marker(note_id)
+
+    def get_note_bodies(self, request: NoteBodiesRequest) -> NoteBodiesResponse:
+        """指定ノートのうち、known_version から変化した本文のみを返す。
+
+        同一 ID が複数指定された場合は最後の指定を採用する。
+        """
+        known_versions = {item.id: item.known_version for item in request.notes}
+        notes = self.repository.list_changed_bodies(known_versions)
+        return NoteBodiesResponse(
+            bodies=[
+                NoteBody.model_validate(note, from_attributes=True) for note in notes
+            ]
+        )
+
+    def update_note(
+        self,
+        note_id: UUID,
+        note_in: NoteUpdate,
+        *,
+        expected_version: int | None = None,
+    ) -> Note:
+        """ノートを更新し、変更フィールドを監査ログに記録して返す。
+
+        expected_version を指定した場合、現在のバージョンと一致しなければ
+        ConflictDetected を送出する。
+        """
+        note = self.unit_of_work.run(
+            lambda: self.repository.update(
+                note_id, note_in, expected_version=expected_version
+            ),
+            "Note",
+        )
         log_event(
             logger,
             logging.INFO,
@@ -70,14 +165,24 @@ class NoteUseCases:
             changed_fields=sorted(note_in.model_dump(exclude_unset=True).keys()),
             outcome="success",
         )
+        self.refresh_search_index()
         return note
 
-    def delete_note(self, note_id: UUID) -> None:
+    def delete_note(
+        self, note_id: UUID, *, expected_version: int | None = None
+    ) -> None:
         """ノートを soft delete（deleted_at を現在時刻に設定）し、監査ログを記録する。
 
         物理削除は行わず、スナップショット取得時に削除済みとして返される。
+        expected_version を指定した場合、現在のバージョンと一致しなければ
+        ConflictDetected を送出する。
         """
-        self.repository.soft_delete(note_id)
+        self.unit_of_work.run(
+            lambda: self.repository.soft_delete(
+                note_id, expected_version=expected_version
+            ),
+            "Note",
+        )
         log_event(
             logger,
             logging.INFO,
@@ -85,3 +190,48 @@ class NoteUseCases:
             note_id=note_id,
             outcome="success",
         )
+        self.refresh_search_index()
+
+    def bulk_move_notes(self, request: NoteBulkMoveRequest) -> NoteBulkResponse:
+        """指定ノートをまとめてフォルダへ移動し、監査ログを記録する。
+
+        移動先フォルダが存在しない・削除済み・他ユーザー所有の場合は NotFound を
+        送出する。
+        """
+        if request.folder_id is not None:
+            self.folder_repository.get_owned(request.folder_id)
+        updated = self.repository.bulk_move(request.note_ids, request.folder_id)
+        log_event(
+            logger,
+            logging.INFO,
+            "audit.note.bulk_moved",
+            folder_id=request.folder_id,
+            requested_count=len(request.note_ids),
+            updated_count=updated,
+            outcome="success",
+        )
+        return NoteBulkResponse(updated=updated)
+
+    def bulk_delete_notes(self, request: NoteBulkDeleteRequest) -> NoteBulkResponse:
+        """指定ノートをまとめて soft delete し、監査ログを記録する。"""
+        updated = self.repository.bulk_soft_delete(request.note_ids)
+        log_event(
+            logger,
+            logging.INFO,
+            "audit.note.bulk_deleted",
+            requested_count=len(request.note_ids),
+            updated_count=updated,
+            outcome="success",
+        )
+        self.refresh_search_index()
+        return NoteBulkResponse(updated=updated)
+
+    def refresh_search_index(self) -> None:
+        """コミット済みの書き込みを変更ログから検索インデックスへ反映する。
+
+        unit of work の内側やステージング中はまだコミットされていないため何もせず、
+        外側の呼び出し元がコミット後に改めて呼び出す。
+        """
+        if self.unit_of_work.active or writes_are_staged(self.unit_of_work.session):
+            return
+        self.search_use_case.refresh_index(max_notes=SEARCH_REFRESH_MAX_NOTES)
@@ -1,27 +1,40 @@
 """ワークスペースの読み取り専用クエリユースケース。
 
 責務: 同一フィーチャーおよびクロスフィーチャーから利用される
-    ユーザー所有リソースへの読み取りアクセスを提供する。
+    ユーザー所有リソースへの読み取りアクセスを提供する。フォルダ・ノートの
+    メタデータ一覧はウォームコンテナ内のキャッシュ経由で返す。
 主要なエクスポート: WorkspaceQueryUseCases
 呼び出し関係: share/use_cases.py・assistant ユースケース等のクロスフィーチャー呼び出しと、
     ワークスペース自身のルーターから利用される。
 """
 
+from collections.abc import Sequence
 from datetime import datetime
 from uuid import UUID
 
 from sqlmodel import Session
 
-from app.features.workspace.repositories import FolderRepository, NoteRepository
-from app.models import Folder, Note
+from app.features.workspace.metadata_cache import (
+    CachedWorkspace,
+    workspace_metadata_cache,
+)
+from app.features.workspace.repositories import (
+    FolderRepository,
+    NoteRepository,
+    WorkspaceManifestRepository,
+)
+from app.models import Folder, FolderRead, Note, NoteMetadataRead
 
 
 class WorkspaceQueryUseCases:
     """同一フィーチャー・クロスフィーチャー両用の読み取り専用ワークスペースアクセス。"""
 
     def __init__(self, session: Session, user_id: str):
+        self.session = session
+        self.user_id = user_id
         self.note_repository = NoteRepository(session, user_id)
         self.folder_repository = FolderRepository(session, user_id)
+        self.manifest_repository = WorkspaceManifestRepository(session, user_id)
 
     def get_owned_note(self, note_id: UUID) -> Note:
         """ユーザーが所有するノートを取得する。存在しない場合は NotFound を送出。"""
@@ -45,6 +58,42 @@ class WorkspaceQueryUseCases:
             include_deleted=include_deleted, updated_after=updated_after
         )
 
+    def list_folder_metadata(
+        self,
+        *,
+        include_deleted: bool = False,
+        updated_after: datetime | None = None,
+    ) -> list[FolderRead]:
+        """list_folders と同じ条件のフォルダ一覧をメタデータキャッシュ経由で返す。
+
+        ワークスペースのバージョンマーカーが前回取得時と一致すれば DB の全件読み込みを
+        省略する。返す FolderRead はリクエスト間で共有されるため変更してはならない。
+        """
+        cached = self._cached_workspace()
+        return [
+            folder
+            for folder in cached.folders
+            if self._matches(folder, include_deleted, updated_after)
+        ]
+
+    def list_note_metadata(
+        self,
+        *,
+        include_deleted: bool = False,
+        updated_after: datetime | None = None,
+    ) -> list[NoteMetadataRead]:
+        """本文を除いたノート一覧をメタデータキャッシュ経由で返す。
+
+        条件と並び順は list_all_notes(metadata_only=True) と同じ。返す
+        NoteMetadataRead はリクエスト間で共有されるため変更してはならない。
+        """
+        cached = self._cached_workspace()
+        return [
+            note
+            for note in cached.notes
+            if self._matches(note, include_deleted, updated_after)
+        ]
+
     def list_folder_notes(self, folder_id: UUID) -> list[Note]:
         """指定フォルダ内のノート一覧を返す。"""
         return self.note_repository.list(folder_id)
@@ -54,11 +103,110 @@ class WorkspaceQueryUseCases:
         *,
         include_deleted: bool = False,
         updated_after: datetime | None = None,
+        metadata_only: bool = False,
     ) -> list[Note]:
         """全ノート一覧を返す。
 
         include_deleted で削除済みの包含を、updated_after で差分同期の起点時刻を制御する。
+        metadata_only=True の場合は本文を読み込まない。
         """
         return self.note_repository.list(
-            include_deleted=include_deleted, updated_after=updated_after
+            include_deleted=include_deleted,
+            updated_after=updated_after,
+            metadata_only=metadata_only,
         )
+
+    def list_folders_by_ids(self, folder_ids: Sequence[UUID]) -> list[Folder]:
+        """指定 ID のフォルダ（削除済み含む）を updated_at, id の降順で返す。"""
+        return self.folder_repository.list_by_ids(folder_ids)
+
+    def list_notes_by_ids(
+        self, note_ids: Sequence[UUID], *, metadata_only: bool = False
+    ) -> list[Note]:
+        """指定 ID のノート（削除済み含む）を updated_at, id の降順で返す。
+
+        metadata_only=True の場合は本文を読み込まない。
+        """
+        return self.note_repository.list_by_ids(note_ids, metadata_only=metadata_only)
+
+    def list_folders_page(
+        self,
+        *,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        include_deleted: bool = False,
+        updated_after: datetime | None = None,
+        folder_ids: Sequence[UUID] | None = None,
+    ) -> list[Folder]:
+        """フォルダを (updated_at, id) 昇順のキーセットページングで 1 ページ分返す。
+
+        folder_ids を指定した場合はその ID のフォルダのみを対象にする。
+        """
+        return self.folder_repository.list_page(
+            limit=limit,
+            after=after,
+            include_deleted=include_deleted,
+            updated_after=updated_after,
+            resource_ids=folder_ids,
+        )
+
+    def list_notes_page(
+        self,
+        *,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        include_deleted: bool = False,
+        updated_after: datetime | None = None,
+        note_ids: Sequence[UUID] | None = None,
+        metadata_only: bool = False,
+    ) -> list[Note]:
+        """ノートを (updated_at, id) 昇順のキーセットページングで 1 ページ分返す。
+
+        note_ids を指定した場合はその ID のノートのみを対象にする。
+        """
+        return self.note_repository.list_page(
+            limit=limit,
+            after=after,
+            include_deleted=include_deleted,
+            updated_after=updated_after,
+            resource_ids=note_ids,
+            metadata_only=metadata_only,
+        )
+
+    def workspace_version_marker(self) -> tuple:
+        """ワークスペース全体の変更検知用マーカーを返す。
+
+        マニフェストの version は全コンテナのフォルダ・ノート書き込みと同じ
+        トランザクションで加算されるため、主キーによる 1 行の読み取りで
+        他コンテナからの書き込みも検出できる。
+        """
+        return (self.manifest_repository.current_version(),)
+
+    def _cached_workspace(self) -> CachedWorkspace:
+        """マーカーで検証したキャッシュエントリを返す。ミス時は DB から再構築する。"""
+        marker = self.workspace_version_marker()
+        cached = workspace_metadata_cache.get(self.user_id, marker)
+        if cached is not None:
+            return cached
+        folders = [
+            FolderRead.model_validate(folder)
+            for folder in self.folder_repository.list(include_deleted=True)
+        ]
+        notes = [
+            NoteMetadataRead.model_validate(note)
+            for note in self.note_repository.list(
+                include_deleted=True, metadata_only=True
+            )
+        ]
+        return workspace_metadata_cache.put(self.user_id, marker, folders, notes)
+
+    @staticmethod
+    def _matches(
+        resource: FolderRead | NoteMetadataRead,
+        include_deleted: bool,
+        updated_after: datetime | None,
+    ) -> bool:
+        """キャッシュ済みの行がリポジトリの一覧条件を満たすかを返す。"""
+        if not include_deleted and resource.deleted_at is not None:
+            return False
+        return updated_after is None or resource.updated_at > updated_after
@@ -0,0 +1,335 @@
+"""ノート全文検索ユースケース。
+
+責務: ユーザーごとの転置インデックスを変更ログに追従させ、クエリのトークンの
+    ポスティングリストから BM25 でノートを順位付けし、スニペットとハイライトを
+    付けて返す。検索自体はインデックスを読み取るだけで書き込まない。
+主要なエクスポート: NoteSearchUseCase, refresh_stale_search_indexes,
+    SEARCH_REFRESH_MAX_NOTES, INDEX_BATCH_MAX_ROWS
+呼び出し関係: search エンドポイントから呼ばれる。インデックスの追従は
+    NoteUseCases / WorkspaceChangesUseCase が書き込みのコミット後に、
+    インポートジョブのランナーが取り込み後に、Worker Lambda のスケジュール
+    起動が追従の遅れたユーザーに対して行う。インデックスの読み書きは
+    NoteSearchIndexRepository、変更されたノートの特定は
+    WorkspaceChangeLogRepository に委譲する。
+"""
+
+import heapq
+import logging
+import math
+from collections import defaultdict
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlmodel import Session, col, exists, or_, select, union
+
+from app.core.persistence import utc_now
+from app.db_commit import commit_with_error_handling
+from app.features.workspace.repositories import (
+    NoteRepository,
+    NoteSearchIndexRepository,
+    WorkspaceChangeLogRepository,
+    WorkspaceSyncHorizonRepository,
+)
+from app.features.workspace.schemas import NoteSearchHit, NoteSearchResponse
+from app.features.workspace.search_text import (
+    build_snippet,
+    document_terms,
+    tokenize,
+)
+from app.logging_utils import log_event
+from app.models import Note, NoteSearchState, WorkspaceManifest
+from app.shared import ConflictDetected
+
+logger = logging.getLogger(__name__)
+
+# BM25 のパラメータ
+BM25_K1 = 1.2
+BM25_B = 0.75
+# ノートの書き込みに続けて 1 回でインデックスに反映するノート数の上限。変更ログの
+# 追従はふつう書き込んだノートだけで済む。変更ログより前から存在するノートの
+# 走査は書き込みやスケジュール実行のたびに少しずつ進め、書き込みのレイテンシを
+# 一定に保つ。
+SEARCH_REFRESH_MAX_NOTES = 200
+# 1 トランザクションで書き込むインデックス行数（ポスティングの削除と追加）の目安。
+# DSQL のトランザクションあたりの行数上限（3,000 行）に収める。
+INDEX_BATCH_MAX_ROWS = 2500
+# 変更ログを 1 回に読み取るシーケンス幅と、全ノート走査で 1 回に読み込むノート数
+INDEX_LOG_WINDOW = 500
+INDEX_SCAN_CHUNK = 200
+# クエリから使用するトークン数の上限
+MAX_QUERY_TERMS = 16
+
+
+class NoteSearchUseCase:
+    """現在のユーザーのノートを全文検索する。"""
+
+    def __init__(self, session: Session, user_id: str):
+        self.session = session
+        self.user_id = user_id
+        self.index_repository = NoteSearchIndexRepository(session, user_id)
+        self.note_repository = NoteRepository(session, user_id)
+        self.change_log_repository = WorkspaceChangeLogRepository(session, user_id)
+        self.horizon_repository = WorkspaceSyncHorizonRepository(session, user_id)
+
+    def search(self, query: str, *, limit: int) -> NoteSearchResponse:
+        """query のすべてのトークンを含むノートを BM25 スコアの降順で最大 limit 件返す。
+
+        インデックスは書き込み側で追従させるため、ここでは読み取りのみを行う。
+        スコアの計算はポスティングのみで行い、本文は返却する上位 limit 件の
+        スニペット生成のためにだけ読み込む。
+        """
+        index_complete = self.index_is_current()
+        terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+        if not terms:
+            return NoteSearchResponse(
+                query=query, total=0, items=[], index_complete=index_complete
+            )
+
+        scores = self._score(terms)
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        rows = {
+            note.id: note
+            for note in self.note_repository.list_by_ids(
+                [note_id for note_id, _ in top]
+            )
+            if note.deleted_at is None
+        }
+        items = []
+        for note_id, score in top:
+            note = rows.get(note_id)
+            if note is None:
+                continue
+            snippet, highlights = build_snippet(note.content or "", terms)
+            items.append(
+                NoteSearchHit(
+                    id=note.id,
+                    title=note.title or "",
+                    folder_id=note.folder_id,
+                    updated_at=note.updated_at,
+                    score=round(score, 6),
+                    snippet=snippet,
+                    highlights=highlights,
+                )
+            )
+        log_event(
+            logger,
+            logging.INFO,
+            "workspace.search.completed",
+            term_count=len(terms),
+            total=len(scores),
+            returned=len(items),
+            index_complete=index_complete,
+        )
+        return NoteSearchResponse(
+            query=query, total=len(scores), items=items, index_complete=index_complete
+        )
+
+    def _score(self, terms: Sequence[str]) -> dict[UUID, float]:
+        """すべてのトークンを含むノートの note_id → BM25 スコアを返す。"""
+        state = self.index_repository.get_state()
+        if state is None:
+            return {}
+        document_count = max(state.document_count, 1)
+        average_length = max(state.total_length / document_count, 1.0)
+
+        postings: dict[str, list[tuple[UUID, int, int]]] = defaultdict(list)
+        for token, note_id, frequency, length in self.index_repository.list_postings(
+            terms
+        ):
+            postings[token].append((note_id, frequency, length))
+        if len(postings) < len(terms):
+            return {}
+
+        # 最も短いポスティングリストから候補を絞り込む
+        ordered = sorted(postings.values(), key=len)
+        candidates = {note_id for note_id, _, _ in ordered[0]}
+        for posting_list in ordered[1:]:
+            candidates.intersection_update(note_id for note_id, _, _ in posting_list)
+            if not candidates:
+                return {}
+
+        scores: dict[UUID, float] = dict.fromkeys(candidates, 0.0)
+        for posting_list in ordered:
+            frequency_in_index = len(posting_list)
+            idf = math.log(
+                (document_count - frequency_in_index + 0.5) / (frequency_in_index + 0.5)
+                + 1
+            )
+            for note_id, frequency, length in posting_list:
+                if note_id not in scores:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[note_id] += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+        return scores
+
+    def index_is_current(self) -> bool:
+        """インデックスが変更ログの現在位置まで追従し、走査も完了しているかを返す。"""
+        state = self.index_repository.get_state()
+        return (
+            state is not None
+            and not state.scan_pending
+            and state.indexed_sequence >= self.change_log_repository.current_sequence()
+        )
+
+    def refresh_index(self, *, max_notes: int | None = None) -> bool:
+        """前回以降に変更されたノートをインデックスへ反映する。
+
+        変更ログに記録されたノートを再索引（削除済みなら除去）し、変更ログより
+        前から存在するノートはノート ID 順の走査で索引する。max_notes を指定した
+        場合はおよそその件数で打ち切る。進捗は書き込みと同じトランザクションで
+        状態行に保存するため、中断しても次回は続きから再開する。すべて反映
+        できた場合に True を返す。同時実行と競合した場合は反映を打ち切り
+        False を返す（先に確定した側の進捗が残る）。
+        """
+        try:
+            return self._refresh_index(max_notes)
+        except ConflictDetected:
+            log_event(
+                logger,
+                logging.WARNING,
+                "workspace.search.refresh_conflict",
+                user_id=self.user_id,
+            )
+            return False
+
+    def _refresh_index(self, max_notes: int | None) -> bool:
+        remaining = math.inf if max_notes is None else max_notes
+        up_to = self.change_log_repository.current_sequence()
+        state = self.index_repository.get_state()
+        if state is None:
+            # 初回は変更ログの現在位置から追従し、既存ノートは走査で索引する
+            state = NoteSearchState(user_id=self.user_id, indexed_sequence=up_to)
+        elif state.indexed_sequence < self.horizon_repository.get_min_valid_sequence():
+            # 未反映の変更ログが圧縮で失われたため、全ノートを走査し直す
+            state.indexed_sequence = up_to
+            state.scan_pending = True
+            state.scan_after_id = None
+
+        while state.indexed_sequence < up_to and remaining > 0:
+            window_end = min(state.indexed_sequence + INDEX_LOG_WINDOW, up_to)
+            note_ids = self.change_log_repository.list_changed_ids(
+                after=state.indexed_sequence, up_to=window_end
+            ).note_ids
+            rows = self.note_repository.list_search_rows(note_ids=note_ids)
+            live_ids = {note_id for note_id, _, _ in rows}
+            removed_ids = [note_id for note_id in note_ids if note_id not in live_ids]
+            self._apply(state, rows, removed_ids, indexed_sequence=window_end)
+            remaining -= len(note_ids)
+
+        while state.scan_pending and remaining > 0:
+            after_id = state.scan_after_id
+            rows = self.note_repository.list_search_rows(
+                after_id=after_id, limit=INDEX_SCAN_CHUNK
+            )
+            finished = len(rows) < INDEX_SCAN_CHUNK
+            up_to_id = None if finished else rows[-1][0]
+            live_ids = {note_id for note_id, _, _ in rows}
+            removed_ids = [
+                note_id
+                for note_id in self.index_repository.list_document_ids(
+                    after_id=after_id, up_to_id=up_to_id
+                )
+                if note_id not in live_ids
+            ]
+            self._apply(
+                state,
+                rows,
+                removed_ids,
+                scan_after_id=up_to_id,
+                scan_pending=not finished,
+            )
+            remaining -= len(rows)
+
+        return not state.scan_pending and state.indexed_sequence >= up_to
+
+    def _apply(
+        self,
+        state: NoteSearchState,
+        rows: Sequence[tuple[UUID, str, str]],
+        removed_ids: Sequence[UUID],
+        **progress,
+    ) -> None:
+        """ノートを再索引・除去し、INDEX_BATCH_MAX_ROWS 行ごとにコミットする。
+
+        progress（反映済みシーケンス・走査位置）は最後のトランザクションで
+        状態行に書き込む。途中で中断した場合は同じ範囲を再処理するが、
+        ポスティングの差し替えは冪等なので結果は変わらない。
+        """
+        documents = self.index_repository.get_documents(
+            [note_id for note_id, _, _ in rows] + list(removed_ids)
+        )
+        pending_rows = 0
+        for note_id in removed_ids:
+            document = documents.get(note_id)
+            if document is None:
+                continue
+            pending_rows = self._commit_if_full(
+                state, pending_rows, len(document.terms.split()) + 1
+            )
+            state.document_count -= 1
+            state.total_length -= document.length
+            self.index_repository.delete_document(document)
+
+        for note_id, title, content in rows:
+            terms, length = document_terms(title, content or "")
+            previous = documents.get(note_id)
+            previous_terms = len(previous.terms.split()) if previous else 0
+            pending_rows = self._commit_if_full(
+                state, pending_rows, previous_terms + len(terms) + 1
+            )
+            if previous is None:
+                state.document_count += 1
+            else:
+                state.total_length -= previous.length
+            state.total_length += length
+            self.index_repository.write_document(note_id, terms, length, previous)
+
+        for name, value in progress.items():
+            setattr(state, name, value)
+        self._commit(state)
+
+    def _commit_if_full(
+        self, state: NoteSearchState, pending_rows: int, next_rows: int
+    ) -> int:
+        """次の書き込みで行数の目安を超える場合は先にコミットし、累計行数を返す。"""
+        if pending_rows and pending_rows + next_rows > INDEX_BATCH_MAX_ROWS:
+            self._commit(state)
+            pending_rows = 0
+        return pending_rows + next_rows
+
+    def _commit(self, state: NoteSearchState) -> None:
+        """状態行の集計値とともにインデックスの書き込みをコミットする。"""
+        state.updated_at = utc_now()
+        self.session.add(state)
+        commit_with_error_handling(self.session, "NoteSearchIndex")
+
+
+def refresh_stale_search_indexes(session: Session) -> int:
+    """インデックスが変更ログに追いついていないユーザーを追従させ、人数を返す。
+
+    書き込み後の追従が打ち切られたユーザーや、まだ書き込みのないユーザーの
+    既存ノートを索引する。1 ユーザーあたり SEARCH_REFRESH_MAX_NOTES 件までとし、
+    残りは次回のスケジュール実行で反映する。
+    """
+    state_exists = exists().where(NoteSearchState.user_id == Note.user_id)
+    statement = union(
+        select(NoteSearchState.user_id).where(col(NoteSearchState.scan_pending)),
+        select(WorkspaceManifest.user_id)
+        .outerjoin(
+            NoteSearchState,
+            col(NoteSearchState.user_id) == col(WorkspaceManifest.user_id),
+        )
+        .where(
+            or_(
+                col(NoteSearchState.user_id).is_(None),
+                col(NoteSearchState.indexed_sequence) < WorkspaceManifest.version,
+            )
+        ),
+        select(Note.user_id).where(~state_exists),
+    )
+    user_ids = sorted(session.exec(statement).scalars().all())
+    for user_id in user_ids:
+        NoteSearchUseCase(session, user_id).refresh_index(
+            max_notes=SEARCH_REFRESH_MAX_NOTES
+        )
+    return len(user_ids)
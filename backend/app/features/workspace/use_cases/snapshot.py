@@ -1,78 +1,420 @@
 """ワークスペーススナップショット構築ユースケース。
 
-責務: 全フォルダ・ノート（soft delete 済みを含む）を取得し、
-    カーソルを算出して WorkspaceSnapshotResponse を組み立てる。
-主要なエクスポート: WorkspaceSnapshotUseCase
+責務: 全フォルダ・ノート（soft delete 済みを含む）を取得し、変更ログの
+    シーケンス番号をカーソルとして WorkspaceSnapshotResponse を組み立てる。
+    差分要求は変更ログのシーケンス範囲から変更された ID を引いて読み込む。
+    大規模ワークスペース向けにキーセットページングでの分割取得も提供する。
+    コンパクションで削除された範囲を跨ぐ差分要求には、全件スナップショットと
+    resync_required を返す。
+主要なエクスポート: WorkspaceSnapshotUseCase, SnapshotRows,
+    DEFAULT_SNAPSHOT_PAGE_SIZE, MAX_SNAPSHOT_PAGE_SIZE
 呼び出し関係: snapshot エンドポイントおよび WorkspaceChangesUseCase から
     呼ばれ、WorkspaceQueryUseCases に読み取りを委譲する。
 """
 
+import base64
+import binascii
+import json
 import logging
+from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import Literal
+from uuid import UUID
 
 from sqlmodel import Session
 
-from app.features.workspace.schemas import WorkspaceSnapshotResponse
+from app.features.workspace.repositories import (
+    ChangedEntityIds,
+    WorkspaceChangeLogRepository,
+    WorkspaceSyncHorizonRepository,
+    encode_sequence_cursor,
+    parse_sequence_cursor,
+)
+from app.features.workspace.schemas import (
+    WorkspaceSnapshotMetadataResponse,
+    WorkspaceSnapshotResponse,
+)
 from app.features.workspace.use_cases.queries import WorkspaceQueryUseCases
 from app.logging_utils import log_event
-from app.models import FolderRead, NoteRead
+from app.models import Folder, FolderRead, Note, NoteMetadataRead, NoteRead
+from app.shared import ValidationFailed
 
 logger = logging.getLogger(__name__)
 
+# page_token のみ指定された場合に使用するページサイズ
+DEFAULT_SNAPSHOT_PAGE_SIZE = 500
+# 1 ページで返すフォルダ・ノートの合計件数の上限
+MAX_SNAPSHOT_PAGE_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class SnapshotRows:
+    """スキーマ変換前のスナップショット構成要素。
+
+    folders / notes は ORM 行、またはメタデータキャッシュ上の読み取りモデル
+    （FolderRead / NoteMetadataRead）。いずれも属性名は共通で、読み取り専用として
+    扱う。metadata_only=True の場合、notes の content は参照してはならない。
+    resync_required=True は、要求された差分の起点カーソルがコンパクション済みの
+    範囲より古いため差分ではなく全件を返したことを示す。
+    """
+
+    user_id: str
+    folders: Sequence[Folder | FolderRead]
+    notes: Sequence[Note | NoteMetadataRead]
+    cursor: str
+    server_time: datetime
+    metadata_only: bool = False
+    next_page_token: str | None = None
+    resync_required: bool = False
+
+
+@dataclass(frozen=True)
+class SnapshotPagePosition:
+    """ページングスナップショットの走査位置。page_token にエンコードされる。
+
+    フォルダを先に (updated_at, id) 昇順で走査し、終わったらノートへ進む。
+    cursor は最初のページで確定したシーケンスカーソルを全ページで引き継ぎ、
+    差分のページングではその番号を変更ログの読み取り上限に使う。
+    """
+
+    entity: Literal["folder", "note"]
+    after: tuple[datetime, UUID] | None
+    cursor: str
+
+
+@dataclass(frozen=True)
+class _DeltaScope:
+    """since カーソルから決まるスナップショットの読み取り範囲。
+
+    changed が設定されていればシーケンスカーソルによる差分で、その ID のみを読む。
+    updated_after が設定されていれば旧形式（ISO 8601）カーソルによる差分。
+    いずれも None なら全件を読む。
+    """
+
+    changed: ChangedEntityIds | None = None
+    updated_after: datetime | None = None
+    resync_required: bool = False
+
 
 class WorkspaceSnapshotUseCase:
     """クライアントのブートストラップおよび同期用スナップショットを構築する。"""
 
     def __init__(self, session: Session, user_id: str):
+        self.user_id = user_id
         self.workspace_queries = WorkspaceQueryUseCases(session, user_id)
+        self.change_log_repository = WorkspaceChangeLogRepository(session, user_id)
+        self.sync_horizon_repository = WorkspaceSyncHorizonRepository(session, user_id)
 
     def get_snapshot(
-        self, since_cursor: str | None = None
-    ) -> WorkspaceSnapshotResponse:
+        self, since_cursor: str | None = None, *, metadata_only: bool = False
+    ) -> WorkspaceSnapshotResponse | WorkspaceSnapshotMetadataResponse:
         """フォルダ・ノートのスナップショットを返す。
 
-        since_cursor が指定された場合は、そのカーソル時刻より後に更新された
+        since_cursor が指定された場合は、そのカーソル以降に変更ログへ記録された
         エントリのみ（削除済みの tombstone を含む）を差分として返す。未指定の
         場合は全件を返す（初回ブートストラップ用）。いずれも soft delete 済みを
         含めることで、クライアントは削除も含めてローカル DB と同期できる。
-        失敗時はエラーログを記録して例外を再送出する。
+        旧形式の ISO 8601 カーソルは updated_at による差分として解釈する。
+        since_cursor がコンパクション済みの範囲より古い場合は全件を返し、
+        resync_required=True でローカルデータの置き換えを要求する。
+        metadata_only=True の場合はノート本文を DB から読み込まず、
+        WorkspaceSnapshotMetadataResponse を返す。
+        """
+        return self.to_response(
+            self.load_snapshot_rows(since_cursor, metadata_only=metadata_only)
+        )
+
+    def get_snapshot_page(
+        self,
+        *,
+        page_size: int,
+        page_token: str | None = None,
+        since_cursor: str | None = None,
+        metadata_only: bool = False,
+    ) -> WorkspaceSnapshotResponse | WorkspaceSnapshotMetadataResponse:
+        """スナップショットを (updated_at, id) 昇順のキーセットページングで返す。
+
+        1 ページにはフォルダとノートを合計 page_size 件まで含め、続きがある場合は
+        next_page_token を返す。並び替えは SQL 側で行うため、ページごとのメモリ量と
+        レスポンスサイズは page_size に比例する。cursor は最初のページ取得時点の
+        シーケンス番号で固定し、ページング中の更新は次回の差分同期で再取得される。
+        metadata_only=True の場合はノート本文を読み込まない。
+        """
+        return self.to_response(
+            self.load_snapshot_page_rows(
+                page_size=page_size,
+                page_token=page_token,
+                since_cursor=since_cursor,
+                metadata_only=metadata_only,
+            )
+        )
+
+    def load_snapshot_rows(
+        self, since_cursor: str | None = None, *, metadata_only: bool = False
+    ) -> SnapshotRows:
+        """get_snapshot と同じ範囲の行を Pydantic 変換せずに返す。
+
+        列指向エンコードなど、行ごとのスキーマ検証を省いて直接シリアライズする
+        経路から利用する。フォルダと（metadata_only 時の）ノートはメタデータ
+        キャッシュから取得する。失敗時はエラーログを記録して例外を再送出する。
         """
         try:
-            updated_after = self._parse_cursor(since_cursor)
-            folders = [
-                FolderRead.model_validate(folder)
-                for folder in self.workspace_queries.list_folders(
-                    include_deleted=True, updated_after=updated_after
+            # 行より先にシーケンスを読み、以降の書き込みは次回の差分に含める
+            sequence = self.change_log_repository.current_sequence()
+            scope = self._resolve_since(since_cursor, sequence)
+            folders: Sequence[Folder | FolderRead]
+            notes: Sequence[Note | NoteMetadataRead]
+            if scope.changed is not None:
+                folders = self.workspace_queries.list_folders_by_ids(
+                    scope.changed.folder_ids
+                )
+                notes = self.workspace_queries.list_notes_by_ids(
+                    scope.changed.note_ids, metadata_only=metadata_only
+                )
+            else:
+                folders = self.workspace_queries.list_folder_metadata(
+                    include_deleted=True, updated_after=scope.updated_after
+                )
+                if metadata_only:
+                    notes = self.workspace_queries.list_note_metadata(
+                        include_deleted=True, updated_after=scope.updated_after
+                    )
+                else:
+                    notes = self.workspace_queries.list_all_notes(
+                        include_deleted=True, updated_after=scope.updated_after
+                    )
+            return SnapshotRows(
+                user_id=self.user_id,
+                folders=folders,
+                notes=notes,
+                cursor=encode_sequence_cursor(sequence),
+                server_time=datetime.now(UTC),
+                metadata_only=metadata_only,
+                resync_required=scope.resync_required,
+            )
+        except Exception:
+            log_event(
+                logger,
+                logging.ERROR,
+                "workspace.snapshot.build_failed",
+                exc_info=True,
+            )
+            raise
+
+    def load_snapshot_page_rows(
+        self,
+        *,
+        page_size: int,
+        page_token: str | None = None,
+        since_cursor: str | None = None,
+        metadata_only: bool = False,
+    ) -> SnapshotRows:
+        """get_snapshot_page と同じ 1 ページ分の行を Pydantic 変換せずに返す。"""
+        try:
+            if page_token:
+                position = self._decode_page_token(page_token)
+                sequence = parse_sequence_cursor(position.cursor)
+                if sequence is None:
+                    raise ValidationFailed("Invalid snapshot page token")
+            else:
+                sequence = self.change_log_repository.current_sequence()
+                position = SnapshotPagePosition(
+                    entity="folder",
+                    after=None,
+                    cursor=encode_sequence_cursor(sequence),
                 )
-            ]
-            notes = [
-                NoteRead.model_validate(note)
-                for note in self.workspace_queries.list_all_notes(
-                    include_deleted=True, updated_after=updated_after
+            # 差分の読み取り上限は最初のページで固定したシーケンスとする
+            scope = self._resolve_since(since_cursor, sequence)
+            changed = scope.changed
+
+            folders: Sequence[Folder | FolderRead] = []
+            notes: Sequence[Note | NoteMetadataRead] = []
+            next_position: SnapshotPagePosition | None = None
+            remaining = page_size
+
+            if position.entity == "folder":
+                folders = self.workspace_queries.list_folders_page(
+                    limit=remaining + 1,
+                    after=position.after,
+                    include_deleted=True,
+                    updated_after=scope.updated_after,
+                    folder_ids=changed.folder_ids if changed is not None else None,
+                )
+                if len(folders) > remaining:
+                    folders = folders[:remaining]
+                    next_position = self._next_position("folder", folders[-1], position)
+                remaining -= len(folders)
+                # フォルダを走査し終えたらノートの先頭へ進む
+                position = SnapshotPagePosition(
+                    entity="note", after=None, cursor=position.cursor
+                )
+
+            if next_position is None and remaining == 0:
+                # フォルダだけでページが埋まった場合は次ページをノートの先頭から始める
+                next_position = position
+            elif next_position is None:
+                notes = self.workspace_queries.list_notes_page(
+                    limit=remaining + 1,
+                    after=position.after,
+                    include_deleted=True,
+                    updated_after=scope.updated_after,
+                    note_ids=changed.note_ids if changed is not None else None,
+                    metadata_only=metadata_only,
                 )
-            ]
-            server_time = datetime.now(UTC)
-            # 差分が空のときは起点カーソルを維持し、巻き戻りを防ぐ。
-            fallback = updated_after or server_time
-            cursor = self._build_cursor(folders, notes, fallback)
-            return WorkspaceSnapshotResponse(
+                if len(notes) > remaining:
+                    notes = notes[:remaining]
+                    next_position = self._next_position("note", notes[-1], position)
+
+            return SnapshotRows(
+                user_id=self.user_id,
                 folders=folders,
                 notes=notes,
-                cursor=cursor,
-                server_time=server_time,
+                cursor=position.cursor,
+                server_time=datetime.now(UTC),
+                metadata_only=metadata_only,
+                next_page_token=(
+                    self._encode_page_token(next_position)
+                    if next_position is not None
+                    else None
+                ),
+                resync_required=scope.resync_required,
             )
+        except ValidationFailed:
+            raise
         except Exception:
             log_event(
                 logger,
                 logging.ERROR,
                 "workspace.snapshot.build_failed",
                 exc_info=True,
+                paginated=True,
             )
             raise
 
+    def get_version_marker(self) -> tuple[str, int]:
+        """スナップショットの ETag 算出に使う (user_id, マニフェストの version) を返す。
+
+        version はフォルダ・ノートの書き込みのたびに加算されるため、変更がない
+        ポーリングをマニフェスト行の主キー読み取り 1 回で判定できる。version は
+        ユーザーごとの連番で他のアカウントと重なり得るため、user_id も含める。
+        """
+        return self.user_id, self.change_log_repository.current_sequence()
+
+    @staticmethod
+    def to_response(
+        rows: SnapshotRows,
+    ) -> WorkspaceSnapshotResponse | WorkspaceSnapshotMetadataResponse:
+        """取得済みの行を JSON レスポンス用の Pydantic スキーマに変換する。"""
+        if rows.metadata_only:
+            return WorkspaceSnapshotMetadataResponse(
+                folders=[FolderRead.model_validate(folder) for folder in rows.folders],
+                notes=[NoteMetadataRead.model_validate(note) for note in rows.notes],
+                cursor=rows.cursor,
+                server_time=rows.server_time,
+                next_page_token=rows.next_page_token,
+                resync_required=rows.resync_required,
+            )
+        return WorkspaceSnapshotResponse(
+            folders=[FolderRead.model_validate(folder) for folder in rows.folders],
+            notes=[NoteRead.model_validate(note) for note in rows.notes],
+            cursor=rows.cursor,
+            server_time=rows.server_time,
+            next_page_token=rows.next_page_token,
+            resync_required=rows.resync_required,
+        )
+
+    @staticmethod
+    def _next_position(
+        entity: Literal["folder", "note"],
+        last_row,
+        position: SnapshotPagePosition,
+    ) -> SnapshotPagePosition:
+        """ページ末尾の行から次ページの走査位置を組み立てる。"""
+        return SnapshotPagePosition(
+            entity=entity,
+            after=(last_row.updated_at, last_row.id),
+            cursor=position.cursor,
+        )
+
+    @staticmethod
+    def _encode_page_token(position: SnapshotPagePosition) -> str:
+        """走査位置を URL セーフな不透明トークン文字列にエンコードする。"""
+        payload = {
+            "entity": position.entity,
+            "updated_at": position.after[0].isoformat() if position.after else None,
+            "id": str(position.after[1]) if position.after else None,
+            "cursor": position.cursor,
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_page_token(page_token: str) -> SnapshotPagePosition:
+        """page_token を走査位置に復元する。不正な値は ValidationFailed を送出する。"""
+        try:
+            padded = page_token + "=" * (-len(page_token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded))
+            entity = payload["entity"]
+            if entity not in {"folder", "note"}:
+                raise ValueError(entity)
+            after = None
+            if payload["updated_at"] is not None:
+                after = (
+                    datetime.fromisoformat(payload["updated_at"]),
+                    UUID(payload["id"]),
+                )
+            return SnapshotPagePosition(
+                entity=entity, after=after, cursor=str(payload["cursor"])
+            )
+        except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+            raise ValidationFailed("Invalid snapshot page token") from exc
+
+    def _resolve_since(self, since_cursor: str | None, sequence: int) -> _DeltaScope:
+        """since カーソルから読み取り範囲を決める。
+
+        シーケンスカーソルの場合は変更ログから (since, sequence] の範囲で変更された
+        ID を引く。起点が min_valid_sequence（旧形式カーソルでは min_valid_cursor）
+        より前の場合、その間に削除された変更を差分で返せないため全件取得に
+        切り替える。解析できないカーソルは未指定（全件取得）として扱う。
+        """
+        since_sequence = parse_sequence_cursor(since_cursor)
+        if since_sequence is not None:
+            min_valid_sequence = self.sync_horizon_repository.get_min_valid_sequence()
+            if since_sequence < min_valid_sequence:
+                self._log_resync(since_cursor, min_valid_sequence=min_valid_sequence)
+                return _DeltaScope(resync_required=True)
+            return _DeltaScope(
+                changed=self.change_log_repository.list_changed_ids(
+                    after=since_sequence, up_to=sequence
+                )
+            )
+
+        updated_after = self._parse_cursor(since_cursor)
+        if updated_after is None:
+            return _DeltaScope()
+        min_valid_cursor = self.sync_horizon_repository.get_min_valid_cursor()
+        if min_valid_cursor is not None and updated_after < min_valid_cursor:
+            self._log_resync(
+                since_cursor, min_valid_cursor=min_valid_cursor.isoformat()
+            )
+            return _DeltaScope(resync_required=True)
+        return _DeltaScope(updated_after=updated_after)
+
+    @staticmethod
+    def _log_resync(since_cursor: str | None, **horizon) -> None:
+        """全件再同期への切り替えを記録する。"""
+        log_event(
+            logger,
+            logging.INFO,
+            "workspace.snapshot.resync_required",
+            since_cursor=since_cursor,
+            **horizon,
+        )
+
     @staticmethod
     def _parse_cursor(since_cursor: str | None) -> datetime | None:
-        """カーソル文字列を tz-aware な datetime に変換する。
+        """旧形式（ISO 8601）のカーソル文字列を tz-aware な datetime に変換する。
 
         None・空文字・解析不能な値は None（差分なし＝全件取得）として扱う。
         tzinfo が欠落している場合は UTC を補完する。
@@ -86,19 +428,3 @@ class WorkspaceSnapshotUseCase:
         if parsed.tzinfo is None:
             parsed = parsed.replace(tzinfo=UTC)
         return parsed
-
-    @staticmethod
-    def _build_cursor(
-        folders: list[FolderRead], notes: list[NoteRead], fallback: datetime
-    ) -> str:
-        """スナップショットのカーソルを算出して返す。
-
-        返却したフォルダ・ノートの updated_at の最大値を ISO 8601 文字列にして返す。
-        差分が空の場合は fallback（起点カーソルまたはサーバー時刻）を使用し、
-        カーソルが過去に巻き戻らないようにする。
-        """
-        latest_updated_at = max(
-            [item.updated_at for item in folders] + [item.updated_at for item in notes],
-            default=fallback,
-        )
-        return latest_updated_at.isoformat()
@@ -0,0 +1,48 @@
+"""HTTP 条件付きリクエスト（ETag / If-None-Match）のユーティリティ。
+
+責務: バージョントークンから弱い ETag を生成し、If-None-Match と照合して
+    304 Not Modified レスポンスを組み立てる。
+主要なエクスポート: make_etag, etag_matches, not_modified_response,
+    CACHE_CONTROL_REVALIDATE
+呼び出し関係: スナップショット・ノート取得ルーターから呼ばれる。
+"""
+
+import hashlib
+
+from fastapi import Response, status
+
+# クライアントにキャッシュさせつつ、毎回 ETag で再検証させる
+CACHE_CONTROL_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """バージョンを表す値の組から弱い ETag 文字列を生成する。
+
+    None は空文字として扱い、各値を区切り文字で連結したうえでハッシュ化する。
+    """
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    digest = hashlib.sha256(raw.encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match ヘッダーが指定 ETag と一致するかを返す。
+
+    カンマ区切りの複数指定・ワイルドカード・強弱の違いを考慮して比較する
+    （If-None-Match は弱い比較を用いる）。
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == opaque for candidate in candidates)
+
+
+def not_modified_response(etag: str) -> Response:
+    """ボディなしの 304 Not Modified レスポンスを返す。"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL_REVALIDATE},
+    )
@@ -0,0 +1,280 @@
+"""HTTP レスポンス圧縮ミドルウェア。
+
+責務: Accept-Encoding に応じて JSON などのテキスト系レスポンスを zstd / brotli /
+    gzip で圧縮する。小さいレスポンス・圧縮済みレスポンス・除外パスは素通しし、
+    StreamingResponse はチャンク単位で圧縮して逐次送出する。
+    圧縮結果（方式・バイト数・所要時間）は ASGI scope の state に記録し、
+    アクセスログから参照できるようにする。
+主要なエクスポート: CompressionMiddleware, negotiate_encoding, SUPPORTED_ENCODINGS,
+    COMPRESSION_STATE_KEY
+呼び出し関係: main.py でアプリに登録され、request_logging_middleware が
+    request.state から圧縮結果を読み取る。
+"""
+
+import zlib
+from collections.abc import Iterable
+from time import perf_counter
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# request.state 上で圧縮結果を保持する属性名
+COMPRESSION_STATE_KEY = "compression"
+
+# サポートする圧縮方式（サーバー側の優先順）
+SUPPORTED_ENCODINGS = ("zstd", "br", "gzip")
+
+# 圧縮対象とする Content-Type（前方一致）。+json / +xml 接尾辞も対象にする
+_COMPRESSIBLE_PREFIXES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+_COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+# 応答本文を持たないため圧縮しないステータスコード
+_BODYLESS_STATUSES = {204, 304}
+
+
+class _GzipEncoder:
+    """gzip 形式のストリーミング圧縮器。"""
+
+    name = "gzip"
+
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """data を圧縮し、受信側が即座に展開できるよう同期フラッシュして返す。"""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        """残りのデータを書き出して gzip ストリームを終端する。"""
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    """brotli 形式のストリーミング圧縮器。"""
+
+    name = "br"
+
+    def __init__(self, quality: int = 4):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        """data を圧縮し、フラッシュ済みのブロックを返す。"""
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        """残りのデータを書き出して brotli ストリームを終端する。"""
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    """zstd 形式のストリーミング圧縮器。"""
+
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        """data を圧縮し、ブロック単位でフラッシュして返す。"""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        """残りのデータを書き出して zstd フレームを終端する。"""
+        return self._compressor.flush()
+
+
+def _make_encoder(encoding: str):
+    """圧縮方式名に対応するストリーミング圧縮器を生成する。"""
+    if encoding == "zstd":
+        return _ZstdEncoder()
+    if encoding == "br":
+        return _BrotliEncoder()
+    return _GzipEncoder()
+
+
+def negotiate_encoding(
+    accept_encoding: str | None, supported: Iterable[str]
+) -> str | None:
+    """Accept-Encoding とサーバー側の対応方式から使用する圧縮方式を決める。
+
+    q=0 で明示的に拒否された方式は使わない。クライアントが受け入れる方式の
+    うち、supported の並び順（サーバー側の優先順）で最初のものを返す。
+    """
+    if not accept_encoding:
+        return None
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[token] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for encoding in supported:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def _is_compressible(content_type: str) -> bool:
+    """Content-Type が圧縮に適したテキスト系かを返す。"""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(_COMPRESSIBLE_PREFIXES) or media_type.endswith(
+        _COMPRESSIBLE_SUFFIXES
+    )
+
+
+class CompressionMiddleware:
+    """Accept-Encoding に応じてレスポンス本文を圧縮する ASGI ミドルウェア。
+
+    minimum_size: 一括送信されるレスポンスでこのバイト数未満のものは圧縮しない。
+    exclude_paths: 圧縮しないパス（前方一致）。ZIP など圧縮済みの応答向け。
+    Content-Encoding 設定済みのレスポンスや非テキスト系の Content-Type も素通しする。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        exclude_paths: Iterable[str] = (),
+        encodings: Iterable[str] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.exclude_paths = tuple(exclude_paths)
+        self.encodings = tuple(encodings or SUPPORTED_ENCODINGS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding"), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, scope, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """1 リクエスト分の送信メッセージを横取りして圧縮する。
+
+    http.response.start は最初の本文チャンクを受け取るまで保留し、本文が
+    1 メッセージで完結する場合はサイズ閾値を判定してから一括圧縮する。
+    more_body=True の場合はストリーミングとみなし、Content-Length を外して
+    チャンクごとに圧縮・フラッシュしながら送出する。
+    """
+
+    def __init__(self, send: Send, scope: Scope, encoding: str, minimum_size: int):
+        self._send = send
+        self._state = scope.setdefault("state", {})
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._start_message: Message | None = None
+        self._encoder = None
+        self._passthrough = False
+        self._stats: dict[str, object] = {}
+
+    async def send(self, message: Message) -> None:
+        """下流アプリからの送信メッセージを受け取り、必要に応じて圧縮して送る。"""
+        if self._passthrough:
+            await self._send(message)
+            return
+        if message["type"] == "http.response.start":
+            self._start_message = message
+            return
+        if message["type"] != "http.response.body" or self._start_message is None:
+            await self._send(message)
+            return
+
+        if self._encoder is not None:
+            await self._send_compressed_chunk(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = Headers(raw=self._start_message["headers"])
+        if (
+            self._start_message["status"] in _BODYLESS_STATUSES
+            or "content-encoding" in headers
+            or not _is_compressible(headers.get("content-type", ""))
+            or (not more_body and len(body) < self._minimum_size)
+        ):
+            self._passthrough = True
+            await self._send(self._start_message)
+            await self._send(message)
+            return
+
+        self._encoder = _make_encoder(self._encoding)
+        self._stats = {
+            "content_encoding": self._encoding,
+            "response_bytes": 0,
+            "compressed_bytes": 0,
+            "compression_ms": 0.0,
+            "streamed": more_body,
+        }
+        self._state[COMPRESSION_STATE_KEY] = self._stats
+        if more_body:
+            await self._send_start(content_length=None)
+            await self._send_compressed_chunk(message)
+            return
+
+        compressed = self._compress(body, final=True)
+        await self._send_start(content_length=len(compressed))
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_start(self, *, content_length: int | None) -> None:
+        """圧縮後のヘッダーで http.response.start を送出する。"""
+        headers = MutableHeaders(raw=list(self._start_message["headers"]))
+        headers["Content-Encoding"] = self._encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        await self._send({**self._start_message, "headers": headers.raw})
+
+    async def _send_compressed_chunk(self, message: Message) -> None:
+        """ストリーミング中の 1 チャンクを圧縮して送出する。"""
+        more_body = message.get("more_body", False)
+        compressed = self._compress(message.get("body", b""), final=not more_body)
+        await self._send(
+            {"type": "http.response.body", "body": compressed, "more_body": more_body}
+        )
+
+    def _compress(self, data: bytes, *, final: bool) -> bytes:
+        """data を圧縮し、入出力バイト数と所要時間を統計に加算する。"""
+        started = perf_counter()
+        compressed = self._encoder.compress(data) if data else b""
+        if final:
+            compressed += self._encoder.finish()
+        self._stats["compression_ms"] = round(
+            self._stats["compression_ms"] + (perf_counter() - started) * 1000, 2
+        )
+        self._stats["response_bytes"] += len(data)
+        self._stats["compressed_bytes"] += len(compressed)
+        return compressed
@@ -25,6 +25,7 @@ from app.features.workspace import (
     notes_router,
     snapshot_router,
 )
+from app.http_compression import COMPRESSION_STATE_KEY, CompressionMiddleware
 from app.http_errors import to_http_exception
 from app.logging_utils import (
     bind_log_context,
@@ -74,11 +75,22 @@ app.add_middleware(
     allow_headers=[
         "Authorization",
         "Content-Type",
+        "If-None-Match",
         "X-API-Key",
         "X-Request-ID",
         "baggage",
         "sentry-trace",
     ],
+    # 条件付き取得の ETag と、一覧ページングの次ページカーソルを読めるようにする
+    expose_headers=["ETag", "X-Next-Cursor"],
+)
+
+# レスポンス圧縮ミドルウェアを設定（スナップショット・一覧など大きな JSON 向け）。
+# ZIP エクスポートは圧縮済みのため対象外とする。
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings_app.response_compression_min_bytes,
+    exclude_paths=("/api/notes/export/",),
 )
 
 # 各機能ルーターをAPIパスプレフィックスに紐付けて登録
@@ -107,6 +119,25 @@ async def handle_domain_error(_: Request, exc: DomainError) -> JSONResponse:
 database_initializer = RequestDatabaseInitializer(create_db_and_tables)
 
 
+def _compression_log_fields(request: Request) -> dict[str, object]:
+    """CompressionMiddleware が記録した圧縮結果をアクセスログ用の項目に変換する。
+
+    ストリーミングレスポンスはログ出力時点で送出途中のため、
+    それまでに圧縮したチャンク分の値になる（streamed=True）。
+    """
+    stats = getattr(request.state, COMPRESSION_STATE_KEY, None)
+    if not stats:
+        return {}
+    response_bytes = stats["response_bytes"]
+    compressed_bytes = stats["compressed_bytes"]
+    return {
+        **stats,
+        "compression_ratio": (
+            round(response_bytes / compressed_bytes, 2) if compressed_bytes else None
+        ),
+    }
+
+
 @app.middleware("http")
 async def request_logging_middleware(request: Request, call_next):
     """リクエストコンテキストをバインドし、DBの準備を確認したうえでアクセスログを1件出力する。"""
@@ -185,6 +216,7 @@ async def request_logging_middleware(request: Request, call_next):
         latency_ms=latency_ms,
         outcome=outcome,
         reason=reason,
+        **_compression_log_fields(request),
     )
     reset_log_context(context_tokens)
     return response
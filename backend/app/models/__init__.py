@@ -9,7 +9,20 @@ from app.models.ai_job import AIJob, AIJobRead
 from app.models.app_user import AppUser, AppUserRead
 from app.models.applied_mutation import AppliedMutation
 from app.models.folder import Folder, FolderCreate, FolderRead, FolderUpdate
-from app.models.note import Note, NoteCreate, NoteRead, NoteUpdate
+from app.models.note import (
+    Note,
+    NoteCreate,
+    NoteMetadataRead,
+    NoteRead,
+    NoteUpdate,
+)
+from app.models.note_export_job import NoteExportJob, NoteExportJobRead
+from app.models.note_import_job import NoteImportJob, NoteImportJobRead
+from app.models.note_search import (
+    NoteSearchDocument,
+    NoteSearchPosting,
+    NoteSearchState,
+)
 from app.models.note_share import (
     NoteShare,
     NoteShareCreate,
@@ -39,6 +52,9 @@ from app.models.user_settings import (
     UserSettingsUpdate,
     resolve_model_id,
 )
+from app.models.workspace_change_log import WorkspaceChangeLogEntry
+from app.models.workspace_manifest import WorkspaceManifest
+from app.models.workspace_sync_horizon import WorkspaceSyncHorizon
 
 __all__ = [
     "AVAILABLE_LANGUAGES",
@@ -67,8 +83,16 @@ __all__ = [
     "MONTHLY_TOKEN_LIMIT",
     "Note",
     "NoteCreate",
+    "NoteExportJob",
+    "NoteExportJobRead",
+    "NoteImportJob",
+    "NoteImportJobRead",
+    "NoteMetadataRead",
     "NoteRead",
     "NoteUpdate",
+    "NoteSearchDocument",
+    "NoteSearchPosting",
+    "NoteSearchState",
     "NoteShare",
     "NoteShareCreate",
     "NoteShareRead",
@@ -82,4 +106,7 @@ __all__ = [
     "UserSettings",
     "UserSettingsRead",
     "UserSettingsUpdate",
+    "WorkspaceChangeLogEntry",
+    "WorkspaceManifest",
+    "WorkspaceSyncHorizon",
 ]
@@ -1,7 +1,8 @@
 """ノート（Note）に関するモデル定義。
 
 責務: ノートのDBテーブルモデルおよびAPI入出力スキーマを提供する。
-主要なエクスポート: NoteBase, Note, NoteCreate, NoteUpdate, NoteRead。
+主要なエクスポート: NoteBase, Note, NoteCreate, NoteUpdate, NoteRead,
+    NoteMetadataRead。
 呼び出し関係: routers/notes.py およびワークスペース同期処理から参照される。
 """
 
@@ -78,3 +79,34 @@ class NoteRead(NoteBase):
         if isinstance(v, datetime) and v.tzinfo is None:
             return v.replace(tzinfo=UTC)
         return v
+
+
+class NoteMetadataRead(SQLModel):
+    """本文（content）を含まないノート読み取りスキーマ。
+
+    サイドバー表示など本文が不要な用途向け。content 列を遅延ロード対象にした
+    ORM インスタンスから生成しても本文の読み込みは発生しない。
+    """
+
+    id: UUID
+    user_id: str
+    title: str
+    version: int
+    folder_id: UUID | None
+    created_at: datetime
+    updated_at: datetime
+    deleted_at: datetime | None
+
+    @field_validator("version", mode="before")
+    @classmethod
+    def ensure_version(cls, value: int | None) -> int:
+        # DB に NULL が入り込んだ場合もデフォルト値 1 を返す
+        return 1 if value is None else value
+
+    @field_validator("created_at", "updated_at", "deleted_at", mode="before")
+    @classmethod
+    def ensure_utc_timezone(cls, v: datetime | None) -> datetime | None:
+        """タイムゾーン情報が欠落している場合に UTC を付与し、JSON 直列化を正常化する。"""
+        if isinstance(v, datetime) and v.tzinfo is None:
+            return v.replace(tzinfo=UTC)
+        return v
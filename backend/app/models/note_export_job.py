@@ -0,0 +1,76 @@
+"""ノートエクスポートジョブの DB モデルおよび API スキーマ。
+
+責務: 同期エクスポートでは API Gateway の 30 秒上限とレスポンスサイズ上限に
+    かかる大きなワークスペースのエクスポートを非同期ジョブ化し、生成した
+    ZIP アーカイブの保存先と状態をポーリングで取得できるよう永続化する。
+主要なエクスポート: NoteExportJob, NoteExportJobRead.
+呼び出し関係: features/workspace の notes ルーター / use_cases / export_job_runner
+    から参照される。AIJob と同じ非同期ジョブのパターンに従う。
+"""
+
+from datetime import UTC, datetime
+from typing import Literal
+from uuid import UUID, uuid4
+
+from pydantic import field_validator
+from sqlalchemy import BigInteger, Column, Text
+from sqlmodel import Field, SQLModel
+
+# ジョブ実行状態
+NoteExportJobStatus = Literal["pending", "running", "completed", "failed"]
+
+
+class NoteExportJob(SQLModel, table=True):
+    """非同期ノートエクスポートジョブを DB に永続化するテーブルモデル。
+
+    ワーカーがアーカイブをオブジェクトストレージへ書き出し終えると
+    object_key が設定され、クライアントはジョブ ID のポーリングで
+    署名付きダウンロード URL を受け取る。
+    """
+
+    __tablename__ = "note_export_jobs"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: str = Field()  # Cognito ユーザーサブ
+    status: str = Field(default="pending", max_length=32)  # ジョブ実行状態
+    filename: str = Field(max_length=255)  # ダウンロード時のファイル名
+    object_key: str | None = Field(default=None, max_length=1024)  # 保存先キー
+    size_bytes: int | None = Field(
+        default=None, sa_column=Column(BigInteger)
+    )  # アーカイブのバイト数
+    error_message: str | None = Field(
+        default=None, sa_column=Column(Text)
+    )  # エラー詳細
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    started_at: datetime | None = Field(default=None)  # 処理開始日時
+    completed_at: datetime | None = Field(default=None)  # 処理完了日時
+
+
+class NoteExportJobRead(SQLModel):
+    """エクスポートジョブ取得レスポンススキーマ。ポーリング時にクライアントへ返す。
+
+    download_url は完了済みジョブにのみ設定される有効期限付きの URL。
+    保存先キーは返さない。DB の naive datetime は UTC として補完する。
+    """
+
+    id: UUID
+    status: NoteExportJobStatus
+    filename: str
+    size_bytes: int | None = None
+    download_url: str | None = None
+    error_message: str | None = None
+    created_at: datetime
+    updated_at: datetime
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+
+    @field_validator(
+        "created_at", "updated_at", "started_at", "completed_at", mode="before"
+    )
+    @classmethod
+    def ensure_utc_timezone(cls, value: datetime | None) -> datetime | None:
+        # DB から取得した naive datetime に UTC タイムゾーンを付与する
+        if isinstance(value, datetime) and value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value
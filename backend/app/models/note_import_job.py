@@ -0,0 +1,78 @@
+"""ノートインポートジョブの DB モデルおよび API スキーマ。
+
+責務: Markdown の ZIP アーカイブまたは NDJSON からの一括インポートを
+    非同期ジョブ化し、取り込み件数による進捗をポーリングで取得できるよう永続化する。
+主要なエクスポート: NoteImportJob, NoteImportJobRead.
+呼び出し関係: features/workspace の notes ルーター / use_cases / import_job_runner
+    から参照される。NoteExportJob と同じ非同期ジョブのパターンに従う。
+"""
+
+from datetime import UTC, datetime
+from typing import Literal
+from uuid import UUID, uuid4
+
+from pydantic import field_validator
+from sqlalchemy import Column, Text
+from sqlmodel import Field, SQLModel
+
+# 入力形式: エクスポートと同じ構成の ZIP / 1 行 1 ノートの NDJSON
+NoteImportFormat = Literal["zip", "ndjson"]
+# ジョブ実行状態
+NoteImportJobStatus = Literal["pending", "running", "completed", "failed"]
+
+
+class NoteImportJob(SQLModel, table=True):
+    """非同期ノートインポートジョブを DB に永続化するテーブルモデル。
+
+    imported_count は取り込んだノートと同じトランザクションで更新されるため、
+    ポーリング時点で実際に作成済みのノート数と一致する。
+    """
+
+    __tablename__ = "note_import_jobs"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: str = Field()  # Cognito ユーザーサブ
+    status: str = Field(default="pending", max_length=32)  # ジョブ実行状態
+    format: str = Field(max_length=16)  # "zip" | "ndjson"
+    object_key: str = Field(max_length=1024)  # アップロードされたアーカイブの保存先
+    total_count: int = Field(default=0)  # 取り込み対象のノート数
+    imported_count: int = Field(default=0)  # 作成済みのノート数
+    folder_count: int = Field(default=0)  # 新規作成したフォルダ数
+    skipped_count: int = Field(default=0)  # 取り込み対象外のファイル数
+    error_message: str | None = Field(
+        default=None, sa_column=Column(Text)
+    )  # エラー詳細
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    started_at: datetime | None = Field(default=None)  # 処理開始日時
+    completed_at: datetime | None = Field(default=None)  # 処理完了日時
+
+
+class NoteImportJobRead(SQLModel):
+    """インポートジョブ取得レスポンススキーマ。ポーリング時にクライアントへ返す。
+
+    保存先キーは返さない。DB の naive datetime は UTC として補完する。
+    """
+
+    id: UUID
+    status: NoteImportJobStatus
+    format: NoteImportFormat
+    total_count: int = 0
+    imported_count: int = 0
+    folder_count: int = 0
+    skipped_count: int = 0
+    error_message: str | None = None
+    created_at: datetime
+    updated_at: datetime
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+
+    @field_validator(
+        "created_at", "updated_at", "started_at", "completed_at", mode="before"
+    )
+    @classmethod
+    def ensure_utc_timezone(cls, value: datetime | None) -> datetime | None:
+        # DB から取得した naive datetime に UTC タイムゾーンを付与する
+        if isinstance(value, datetime) and value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value
@@ -0,0 +1,69 @@
+"""ノート全文検索の転置インデックスを永続化するDBモデルを定義するモジュール。
+
+責務: トークン → ノートのポスティング（出現回数と文書長）、ノートごとの索引済み
+    トークン一覧、およびユーザーごとの索引状態（BM25 用の文書数・総文書長と、
+    変更ログのどこまでを反映済みか）を保持する。
+主要なエクスポート: NoteSearchPosting, NoteSearchDocument, NoteSearchState.
+呼び出し関係: NoteSearchIndexRepository が読み書きし、NoteSearchUseCase が
+    検索とインデックスの追従に使用する。
+"""
+
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Column, Text
+from sqlmodel import Field, SQLModel
+
+
+class NoteSearchPosting(SQLModel, table=True):
+    """転置インデックスの 1 エントリ（ユーザー・トークン・ノートの組）。
+
+    主キーが (user_id, token, note_id) の順のため、クエリのトークンに対する
+    ポスティングリストは主キーの範囲読み取りで取得できる（追加のインデックス不要）。
+    document_length を非正規化して持ち、BM25 の計算で文書行を読み直さない。
+    """
+
+    __tablename__ = "note_search_postings"
+
+    user_id: str = Field(primary_key=True)  # Cognito ユーザーサブ
+    token: str = Field(primary_key=True, max_length=64)  # 正規化済みトークン
+    note_id: UUID = Field(primary_key=True)  # 論理参照（外部キーなし）
+    term_frequency: int = Field()  # ノート内での出現回数
+    document_length: int = Field()  # ノートの総トークン数
+
+
+class NoteSearchDocument(SQLModel, table=True):
+    """索引済みノート 1 件分の記録。
+
+    terms は索引したトークンを空白区切りで保持し、再索引・削除時に古い
+    ポスティングを主キー指定で削除するために使う。
+    """
+
+    __tablename__ = "note_search_documents"
+
+    note_id: UUID = Field(primary_key=True)  # 論理参照（外部キーなし）
+    user_id: str = Field()  # Cognito ユーザーサブ
+    length: int = Field()  # 総トークン数（BM25 の文書長）
+    terms: str = Field(default="", sa_column=Column(Text))  # 索引済みトークン
+    indexed_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class NoteSearchState(SQLModel, table=True):
+    """ユーザーごとの検索インデックスの状態。1 ユーザー 1 行。
+
+    indexed_sequence は変更ログのどのシーケンスまでをインデックスに反映したかを
+    示す。変更ログより前から存在するノート（または圧縮で変更ログが失われた区間）は
+    ノート ID 順の走査で索引し、scan_pending / scan_after_id で中断位置を保持する。
+    """
+
+    __tablename__ = "note_search_states"
+
+    user_id: str = Field(primary_key=True)  # Cognito ユーザーサブ
+    indexed_sequence: int = Field(default=0)  # 反映済みの変更ログのシーケンス
+    scan_pending: bool = Field(default=True)  # 全ノートの走査が未完了か
+    scan_after_id: UUID | None = Field(default=None)  # 走査済みの最後のノート ID
+    document_count: int = Field(default=0)  # 索引済みノート数
+    total_length: int = Field(
+        default=0, sa_column=Column(BigInteger, nullable=False)
+    )  # 索引済みノートの総トークン数
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -0,0 +1,40 @@
+"""ワークスペースの追記専用変更ログのDBモデルを定義するモジュール。
+
+責務: ユーザーごとに単調増加するシーケンス番号付きで、フォルダ・ノートの
+    書き込みを記録する。差分同期はこのログの範囲読み取りで変更対象を特定する。
+    シーケンス番号は WorkspaceManifest.version から払い出す。
+主要なエクスポート: WorkspaceChangeLogEntry.
+呼び出し関係: WorkspaceChangeLogRepository が書き込み・読み取りを行い、
+    NoteRepository / FolderRepository の書き込み経路から追記される。
+"""
+
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class WorkspaceChangeLogEntry(SQLModel, table=True):
+    """1 エンティティ分の書き込みを表す変更ログの行。
+
+    (user_id, sequence) の複合ユニーク制約で、同一ユーザー内のシーケンスの
+    重複を防ぐ。行は追記のみで更新せず、保持期間を過ぎたものはコンパクションで
+    削除する。
+    """
+
+    __tablename__ = "workspace_change_log"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "sequence",
+            name="uq_workspace_change_log_user_sequence",
+        ),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: str = Field()  # Cognito ユーザーサブ
+    sequence: int = Field()  # ユーザー内で単調増加する変更番号（1 始まり）
+    entity: str = Field(max_length=32)  # 変更対象エンティティ種別（"folder" / "note"）
+    entity_id: UUID = Field()  # 変更対象エンティティのID
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -0,0 +1,36 @@
+"""ユーザーごとのワークスペースマニフェストのDBモデルを定義するモジュール。
+
+責務: フォルダ数・ノート数・本文の総バイト数・最終変更時刻と、変更ログの
+    シーケンス番号を兼ねるバージョンカウンターを 1 ユーザー 1 行で保持する。
+主要なエクスポート: WorkspaceManifest.
+呼び出し関係: WorkspaceManifestRepository が書き込みと同じトランザクションで
+    更新し、manifest エンドポイントとスナップショットが参照する。
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import BigInteger, Column
+from sqlmodel import Field, SQLModel
+
+
+class WorkspaceManifest(SQLModel, table=True):
+    """ユーザーごとのワークスペース集計とバージョンカウンターを保持する行。
+
+    version はフォルダ・ノートの書き込みのたびに同じトランザクションで加算され、
+    変更ログのシーケンス番号として払い出される。同時書き込みはこの行の更新競合と
+    して検出されるため、シーケンスに重複や逆転は生じない。
+    集計列が NULL の行は集計が未確定（集計導入前から存在する行）であることを示し、
+    初回の読み取り時に実テーブルから再計算する。
+    """
+
+    __tablename__ = "workspace_manifests"
+
+    user_id: str = Field(primary_key=True)  # Cognito ユーザーサブ
+    version: int = Field(default=0)  # 最後に払い出した変更シーケンス番号
+    folder_count: int | None = Field(default=None)  # 削除済みを除くフォルダ数
+    note_count: int | None = Field(default=None)  # 削除済みを除くノート数
+    # 削除済みを除く本文の UTF-8 バイト数
+    content_bytes: int | None = Field(default=None, sa_column=Column(BigInteger))
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC)
+    )  # 最終変更時刻
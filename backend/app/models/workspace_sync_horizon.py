@@ -0,0 +1,29 @@
+"""ワークスペース差分同期の有効範囲を管理するDBモデルを定義するモジュール。
+
+責務: コンパクションで tombstone・変更ログを物理削除したユーザーごとに、差分同期の
+    起点として受け付ける最小カーソル（min_valid_cursor / min_valid_sequence）を
+    永続化する。
+主要なエクスポート: WorkspaceSyncHorizon.
+呼び出し関係: WorkspaceCompactionUseCase が更新し、WorkspaceSnapshotUseCase が
+    差分同期の可否判定に参照する。
+"""
+
+from datetime import UTC, datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class WorkspaceSyncHorizon(SQLModel, table=True):
+    """ユーザーごとの差分同期の有効範囲を保持するテーブルモデル。
+
+    min_valid_cursor より前の（旧形式の時刻）カーソル、min_valid_sequence より前の
+    シーケンスカーソルからの差分では、物理削除済みの tombstone・変更ログを
+    返せないため、クライアントに全件再同期を要求する。1 ユーザー 1 行。
+    """
+
+    __tablename__ = "workspace_sync_horizons"
+
+    user_id: str = Field(primary_key=True)  # Cognito ユーザーサブ
+    min_valid_cursor: datetime = Field()  # 物理削除した tombstone の最新 updated_at
+    min_valid_sequence: int = Field(default=0)  # 物理削除した変更ログの最大シーケンス
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -1,15 +1,24 @@
-"""SQS キューからの AI 編集ジョブを処理する Worker Lambda のエントリーポイント。
+"""SQS の AI 編集ジョブと定期メンテナンスを処理する Worker Lambda のエントリーポイント。
 
 責務: SQS イベントの検証とコールドスタート初期化、AI 編集ジョブキューの実行。
+    EventBridge スケジュールからの起動時は検索インデックスの追従と
+    ワークスペースのコンパクションを実行する。
 主要なエクスポート: handler (Lambda 関数ハンドラー)。
 呼び出し関係: SQS トリガーから呼び出され、app.features.assistant の処理に委譲する。
+    スケジュール起動は app.features.workspace の refresh_stale_search_indexes と
+    WorkspaceCompactionUseCase に委譲する。
 """
 
 import logging
+from dataclasses import asdict
 
 from app.bootstrap import run_cold_start_database_bootstrap
-from app.database import create_db_and_tables
+from app.database import create_db_and_tables, create_session
 from app.features.assistant import run_edit_job_queue_records
+from app.features.workspace import (
+    WorkspaceCompactionUseCase,
+    refresh_stale_search_indexes,
+)
 from app.logging_utils import bind_log_context, configure_logging, reset_log_context
 from app.observability import init_sentry
 
@@ -29,16 +38,42 @@ run_cold_start_database_bootstrap(
 )
 
 
+def _is_scheduled_event(event) -> bool:
+    """EventBridge のスケジュールルールからの起動かを返す。"""
+    return (
+        isinstance(event, dict)
+        and event.get("source") == "aws.events"
+        and event.get("detail-type") == "Scheduled Event"
+    )
+
+
+def run_workspace_compaction() -> dict:
+    """検索インデックスを追従させてからコンパクションを実行し、処理件数を返す。
+
+    未反映の変更ログがコンパクションで削除されると全ノートの再走査が必要になる
+    ため、先にインデックスを追従させる。
+    """
+    with create_session() as session:
+        search_indexes_refreshed = refresh_stale_search_indexes(session)
+        result = WorkspaceCompactionUseCase(session).run()
+    return {**asdict(result), "search_indexes_refreshed": search_indexes_refreshed}
+
+
 def handler(event, context):
     """SQS イベントを受け取り、キューイングされた AI 編集ジョブを処理する。
 
     ログコンテキストをリクエストIDで束縛し、処理後に必ずリセットする。
-    SQS 以外のイベントソースや不正な形式の場合は ValueError を送出する。
+    EventBridge のスケジュールイベントでは検索インデックスの追従と
+    ワークスペースのコンパクションを実行する。
+    それ以外のイベントソースや不正な形式の場合は ValueError を送出する。
     """
     context_tokens = bind_log_context(
         request_id=getattr(context, "aws_request_id", None),
     )
     try:
+        if _is_scheduled_event(event):
+            return run_workspace_compaction()
+
         if not isinstance(event, dict) or not event.get("Records"):
             raise ValueError("AI edit worker expects SQS records")
 
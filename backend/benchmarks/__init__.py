@@ -0,0 +1,4 @@
+"""バックエンドのホットパスを計測するローカルベンチマーク群。
+
+各モジュールは `uv run python -m benchmarks.<name>` で単体実行できる。
+"""
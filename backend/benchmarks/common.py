@@ -0,0 +1,63 @@
+"""ベンチマーク共通のインメモリ DB とクエリ計測ヘルパー。
+
+責務: SQLite インメモリエンジンの生成と、発行 SQL 文・コミット回数の計測。
+主要なエクスポート: make_engine, QueryCounter
+呼び出し関係: benchmarks 配下の各ベンチマークスクリプトから利用される。
+"""
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+import app.models  # noqa: F401  テーブル定義をメタデータに登録する
+
+
+def make_engine() -> Engine:
+    """全テーブルを作成済みの SQLite インメモリエンジンを返す。"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@dataclass
+class QueryCounter:
+    """エンジン上で発行された SQL 文とコミットの回数を数える。
+
+    DSQL ではいずれも 1 回のネットワーク往復に相当するため、
+    round_trips をレイテンシの近似指標として扱う。
+    """
+
+    engine: Engine
+    statements: int = 0
+    commits: int = 0
+    _listeners: list = field(default_factory=list)
+
+    def __enter__(self) -> "QueryCounter":
+        def on_execute(*_args) -> None:
+            self.statements += 1
+
+        def on_commit(*_args) -> None:
+            self.commits += 1
+
+        self._listeners = [
+            ("before_cursor_execute", on_execute),
+            ("commit", on_commit),
+        ]
+        for name, listener in self._listeners:
+            event.listen(self.engine, name, listener)
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        for name, listener in self._listeners:
+            event.remove(self.engine, name, listener)
+
+    @property
+    def round_trips(self) -> int:
+        return self.statements + self.commits
@@ -0,0 +1,118 @@
+"""ノートの ZIP エクスポートの所要時間とピークメモリを計測する。
+
+合成したワークスペース（既定 10 万ノート）について、逐次生成の ZIP を
+チャンクごとに送信したものとして破棄する経路と、全ノートを ORM で読み込んで
+BytesIO 上にアーカイブ全体を構築する従来の経路のそれぞれで、所要時間と
+Python ヒープのピーク使用量（tracemalloc）を出力する。
+
+    uv run python -m benchmarks.note_export --notes 100000
+"""
+
+import argparse
+import io
+import tracemalloc
+import zipfile
+from time import perf_counter
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from app.core.persistence import utc_now
+from app.features.workspace.repositories import NoteRepository
+from app.features.workspace.use_cases import NoteExportUseCase
+from app.models import Folder, Note
+from benchmarks.common import make_engine
+
+USER_ID = "benchmark-user-0000-0000-000000000000"
+SEED_BATCH_SIZE = 5_000
+
+
+def seed(session: Session, note_count: int, folder_count: int, body_bytes: int) -> None:
+    """フォルダとノートを Core の一括 INSERT で作成する。"""
+    folder_ids = [uuid4() for _ in range(folder_count)]
+    now = utc_now()
+    session.exec(
+        insert(Folder),
+        params=[
+            {"id": folder_id, "user_id": USER_ID, "name": f"Folder {i}"}
+            for i, folder_id in enumerate(folder_ids)
+        ],
+    )
+    body = ("Lorem ipsum dolor sit amet. " * (body_bytes // 28 + 1))[:body_bytes]
+    for start in range(0, note_count, SEED_BATCH_SIZE):
+        session.exec(
+            insert(Note),
+            params=[
+                {
+                    "id": uuid4(),
+                    "user_id": USER_ID,
+                    "title": f"Note {i % (note_count // 2 or 1)}",
+                    "content": f"{i} {body}",
+                    "folder_id": folder_ids[i % folder_count] if i % 3 else None,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(start, min(start + SEED_BATCH_SIZE, note_count))
+            ],
+        )
+    session.commit()
+
+
+def export_streamed(session: Session) -> tuple[int, int]:
+    """逐次生成の経路。チャンクは送信済みとして保持しない。"""
+    total = largest = 0
+    for chunk in NoteExportUseCase(session, USER_ID).export_archive().chunks:
+        total += len(chunk)
+        largest = max(largest, len(chunk))
+    return total, largest
+
+
+def export_in_memory(session: Session) -> tuple[int, int]:
+    """従来の経路: 全ノートを読み込み、アーカイブ全体を BytesIO に構築する。"""
+    notes = NoteRepository(session, USER_ID).list()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for index, note in enumerate(notes):
+            zip_file.writestr(f"{note.title} ({index}).md", note.content)
+    data = buffer.getvalue()
+    return len(data), len(data)
+
+
+def measure(session: Session, export) -> tuple[int, int, float, float]:
+    """エクスポートを 1 回実行し、(バイト数, 最大チャンク, 所要秒, ピーク MiB) を返す。"""
+    session.expunge_all()
+    tracemalloc.start()
+    started = perf_counter()
+    total, largest = export(session)
+    elapsed = perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    session.expunge_all()
+    return total, largest, elapsed, peak / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=100_000)
+    parser.add_argument("--folders", type=int, default=200)
+    parser.add_argument("--body-bytes", type=int, default=1_024)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    with Session(engine) as session:
+        seed(session, args.notes, args.folders, args.body_bytes)
+        print(f"notes={args.notes} folders={args.folders} body_bytes={args.body_bytes}")
+        for label, export in (
+            ("streamed", export_streamed),
+            ("in_memory", export_in_memory),
+        ):
+            total, largest, elapsed, peak_mib = measure(session, export)
+            print(
+                f"{label:>9}: archive_bytes={total} max_chunk_bytes={largest} "
+                f"elapsed_s={elapsed:.2f} peak_mib={peak_mib:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""JSON レスポンスの行あたりシリアライズコストを Pydantic 経路と高速経路で比較する。
+
+ノート一覧を ORM 行と Core の select が返す Row の両方で読み込み、行ごとに
+NoteRead で検証してから直列化する既存の経路と、fast_json で行から直接
+JSON バイト列へ変換する経路のそれぞれについて、1 行あたりの所要時間（µs、
+DB 読み込みを除く）を出力する。orjson がインストールされていれば高速経路は
+orjson で直列化する。
+
+    uv run python -m benchmarks.response_serialization --notes 10000
+"""
+
+import argparse
+import json
+from time import perf_counter
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+
+from app.features.workspace import fast_json
+from app.models import Note, NoteRead
+from benchmarks.common import make_engine
+
+USER_ID = "benchmark-user-0000-0000-000000000000"
+
+NOTE_LIST_ADAPTER = TypeAdapter(list[NoteRead])
+
+
+def seed(session: Session, note_count: int) -> None:
+    """ノートを作成する。本文は短めのメモ程度の長さにする。"""
+    session.add_all(
+        Note(user_id=USER_ID, title=f"Note {i}", content=f"Body of note {i}. " * 8)
+        for i in range(note_count)
+    )
+    session.commit()
+
+
+def encode_pydantic(rows) -> bytes:
+    """既存経路: NoteRead に検証し、response_model で再検証して JSONResponse と同様に直列化する。"""
+    notes = [NoteRead.model_validate(row) for row in rows]
+    return json.dumps(
+        NOTE_LIST_ADAPTER.dump_python(
+            NOTE_LIST_ADAPTER.validate_python(notes), mode="json"
+        ),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def encode_fast(rows) -> bytes:
+    """高速経路: 行から直接 JSON 互換の dict を組み立てて直列化する。"""
+    return fast_json.dumps(fast_json.notes_json(rows))
+
+
+def measure(encoder, rows, repeat: int) -> float:
+    """encoder を repeat 回実行し、最短所要時間から 1 行あたりの µs を返す。"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        encoder(rows)
+        best = min(best, perf_counter() - started)
+    return round(best * 1_000_000 / max(len(rows), 1), 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    with Session(engine) as session:
+        seed(session, args.notes)
+        sources = {
+            "orm": session.exec(select(Note)).all(),
+            "core": session.exec(select(*Note.__table__.columns)).all(),
+        }
+        backend = "orjson" if fast_json.orjson is not None else "json"
+        print(f"notes={args.notes} repeat={args.repeat} fast_backend={backend}")
+        for source, rows in sources.items():
+            for name, encoder in (("pydantic", encode_pydantic), ("fast", encode_fast)):
+                per_row_us = measure(encoder, rows, args.repeat)
+                print(f"{source:>5} {name:>8}: per_row_us={per_row_us}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""スナップショットの JSON 形式と列指向形式のサイズ・シリアライズ時間を比較する。
+
+同じ行集合を、行ごとに Pydantic 検証して JSONResponse 相当で直列化する
+既存の経路と、ORM 行から直接列指向に変換する経路でそれぞれエンコードし、
+バイト数と所要時間（DB 読み込みを除く）を出力する。
+
+    uv run python -m benchmarks.snapshot_encoding --notes 10000
+"""
+
+import argparse
+import json
+from time import perf_counter
+
+from sqlmodel import Session
+
+from app.features.workspace.encoding import encode_snapshot_columns
+from app.features.workspace.use_cases import WorkspaceSnapshotUseCase
+from app.models import Folder, Note
+from benchmarks.common import make_engine
+
+USER_ID = "benchmark-user-0000-0000-000000000000"
+
+
+def seed(session: Session, note_count: int, folder_count: int) -> None:
+    """フォルダとノートを作成する。本文は短めのメモ程度の長さにする。"""
+    folders = [Folder(user_id=USER_ID, name=f"Folder {i}") for i in range(folder_count)]
+    session.add_all(folders)
+    session.flush()
+    session.add_all(
+        Note(
+            user_id=USER_ID,
+            title=f"Note {i}",
+            content=f"Body of note {i}. " * 8,
+            folder_id=folders[i % folder_count].id if i % 3 else None,
+        )
+        for i in range(note_count)
+    )
+    session.commit()
+
+
+def encode_json(use_case: WorkspaceSnapshotUseCase, rows) -> bytes:
+    """既存経路: Pydantic スキーマへ変換し、FastAPI の JSONResponse と同様に直列化する。"""
+    response = use_case.to_response(rows)
+    return json.dumps(
+        response.model_dump(mode="json"),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def encode_columnar(_use_case: WorkspaceSnapshotUseCase, rows) -> bytes:
+    """列指向経路: ORM 行から直接列配列を組み立てて直列化する。"""
+    return json.dumps(
+        encode_snapshot_columns(rows), ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def measure(encoder, use_case, rows, repeat: int) -> tuple[int, float]:
+    """encoder を repeat 回実行し、出力バイト数と最短所要時間（ms）を返す。"""
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        started = perf_counter()
+        size = len(encoder(use_case, rows))
+        best = min(best, perf_counter() - started)
+    return size, round(best * 1000, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--folders", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    with Session(engine) as session:
+        seed(session, args.notes, args.folders)
+        use_case = WorkspaceSnapshotUseCase(session, USER_ID)
+        print(f"notes={args.notes} folders={args.folders} repeat={args.repeat}")
+        for metadata_only in (False, True):
+            rows = use_case.load_snapshot_rows(metadata_only=metadata_only)
+            label = "metadata" if metadata_only else "full"
+            for name, encoder in (("json", encode_json), ("columnar", encode_columnar)):
+                size, elapsed_ms = measure(encoder, use_case, rows, args.repeat)
+                print(f"{label:>8} {name:>8}: bytes={size:>10} elapsed_ms={elapsed_ms}")
+
+
+if __name__ == "__main__":
+    main()
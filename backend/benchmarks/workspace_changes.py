@@ -0,0 +1,97 @@
+"""POST /api/workspace/changes の適用方式ごとの DB 往復回数を比較する。
+
+sequential（1 件ずつコミット）と atomic（1 トランザクションでコミット）で
+同じオフラインフラッシュ相当のバッチを適用し、SQL 文数・コミット数・
+実行時間を出力する。
+
+    uv run python -m benchmarks.workspace_changes --changes 50
+"""
+
+import argparse
+from time import perf_counter
+from uuid import uuid4
+
+from app.database import create_session
+from app.features.workspace.schemas import WorkspaceChangesRequest
+from app.features.workspace.use_cases import WorkspaceChangesUseCase
+from app.models import Note
+from benchmarks.common import QueryCounter, make_engine
+
+USER_ID = "benchmark-user"
+
+
+def build_request(
+    note_ids: list, change_count: int, apply_mode: str
+) -> WorkspaceChangesRequest:
+    """作成と更新を交互に含むバッチリクエストを組み立てる。"""
+    changes = []
+    for index in range(change_count):
+        mutation_id = f"{apply_mode}-{index}-{uuid4()}"
+        if index % 2 == 0:
+            changes.append(
+                {
+                    "entity": "note",
+                    "operation": "create",
+                    "client_mutation_id": mutation_id,
+                    "payload": {"title": f"Note {index}", "content": "body"},
+                }
+            )
+        else:
+            changes.append(
+                {
+                    "entity": "note",
+                    "operation": "update",
+                    "entity_id": note_ids[index % len(note_ids)],
+                    "client_mutation_id": mutation_id,
+                    "payload": {"content": f"edited {index}"},
+                }
+            )
+    return WorkspaceChangesRequest.model_validate(
+        {"apply_mode": apply_mode, "response_mode": "full", "changes": changes}
+    )
+
+
+def run(apply_mode: str, change_count: int, seed_notes: int) -> dict[str, float]:
+    """指定した適用方式でバッチを 1 回適用し、計測結果を返す。"""
+    engine = make_engine()
+    with create_session(engine) as session:
+        notes = [
+            Note(user_id=USER_ID, title=f"Seed {i}", content="seed")
+            for i in range(seed_notes)
+        ]
+        session.add_all(notes)
+        session.commit()
+        note_ids = [note.id for note in notes]
+
+    request = build_request(note_ids, change_count, apply_mode)
+    with create_session(engine) as session, QueryCounter(engine) as counter:
+        started = perf_counter()
+        WorkspaceChangesUseCase(session, USER_ID).apply_changes(request)
+        elapsed_ms = (perf_counter() - started) * 1000
+
+    return {
+        "statements": counter.statements,
+        "commits": counter.commits,
+        "round_trips": counter.round_trips,
+        "elapsed_ms": round(elapsed_ms, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--changes", type=int, default=50)
+    parser.add_argument("--seed-notes", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"changes={args.changes} seed_notes={args.seed_notes}")
+    for apply_mode in ("sequential", "atomic"):
+        result = run(apply_mode, args.changes, args.seed_notes)
+        print(
+            f"{apply_mode:>10}: statements={result['statements']:>4} "
+            f"commits={result['commits']:>3} round_trips={result['round_trips']:>4} "
+            f"elapsed_ms={result['elapsed_ms']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
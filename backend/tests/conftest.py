@@ -1,14 +1,17 @@
 """Test fixtures and configuration."""
 
 from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
 from app.auth import get_current_user, get_folder_note_user_id, get_user_id
-from app.database import get_session
+from app.database import create_session, get_session
+from app.features.workspace.metadata_cache import workspace_metadata_cache
 from app.main import app
 
 # Mock user ID for testing
@@ -16,6 +19,14 @@ TEST_USER_ID = "test-user-123"
 OTHER_USER_ID = "other-user-456"
 
 
+@pytest.fixture(autouse=True)
+def clear_workspace_metadata_cache():
+    """Reset the process-wide workspace metadata cache between tests."""
+    workspace_metadata_cache.clear()
+    yield
+    workspace_metadata_cache.clear()
+
+
 # Test database engine (SQLite in-memory)
 @pytest.fixture(name="engine")
 def engine_fixture():
@@ -29,10 +40,42 @@ def engine_fixture():
     return engine
 
 
+@pytest.fixture(name="capture_sql")
+def capture_sql_fixture(
+    engine,
+) -> Callable[[], AbstractContextManager[list[str]]]:
+    """Capture SQL statements issued inside a with-block, with "COMMIT" markers.
+
+    Usage:
+        with capture_sql() as statements:
+            client.post(...)
+    """
+
+    @contextmanager
+    def _capture() -> Generator[list[str], None, None]:
+        statements: list[str] = []
+
+        def on_execute(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        def on_commit(_conn) -> None:
+            statements.append("COMMIT")
+
+        event.listen(engine, "before_cursor_execute", on_execute)
+        event.listen(engine, "commit", on_commit)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", on_execute)
+            event.remove(engine, "commit", on_commit)
+
+    return _capture
+
+
 @pytest.fixture(name="session")
 def session_fixture(engine) -> Generator[Session, None, None]:
     """Create a test database session."""
-    with Session(engine) as session:
+    with create_session(engine) as session:
         yield session
 
 
@@ -5,6 +5,7 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
+from app.database import create_session
 from app.features.assistant.gateway import (
     AIGateway,
     AIGatewayTimeoutError,
@@ -29,7 +30,7 @@ def _run_ai_job(process_fn, job_id, session, ai_gateway):
     asyncio.run(
         process_fn(
             UUID(job_id),
-            session_factory=lambda: Session(engine),
+            session_factory=lambda: create_session(engine),
             ai_gateway=ai_gateway,
         )
     )
@@ -102,6 +103,28 @@ def test_summarize_note(
     assert data["tokens_used"] == 20
 
 
+def test_create_job_does_not_reload_the_row(
+    client: TestClient,
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    capture_sql,
+):
+    async def noop_dispatch(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr("app.features.assistant.router.dispatch_ai_job", noop_dispatch)
+    note = Note(title="Test Note", content="Test Content", user_id="test-user-123")
+    session.add(note)
+    session.commit()
+
+    with capture_sql() as statements:
+        response = client.post("/api/ai/summarize-jobs", json={"note_id": str(note.id)})
+
+    assert response.status_code == 202
+    assert statements[-1] == "COMMIT"
+    assert not any(s.startswith("SELECT ai_jobs") for s in statements)
+
+
 def test_summarize_empty_note(
     client: TestClient,
     session: Session,
@@ -435,7 +458,7 @@ def test_create_edit_job_and_poll_result(
     asyncio.run(
         process_edit_job(
             UUID(job["id"]),
-            session_factory=lambda: Session(engine),
+            session_factory=lambda: create_session(engine),
             ai_gateway=mock_ai_service,
         )
     )
@@ -529,7 +552,7 @@ def test_edit_job_failure_is_persisted(
     asyncio.run(
         process_edit_job(
             UUID(job_id),
-            session_factory=lambda: Session(engine),
+            session_factory=lambda: create_session(engine),
             ai_gateway=TimeoutAIGateway(),
         )
     )
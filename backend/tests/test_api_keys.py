@@ -47,6 +47,13 @@ class TestApiKeyManagement:
         assert list_response.status_code == 200
         assert list_response.json() == [data["api_key"]]
 
+    def test_create_api_key_does_not_reload_the_row(self, client, capture_sql):
+        with capture_sql() as statements:
+            response = client.post("/api/settings/api-keys", json={"name": "CLI key"})
+
+        assert response.status_code == 201
+        assert [s.split(" ")[0] for s in statements] == ["INSERT", "COMMIT"]
+
     def test_revoke_api_key_removes_it_from_active_list(self, client, session: Session):
         created = client.post("/api/settings/api-keys", json={"name": "Temp key"})
         assert created.status_code == 201
@@ -1,6 +1,6 @@
 from datetime import UTC, datetime, timedelta
 from types import SimpleNamespace
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 import pytest
 from sqlalchemy.exc import OperationalError
@@ -18,7 +18,7 @@ def make_settings(**overrides):
 
 
 def test_ensure_app_user_returns_existing_user_after_retryable_commit_conflict():
-    session = Mock()
+    session = MagicMock(info={})
     existing_user = AppUser(
         user_id="user-123",
         email="user@example.com",
@@ -46,8 +46,10 @@ def test_ensure_app_user_returns_existing_user_after_retryable_commit_conflict()
         }
     )
 
+    # 競合後は読み直した既存ユーザーで再実行され、変更がないためコミットしない
     assert result is existing_user
-    session.rollback.assert_called_once()
+    assert session.commit.call_count == 1
+    session.rollback.assert_called()
 
 
 def test_ensure_app_user_skips_commit_when_touch_interval_has_not_elapsed():
@@ -59,7 +61,7 @@ def test_ensure_app_user_skips_commit_when_touch_interval_has_not_elapsed():
         admin=False,
         last_seen_at=now - timedelta(minutes=5),
     )
-    session = Mock()
+    session = MagicMock(info={})
     session.get.return_value = app_user
 
     service = AppUserService(session, settings=make_settings())
@@ -76,7 +78,7 @@ def test_ensure_app_user_skips_commit_when_touch_interval_has_not_elapsed():
 
 
 def test_ensure_app_user_bootstraps_admin_from_configured_email():
-    session = Mock()
+    session = MagicMock(info={})
     session.get.return_value = None
 
     service = AppUserService(
@@ -95,7 +97,8 @@ def test_ensure_app_user_bootstraps_admin_from_configured_email():
 
     assert result.admin is True
     session.add.assert_called_once()
-    session.refresh.assert_called_once_with(result)
+    session.commit.assert_called_once()
+    session.refresh.assert_not_called()
 
 
 def test_ensure_app_user_updates_profile_fields_and_touches_last_seen():
@@ -107,7 +110,7 @@ def test_ensure_app_user_updates_profile_fields_and_touches_last_seen():
         admin=False,
         last_seen_at=stale_time,
     )
-    session = Mock()
+    session = MagicMock(info={})
     session.get.return_value = app_user
 
     service = AppUserService(session, settings=make_settings())
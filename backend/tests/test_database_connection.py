@@ -13,7 +13,7 @@ from app.database import get_dsql_engine
 
 @pytest.fixture
 def mock_boto3():
-    with patch("app.database.boto3") as mock:
+    with patch("app.dsql_auth.boto3") as mock:
         yield mock
 
 
@@ -34,10 +34,10 @@ def mock_psycopg2_extras():
         yield mock_uuid, mock_hstore
 
 
-def test_dsql_connection_creates_fresh_token(
-    mock_boto3, mock_connect, mock_psycopg2_extras
+def test_dsql_connection_reuses_cached_token_and_client(
+    mock_boto3, mock_connect, mock_psycopg2_extras, caplog
 ):
-    """Test that a fresh token is generated for each new connection."""
+    """New pool connections reuse one DSQL client and the cached token."""
     # Reset the engine cache
     import app.database
 
@@ -79,6 +79,7 @@ def test_dsql_connection_creates_fresh_token(
     mock_dsql_client.generate_db_connect_admin_auth_token.assert_called_with(
         Hostname="test-dsql-cluster.dsql.ap-northeast-1.on.aws",
         Region="ap-northeast-1",
+        ExpiresIn=900,
     )
 
     # Verify connect call
@@ -99,13 +100,21 @@ def test_dsql_connection_creates_fresh_token(
     with engine.connect() as conn:
         conn.execute(text("SELECT 1"))
 
-    # Verify second token generation (should be token2)
-    # Note: connect might be called multiple times due to retry logic if first attempt fails
-    # but here we mock success on first try, so it should be fine.
+    # The cached token is still valid, so neither a new client nor a new
+    # token is created for the second connection
+    assert mock_connect.call_args.kwargs["password"] == "token1"
+    assert mock_boto3.client.call_count == 1
+    assert mock_dsql_client.generate_db_connect_admin_auth_token.call_count == 1
 
-    # We need to check key word arguments for the *last* call
-    call_args = mock_connect.call_args
-    assert call_args.kwargs["password"] == "token2"
+    opened = [
+        record.details
+        for record in caplog.records
+        if record.msg == "ops.db.connection.opened"
+    ]
+    assert [details["token_cache_hit"] for details in opened] == [False, True]
+    assert all(
+        {"token_ms", "connect_ms", "total_ms"} <= details.keys() for details in opened
+    )
 
 
 def test_dsql_connection_retries_on_signature_error(
@@ -124,7 +133,10 @@ def test_dsql_connection_retries_on_signature_error(
     # Mock DSQL client
     mock_dsql_client = MagicMock()
     mock_boto3.client.return_value = mock_dsql_client
-    mock_dsql_client.generate_db_connect_admin_auth_token.as_return_value = "mock_token"
+    mock_dsql_client.generate_db_connect_admin_auth_token.side_effect = [
+        "stale_token",
+        "fresh_token",
+    ]
 
     # Mock psycopg2 connection failure then success
     import psycopg2
@@ -153,5 +165,6 @@ def test_dsql_connection_retries_on_signature_error(
         # Verify sleep was called
         mock_sleep.assert_called()
 
-    # Verify connect was called twice
+    # Verify connect was called twice, the retry with a regenerated token
     assert mock_connect.call_count == 2
+    assert mock_connect.call_args.kwargs["password"] == "fresh_token"
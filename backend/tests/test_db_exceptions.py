@@ -22,7 +22,6 @@ def test_commit_with_retry_returns_recovered_resource_on_retryable_conflict():
 
     result = commit_with_retry(
         session,
-        max_retries=3,
         recovery=lambda: recovered,
     )
 
@@ -39,4 +38,4 @@ def test_commit_with_error_handling_maps_retryable_conflict_to_domain_conflict()
     )
 
     with pytest.raises(ConflictDetected, match="Concurrent update conflict"):
-        commit_with_error_handling(session, "Note", max_retries=1)
+        commit_with_error_handling(session, "Note")
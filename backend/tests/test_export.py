@@ -1,7 +1,25 @@
+import asyncio
 import io
 import zipfile
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+from uuid import UUID
 
+import pytest
 from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.database import create_session
+from app.features.assistant.job_runner import PROCESS_NOTE_EXPORT_JOB_TASK
+from app.features.workspace import export_storage as export_storage_module
+from app.features.workspace.export_job_runner import process_note_export_job
+from app.features.workspace.export_storage import (
+    ExportStorage,
+    LocalObjectStorageClient,
+    get_export_storage,
+)
+from app.features.workspace.use_cases import NoteExportUseCase, note_exports
+from app.main import app
 
 
 class TestExportNotes:
@@ -64,3 +82,171 @@ class TestExportNotes:
         with zipfile.ZipFile(io.BytesIO(response.content)) as z:
             assert len(z.namelist()) == 0
             assert "User A Note.md" not in z.namelist()
+
+    def test_export_pages_notes_and_streams_chunks(
+        self,
+        client: TestClient,
+        session: Session,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Notes are read in keyset batches and the ZIP is yielded incrementally."""
+        monkeypatch.setattr(note_exports, "EXPORT_BATCH_SIZE", 2)
+        monkeypatch.setattr(note_exports, "EXPORT_CHUNK_BYTES", 1)
+        folder_id = client.post("/api/folders", json={"name": "Folder"}).json()["id"]
+        for title in ["Same", "Same", "Other", "Same"]:
+            client.post(
+                "/api/notes",
+                json={"title": title, "content": title * 100, "folder_id": folder_id},
+            )
+        client.post("/api/notes", json={"title": "Root", "content": "Root"})
+
+        archive = NoteExportUseCase(session, "test-user-123").export_archive()
+        chunks = list(archive.chunks)
+
+        assert len(chunks) > 5
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as z:
+            assert sorted(z.namelist()) == [
+                "Folder/Other.md",
+                "Folder/Same (1).md",
+                "Folder/Same (2).md",
+                "Folder/Same.md",
+                "Root.md",
+            ]
+            assert z.read("Folder/Other.md").decode() == "Other" * 100
+
+    def test_export_skips_deleted_notes_and_folders(self, client: TestClient):
+        folder_id = client.post("/api/folders", json={"name": "Gone"}).json()["id"]
+        client.post(
+            "/api/notes",
+            json={"title": "Orphan", "content": "Body", "folder_id": folder_id},
+        )
+        deleted_id = client.post(
+            "/api/notes", json={"title": "Deleted", "content": "Body"}
+        ).json()["id"]
+        client.delete(f"/api/notes/{deleted_id}")
+        client.delete(f"/api/folders/{folder_id}")
+
+        response = client.get("/api/notes/export/all")
+
+        with zipfile.ZipFile(io.BytesIO(response.content)) as z:
+            assert z.namelist() == ["Orphan.md"]
+
+
+@pytest.fixture
+def export_storage(tmp_path) -> ExportStorage:
+    """Local stand-in for S3 that the export job endpoints and runner share."""
+    storage = ExportStorage(LocalObjectStorageClient(tmp_path), "exports-test", 60)
+    app.dependency_overrides[get_export_storage] = lambda: storage
+    yield storage
+    app.dependency_overrides.pop(get_export_storage, None)
+
+
+@pytest.fixture
+def queued_export_jobs(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Capture dispatched export jobs instead of running them in the request."""
+    dispatched: list = []
+
+    async def record_dispatch(job_id, task, background_tasks=None):
+        dispatched.append((job_id, task))
+
+    monkeypatch.setattr("app.features.workspace.notes.dispatch_ai_job", record_dispatch)
+    return dispatched
+
+
+def _run_export_job(job_id, session: Session, storage: ExportStorage) -> None:
+    """Run the worker side of an export job against the test database."""
+    engine = session.get_bind()
+    asyncio.run(
+        process_note_export_job(
+            job_id, session_factory=lambda: create_session(engine), storage=storage
+        )
+    )
+
+
+class TestExportJobs:
+    """Tests for POST/GET /api/notes/export-jobs"""
+
+    def test_export_job_uploads_archive_and_returns_download_url(
+        self,
+        client: TestClient,
+        session: Session,
+        export_storage: ExportStorage,
+        queued_export_jobs: list,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(export_storage_module, "EXPORT_PART_BYTES", 64)
+        folder_id = client.post("/api/folders", json={"name": "Work"}).json()["id"]
+        client.post(
+            "/api/notes",
+            json={"title": "Plan", "content": "x" * 500, "folder_id": folder_id},
+        )
+        client.post("/api/notes", json={"title": "Root", "content": "Root"})
+
+        response = client.post("/api/notes/export-jobs")
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "pending"
+        assert job["download_url"] is None
+        assert job["filename"].endswith(".zip")
+        assert queued_export_jobs == [(UUID(job["id"]), PROCESS_NOTE_EXPORT_JOB_TASK)]
+
+        _run_export_job(job["id"], session, export_storage)
+
+        poll = client.get(f"/api/notes/export-jobs/{job['id']}")
+        assert poll.status_code == 200
+        data = poll.json()
+        assert data["status"] == "completed"
+        assert data["download_url"].startswith("file://")
+        archive_path = Path(unquote(urlparse(data["download_url"]).path))
+        assert data["size_bytes"] == archive_path.stat().st_size
+        with zipfile.ZipFile(archive_path) as z:
+            assert sorted(z.namelist()) == ["Root.md", "Work/Plan.md"]
+            assert z.read("Work/Plan.md").decode() == "x" * 500
+
+    def test_create_export_job_does_not_reload_the_row(
+        self,
+        client: TestClient,
+        export_storage: ExportStorage,
+        queued_export_jobs: list,
+        capture_sql,
+    ):
+        with capture_sql() as statements:
+            response = client.post("/api/notes/export-jobs")
+
+        assert response.status_code == 202
+        assert [s.split(" ")[0] for s in statements] == ["INSERT", "COMMIT"]
+
+    def test_export_job_records_failure_and_aborts_upload(
+        self,
+        client: TestClient,
+        session: Session,
+        export_storage: ExportStorage,
+        queued_export_jobs: list,
+        tmp_path,
+    ):
+        client.post("/api/notes", json={"title": "Note", "content": "Body"})
+        job_id = client.post("/api/notes/export-jobs").json()["id"]
+
+        def failing_upload_part(**kwargs):
+            raise RuntimeError("upload failed")
+
+        export_storage.client.upload_part = failing_upload_part
+        _run_export_job(job_id, session, export_storage)
+
+        data = client.get(f"/api/notes/export-jobs/{job_id}").json()
+        assert data["status"] == "failed"
+        assert data["error_message"] == "upload failed"
+        assert data["download_url"] is None
+        assert list((tmp_path / ".multipart").iterdir()) == []
+
+    def test_export_job_is_private_to_owner(
+        self,
+        make_client,
+        export_storage: ExportStorage,
+        queued_export_jobs: list,
+    ):
+        job_id = make_client("user-a").post("/api/notes/export-jobs").json()["id"]
+
+        response = make_client("user-b").get(f"/api/notes/export-jobs/{job_id}")
+
+        assert response.status_code == 404
@@ -1,7 +1,15 @@
 """Tests for folders API endpoints."""
 
+from uuid import UUID
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
 
+from app.features.workspace.metadata_cache import workspace_metadata_cache
+from app.features.workspace.repositories import WorkspaceManifestRepository
+from app.models import Folder, Note
 from tests.conftest import TEST_USER_ID
 
 
@@ -36,6 +44,31 @@ class TestListFolders:
             "Folder 2",
         ]
 
+    def test_list_folders_paginates_and_projects_fields(self, client: TestClient):
+        """Test limit/cursor pagination combined with fields= projection."""
+        for i in range(3):
+            client.post("/api/folders", json={"name": f"Folder {i}"})
+
+        first = client.get("/api/folders", params={"limit": 2, "fields": "id,name"})
+        second = client.get(
+            "/api/folders",
+            params={
+                "limit": 2,
+                "fields": "id,name",
+                "cursor": first.headers["X-Next-Cursor"],
+            },
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert [folder["name"] for folder in first.json() + second.json()] == [
+            "Folder 2",
+            "Folder 1",
+            "Folder 0",
+        ]
+        assert all(set(folder) == {"id", "name"} for folder in first.json())
+        assert "X-Next-Cursor" not in second.headers
+
 
 class TestCreateFolder:
     """Tests for POST /api/folders/"""
@@ -54,6 +87,16 @@ class TestCreateFolder:
         assert "created_at" in folder
         assert "updated_at" in folder
 
+    def test_create_folder_does_not_reload_the_row(
+        self, client: TestClient, capture_sql
+    ):
+        with capture_sql() as statements:
+            response = client.post("/api/folders", json={"name": "My Folder"})
+
+        assert response.status_code == 201
+        # コミット後に書き込んだ行を読み直す SELECT を発行しない
+        assert statements[-1] == "COMMIT"
+
 
 class TestGetFolder:
     """Tests for GET /api/folders/{folder_id}"""
@@ -152,6 +195,38 @@ class TestDeleteFolder:
         # version bumped because the note was modified during folder deletion
         assert note["version"] >= 2
 
+    def test_delete_folder_detaches_notes_in_chunks(
+        self, client: TestClient, session: Session, engine: Engine, monkeypatch
+    ):
+        """Child notes are detached with set-based UPDATEs, not one write per note."""
+        monkeypatch.setattr("app.core.persistence.BULK_WRITE_CHUNK_SIZE", 2)
+        folder = Folder(user_id=TEST_USER_ID, name="Big")
+        session.add(folder)
+        session.commit()
+        session.add_all(
+            Note(user_id=TEST_USER_ID, title=f"Child {i}", folder_id=folder.id)
+            for i in range(5)
+        )
+        session.commit()
+        statements: list[str] = []
+
+        def capture(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.delete(f"/api/folders/{folder.id}")
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert response.status_code == 204
+        note_updates = [s for s in statements if s.startswith("UPDATE notes")]
+        assert len(note_updates) == 3
+        notes = client.get("/api/workspace/snapshot").json()["notes"]
+        assert len(notes) == 5
+        assert all(note["folder_id"] is None for note in notes)
+        assert all(note["version"] == 2 for note in notes)
+
 
 class TestFolderAuthorization:
     """Tests for folder authorization (user isolation)."""
@@ -190,3 +265,54 @@ class TestFolderAuthorization:
         other_client = make_client("other-user-456")
         response = other_client.delete(f"/api/folders/{folder_id}")
         assert response.status_code == 404
+
+
+class TestFolderMetadataCache:
+    """Tests for the warm-container metadata cache behind GET /api/folders."""
+
+    def test_repeated_list_is_served_from_cache(
+        self, client: TestClient, engine: Engine
+    ):
+        client.post("/api/folders", json={"name": "Cached"})
+        client.get("/api/folders")
+        statements: list[str] = []
+
+        def capture(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.get("/api/folders")
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert [folder["name"] for folder in response.json()] == ["Cached"]
+        # マニフェスト version の主キー読み取り 1 回のみで、一覧の SELECT は発行しない
+        assert len(statements) == 1
+        assert workspace_metadata_cache.stats()["hits"] == 1
+
+    def test_write_invalidates_cache(self, client: TestClient):
+        folder_id = client.post("/api/folders", json={"name": "Before"}).json()["id"]
+        client.get("/api/folders")
+
+        client.patch(f"/api/folders/{folder_id}", json={"name": "After"})
+
+        assert workspace_metadata_cache.stats()["invalidations"] >= 1
+        assert [f["name"] for f in client.get("/api/folders").json()] == ["After"]
+
+    def test_write_from_another_container_is_detected(
+        self, client: TestClient, session: Session
+    ):
+        folder_id = client.post("/api/folders", json={"name": "Before"}).json()["id"]
+        client.get("/api/folders")
+
+        # 別コンテナの書き込みはこのコンテナのキャッシュを invalidate しないが、
+        # 同じトランザクションでマニフェストの version を加算する
+        folder = session.get(Folder, UUID(folder_id))
+        folder.name = "Elsewhere"
+        folder.version += 1
+        session.add(folder)
+        WorkspaceManifestRepository(session, TEST_USER_ID).record_write("folder", 1)
+        session.commit()
+
+        assert [f["name"] for f in client.get("/api/folders").json()] == ["Elsewhere"]
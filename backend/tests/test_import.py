@@ -0,0 +1,188 @@
+import asyncio
+import gzip
+import io
+import json
+import zipfile
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.database import create_session
+from app.features.assistant.job_runner import PROCESS_NOTE_IMPORT_JOB_TASK
+from app.features.workspace.export_storage import (
+    ExportStorage,
+    LocalObjectStorageClient,
+    get_export_storage,
+)
+from app.features.workspace.import_job_runner import process_note_import_job
+from app.features.workspace.use_cases import NoteExportUseCase, note_imports
+from app.main import app
+from app.models import Folder, Note
+
+
+@pytest.fixture
+def import_storage(tmp_path) -> ExportStorage:
+    """Local stand-in for S3 shared by the import job endpoints and runner."""
+    storage = ExportStorage(LocalObjectStorageClient(tmp_path), "imports-test", 60)
+    app.dependency_overrides[get_export_storage] = lambda: storage
+    yield storage
+    app.dependency_overrides.pop(get_export_storage, None)
+
+
+@pytest.fixture
+def queued_import_jobs(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Capture dispatched import jobs instead of running them in the request."""
+    dispatched: list = []
+
+    async def record_dispatch(job_id, task, background_tasks=None):
+        dispatched.append((job_id, task))
+
+    monkeypatch.setattr("app.features.workspace.notes.dispatch_ai_job", record_dispatch)
+    return dispatched
+
+
+def _run_import_job(job_id, session: Session, storage: ExportStorage) -> None:
+    """Run the worker side of an import job against the test database."""
+    engine = session.get_bind()
+    asyncio.run(
+        process_note_import_job(
+            job_id, session_factory=lambda: create_session(engine), storage=storage
+        )
+    )
+
+
+def _live_notes(session: Session, user_id: str) -> list[Note]:
+    session.expire_all()
+    return list(
+        session.exec(
+            select(Note).where(Note.user_id == user_id, Note.deleted_at.is_(None))
+        )
+    )
+
+
+class TestImportJobs:
+    """Tests for POST/GET /api/notes/import-jobs"""
+
+    def test_import_zip_round_trips_export(
+        self,
+        make_client,
+        session: Session,
+        import_storage: ExportStorage,
+        queued_import_jobs: list,
+    ):
+        source = make_client("user-a")
+        folder_id = source.post("/api/folders", json={"name": "Work"}).json()["id"]
+        source.post(
+            "/api/notes",
+            json={"title": "Plan", "content": "# Plan", "folder_id": folder_id},
+        )
+        source.post("/api/notes", json={"title": "Root", "content": "Root body"})
+        archive = b"".join(NoteExportUseCase(session, "user-a").export_archive().chunks)
+
+        target = make_client("user-b")
+        response = target.post(
+            "/api/notes/import-jobs",
+            content=archive,
+            headers={"Content-Type": "application/zip"},
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "pending"
+        assert job["format"] == "zip"
+        assert queued_import_jobs == [(UUID(job["id"]), PROCESS_NOTE_IMPORT_JOB_TASK)]
+
+        _run_import_job(job["id"], session, import_storage)
+
+        data = target.get(f"/api/notes/import-jobs/{job['id']}").json()
+        assert data["status"] == "completed"
+        assert data["total_count"] == 2
+        assert data["imported_count"] == 2
+        assert data["folder_count"] == 1
+        folders = target.get("/api/folders").json()
+        assert [folder["name"] for folder in folders] == ["Work"]
+        notes = {note["title"]: note for note in target.get("/api/notes").json()}
+        assert notes["Plan"]["content"] == "# Plan"
+        assert notes["Plan"]["folder_id"] == folders[0]["id"]
+        assert notes["Root"]["folder_id"] is None
+
+    def test_import_ndjson_in_batches_reuses_existing_folder(
+        self,
+        client: TestClient,
+        session: Session,
+        import_storage: ExportStorage,
+        queued_import_jobs: list,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(note_imports, "IMPORT_BATCH_SIZE", 2)
+        folder_id = client.post("/api/folders", json={"name": "Inbox"}).json()["id"]
+        lines = [
+            json.dumps({"title": f"Note {index}", "content": "body", "folder": "Inbox"})
+            for index in range(5)
+        ]
+        lines.append(json.dumps({"title": "Loose", "content": "text"}))
+        body = gzip.compress("\n".join(lines).encode())
+
+        job = client.post("/api/notes/import-jobs", content=body).json()
+        assert job["format"] == "ndjson"
+        _run_import_job(job["id"], session, import_storage)
+
+        data = client.get(f"/api/notes/import-jobs/{job['id']}").json()
+        assert data["status"] == "completed"
+        assert data["imported_count"] == 6
+        assert data["folder_count"] == 0
+        notes = _live_notes(session, "test-user-123")
+        assert len(notes) == 6
+        assert sum(str(note.folder_id) == folder_id for note in notes) == 5
+        manifest = client.get("/api/workspace/manifest").json()
+        assert manifest["note_count"] == 6
+
+    def test_invalid_ndjson_fails_without_creating_notes(
+        self,
+        client: TestClient,
+        session: Session,
+        import_storage: ExportStorage,
+        queued_import_jobs: list,
+    ):
+        body = b'{"title": "ok", "content": "fine"}\nnot json\n'
+        job_id = client.post("/api/notes/import-jobs", content=body).json()["id"]
+
+        _run_import_job(job_id, session, import_storage)
+
+        data = client.get(f"/api/notes/import-jobs/{job_id}").json()
+        assert data["status"] == "failed"
+        assert data["error_message"] == "Line 2: invalid JSON"
+        assert data["imported_count"] == 0
+        assert _live_notes(session, "test-user-123") == []
+        assert list(session.exec(select(Folder))) == []
+
+    def test_import_rejects_empty_body(
+        self, client: TestClient, import_storage: ExportStorage
+    ):
+        response = client.post("/api/notes/import-jobs", content=b"")
+
+        assert response.status_code == 400
+
+    def test_import_skips_non_markdown_entries(
+        self,
+        client: TestClient,
+        session: Session,
+        import_storage: ExportStorage,
+        queued_import_jobs: list,
+    ):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("Projects/Alpha.md", "alpha")
+            archive.writestr("Projects/diagram.png", b"\x89PNG")
+            archive.writestr(".DS_Store", b"")
+        job_id = client.post(
+            "/api/notes/import-jobs", content=buffer.getvalue()
+        ).json()["id"]
+
+        _run_import_job(job_id, session, import_storage)
+
+        data = client.get(f"/api/notes/import-jobs/{job_id}").json()
+        assert data["status"] == "completed"
+        assert data["imported_count"] == 1
+        assert data["skipped_count"] == 2
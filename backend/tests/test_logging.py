@@ -29,3 +29,25 @@ def test_admin_forbidden_emits_authorization_log(client: TestClient, caplog):
 
     assert response.status_code == 403
     assert "security.authorization.denied" in _events(caplog)
+
+
+def test_access_log_reports_compression(client: TestClient, caplog):
+    for index in range(20):
+        client.post("/api/notes", json={"title": f"Note {index}", "content": "x" * 200})
+
+    with caplog.at_level(logging.INFO):
+        response = client.get(
+            "/api/workspace/snapshot", headers={"Accept-Encoding": "gzip"}
+        )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    [record] = [
+        record
+        for record in caplog.records
+        if getattr(record, "event", "") == "ops.http.request.completed"
+    ]
+    details = record.details
+    assert details["content_encoding"] == "gzip"
+    assert details["response_bytes"] > details["compressed_bytes"] > 0
+    assert details["compression_ratio"] > 1
+    assert details["compression_ms"] >= 0
@@ -107,6 +107,9 @@ def test_migration_applies_initial_revision_to_fresh_db():
         "token_usage",
         "user_api_keys",
         "user_settings",
+        "workspace_change_log",
+        "workspace_manifests",
+        "workspace_sync_horizons",
     }
 
     assert expected_tables.issubset(set(inspector.get_table_names()))
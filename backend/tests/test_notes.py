@@ -1,6 +1,10 @@
 """Tests for notes API endpoints."""
 
+from uuid import uuid4
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 from tests.conftest import TEST_USER_ID
 
@@ -53,6 +57,75 @@ class TestListNotes:
         assert len(notes) == 1
         assert notes[0]["title"] == "In Folder"
 
+    def test_list_notes_paginates_with_cursor(self, client: TestClient):
+        """Test keyset pagination returns every note once, newest first."""
+        for i in range(5):
+            client.post("/api/notes", json={"title": f"Note {i}"})
+        expected = [note["id"] for note in client.get("/api/notes").json()]
+
+        seen: list[str] = []
+        params: dict = {"limit": 2}
+        while True:
+            response = client.get("/api/notes", params=params)
+            assert response.status_code == 200
+            seen.extend(note["id"] for note in response.json())
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if next_cursor is None:
+                break
+            params = {"limit": 2, "cursor": next_cursor}
+
+        assert seen == expected
+
+    def test_list_notes_paginates_within_folder(self, client: TestClient):
+        """Test folder_id combined with pagination."""
+        folder_id = client.post("/api/folders", json={"name": "Folder"}).json()["id"]
+        for i in range(3):
+            client.post("/api/notes", json={"title": f"In {i}", "folder_id": folder_id})
+        client.post("/api/notes", json={"title": "Outside"})
+
+        first = client.get("/api/notes", params={"folder_id": folder_id, "limit": 2})
+        second = client.get(
+            "/api/notes",
+            params={
+                "folder_id": folder_id,
+                "limit": 2,
+                "cursor": first.headers["X-Next-Cursor"],
+            },
+        )
+
+        titles = [note["title"] for note in first.json() + second.json()]
+        assert titles == ["In 2", "In 1", "In 0"]
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_list_notes_projects_fields_without_loading_content(
+        self, client: TestClient, engine: Engine
+    ):
+        """Test fields= returns only the requested keys and skips the content column."""
+        client.post("/api/notes", json={"title": "Note", "content": "Body"})
+        statements: list[str] = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.get(
+                "/api/notes", params={"fields": "id,title,updated_at", "limit": 10}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert response.status_code == 200
+        assert list(response.json()[0]) == ["id", "title", "updated_at"]
+        assert not any("notes.content" in statement for statement in statements)
+
+    def test_list_notes_rejects_unknown_fields_and_bad_cursor(self, client: TestClient):
+        """Test invalid fields and cursors are rejected with 400."""
+        assert (
+            client.get("/api/notes", params={"fields": "id,secret"}).status_code == 400
+        )
+        assert client.get("/api/notes", params={"cursor": "garbage"}).status_code == 400
+
 
 class TestCreateNote:
     """Tests for POST /api/notes/"""
@@ -108,6 +181,41 @@ class TestGetNote:
         response = client.get(f"/api/notes/{fake_id}")
         assert response.status_code == 404
 
+    def test_get_note_returns_not_modified_for_matching_etag(self, client: TestClient):
+        """Test conditional GET returns 304 while the note is unchanged."""
+        note_id = client.post(
+            "/api/notes", json={"title": "Test", "content": "Content"}
+        ).json()["id"]
+        etag = client.get(f"/api/notes/{note_id}").headers["ETag"]
+
+        response = client.get(f"/api/notes/{note_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_get_note_etag_changes_after_update(self, client: TestClient):
+        """Test conditional GET returns the note again once it was updated."""
+        note_id = client.post(
+            "/api/notes", json={"title": "Test", "content": "Content"}
+        ).json()["id"]
+        etag = client.get(f"/api/notes/{note_id}").headers["ETag"]
+        client.patch(f"/api/notes/{note_id}", json={"content": "Updated"})
+
+        response = client.get(f"/api/notes/{note_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["content"] == "Updated"
+        assert response.headers["ETag"] != etag
+
+    def test_get_deleted_note_ignores_etag(self, client: TestClient):
+        """Test a deleted note is reported as 404 even with a stale ETag."""
+        note_id = client.post(
+            "/api/notes", json={"title": "Test", "content": "Content"}
+        ).json()["id"]
+        etag = client.get(f"/api/notes/{note_id}").headers["ETag"]
+        client.delete(f"/api/notes/{note_id}")
+
+        response = client.get(f"/api/notes/{note_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 404
+
 
 class TestUpdateNote:
     """Tests for PATCH /api/notes/{note_id}"""
@@ -174,6 +282,19 @@ class TestUpdateNote:
         response = client.patch(f"/api/notes/{fake_id}", json={"title": "New"})
         assert response.status_code == 404
 
+    def test_create_and_update_do_not_reload_the_row(
+        self, client: TestClient, capture_sql
+    ):
+        with capture_sql() as created:
+            note = client.post("/api/notes", json={"title": "A", "content": "B"}).json()
+        with capture_sql() as updated:
+            response = client.patch(f"/api/notes/{note['id']}", json={"title": "C"})
+
+        assert response.json()["version"] == 2
+        # コミット後に書き込んだ行を読み直す SELECT を発行しない
+        assert created[-1] == "COMMIT"
+        assert updated[-1] == "COMMIT"
+
 
 class TestDeleteNote:
     """Tests for DELETE /api/notes/{note_id}"""
@@ -239,3 +360,143 @@ class TestNoteAuthorization:
         other_client = make_client("other-user-456")
         response = other_client.delete(f"/api/notes/{note_id}")
         assert response.status_code == 404
+
+
+class TestNoteBodies:
+    """Tests for POST /api/notes/bodies"""
+
+    def test_returns_only_changed_bodies(self, client: TestClient):
+        unchanged = client.post(
+            "/api/notes", json={"title": "Unchanged", "content": "Same"}
+        ).json()
+        changed = client.post(
+            "/api/notes", json={"title": "Changed", "content": "Old"}
+        ).json()
+        client.patch(f"/api/notes/{changed['id']}", json={"content": "New"})
+        unknown = client.post(
+            "/api/notes", json={"title": "Unknown", "content": "Fresh"}
+        ).json()
+
+        response = client.post(
+            "/api/notes/bodies",
+            json={
+                "notes": [
+                    {"id": unchanged["id"], "known_version": 1},
+                    {"id": changed["id"], "known_version": 1},
+                    {"id": unknown["id"]},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        bodies = {body["id"]: body for body in response.json()["bodies"]}
+        assert set(bodies) == {changed["id"], unknown["id"]}
+        assert bodies[changed["id"]]["content"] == "New"
+        assert bodies[changed["id"]]["version"] == 2
+        assert bodies[unknown["id"]]["content"] == "Fresh"
+
+    def test_skips_deleted_and_foreign_notes(self, make_client):
+        foreign = (
+            make_client("other-user-456")
+            .post("/api/notes", json={"title": "Foreign", "content": "Secret"})
+            .json()
+        )
+        client = make_client(TEST_USER_ID)
+        deleted = client.post(
+            "/api/notes", json={"title": "Deleted", "content": "Gone"}
+        ).json()
+        client.delete(f"/api/notes/{deleted['id']}")
+
+        response = client.post(
+            "/api/notes/bodies",
+            json={"notes": [{"id": deleted["id"]}, {"id": foreign["id"]}]},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["bodies"] == []
+
+    def test_rejects_too_many_ids(self, client: TestClient):
+        response = client.post(
+            "/api/notes/bodies",
+            json={"notes": [{"id": str(uuid4())} for _ in range(101)]},
+        )
+
+        assert response.status_code == 422
+
+
+class TestBulkNoteOperations:
+    """Tests for POST /api/notes/bulk/move and /api/notes/bulk/delete."""
+
+    def _create_notes(self, client: TestClient, count: int) -> list[str]:
+        return [
+            client.post("/api/notes", json={"title": f"Note {i}"}).json()["id"]
+            for i in range(count)
+        ]
+
+    def test_bulk_move_notes(self, client: TestClient):
+        folder_id = client.post("/api/folders", json={"name": "Target"}).json()["id"]
+        note_ids = self._create_notes(client, 3)
+
+        response = client.post(
+            "/api/notes/bulk/move",
+            json={"note_ids": note_ids[:2], "folder_id": folder_id},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"updated": 2}
+        moved = client.get(f"/api/notes?folder_id={folder_id}").json()
+        assert sorted(note["id"] for note in moved) == sorted(note_ids[:2])
+        assert all(note["version"] == 2 for note in moved)
+
+    def test_bulk_move_to_no_folder(self, client: TestClient):
+        folder_id = client.post("/api/folders", json={"name": "Source"}).json()["id"]
+        note_id = client.post(
+            "/api/notes", json={"title": "Filed", "folder_id": folder_id}
+        ).json()["id"]
+
+        response = client.post(
+            "/api/notes/bulk/move", json={"note_ids": [note_id], "folder_id": None}
+        )
+
+        assert response.json() == {"updated": 1}
+        assert client.get(f"/api/notes/{note_id}").json()["folder_id"] is None
+
+    def test_bulk_move_to_unknown_folder_returns_404(self, client: TestClient):
+        note_ids = self._create_notes(client, 1)
+
+        response = client.post(
+            "/api/notes/bulk/move",
+            json={"note_ids": note_ids, "folder_id": str(uuid4())},
+        )
+
+        assert response.status_code == 404
+
+    def test_bulk_delete_notes(self, client: TestClient):
+        note_ids = self._create_notes(client, 3)
+        client.delete(f"/api/notes/{note_ids[0]}")
+
+        response = client.post(
+            "/api/notes/bulk/delete", json={"note_ids": [*note_ids, str(uuid4())]}
+        )
+
+        # 削除済み・存在しない ID は無視される
+        assert response.json() == {"updated": 2}
+        assert client.get("/api/notes").json() == []
+        tombstones = client.get("/api/workspace/snapshot").json()["notes"]
+        assert all(note["deleted_at"] is not None for note in tombstones)
+
+    def test_bulk_operations_ignore_other_users_notes(self, make_client):
+        owner = make_client(TEST_USER_ID)
+        note_id = owner.post("/api/notes", json={"title": "Mine"}).json()["id"]
+
+        other = make_client("other-user-456")
+        response = other.post("/api/notes/bulk/delete", json={"note_ids": [note_id]})
+
+        assert response.json() == {"updated": 0}
+        owner = make_client(TEST_USER_ID)
+        assert owner.get(f"/api/notes/{note_id}").status_code == 200
+
+    def test_bulk_request_requires_note_ids(self, client: TestClient):
+        response = client.post("/api/notes/bulk/delete", json={"note_ids": []})
+
+        assert response.status_code == 422
@@ -4,8 +4,21 @@ from uuid import uuid4
 import pytest
 from sqlmodel import Session
 
-from app.features.workspace.repositories import FolderRepository, NoteRepository
-from app.models import Folder, FolderCreate, FolderUpdate, Note, NoteCreate, NoteUpdate
+from app.features.workspace.repositories import (
+    AppliedMutationRepository,
+    FolderRepository,
+    NoteRepository,
+    applied_mutations,
+)
+from app.models import (
+    AppliedMutation,
+    Folder,
+    FolderCreate,
+    FolderUpdate,
+    Note,
+    NoteCreate,
+    NoteUpdate,
+)
 from app.shared import NotFound
 
 
@@ -187,3 +200,36 @@ def test_folder_repository_update_bumps_legacy_null_version_to_two(session: Sess
     updated = repository.update(folder.id, FolderUpdate(name="updated"))
 
     assert updated.version == 2
+
+
+def test_applied_mutation_repository_bulk_lookup_is_user_scoped_and_chunked(
+    session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    user_id = "test-user-123"
+    for client_mutation_id in ("m1", "m2", "m3"):
+        session.add(
+            AppliedMutation(
+                user_id=user_id,
+                client_mutation_id=client_mutation_id,
+                entity="note",
+                operation="create",
+                entity_id=uuid4(),
+            )
+        )
+    session.add(
+        AppliedMutation(
+            user_id="other-user-456",
+            client_mutation_id="m4",
+            entity="note",
+            operation="create",
+            entity_id=uuid4(),
+        )
+    )
+    session.commit()
+    monkeypatch.setattr(applied_mutations, "LOOKUP_CHUNK_SIZE", 2)
+
+    found = AppliedMutationRepository(session, user_id).get_many_by_client_mutation_ids(
+        ["m1", "m3", "m4", "missing", "m1"]
+    )
+
+    assert set(found) == {"m1", "m3"}
@@ -0,0 +1,140 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.features.workspace.use_cases import search as search_module
+from app.models import Note, NoteSearchState
+
+TEST_USER_ID = "test-user-123"
+OTHER_USER_ID = "other-user-456"
+
+
+def _search(client: TestClient, query: str, **params) -> dict:
+    response = client.get("/api/notes/search", params={"q": query, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _create_note(client: TestClient, title: str, content: str) -> str:
+    response = client.post("/api/notes", json={"title": title, "content": content})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+class TestNoteSearch:
+    """Tests for GET /api/notes/search."""
+
+    def test_ranks_notes_containing_every_term(self, client: TestClient):
+        best = _create_note(client, "Deploy guide", "How to deploy the lambda stack.")
+        other = _create_note(client, "Notes", "We deploy a lambda on Fridays.")
+        _create_note(client, "Lambda only", "Nothing about releases here.")
+
+        result = _search(client, "deploy lambda")
+
+        assert result["total"] == 2
+        assert result["index_complete"] is True
+        assert [item["id"] for item in result["items"]] == [best, other]
+        first = result["items"][0]
+        snippet = first["snippet"]
+        assert [snippet[start:end] for start, end in first["highlights"]] == [
+            "deploy",
+            "lambda",
+        ]
+
+    def test_reflects_updates_and_deletes(self, client: TestClient):
+        note_id = _create_note(client, "Groceries", "apples and bananas")
+        assert _search(client, "apples")["total"] == 1
+
+        client.patch(f"/api/notes/{note_id}", json={"content": "cherries only"})
+        assert _search(client, "apples")["total"] == 0
+        assert _search(client, "cherries")["total"] == 1
+
+        client.delete(f"/api/notes/{note_id}")
+        assert _search(client, "cherries")["total"] == 0
+
+    def test_matches_japanese_text_with_bigrams(self, client: TestClient):
+        note_id = _create_note(client, "旅行", "来週は東京都庁を見学する予定です。")
+        _create_note(client, "買い物", "京都の和菓子を買う")
+
+        result = _search(client, "東京都")
+
+        assert [item["id"] for item in result["items"]] == [note_id]
+        item = result["items"][0]
+        start, end = item["highlights"][0]
+        assert item["snippet"][start:end] == "東京都"
+
+    def test_is_scoped_to_the_current_user(self, client: TestClient, make_client):
+        _create_note(client, "Secret", "classified roadmap")
+        other_client = make_client(OTHER_USER_ID)
+
+        assert _search(other_client, "roadmap")["total"] == 0
+
+    def test_reflects_workspace_change_batches(self, client: TestClient):
+        response = client.post(
+            "/api/workspace/changes",
+            json={
+                "device_id": "device-1",
+                "changes": [
+                    {
+                        "entity": "note",
+                        "operation": "create",
+                        "payload": {"title": "Synced", "content": "offline draft"},
+                    }
+                ],
+            },
+        )
+        assert response.status_code == 200
+
+        result = _search(client, "draft")
+
+        assert result["total"] == 1
+        assert result["index_complete"] is True
+
+    def test_worker_indexes_notes_written_before_the_change_log(
+        self, client: TestClient, session: Session, monkeypatch
+    ):
+        session.add_all(
+            Note(user_id=TEST_USER_ID, title=f"Legacy {i}", content="archived memo")
+            for i in range(5)
+        )
+        session.commit()
+        monkeypatch.setattr(search_module, "INDEX_SCAN_CHUNK", 2)
+        monkeypatch.setattr(search_module, "SEARCH_REFRESH_MAX_NOTES", 2)
+
+        assert _search(client, "memo") == {
+            "query": "memo",
+            "total": 0,
+            "items": [],
+            "index_complete": False,
+        }
+
+        assert search_module.refresh_stale_search_indexes(session) == 1
+        partial = _search(client, "memo")
+        assert partial["index_complete"] is False
+        assert partial["total"] == 2
+
+        search_module.refresh_stale_search_indexes(session)
+        search_module.refresh_stale_search_indexes(session)
+        complete = _search(client, "memo")
+        assert complete["index_complete"] is True
+        assert complete["total"] == 5
+        assert search_module.refresh_stale_search_indexes(session) == 0
+        state = session.get(NoteSearchState, TEST_USER_ID)
+        assert state.document_count == 5
+        assert state.scan_pending is False
+
+    def test_search_does_not_write(self, client: TestClient, capture_sql):
+        _create_note(client, "Note", "persistent index")
+
+        with capture_sql() as statements:
+            result = _search(client, "persistent")
+
+        assert result["total"] == 1
+        assert "COMMIT" not in statements
+        assert not [
+            statement
+            for statement in statements
+            if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+
+    def test_rejects_empty_query(self, client: TestClient):
+        assert client.get("/api/notes/search", params={"q": ""}).status_code == 422
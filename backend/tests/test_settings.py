@@ -131,6 +131,35 @@ class TestUpdateSettings:
         settings = data["settings"]
         assert settings["llm_model_id"] == valid_model_id
 
+    def test_first_get_creates_settings_and_usage_in_one_commit(
+        self, client: TestClient, capture_sql
+    ):
+        with capture_sql() as statements:
+            response = client.get("/api/settings")
+
+        assert response.status_code == 200
+        assert any(s.startswith("INSERT INTO user_settings") for s in statements)
+        assert any(s.startswith("INSERT INTO token_usage") for s in statements)
+        assert statements.count("COMMIT") == 1
+
+    def test_update_settings_does_not_reload_the_written_row(
+        self, client: TestClient, capture_sql
+    ):
+        with capture_sql() as statements:
+            response = client.put("/api/settings", json={"language": "ja"})
+
+        assert response.status_code == 200
+        write = next(
+            i
+            for i, statement in enumerate(statements)
+            if statement.startswith("INSERT INTO user_settings")
+        )
+        assert statements.count("COMMIT") == 1
+        assert not any(
+            statement.startswith("SELECT user_settings")
+            for statement in statements[write:]
+        )
+
     def test_update_settings_rejects_token_limit(self, client: TestClient):
         """Token limit must not be user-editable from the settings endpoint."""
         response = client.put(
@@ -2,12 +2,15 @@
 
 import asyncio
 from datetime import UTC, datetime
+from unittest.mock import patch
 from uuid import UUID
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
 from sqlmodel import Session
 
+from app.database import create_session
 from app.features.assistant.gateway import AIGateway, get_ai_gateway
 from app.features.assistant.job_runner import process_chat_job, process_summarize_job
 from app.features.assistant.usage_policy import (
@@ -21,6 +24,12 @@ from app.models import Note
 from app.models.token_usage import MONTHLY_TOKEN_LIMIT, TokenUsage
 from tests.conftest import TEST_USER_ID
 
+OCC_CONFLICT = OperationalError(
+    "COMMIT",
+    {},
+    Exception("change conflicts with another transaction, please retry: (OC000)"),
+)
+
 
 async def _noop_dispatch(*args, **kwargs):
     """テストでは SNS ディスパッチを無効化し、処理は明示的に実行する。"""
@@ -34,7 +43,7 @@ def _run_ai_job(process_fn, job_id, session, ai_gateway):
     asyncio.run(
         process_fn(
             UUID(job_id),
-            session_factory=lambda: Session(engine),
+            session_factory=lambda: create_session(engine),
             ai_gateway=ai_gateway,
         )
     )
@@ -105,6 +114,39 @@ class TestTokenUsageService:
         usage = record_usage(session, TEST_USER_ID, 50)
         assert usage.tokens_used == 150
 
+    def test_record_usage_is_a_single_increment(self, session: Session, capture_sql):
+        get_or_create_current_period(session, TEST_USER_ID)
+
+        with capture_sql() as statements:
+            usage = record_usage(session, TEST_USER_ID, 70)
+
+        assert usage.tokens_used == 70
+        assert len(statements) == 2
+        assert statements[0].startswith("UPDATE token_usage")
+        assert "RETURNING" in statements[0]
+        assert statements[1] == "COMMIT"
+
+    def test_record_usage_retries_concurrent_increments(self, session: Session):
+        get_or_create_current_period(session, TEST_USER_ID)
+        original_commit = session.commit
+        conflicts = iter([OCC_CONFLICT, OCC_CONFLICT])
+
+        def contended_commit():
+            error = next(conflicts, None)
+            if error is not None:
+                raise error
+            original_commit()
+
+        with (
+            patch.object(session, "commit", side_effect=contended_commit),
+            patch("app.db_retry.time.sleep"),
+        ):
+            usage = record_usage(session, TEST_USER_ID, 40)
+
+        assert usage.tokens_used == 40
+        session.expire_all()
+        assert get_or_create_current_period(session, TEST_USER_ID).tokens_used == 40
+
     def test_check_limit_within(self, session: Session):
         """Test check_limit returns True when within limit."""
         assert check_limit(session, TEST_USER_ID) is True
@@ -1,4 +1,12 @@
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from app.features.workspace.encoding import COLUMNAR_MEDIA_TYPE
+from app.models import AppliedMutation, Note
 
 
 class TestWorkspaceChanges:
@@ -126,6 +134,99 @@ class TestWorkspaceChanges:
         assert response.status_code == 409
         assert "version mismatch" in response.json()["detail"]
 
+    def test_versioned_update_is_a_single_conditional_update(
+        self, client: TestClient, engine
+    ):
+        note = client.post(
+            "/api/notes", json={"title": "Original", "content": "Body"}
+        ).json()
+        statements: list[str] = []
+
+        def capture(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.post(
+                "/api/workspace/changes",
+                json={
+                    "response_mode": "delta",
+                    "base_cursor": "bootstrap",
+                    "changes": [
+                        {
+                            "entity": "note",
+                            "operation": "update",
+                            "entity_id": note["id"],
+                            "expected_version": 1,
+                            "payload": {"title": "Renamed", "content": "日本語"},
+                        }
+                    ],
+                },
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert response.status_code == 200
+        assert response.json()["applied"][0]["note"]["version"] == 2
+        note_writes = [s for s in statements if s.startswith("UPDATE notes")]
+        assert len(note_writes) == 1
+        assert "RETURNING" in note_writes[0]
+        # 更新前にノートの行全体を読み込まない
+        before_write = statements[: statements.index(note_writes[0])]
+        assert not any(s.startswith("SELECT notes.title") for s in before_write)
+        manifest = client.get("/api/workspace/manifest").json()
+        assert manifest["content_bytes"] == len("日本語".encode())
+
+    def test_versioned_delete_reports_conflict_or_not_found(self, client: TestClient):
+        folder = client.post("/api/folders", json={"name": "Folder"}).json()
+
+        def delete(entity_id: str, expected_version: int):
+            return client.post(
+                "/api/workspace/changes",
+                json={
+                    "changes": [
+                        {
+                            "entity": "folder",
+                            "operation": "delete",
+                            "entity_id": entity_id,
+                            "expected_version": expected_version,
+                        }
+                    ]
+                },
+            )
+
+        assert delete(folder["id"], 3).status_code == 409
+        assert delete("00000000-0000-0000-0000-000000000000", 1).status_code == 404
+        assert delete(folder["id"], 1).status_code == 200
+        assert delete(folder["id"], 2).status_code == 404
+        manifest = client.get("/api/workspace/manifest").json()
+        assert manifest["folder_count"] == 0
+
+    def test_recording_mutation_does_not_reload_the_row(
+        self, client: TestClient, capture_sql
+    ):
+        with capture_sql() as statements:
+            response = client.post(
+                "/api/workspace/changes",
+                json={
+                    "changes": [
+                        {
+                            "entity": "note",
+                            "operation": "create",
+                            "client_mutation_id": "m1",
+                            "payload": {"title": "Recorded"},
+                        }
+                    ]
+                },
+            )
+
+        assert response.status_code == 200
+        # 冪等性チェックの一括取得のみで、記録後の読み直しはない
+        mutation_reads = [
+            s for s in statements if s.startswith("SELECT applied_mutations")
+        ]
+        assert len(mutation_reads) == 1
+
     def test_replays_client_mutation_id_without_creating_duplicates(
         self, client: TestClient
     ):
@@ -184,3 +285,353 @@ class TestWorkspaceChanges:
         assert first_response.status_code == 200
         assert second_response.status_code == 200
         assert first_response.json()["applied"] == second_response.json()["applied"]
+
+    def test_returns_delta_snapshot_since_base_cursor(self, client: TestClient):
+        untouched = client.post(
+            "/api/notes", json={"title": "Untouched", "content": "Body"}
+        ).json()
+        edited = client.post(
+            "/api/notes", json={"title": "Edited", "content": "Body"}
+        ).json()
+        base_cursor = client.get("/api/workspace/snapshot").json()["cursor"]
+
+        response = client.post(
+            "/api/workspace/changes",
+            json={
+                "base_cursor": base_cursor,
+                "changes": [
+                    {
+                        "entity": "note",
+                        "operation": "update",
+                        "entity_id": edited["id"],
+                        "payload": {"content": "Body updated"},
+                    }
+                ],
+            },
+        )
+
+        assert response.status_code == 200
+        snapshot = response.json()["snapshot"]
+        note_ids = {note["id"] for note in snapshot["notes"]}
+        assert edited["id"] in note_ids
+        assert untouched["id"] not in note_ids
+        assert snapshot["cursor"] > base_cursor
+
+    def test_full_response_mode_returns_entire_snapshot(self, client: TestClient):
+        untouched = client.post(
+            "/api/notes", json={"title": "Untouched", "content": "Body"}
+        ).json()
+        base_cursor = client.get("/api/workspace/snapshot").json()["cursor"]
+
+        response = client.post(
+            "/api/workspace/changes",
+            json={
+                "base_cursor": base_cursor,
+                "response_mode": "full",
+                "changes": [
+                    {
+                        "entity": "folder",
+                        "operation": "create",
+                        "payload": {"name": "New Folder"},
+                    }
+                ],
+            },
+        )
+
+        assert response.status_code == 200
+        snapshot = response.json()["snapshot"]
+        assert any(note["id"] == untouched["id"] for note in snapshot["notes"])
+        assert any(folder["name"] == "New Folder" for folder in snapshot["folders"])
+
+    def test_atomic_apply_commits_batch_once(
+        self, client: TestClient, session: Session
+    ):
+        commits: list[Session] = []
+
+        def count_commit(committed: Session) -> None:
+            commits.append(committed)
+
+        event.listen(session, "after_commit", count_commit)
+        try:
+            response = client.post(
+                "/api/workspace/changes",
+                json={
+                    "apply_mode": "atomic",
+                    "changes": [
+                        {
+                            "entity": "note",
+                            "operation": "create",
+                            "client_mutation_id": f"m-atomic-{index}",
+                            "payload": {"title": f"Atomic {index}", "content": ""},
+                        }
+                        for index in range(5)
+                    ],
+                },
+            )
+        finally:
+            event.remove(session, "after_commit", count_commit)
+
+        assert response.status_code == 200
+        assert len(response.json()["applied"]) == 5
+        # バッチの書き込みで 1 回、コミット後の検索インデックスの追従で 1 回
+        assert len(commits) == 2
+        recorded = session.exec(select(AppliedMutation)).all()
+        assert len(recorded) == 5
+
+    def test_atomic_apply_rejects_folder_delete(
+        self, client: TestClient, session: Session
+    ):
+        folder = client.post("/api/folders", json={"name": "Kept"}).json()
+        note = client.post(
+            "/api/notes", json={"title": "Child", "folder_id": folder["id"]}
+        ).json()
+        commits: list[Session] = []
+
+        def count_commit(committed: Session) -> None:
+            commits.append(committed)
+
+        event.listen(session, "after_commit", count_commit)
+        try:
+            response = client.post(
+                "/api/workspace/changes",
+                json={
+                    "apply_mode": "atomic",
+                    "changes": [
+                        {
+                            "entity": "note",
+                            "operation": "create",
+                            "client_mutation_id": "m-before-delete",
+                            "payload": {"title": "Not Applied", "content": ""},
+                        },
+                        {
+                            "entity": "folder",
+                            "operation": "delete",
+                            "entity_id": folder["id"],
+                            "client_mutation_id": "m-delete-folder",
+                        },
+                    ],
+                },
+            )
+        finally:
+            event.remove(session, "after_commit", count_commit)
+
+        assert response.status_code == 400
+        assert "sequential" in response.json()["detail"]
+        assert commits == []
+        assert client.get(f"/api/folders/{folder['id']}").status_code == 200
+        child = client.get(f"/api/notes/{note['id']}").json()
+        assert child["folder_id"] == folder["id"]
+        assert session.exec(select(AppliedMutation)).all() == []
+
+    def test_atomic_apply_rolls_back_whole_batch_on_failure(
+        self, client: TestClient, session: Session
+    ):
+        note = client.post(
+            "/api/notes", json={"title": "Original", "content": "Body"}
+        ).json()
+
+        response = client.post(
+            "/api/workspace/changes",
+            json={
+                "apply_mode": "atomic",
+                "changes": [
+                    {
+                        "entity": "note",
+                        "operation": "create",
+                        "client_mutation_id": "m-atomic-created",
+                        "payload": {"title": "Should Not Persist", "content": ""},
+                    },
+                    {
+                        "entity": "note",
+                        "operation": "update",
+                        "entity_id": note["id"],
+                        "expected_version": 5,
+                        "payload": {"title": "Stale"},
+                    },
+                ],
+            },
+        )
+
+        assert response.status_code == 409
+        titles = {item.title for item in session.exec(select(Note)).all()}
+        assert titles == {"Original"}
+        assert session.exec(select(AppliedMutation)).all() == []
+
+    def test_atomic_apply_retries_whole_batch_on_commit_conflict(
+        self, client: TestClient, session: Session
+    ):
+        original_commit = session.commit
+        conflict = OperationalError(
+            "COMMIT",
+            {},
+            Exception(
+                "change conflicts with another transaction, please retry: (OC000)"
+            ),
+        )
+        attempts = iter([conflict])
+
+        def flaky_commit():
+            error = next(attempts, None)
+            if error is not None:
+                raise error
+            original_commit()
+
+        with (
+            patch.object(session, "commit", side_effect=flaky_commit),
+            patch("app.db_retry.time.sleep"),
+        ):
+            response = client.post(
+                "/api/workspace/changes",
+                json={
+                    "apply_mode": "atomic",
+                    "changes": [
+                        {
+                            "entity": "folder",
+                            "operation": "create",
+                            "client_mutation_id": "m-atomic-retry",
+                            "payload": {"name": "Retried Folder"},
+                        }
+                    ],
+                },
+            )
+
+        assert response.status_code == 200
+        folders_response = client.get("/api/folders")
+        assert [folder["name"] for folder in folders_response.json()] == [
+            "Retried Folder"
+        ]
+
+    def test_duplicate_client_mutation_id_in_batch_applies_once(
+        self, client: TestClient, session: Session
+    ):
+        change = {
+            "entity": "note",
+            "operation": "create",
+            "client_mutation_id": "m-duplicate-in-batch",
+            "payload": {"title": "Once", "content": ""},
+        }
+
+        response = client.post(
+            "/api/workspace/changes", json={"changes": [change, change]}
+        )
+
+        assert response.status_code == 200
+        first, second = response.json()["applied"]
+        assert first == second
+        assert len(session.exec(select(Note)).all()) == 1
+
+    def test_apply_changes_returns_columnar_snapshot(self, client: TestClient):
+        response = client.post(
+            "/api/workspace/changes",
+            headers={"Accept": COLUMNAR_MEDIA_TYPE},
+            json={
+                "changes": [
+                    {
+                        "entity": "note",
+                        "operation": "create",
+                        "client_mutation_id": "columnar-create",
+                        "payload": {"title": "Columnar", "content": "Body"},
+                    }
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == COLUMNAR_MEDIA_TYPE
+        body = response.json()
+        [applied] = body["applied"]
+        assert applied["note"]["title"] == "Columnar"
+        assert body["snapshot"]["notes"]["id"] == [applied["entity_id"]]
+        assert body["snapshot"]["notes"]["content"] == ["Body"]
+
+    def _patch_note(self, client: TestClient, note: dict, patch: list, **extra):
+        return client.post(
+            "/api/workspace/changes",
+            json={
+                "changes": [
+                    {
+                        "entity": "note",
+                        "operation": "update",
+                        "entity_id": note["id"],
+                        "expected_version": note["version"],
+                        "content_patch": patch,
+                        **extra,
+                    }
+                ]
+            },
+        )
+
+    def test_content_patch_updates_note_body(self, client: TestClient):
+        note = client.post(
+            "/api/notes", json={"title": "Long", "content": "Hello world"}
+        ).json()
+
+        response = self._patch_note(
+            client,
+            note,
+            [
+                {"offset": 0, "delete": 5, "insert": "Goodbye"},
+                {"offset": 11, "insert": "!"},
+            ],
+            payload={"title": "Patched"},
+        )
+
+        assert response.status_code == 200
+        [applied] = response.json()["applied"]
+        assert applied["note"]["content"] == "Goodbye world!"
+        assert applied["note"]["title"] == "Patched"
+        assert applied["note"]["version"] == 2
+
+    def test_content_patch_offsets_use_utf16_code_units(self, client: TestClient):
+        # 絵文字は UTF-16 で 2 コード単位（JavaScript の length と同じ）
+        note = client.post(
+            "/api/notes", json={"title": "Emoji", "content": "a😀b"}
+        ).json()
+
+        response = self._patch_note(
+            client, note, [{"offset": 3, "delete": 1, "insert": "c"}]
+        )
+
+        assert response.status_code == 200
+        assert response.json()["applied"][0]["note"]["content"] == "a😀c"
+
+    def test_content_patch_rejects_moved_base_version(self, client: TestClient):
+        note = client.post(
+            "/api/notes", json={"title": "Base", "content": "Base"}
+        ).json()
+        client.patch(f"/api/notes/{note['id']}", json={"content": "Moved"})
+
+        response = self._patch_note(client, note, [{"offset": 4, "insert": "!"}])
+
+        assert response.status_code == 409
+        assert client.get(f"/api/notes/{note['id']}").json()["content"] == "Moved"
+
+    def test_content_patch_rejects_out_of_range_operation(self, client: TestClient):
+        note = client.post(
+            "/api/notes", json={"title": "Short", "content": "Short"}
+        ).json()
+
+        response = self._patch_note(client, note, [{"offset": 3, "delete": 10}])
+
+        assert response.status_code == 400
+
+    def test_content_patch_requires_expected_version_and_ordered_operations(
+        self, client: TestClient
+    ):
+        note = client.post("/api/notes", json={"title": "T", "content": "abc"}).json()
+
+        missing_version = self._patch_note(
+            client, {**note, "version": None}, [{"offset": 0, "insert": "x"}]
+        )
+        overlapping = self._patch_note(
+            client,
+            note,
+            [{"offset": 1, "delete": 2}, {"offset": 2, "insert": "x"}],
+        )
+        with_content = self._patch_note(
+            client, note, [{"offset": 0, "insert": "x"}], payload={"content": "abc"}
+        )
+
+        assert missing_version.status_code == 422
+        assert overlapping.status_code == 422
+        assert with_content.status_code == 422
@@ -0,0 +1,250 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.features.workspace.repositories import (
+    NoteRepository,
+    WorkspaceChangeLogRepository,
+    WorkspaceManifestRepository,
+    WorkspaceSyncHorizonRepository,
+)
+from app.features.workspace.use_cases import WorkspaceCompactionUseCase
+from app.models import (
+    AppliedMutation,
+    Folder,
+    Note,
+    NoteShare,
+    WorkspaceChangeLogEntry,
+)
+
+TEST_USER_ID = "test-user-123"
+OTHER_USER_ID = "other-user-456"
+
+NOW = datetime(2026, 10, 17, tzinfo=UTC)
+OLD = NOW - timedelta(days=120)
+RECENT = NOW - timedelta(days=10)
+
+
+def _note(user_id: str, title: str, *, deleted_at: datetime | None = None) -> Note:
+    return Note(
+        user_id=user_id,
+        title=title,
+        content="Body",
+        deleted_at=deleted_at,
+        updated_at=deleted_at or RECENT,
+    )
+
+
+def _mutation(user_id: str, client_mutation_id: str, created_at: datetime):
+    return AppliedMutation(
+        user_id=user_id,
+        client_mutation_id=client_mutation_id,
+        entity="note",
+        operation="create",
+        entity_id=uuid4(),
+        created_at=created_at,
+    )
+
+
+def _compact(session: Session, *, batch_size: int = 500):
+    return WorkspaceCompactionUseCase(
+        session,
+        tombstone_retention=timedelta(days=90),
+        applied_mutation_retention=timedelta(days=30),
+        batch_size=batch_size,
+    ).run(now=NOW)
+
+
+class TestWorkspaceCompaction:
+    def test_purges_only_expired_tombstones(self, session: Session):
+        expired = _note(TEST_USER_ID, "expired", deleted_at=OLD)
+        recently_deleted = _note(TEST_USER_ID, "recent", deleted_at=RECENT)
+        active = _note(TEST_USER_ID, "active")
+        other_expired = _note(OTHER_USER_ID, "other", deleted_at=OLD)
+        expired_folder = Folder(
+            user_id=TEST_USER_ID, name="old", deleted_at=OLD, updated_at=OLD
+        )
+        session.add_all(
+            [expired, recently_deleted, active, other_expired, expired_folder]
+        )
+        session.commit()
+        session.add(NoteShare(note_id=expired.id))
+        session.add(NoteShare(note_id=active.id))
+        session.commit()
+
+        result = _compact(session)
+
+        remaining = {note.title for note in session.exec(select(Note))}
+        assert remaining == {"recent", "active"}
+        assert session.exec(select(Folder)).all() == []
+        assert [share.note_id for share in session.exec(select(NoteShare))] == [
+            active.id
+        ]
+        assert result.users == 2
+        assert result.notes_deleted == 2
+        assert result.folders_deleted == 1
+        assert result.note_shares_deleted == 1
+
+    def test_purges_in_batches_and_advances_min_valid_cursor(self, session: Session):
+        deleted_times = [OLD - timedelta(hours=hour) for hour in range(5)]
+        session.add_all(
+            _note(TEST_USER_ID, f"expired-{index}", deleted_at=deleted_at)
+            for index, deleted_at in enumerate(deleted_times)
+        )
+        session.commit()
+
+        result = _compact(session, batch_size=2)
+
+        assert result.notes_deleted == 5
+        assert session.exec(select(Note)).all() == []
+        horizon = WorkspaceSyncHorizonRepository(session, TEST_USER_ID)
+        assert horizon.get_min_valid_cursor() == max(deleted_times)
+        assert (
+            WorkspaceSyncHorizonRepository(
+                session, OTHER_USER_ID
+            ).get_min_valid_cursor()
+            is None
+        )
+
+    def test_min_valid_cursor_never_moves_backwards(self, session: Session):
+        repository = WorkspaceSyncHorizonRepository(session, TEST_USER_ID)
+        repository.advance(RECENT)
+        session.commit()
+        repository.advance(OLD)
+        session.commit()
+
+        assert repository.get_min_valid_cursor() == RECENT
+
+    def test_purges_expired_applied_mutations(self, session: Session):
+        session.add_all(
+            [
+                _mutation(TEST_USER_ID, "old-1", NOW - timedelta(days=31)),
+                _mutation(TEST_USER_ID, "old-2", NOW - timedelta(days=60)),
+                _mutation(TEST_USER_ID, "recent", NOW - timedelta(days=1)),
+                _mutation(OTHER_USER_ID, "other-old", NOW - timedelta(days=45)),
+            ]
+        )
+        session.commit()
+
+        result = _compact(session, batch_size=1)
+
+        remaining = session.exec(select(AppliedMutation.client_mutation_id)).all()
+        assert remaining == ["recent"]
+        assert result.applied_mutations_deleted == 3
+        # ミューテーションのみの削除では差分同期の有効範囲は変わらない
+        assert (
+            WorkspaceSyncHorizonRepository(session, TEST_USER_ID).get_min_valid_cursor()
+            is None
+        )
+
+    def test_purges_expired_change_log_and_advances_min_valid_sequence(
+        self, session: Session
+    ):
+        change_log = WorkspaceChangeLogRepository(session, TEST_USER_ID)
+        change_log.append("note", [uuid4(), uuid4(), uuid4()])
+        change_log.append("folder", [uuid4()])
+        session.commit()
+        for entry in session.exec(select(WorkspaceChangeLogEntry)):
+            entry.created_at = OLD if entry.sequence <= 3 else RECENT
+            session.add(entry)
+        session.commit()
+
+        result = _compact(session, batch_size=2)
+
+        remaining = session.exec(select(WorkspaceChangeLogEntry.sequence)).all()
+        assert remaining == [4]
+        assert result.change_log_entries_deleted == 3
+        horizon = WorkspaceSyncHorizonRepository(session, TEST_USER_ID)
+        assert horizon.get_min_valid_sequence() == 3
+
+    def test_purged_tombstone_invalidates_its_change_log_entries(
+        self, session: Session
+    ):
+        """A tombstone purged while its log entry is retained still forces resync."""
+        repository = NoteRepository(session, TEST_USER_ID)
+        note = repository.save(
+            Note(user_id=TEST_USER_ID, title="Purged", content="Body")
+        )
+        repository.soft_delete(note.id)
+        note.deleted_at = OLD
+        session.add(note)
+        session.commit()
+
+        _compact(session)
+
+        assert session.exec(select(Note)).all() == []
+        horizon = WorkspaceSyncHorizonRepository(session, TEST_USER_ID)
+        assert horizon.get_min_valid_sequence() == 2
+
+    def test_purge_bumps_the_manifest_version(self, session: Session):
+        repository = NoteRepository(session, TEST_USER_ID)
+        note = repository.save(
+            Note(user_id=TEST_USER_ID, title="Purged", content="Body")
+        )
+        repository.soft_delete(note.id)
+        note.deleted_at = OLD
+        session.add(note)
+        session.commit()
+        manifest = WorkspaceManifestRepository(session, TEST_USER_ID)
+        before = manifest.current_version()
+
+        _compact(session)
+
+        # tombstone の削除でキャッシュ・ETag の検証に使う version が変わる
+        assert manifest.current_version() == before + 1
+        assert (
+            WorkspaceManifestRepository(session, OTHER_USER_ID).current_version() == 0
+        )
+
+
+class TestSnapshotResync:
+    def _compact_deleted_note(self, client: TestClient, session: Session) -> str:
+        """ノートを作成・削除し、その tombstone をコンパクションで物理削除する。"""
+        kept = client.post("/api/notes", json={"title": "Kept", "content": "Body"})
+        purged = client.post("/api/notes", json={"title": "Purged", "content": "Body"})
+        stale_cursor = client.get("/api/workspace/snapshot").json()["cursor"]
+        assert client.delete(f"/api/notes/{purged.json()['id']}").status_code == 204
+
+        WorkspaceCompactionUseCase(session, tombstone_retention=timedelta(0)).run(
+            now=datetime.now(UTC) + timedelta(seconds=1)
+        )
+        assert kept.status_code == 201
+        return stale_cursor
+
+    def test_stale_cursor_returns_full_snapshot_with_resync_flag(
+        self, client: TestClient, session: Session
+    ):
+        stale_cursor = self._compact_deleted_note(client, session)
+
+        response = client.get("/api/workspace/snapshot", params={"since": stale_cursor})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["resync_required"] is True
+        assert [note["title"] for note in data["notes"]] == ["Kept"]
+
+    def test_cursor_after_horizon_returns_delta(
+        self, client: TestClient, session: Session
+    ):
+        self._compact_deleted_note(client, session)
+        fresh_cursor = client.get("/api/workspace/snapshot").json()["cursor"]
+
+        response = client.get("/api/workspace/snapshot", params={"since": fresh_cursor})
+
+        data = response.json()
+        assert data["resync_required"] is False
+        assert data["notes"] == []
+
+    def test_paged_snapshot_reports_resync(self, client: TestClient, session: Session):
+        stale_cursor = self._compact_deleted_note(client, session)
+
+        response = client.get(
+            "/api/workspace/snapshot",
+            params={"since": stale_cursor, "page_size": 10},
+        )
+
+        data = response.json()
+        assert data["resync_required"] is True
+        assert [note["title"] for note in data["notes"]] == ["Kept"]
@@ -0,0 +1,114 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.models import WorkspaceManifest
+
+TEST_USER_ID = "test-user-123"
+
+
+def _manifest(client: TestClient) -> dict:
+    response = client.get("/api/workspace/manifest")
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestWorkspaceManifest:
+    """Tests for GET /api/workspace/manifest."""
+
+    def test_empty_workspace(self, client: TestClient):
+        assert _manifest(client) == {
+            "version": 0,
+            "cursor": "seq:000000000000",
+            "folder_count": 0,
+            "note_count": 0,
+            "content_bytes": 0,
+            "last_changed_at": None,
+        }
+
+    def test_tracks_counts_and_content_bytes(self, client: TestClient):
+        folder_id = client.post("/api/folders", json={"name": "Folder"}).json()["id"]
+        note_id = client.post(
+            "/api/notes", json={"title": "A", "content": "abc", "folder_id": folder_id}
+        ).json()["id"]
+        client.post("/api/notes", json={"title": "B", "content": "xy"})
+        client.patch(f"/api/notes/{note_id}", json={"content": "日本語"})
+
+        manifest = _manifest(client)
+        assert manifest["folder_count"] == 1
+        assert manifest["note_count"] == 2
+        assert manifest["content_bytes"] == len("日本語".encode()) + 2
+        assert manifest["last_changed_at"] is not None
+
+        client.delete(f"/api/notes/{note_id}")
+        client.delete(f"/api/folders/{folder_id}")
+
+        manifest = _manifest(client)
+        assert manifest["folder_count"] == 0
+        assert manifest["note_count"] == 1
+        assert manifest["content_bytes"] == 2
+
+    def test_bulk_delete_updates_counts(self, client: TestClient):
+        note_ids = [
+            client.post(
+                "/api/notes", json={"title": f"Note {i}", "content": "1234"}
+            ).json()["id"]
+            for i in range(3)
+        ]
+
+        client.post("/api/notes/bulk/delete", json={"note_ids": note_ids[:2]})
+
+        manifest = _manifest(client)
+        assert manifest["note_count"] == 1
+        assert manifest["content_bytes"] == 4
+
+    def test_cursor_matches_snapshot_cursor(self, client: TestClient):
+        client.post("/api/notes", json={"title": "Note", "content": "Body"})
+        client.post("/api/folders", json={"name": "Folder"})
+
+        manifest = _manifest(client)
+        snapshot = client.get("/api/workspace/snapshot").json()
+
+        assert manifest["version"] == 2
+        assert manifest["cursor"] == snapshot["cursor"]
+
+    def test_poll_is_a_single_primary_key_read(
+        self, client: TestClient, engine: Engine
+    ):
+        client.post("/api/notes", json={"title": "Note", "content": "Body"})
+        statements: list[str] = []
+
+        def capture(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            _manifest(client)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert len(statements) == 1
+        assert "FROM workspace_manifests" in statements[0]
+
+    def test_initializes_rows_without_totals(
+        self, client: TestClient, session: Session
+    ):
+        """Rows created before the totals existed are backfilled on first read."""
+        client.post("/api/notes", json={"title": "Note", "content": "Body"})
+        manifest = session.get(WorkspaceManifest, TEST_USER_ID)
+        manifest.note_count = None
+        manifest.folder_count = None
+        manifest.content_bytes = None
+        session.add(manifest)
+        session.commit()
+        client.post("/api/folders", json={"name": "Folder"})
+
+        assert _manifest(client)["note_count"] == 1
+        session.expire_all()
+        stored = session.get(WorkspaceManifest, TEST_USER_ID)
+        assert (stored.folder_count, stored.note_count, stored.content_bytes) == (
+            1,
+            1,
+            4,
+        )
@@ -1,4 +1,15 @@
+from datetime import UTC, datetime, timedelta
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.features.workspace.encoding import COLUMNAR_MEDIA_TYPE
+from app.features.workspace.repositories import NoteRepository
+from app.models import Note
+
+COLUMNAR_HEADERS = {"Accept": COLUMNAR_MEDIA_TYPE}
 
 
 class TestWorkspaceSnapshot:
@@ -169,3 +180,340 @@ class TestWorkspaceSnapshot:
         assert deleted_folder["version"] == 2
         assert deleted_note["deleted_at"] is not None
         assert deleted_note["version"] == 2
+
+    def test_snapshot_pages_cover_workspace_without_duplicates(
+        self, client: TestClient
+    ):
+        folder_ids = {
+            client.post("/api/folders", json={"name": f"Folder {i}"}).json()["id"]
+            for i in range(3)
+        }
+        note_ids = {
+            client.post(
+                "/api/notes", json={"title": f"Note {i}", "content": "Body"}
+            ).json()["id"]
+            for i in range(5)
+        }
+
+        pages = []
+        params: dict[str, str | int] = {"page_size": 3}
+        while True:
+            response = client.get("/api/workspace/snapshot", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            pages.append(page)
+            if page["next_page_token"] is None:
+                break
+            params = {"page_size": 3, "page_token": page["next_page_token"]}
+
+        seen_folders = [folder["id"] for page in pages for folder in page["folders"]]
+        seen_notes = [note["id"] for page in pages for note in page["notes"]]
+        assert all(len(page["folders"]) + len(page["notes"]) <= 3 for page in pages)
+        assert sorted(seen_folders) == sorted(folder_ids)
+        assert sorted(seen_notes) == sorted(note_ids)
+        assert len({page["cursor"] for page in pages}) == 1
+
+    def test_snapshot_page_picks_up_notes_updated_during_paging(
+        self, client: TestClient
+    ):
+        notes = [
+            client.post(
+                "/api/notes", json={"title": f"Note {i}", "content": "Body"}
+            ).json()
+            for i in range(4)
+        ]
+
+        first = client.get("/api/workspace/snapshot", params={"page_size": 2}).json()
+        first_ids = [note["id"] for note in first["notes"]]
+        assert first_ids == [notes[0]["id"], notes[1]["id"]]
+        client.patch(f"/api/notes/{notes[0]['id']}", json={"content": "Edited"})
+
+        rest = client.get(
+            "/api/workspace/snapshot",
+            params={"page_size": 10, "page_token": first["next_page_token"]},
+        ).json()
+
+        assert [note["id"] for note in rest["notes"]] == [
+            notes[2]["id"],
+            notes[3]["id"],
+            notes[0]["id"],
+        ]
+        assert rest["next_page_token"] is None
+
+    def test_snapshot_rejects_invalid_page_token(self, client: TestClient):
+        response = client.get(
+            "/api/workspace/snapshot", params={"page_token": "not-a-token"}
+        )
+
+        assert response.status_code == 400
+
+    def test_metadata_snapshot_omits_note_bodies(
+        self, client: TestClient, engine: Engine
+    ):
+        client.post("/api/notes", json={"title": "Large", "content": "x" * 1000})
+        statements: list[str] = []
+
+        def capture(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.get("/api/workspace/snapshot/metadata")
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert response.status_code == 200
+        [note] = response.json()["notes"]
+        assert note["title"] == "Large"
+        assert "content" not in note
+        assert not any("notes.content" in statement for statement in statements)
+
+    def test_metadata_snapshot_supports_paging(self, client: TestClient):
+        for i in range(3):
+            client.post("/api/notes", json={"title": f"Note {i}", "content": "Body"})
+
+        first = client.get(
+            "/api/workspace/snapshot/metadata", params={"page_size": 2}
+        ).json()
+        rest = client.get(
+            "/api/workspace/snapshot/metadata",
+            params={"page_token": first["next_page_token"]},
+        ).json()
+
+        assert len(first["notes"]) == 2
+        assert len(rest["notes"]) == 1
+        assert rest["next_page_token"] is None
+
+    def test_snapshot_returns_not_modified_for_matching_etag(
+        self, client: TestClient, engine: Engine
+    ):
+        client.post("/api/notes", json={"title": "Cached", "content": "Body"})
+        first = client.get("/api/workspace/snapshot")
+        etag = first.headers["ETag"]
+        statements: list[str] = []
+
+        def capture(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            cached = client.get(
+                "/api/workspace/snapshot", headers={"If-None-Match": etag}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+        assert len(statements) == 1
+        assert "notes.content" not in statements[0]
+
+    def test_snapshot_etag_changes_after_write(self, client: TestClient):
+        note_id = client.post(
+            "/api/notes", json={"title": "Cached", "content": "Body"}
+        ).json()["id"]
+        etag = client.get("/api/workspace/snapshot").headers["ETag"]
+
+        client.delete(f"/api/notes/{note_id}")
+        response = client.get(
+            "/api/workspace/snapshot", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["notes"][0]["deleted_at"] is not None
+
+    def test_snapshot_etag_differs_between_users(self, make_client):
+        first_user = make_client("user-a")
+        first_user.post("/api/notes", json={"title": "A", "content": "Body"})
+        etag = first_user.get("/api/workspace/snapshot").headers["ETag"]
+
+        second_user = make_client("user-b")
+        second_user.post("/api/notes", json={"title": "B", "content": "Body"})
+        response = second_user.get(
+            "/api/workspace/snapshot", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert [note["title"] for note in response.json()["notes"]] == ["B"]
+
+    def test_snapshot_etag_depends_on_query(self, client: TestClient):
+        client.post("/api/notes", json={"title": "Cached", "content": "Body"})
+        full = client.get("/api/workspace/snapshot").headers["ETag"]
+        metadata = client.get("/api/workspace/snapshot/metadata").headers["ETag"]
+        paged = client.get("/api/workspace/snapshot", params={"page_size": 1}).headers[
+            "ETag"
+        ]
+
+        assert len({full, metadata, paged}) == 3
+
+    def test_columnar_snapshot_matches_json_snapshot(self, client: TestClient):
+        folder_id = client.post("/api/folders", json={"name": "Folder"}).json()["id"]
+        client.post(
+            "/api/notes",
+            json={"title": "In folder", "content": "Body", "folder_id": folder_id},
+        )
+        client.post("/api/notes", json={"title": "Loose", "content": "Other"})
+        expected = client.get("/api/workspace/snapshot").json()
+
+        response = client.get("/api/workspace/snapshot", headers=COLUMNAR_HEADERS)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == COLUMNAR_MEDIA_TYPE
+        assert "Accept" in response.headers["Vary"]
+        body = response.json()
+        assert body["format"] == "columnar-v1"
+        assert body["user_id"] == expected["notes"][0]["user_id"]
+        assert body["cursor"] == expected["cursor"]
+        notes = body["notes"]
+        assert notes["id"] == [note["id"] for note in expected["notes"]]
+        assert notes["title"] == [note["title"] for note in expected["notes"]]
+        assert notes["content"] == [note["content"] for note in expected["notes"]]
+        assert notes["folder_id"] == [note["folder_id"] for note in expected["notes"]]
+        assert notes["deleted_at"] == [None, None]
+        assert all(isinstance(value, int) for value in notes["updated_at"])
+        assert body["folders"]["name"] == ["Folder"]
+
+    def test_columnar_metadata_snapshot_omits_content_column(self, client: TestClient):
+        client.post("/api/notes", json={"title": "Note", "content": "Body"})
+
+        body = client.get(
+            "/api/workspace/snapshot/metadata", headers=COLUMNAR_HEADERS
+        ).json()
+
+        assert body["notes"]["title"] == ["Note"]
+        assert "content" not in body["notes"]
+
+    def test_columnar_snapshot_has_its_own_etag(self, client: TestClient):
+        client.post("/api/notes", json={"title": "Note", "content": "Body"})
+        json_etag = client.get("/api/workspace/snapshot").headers["ETag"]
+
+        response = client.get(
+            "/api/workspace/snapshot",
+            headers={**COLUMNAR_HEADERS, "If-None-Match": json_etag},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != json_etag
+        cached = client.get(
+            "/api/workspace/snapshot",
+            headers={**COLUMNAR_HEADERS, "If-None-Match": response.headers["ETag"]},
+        )
+        assert cached.status_code == 304
+
+
+class TestWorkspaceChangeLogCursor:
+    """Sequence cursors backed by the workspace change log."""
+
+    def test_cursor_is_a_sequence_that_advances_per_write(self, client: TestClient):
+        assert client.get("/api/workspace/snapshot").json()["cursor"] == (
+            "seq:000000000000"
+        )
+        note_id = client.post(
+            "/api/notes", json={"title": "Note", "content": "Body"}
+        ).json()["id"]
+        client.patch(f"/api/notes/{note_id}", json={"title": "Renamed"})
+
+        assert client.get("/api/workspace/snapshot").json()["cursor"] == (
+            "seq:000000000002"
+        )
+
+    def test_delta_includes_writes_with_skewed_updated_at(
+        self, client: TestClient, session: Session
+    ):
+        """A write stamped before the cursor (clock skew) is still delivered."""
+        client.post("/api/notes", json={"title": "Existing", "content": "Body"})
+        cursor = client.get("/api/workspace/snapshot").json()["cursor"]
+        skewed = Note(
+            user_id="test-user-123",
+            title="Skewed",
+            content="Body",
+            updated_at=datetime.now(UTC) - timedelta(minutes=5),
+        )
+        NoteRepository(session, "test-user-123").save(skewed)
+
+        delta = client.get("/api/workspace/snapshot", params={"since": cursor}).json()
+
+        assert [note["title"] for note in delta["notes"]] == ["Skewed"]
+
+    def test_delta_reads_only_changed_rows(self, client: TestClient, engine: Engine):
+        for i in range(5):
+            client.post("/api/notes", json={"title": f"Note {i}", "content": "Body"})
+        cursor = client.get("/api/workspace/snapshot").json()["cursor"]
+        changed_id = client.post(
+            "/api/notes", json={"title": "Changed", "content": "Body"}
+        ).json()["id"]
+        statements: list[str] = []
+
+        def capture(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            delta = client.get(
+                "/api/workspace/snapshot", params={"since": cursor}
+            ).json()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert [note["id"] for note in delta["notes"]] == [changed_id]
+        note_reads = [
+            statement
+            for statement in statements
+            if statement.startswith("SELECT notes.")
+        ]
+        assert note_reads
+        assert all("notes.id IN" in statement for statement in note_reads)
+
+    def test_bulk_updates_are_recorded(self, client: TestClient):
+        note_ids = [
+            client.post(
+                "/api/notes", json={"title": f"Note {i}", "content": "Body"}
+            ).json()["id"]
+            for i in range(3)
+        ]
+        cursor = client.get("/api/workspace/snapshot").json()["cursor"]
+
+        client.post("/api/notes/bulk/delete", json={"note_ids": note_ids[:2]})
+        delta = client.get("/api/workspace/snapshot", params={"since": cursor}).json()
+
+        assert sorted(note["id"] for note in delta["notes"]) == sorted(note_ids[:2])
+        assert all(note["deleted_at"] is not None for note in delta["notes"])
+
+    def test_paged_delta_returns_only_changed_rows(self, client: TestClient):
+        for i in range(3):
+            client.post("/api/notes", json={"title": f"Old {i}", "content": "Body"})
+        cursor = client.get("/api/workspace/snapshot").json()["cursor"]
+        for i in range(3):
+            client.post("/api/notes", json={"title": f"New {i}", "content": "Body"})
+
+        first = client.get(
+            "/api/workspace/snapshot", params={"since": cursor, "page_size": 2}
+        ).json()
+        rest = client.get(
+            "/api/workspace/snapshot",
+            params={
+                "since": cursor,
+                "page_size": 2,
+                "page_token": first["next_page_token"],
+            },
+        ).json()
+
+        titles = [note["title"] for note in [*first["notes"], *rest["notes"]]]
+        assert sorted(titles) == ["New 0", "New 1", "New 2"]
+        assert first["cursor"] == rest["cursor"] == "seq:000000000006"
+        assert rest["next_page_token"] is None
+
+    def test_legacy_timestamp_cursor_is_still_accepted(self, client: TestClient):
+        client.post("/api/notes", json={"title": "Old", "content": "Body"})
+        legacy_cursor = datetime.now(UTC).isoformat()
+        client.post("/api/notes", json={"title": "New", "content": "Body"})
+
+        delta = client.get(
+            "/api/workspace/snapshot", params={"since": legacy_cursor}
+        ).json()
+
+        assert [note["title"] for note in delta["notes"]] == ["New"]
+        assert delta["cursor"] == "seq:000000000002"
@@ -0,0 +1,45 @@
+"""Unit tests for note content patch application."""
+
+import pytest
+
+from app.features.workspace.content_patch import apply_content_patch
+from app.features.workspace.schemas import ContentPatchOperation
+from app.shared import ValidationFailed
+
+
+def _ops(*operations: dict) -> list[ContentPatchOperation]:
+    return [ContentPatchOperation(**operation) for operation in operations]
+
+
+def test_applies_operations_against_base_positions():
+    patched = apply_content_patch(
+        "The quick fox",
+        _ops(
+            {"offset": 4, "delete": 5, "insert": "slow"},
+            {"offset": 13, "insert": " jumps"},
+        ),
+    )
+
+    assert patched == "The slow fox jumps"
+
+
+def test_bmp_text_uses_string_indexes():
+    assert apply_content_patch("日本語", _ops({"offset": 1, "delete": 1})) == "日語"
+
+
+def test_astral_characters_count_as_two_units():
+    patched = apply_content_patch(
+        "😀😀", _ops({"offset": 2, "delete": 2, "insert": "!"})
+    )
+
+    assert patched == "😀!"
+
+
+def test_rejects_splitting_surrogate_pair():
+    with pytest.raises(ValidationFailed):
+        apply_content_patch("😀", _ops({"offset": 1, "delete": 1}))
+
+
+def test_rejects_out_of_range_operation():
+    with pytest.raises(ValidationFailed):
+        apply_content_patch("abc", _ops({"offset": 2, "delete": 2}))
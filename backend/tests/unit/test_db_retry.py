@@ -0,0 +1,209 @@
+"""Unit tests for the DSQL OCC retry engine."""
+
+import logging
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlmodel import Session, SQLModel
+
+from app.database import create_session
+from app.db_retry import (
+    FOREIGN_KEY_VIOLATION,
+    SERIALIZATION_FAILURE,
+    UNIQUE_VIOLATION,
+    RetryPolicy,
+    backoff_delay,
+    classify_db_error,
+    occ_table_stats,
+    reset_occ_table_stats,
+    run_transaction,
+)
+from app.models import Folder
+from app.shared import ConflictDetected
+
+
+class PgError(Exception):
+    """psycopg2 のエラーと同様に pgcode を持つ DBAPI エラー。"""
+
+    def __init__(self, message: str, pgcode: str):
+        super().__init__(message)
+        self.pgcode = pgcode
+
+
+def _occ_conflict() -> OperationalError:
+    return OperationalError(
+        "COMMIT",
+        {},
+        PgError(
+            "change conflicts with another transaction, please retry: (OC000)",
+            "40001",
+        ),
+    )
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    reset_occ_table_stats()
+    with create_session(engine) as session:
+        yield session
+    reset_occ_table_stats()
+
+
+def test_classifies_by_sqlstate_and_dsql_code():
+    assert classify_db_error(_occ_conflict()) == SERIALIZATION_FAILURE
+    assert (
+        classify_db_error(IntegrityError("INSERT", {}, PgError("dup", "23505")))
+        == UNIQUE_VIOLATION
+    )
+    assert (
+        classify_db_error(IntegrityError("INSERT", {}, PgError("fk", "23503")))
+        == FOREIGN_KEY_VIOLATION
+    )
+    # DSQL のスキーマ競合はメッセージ中のコードのみで識別する
+    assert (
+        classify_db_error(OperationalError("SELECT", {}, Exception("... (OC001)")))
+        == SERIALIZATION_FAILURE
+    )
+    # エラーメッセージ中の語句だけでは分類しない
+    assert (
+        classify_db_error(
+            OperationalError("SELECT", {}, Exception("duplicate unique value"))
+        )
+        is None
+    )
+
+
+def test_classifies_sqlite_constraint_errors_and_wrapped_domain_errors():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+    connection.execute("INSERT INTO t VALUES (1)")
+    with pytest.raises(sqlite3.IntegrityError) as raised:
+        connection.execute("INSERT INTO t VALUES (1)")
+
+    error = IntegrityError("INSERT", {}, raised.value)
+    assert classify_db_error(error) == UNIQUE_VIOLATION
+
+    try:
+        raise ConflictDetected("Note already exists") from error
+    except ConflictDetected as conflict:
+        assert classify_db_error(conflict) == UNIQUE_VIOLATION
+
+
+def test_backoff_is_exponential_capped_and_jittered():
+    policy = RetryPolicy("test", base_delay=0.01, max_delay=0.05)
+
+    with patch("app.db_retry.random.uniform", side_effect=lambda low, high: high):
+        ceilings = [backoff_delay(attempt, policy) for attempt in range(1, 6)]
+
+    assert ceilings == [0.01, 0.02, 0.04, 0.05, 0.05]
+    assert all(0 <= backoff_delay(4, policy) <= 0.05 for _ in range(100))
+
+
+def test_reruns_whole_transaction_on_occ_conflict(session: Session, caplog):
+    failures = iter([_occ_conflict(), _occ_conflict()])
+    calls: list[int] = []
+
+    def transaction() -> Folder:
+        calls.append(1)
+        folder = Folder(user_id="user", name="hot")
+        session.add(folder)
+        session.flush()
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        session.commit()
+        return folder
+
+    with (
+        patch("app.db_retry.time.sleep") as sleep,
+        caplog.at_level(logging.INFO, logger="app.db_retry"),
+    ):
+        run_transaction(
+            session, transaction, policy=RetryPolicy("test", max_attempts=3)
+        )
+
+    assert len(calls) == 3
+    assert sleep.call_count == 2
+    assert occ_table_stats() == {"folders": {"transactions": 3, "conflicts": 2}}
+    retrying = [r for r in caplog.records if r.msg == "ops.db.occ.retrying"]
+    assert [r.details["attempt"] for r in retrying] == [1, 2]
+    assert retrying[-1].details["conflict_rate"] == {"folders": 1.0}
+    resolved = [r for r in caplog.records if r.msg == "ops.db.occ.resolved"]
+    assert resolved[0].details["attempts"] == 3
+
+
+def test_gives_up_when_attempt_budget_is_spent(session: Session):
+    calls: list[int] = []
+
+    def transaction() -> None:
+        calls.append(1)
+        raise _occ_conflict()
+
+    with (
+        patch("app.db_retry.time.sleep"),
+        pytest.raises(OperationalError),
+    ):
+        run_transaction(
+            session, transaction, policy=RetryPolicy("test", max_attempts=4)
+        )
+
+    assert len(calls) == 4
+
+
+def test_gives_up_when_delay_budget_is_spent(session: Session):
+    calls: list[int] = []
+
+    def transaction() -> None:
+        calls.append(1)
+        raise _occ_conflict()
+
+    policy = RetryPolicy(
+        "test", max_attempts=10, base_delay=1.0, max_delay=1.0, max_total_delay=2.5
+    )
+    with (
+        patch("app.db_retry.random.uniform", return_value=1.0),
+        patch("app.db_retry.time.sleep"),
+        pytest.raises(OperationalError),
+    ):
+        run_transaction(session, transaction, policy=policy)
+
+    assert len(calls) == 3
+
+
+def test_unique_violations_are_retried_only_when_policy_allows(session: Session):
+    def transaction() -> None:
+        calls.append(1)
+        raise IntegrityError("INSERT", {}, PgError("dup", "23505"))
+
+    for policy, expected_calls in (
+        (RetryPolicy("strict"), 1),
+        (RetryPolicy("get_or_create", retry_unique_violations=True), 3),
+    ):
+        calls: list[int] = []
+        with (
+            patch("app.db_retry.time.sleep"),
+            pytest.raises(IntegrityError),
+        ):
+            run_transaction(session, transaction, policy=policy)
+        assert len(calls) == expected_calls
+
+
+def test_non_conflict_errors_roll_back_without_retry(session: Session):
+    calls: list[int] = []
+
+    def transaction() -> None:
+        calls.append(1)
+        session.add(Folder(user_id="user", name="discarded"))
+        session.flush()
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        run_transaction(session, transaction)
+
+    assert calls == [1]
+    assert session.exec(Folder.__table__.select()).all() == []
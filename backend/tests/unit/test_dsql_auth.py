@@ -0,0 +1,119 @@
+"""Unit tests for the cached DSQL IAM auth token provider."""
+
+import threading
+from unittest.mock import MagicMock
+
+from app.dsql_auth import DsqlAuthTokenProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _provider(
+    clock: FakeClock, client: MagicMock
+) -> tuple[DsqlAuthTokenProvider, MagicMock]:
+    factory = MagicMock(return_value=client)
+    provider = DsqlAuthTokenProvider(
+        "cluster.dsql.ap-northeast-1.on.aws",
+        "ap-northeast-1",
+        ttl_seconds=900,
+        refresh_before_seconds=120,
+        min_remaining_seconds=30,
+        client_factory=factory,
+        clock=clock,
+    )
+    return provider, factory
+
+
+def _wait_for_background_refresh() -> None:
+    for thread in threading.enumerate():
+        if thread.name == "dsql-token-refresh":
+            thread.join(timeout=5)
+
+
+def test_caches_token_and_client_until_refresh_window():
+    clock = FakeClock()
+    client = MagicMock()
+    client.generate_db_connect_admin_auth_token.side_effect = ["token1", "token2"]
+    provider, factory = _provider(clock, client)
+
+    first = provider.get_token()
+    clock.now += 700
+    second = provider.get_token()
+
+    assert first == ("token1", False)
+    assert second == ("token1", True)
+    factory.assert_called_once()
+    client.generate_db_connect_admin_auth_token.assert_called_once_with(
+        Hostname="cluster.dsql.ap-northeast-1.on.aws",
+        Region="ap-northeast-1",
+        ExpiresIn=900,
+    )
+
+
+def test_refreshes_in_background_near_expiry():
+    clock = FakeClock()
+    client = MagicMock()
+    client.generate_db_connect_admin_auth_token.side_effect = ["token1", "token2"]
+    provider, _ = _provider(clock, client)
+    provider.get_token()
+
+    clock.now += 800
+    during_refresh = provider.get_token()
+    _wait_for_background_refresh()
+
+    # 期限までの残りが十分あるため、更新を待たずにキャッシュを返す
+    assert during_refresh == ("token1", True)
+    assert provider.get_token() == ("token2", True)
+    assert client.generate_db_connect_admin_auth_token.call_count == 2
+
+
+def test_regenerates_synchronously_when_nearly_expired_or_invalidated():
+    clock = FakeClock()
+    client = MagicMock()
+    client.generate_db_connect_admin_auth_token.side_effect = [
+        "token1",
+        "token2",
+        "token3",
+        "token4",
+    ]
+    provider, factory = _provider(clock, client)
+    provider.get_token()
+
+    clock.now += 880
+    assert provider.get_token() == ("token2", False)
+    assert not any(t.name == "dsql-token-refresh" for t in threading.enumerate())
+
+    provider.invalidate()
+    assert provider.get_token() == ("token3", False)
+    factory.assert_called_once()
+
+    # 同期生成の後も、期限が近づけば再びバックグラウンドで更新する
+    clock.now += 800
+    assert provider.get_token() == ("token3", True)
+    _wait_for_background_refresh()
+    assert provider.get_token() == ("token4", True)
+
+
+def test_failed_background_refresh_falls_back_to_sync_generation():
+    clock = FakeClock()
+    client = MagicMock()
+    client.generate_db_connect_admin_auth_token.side_effect = [
+        "token1",
+        RuntimeError("credentials unavailable"),
+        "token2",
+    ]
+    provider, _ = _provider(clock, client)
+    provider.get_token()
+
+    clock.now += 800
+    assert provider.get_token() == ("token1", True)
+    _wait_for_background_refresh()
+
+    clock.now += 80
+    assert provider.get_token() == ("token2", False)
@@ -0,0 +1,83 @@
+"""Unit tests for the hot-path JSON serializer of workspace responses."""
+
+import json
+from datetime import UTC, datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel, select
+
+from app.features.workspace.fast_json import (
+    dumps,
+    encode_snapshot_json,
+    folder_json,
+    note_json,
+)
+from app.features.workspace.use_cases.snapshot import (
+    SnapshotRows,
+    WorkspaceSnapshotUseCase,
+)
+from app.models import Folder, FolderRead, Note, NoteMetadataRead, NoteRead
+
+
+def _note(**overrides) -> Note:
+    values = {
+        "id": uuid4(),
+        "user_id": "user",
+        "title": 'タイトル "quoted"',
+        "content": "line1\nline2 😀",
+        "folder_id": uuid4(),
+        "version": 3,
+        "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC),
+        "updated_at": datetime(2026, 1, 2, 3, 4, 5, 120000, tzinfo=UTC),
+        "deleted_at": None,
+    }
+    values.update(overrides)
+    return Note(**values)
+
+
+def test_note_matches_pydantic_json():
+    note = _note()
+
+    assert note_json(note) == NoteRead.model_validate(note).model_dump(mode="json")
+    assert note_json(note, include_content=False) == NoteMetadataRead.model_validate(
+        note
+    ).model_dump(mode="json")
+
+
+def test_naive_and_offset_datetimes_match_pydantic_json():
+    note = _note(
+        folder_id=None,
+        updated_at=datetime(2026, 1, 2, 3, 4, 5),
+        deleted_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=9))),
+    )
+
+    assert note_json(note) == NoteRead.model_validate(note).model_dump(mode="json")
+
+
+def test_core_rows_and_cached_read_models_match_pydantic_json():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Folder(user_id="user", name="Inbox"))
+        session.commit()
+        row = session.exec(select(*Folder.__table__.columns)).one()
+
+    expected = FolderRead.model_validate(row).model_dump(mode="json")
+    assert folder_json(row) == expected
+    assert folder_json(FolderRead.model_validate(row)) == expected
+
+
+def test_snapshot_matches_pydantic_response():
+    rows = SnapshotRows(
+        user_id="user",
+        folders=[],
+        notes=[_note(), _note(deleted_at=datetime(2026, 2, 1, tzinfo=UTC))],
+        cursor="cursor",
+        server_time=datetime.now(UTC),
+        metadata_only=True,
+        next_page_token="token",
+    )
+    expected = WorkspaceSnapshotUseCase.to_response(rows).model_dump(mode="json")
+
+    assert json.loads(dumps(encode_snapshot_json(rows))) == expected
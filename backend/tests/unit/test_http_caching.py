@@ -0,0 +1,26 @@
+"""Unit tests for ETag helpers."""
+
+from app.http_caching import etag_matches, make_etag
+
+
+def test_make_etag_is_weak_and_deterministic():
+    etag = make_etag("note", 1, None)
+    assert etag.startswith('W/"')
+    assert etag == make_etag("note", 1, None)
+    assert etag != make_etag("note", 2, None)
+
+
+def test_etag_matches_uses_weak_comparison():
+    etag = make_etag("snapshot")
+    strong = etag.removeprefix("W/")
+    assert etag_matches(etag, etag)
+    assert etag_matches(strong, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+
+
+def test_etag_matches_rejects_missing_or_different_values():
+    etag = make_etag("snapshot")
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+    assert not etag_matches(make_etag("other"), etag)
@@ -0,0 +1,113 @@
+"""Unit tests for the response compression middleware."""
+
+import gzip
+
+import brotli
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.http_compression import CompressionMiddleware, negotiate_encoding
+
+LARGE_TEXT = "notes " * 1000
+
+
+def _make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=500, exclude_paths=("/export/",)
+    )
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse(LARGE_TEXT)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (f"chunk {i}\n" for i in range(100)), media_type="text/plain"
+        )
+
+    @app.get("/binary")
+    def binary():
+        return Response(b"\0" * 2000, media_type="application/octet-stream")
+
+    @app.get("/export/all")
+    def export():
+        return PlainTextResponse(LARGE_TEXT)
+
+    return TestClient(app)
+
+
+def _get_raw(client: TestClient, path: str, accept_encoding: str = "gzip"):
+    """Return the response without letting httpx transparently decode it."""
+    with client.stream(
+        "GET", path, headers={"Accept-Encoding": accept_encoding}
+    ) as response:
+        body = b"".join(response.iter_raw())
+    return response, body
+
+
+def test_negotiate_encoding_prefers_server_order():
+    supported = ("zstd", "br", "gzip")
+    assert negotiate_encoding("gzip, br", supported) == "br"
+    assert negotiate_encoding("gzip", supported) == "gzip"
+    assert negotiate_encoding("*", supported) == "zstd"
+
+
+def test_negotiate_encoding_honours_q_zero_and_identity():
+    supported = ("br", "gzip")
+    assert negotiate_encoding("br;q=0, gzip", supported) == "gzip"
+    assert negotiate_encoding("*;q=0", supported) is None
+    assert negotiate_encoding("identity", supported) is None
+    assert negotiate_encoding(None, supported) is None
+
+
+def test_large_response_is_gzip_compressed():
+    response, body = _get_raw(_make_client(), "/large")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) == len(body)
+    assert gzip.decompress(body).decode() == LARGE_TEXT
+
+
+def test_small_binary_and_excluded_responses_are_not_compressed():
+    client = _make_client()
+    for path in ("/small", "/binary", "/export/all"):
+        response, _ = _get_raw(client, path)
+        assert "Content-Encoding" not in response.headers, path
+
+
+def test_large_response_prefers_zstd_then_brotli():
+    client = _make_client()
+
+    response, body = _get_raw(client, "/large", accept_encoding="gzip, br, zstd")
+    assert response.headers["Content-Encoding"] == "zstd"
+    decompressor = zstandard.ZstdDecompressor()
+    assert decompressor.decompressobj().decompress(body).decode() == LARGE_TEXT
+
+    response, body = _get_raw(client, "/large", accept_encoding="gzip, br")
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(body).decode() == LARGE_TEXT
+
+
+def test_streaming_response_is_compressed_per_chunk():
+    response, body = _get_raw(_make_client(), "/stream")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    expected = "".join(f"chunk {i}\n" for i in range(100))
+    assert gzip.decompress(body).decode() == expected
+
+
+def test_unsupported_encoding_is_passed_through():
+    response, body = _get_raw(_make_client(), "/large", accept_encoding="identity")
+
+    assert "Content-Encoding" not in response.headers
+    assert body.decode() == LARGE_TEXT
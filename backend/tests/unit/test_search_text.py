@@ -0,0 +1,52 @@
+"""Unit tests for full-text search tokenization and snippets."""
+
+from app.features.workspace.search_text import (
+    MAX_TERMS_PER_DOCUMENT,
+    build_snippet,
+    document_terms,
+    tokenize,
+)
+
+
+def test_normalizes_width_and_case():
+    assert tokenize("Hello, ＷＯＲＬＤ!") == ["hello", "world"]
+
+
+def test_splits_japanese_runs_into_bigrams():
+    assert tokenize("東京都 と Tokyo") == ["東京", "京都", "と", "tokyo"]
+
+
+def test_title_terms_are_weighted():
+    terms, length = document_terms("Release", "release notes")
+
+    assert terms["release"] == 3
+    assert length == 4
+
+
+def test_caps_distinct_terms_but_keeps_length():
+    content = " ".join(f"word{i}" for i in range(MAX_TERMS_PER_DOCUMENT + 10))
+
+    terms, length = document_terms("", content)
+
+    assert len(terms) == MAX_TERMS_PER_DOCUMENT
+    assert length == MAX_TERMS_PER_DOCUMENT + 10
+
+
+def test_snippet_is_centered_on_first_match():
+    content = "x" * 100 + " Needle here " + "y" * 300
+
+    snippet, highlights = build_snippet(content, ["needle"])
+
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert [snippet[start:end] for start, end in highlights] == ["Needle"]
+
+
+def test_highlights_merge_overlapping_bigrams_in_utf16_units():
+    snippet, highlights = build_snippet("😀 東京都へ", ["東京", "京都"])
+
+    assert snippet == "😀 東京都へ"
+    assert highlights == [(3, 6)]
+
+
+def test_title_only_match_returns_leading_content():
+    assert build_snippet("body text", ["title"]) == ("body text", [])
@@ -0,0 +1,147 @@
+"""Unit tests for the request-scoped unit of work."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, select
+
+from app.core.unit_of_work import (
+    UNIT_OF_WORK_RETRY_POLICY,
+    commit_or_stage,
+    get_unit_of_work,
+    staged_writes,
+)
+from app.database import create_session
+from app.models import Folder
+from app.shared import ConflictDetected
+
+CONFLICT = OperationalError(
+    "COMMIT",
+    {},
+    Exception("change conflicts with another transaction, please retry: (OC000)"),
+)
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    commits: list[None] = []
+    event.listen(engine, "commit", lambda _conn: commits.append(None))
+    with create_session(engine) as session:
+        session.info["commits"] = commits
+        yield session
+
+
+def _add_folder(session: Session, name: str) -> Folder:
+    folder = Folder(user_id="user", name=name)
+    session.add(folder)
+    commit_or_stage(session, resource_name="Folder")
+    return folder
+
+
+def _names(session: Session) -> list[str]:
+    return sorted(session.exec(select(Folder.name)).all())
+
+
+def test_writes_inside_a_unit_commit_once(session: Session):
+    unit = get_unit_of_work(session)
+
+    folders = unit.run(
+        lambda: [_add_folder(session, "a"), _add_folder(session, "b")], "Folder"
+    )
+
+    assert len(session.info["commits"]) == 1
+    assert _names(session) == ["a", "b"]
+    # コミット後も属性が読み込み済みのまま残る
+    assert "name" in folders[0].__dict__
+
+
+def test_commit_outside_a_unit_keeps_instances_attached_and_loaded(session: Session):
+    folder = _add_folder(session, "standalone")
+
+    assert len(session.info["commits"]) == 1
+    assert folder in session
+    assert "name" in folder.__dict__
+
+
+def test_nested_units_join_the_outer_transaction(session: Session):
+    unit = get_unit_of_work(session)
+
+    def outer() -> None:
+        unit.run(lambda: _add_folder(session, "inner"), "Folder")
+        assert session.info["commits"] == []
+        _add_folder(session, "outer")
+
+    unit.run(outer, "Folder")
+
+    assert len(session.info["commits"]) == 1
+    assert _names(session) == ["inner", "outer"]
+
+
+def test_unit_inside_staged_writes_leaves_commit_to_caller(session: Session):
+    unit = get_unit_of_work(session)
+
+    with staged_writes(session):
+        unit.run(lambda: _add_folder(session, "staged"), "Folder")
+
+    assert session.info["commits"] == []
+    session.rollback()
+    assert _names(session) == []
+
+
+def test_error_rolls_back_the_whole_unit(session: Session):
+    unit = get_unit_of_work(session)
+
+    def fail() -> None:
+        _add_folder(session, "partial")
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        unit.run(fail, "Folder")
+
+    assert _names(session) == []
+    assert not unit.active
+
+
+def test_commit_conflict_reruns_the_whole_unit(session: Session):
+    unit = get_unit_of_work(session)
+    original_commit = session.commit
+    failures = iter([CONFLICT])
+    calls: list[str] = []
+
+    def flaky_commit():
+        error = next(failures, None)
+        if error is not None:
+            session.rollback()
+            raise error
+        original_commit()
+
+    def operation() -> None:
+        calls.append("run")
+        _add_folder(session, "retried")
+
+    with (
+        patch.object(session, "commit", side_effect=flaky_commit),
+        patch("app.db_retry.time.sleep") as sleep,
+    ):
+        unit.run(operation, "Folder")
+
+    assert calls == ["run", "run"]
+    sleep.assert_called_once()
+    assert _names(session) == ["retried"]
+
+
+def test_commit_conflict_surfaces_after_max_attempts(session: Session):
+    unit = get_unit_of_work(session)
+
+    with (
+        patch.object(session, "commit", side_effect=CONFLICT) as commit,
+        patch("app.db_retry.time.sleep"),
+        pytest.raises(ConflictDetected),
+    ):
+        unit.run(lambda: _add_folder(session, "never"), "Folder")
+
+    assert commit.call_count == UNIT_OF_WORK_RETRY_POLICY.max_attempts
@@ -0,0 +1,71 @@
+"""Unit tests for the warm-container workspace metadata cache."""
+
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from app.features.workspace.metadata_cache import WorkspaceMetadataCache
+from app.models import FolderRead
+
+
+def _folder(name: str = "Folder") -> FolderRead:
+    now = datetime.now(UTC)
+    return FolderRead(
+        id=uuid4(),
+        user_id="user",
+        name=name,
+        version=1,
+        created_at=now,
+        updated_at=now,
+        deleted_at=None,
+    )
+
+
+def test_get_hits_only_when_marker_matches():
+    cache = WorkspaceMetadataCache(max_bytes=100_000)
+    cache.put("user", ("v1",), [_folder()], [])
+
+    assert cache.get("user", ("v1",)) is not None
+    assert cache.get("user", ("v2",)) is None
+    # 不一致だったエントリは破棄されている
+    assert cache.get("user", ("v1",)) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_invalidate_drops_entry():
+    cache = WorkspaceMetadataCache(max_bytes=100_000)
+    cache.put("user", ("v1",), [_folder()], [])
+
+    cache.invalidate("user")
+
+    assert cache.get("user", ("v1",)) is None
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["cached_bytes"] == 0
+
+
+def test_least_recently_used_entry_is_evicted_over_memory_cap():
+    entry_bytes = (
+        WorkspaceMetadataCache(max_bytes=10**9)
+        .put("probe", ("v",), [_folder()], [])
+        .size_bytes
+    )
+    cache = WorkspaceMetadataCache(max_bytes=entry_bytes * 2)
+    cache.put("a", ("v",), [_folder()], [])
+    cache.put("b", ("v",), [_folder()], [])
+    cache.get("a", ("v",))
+
+    cache.put("c", ("v",), [_folder()], [])
+
+    assert cache.get("b", ("v",)) is None
+    assert cache.get("a", ("v",)) is not None
+    assert cache.get("c", ("v",)) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_workspace_larger_than_cap_is_not_cached():
+    cache = WorkspaceMetadataCache(max_bytes=10)
+
+    entry = cache.put("user", ("v",), [_folder()], [])
+
+    assert entry.folders
+    assert cache.stats()["entries"] == 0
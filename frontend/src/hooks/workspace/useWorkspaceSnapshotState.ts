@@ -3,7 +3,8 @@
 /**
  * ワークスペースの初期データ読み込みとスナップショット管理を担うフック。
  * マウント時に IndexedDB からローカルキャッシュを即時表示し、続いてサーバースナップショットを取得してマージする。
- * applySnapshot はオフライン同期完了後にも呼ばれ、最新状態をステートへ反映する。
+ * applySnapshot は同期完了後にも呼ばれ、変更 API が返す差分をステートへマージする
+ * （resync_required または replace 指定時は全件で置き換える）。
  *
  * 主なエクスポート:
  * - useWorkspaceSnapshotState: folders / setFolders / notes / setNotes /
@@ -27,8 +28,11 @@ import {
   getActiveNotes,
   getWorkspaceCursor,
   isDeletedEntity,
+  mergeSnapshotFolders,
+  mergeSnapshotNotes,
   persistWorkspaceSnapshot,
   withSnippet,
+  type SnapshotSyncMode,
 } from "@/lib/workspaceSync";
 import { useApi } from "@/hooks/useApi";
 import type { Folder, Note, WorkspaceSnapshotResponse } from "@/types";
@@ -42,10 +46,19 @@ export function useWorkspaceSnapshotState(isAuthenticated: boolean) {
   const { getApi } = useApi();
   const hasFetchedRef = useRef(false);
 
-  const applySnapshot = useCallback((snapshot: WorkspaceSnapshotResponse) => {
-    setFolders(getActiveFolders(snapshot));
-    setNotes(getActiveNotes(snapshot));
-  }, []);
+  const applySnapshot = useCallback(
+    (snapshot: WorkspaceSnapshotResponse, mode: SnapshotSyncMode = {}) => {
+      if (mode.replace || snapshot.resync_required) {
+        setFolders(getActiveFolders(snapshot));
+        setNotes(getActiveNotes(snapshot));
+        return;
+      }
+      // 変更 API は base_cursor 以降の差分のみを返すため、差分外のエンティティを保持してマージする
+      setFolders((current) => mergeSnapshotFolders(current, snapshot));
+      setNotes((current) => mergeSnapshotNotes(current, snapshot));
+    },
+    []
+  );
 
   useEffect(() => {
     let isActive = true;
@@ -94,7 +107,7 @@ export function useWorkspaceSnapshotState(isAuthenticated: boolean) {
             return;
           }
 
-          if (useDelta) {
+          if (useDelta && !snapshot.resync_required) {
             // 差分: tombstone を含む delta をローカルへ適用（取りこぼし防止）
             const deltaNotes = snapshot.notes.map((note) =>
               isDeletedEntity(note) ? note : withSnippet(note)
@@ -102,6 +115,7 @@ export function useWorkspaceSnapshotState(isAuthenticated: boolean) {
             setFolders(reconcileFoldersDelta(localFolders, snapshot.folders));
             setNotes(reconcileNotesDelta(localNotes, deltaNotes));
           } else {
+            // 初回、またはカーソルが古すぎてサーバーが全件を返した場合（resync_required）
             const serverFolders = getActiveFolders(snapshot);
             const serverNotes = getActiveNotes(snapshot);
             setFolders(mergeFolders(localFolders, serverFolders));
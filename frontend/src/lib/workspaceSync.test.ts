@@ -10,6 +10,8 @@ vi.mock("@/lib/indexedDB", () => ({
     saveFolder: vi.fn(),
     deleteNote: vi.fn(),
     deleteFolder: vi.fn(),
+    getAllFolders: vi.fn(),
+    getAllNotes: vi.fn(),
   },
 }));
 
@@ -17,10 +19,41 @@ import {
   getWorkspaceCursor,
   getWorkspaceDeviceId,
   getWorkspaceSyncRequestMetadata,
+  mergeSnapshotFolders,
+  mergeSnapshotNotes,
   persistWorkspaceSnapshot,
   persistWorkspaceSnapshotIncremental,
+  refreshWorkspaceSnapshot,
 } from "./workspaceSync";
-import type { WorkspaceAppliedChange } from "@/types";
+import type { Folder, Note, WorkspaceAppliedChange } from "@/types";
+
+function buildNote(overrides: Partial<Note> = {}): Note {
+  return {
+    id: "note-1",
+    title: "Note",
+    content: "Body",
+    user_id: "user-1",
+    folder_id: null,
+    version: 1,
+    created_at: "2024-01-01T00:00:00.000Z",
+    updated_at: "2024-01-01T00:00:00.000Z",
+    deleted_at: null,
+    ...overrides,
+  };
+}
+
+function buildFolder(overrides: Partial<Folder> = {}): Folder {
+  return {
+    id: "folder-1",
+    name: "Folder",
+    user_id: "user-1",
+    version: 1,
+    created_at: "2024-01-01T00:00:00.000Z",
+    updated_at: "2024-01-01T00:00:00.000Z",
+    deleted_at: null,
+    ...overrides,
+  };
+}
 
 describe("workspaceSync", () => {
   beforeEach(() => {
@@ -32,6 +65,8 @@ describe("workspaceSync", () => {
     vi.mocked(notesDB.saveFolder).mockResolvedValue();
     vi.mocked(notesDB.deleteNote).mockResolvedValue();
     vi.mocked(notesDB.deleteFolder).mockResolvedValue();
+    vi.mocked(notesDB.getAllFolders).mockResolvedValue([]);
+    vi.mocked(notesDB.getAllNotes).mockResolvedValue([]);
   });
 
   it("persists snapshot data and updates the stored cursor", async () => {
@@ -85,6 +120,37 @@ describe("workspaceSync", () => {
     expect(getWorkspaceCursor()).toBe("cursor-2");
   });
 
+  it("removes local entities missing from a resync snapshot", async () => {
+    const localNote = {
+      id: "note-purged",
+      title: "Purged",
+      content: "Body",
+      user_id: "user-1",
+      folder_id: null,
+      version: 1,
+      created_at: "2024-01-01T00:00:00.000Z",
+      updated_at: "2024-01-01T00:00:00.000Z",
+      deleted_at: null,
+    };
+    vi.mocked(notesDB.getAllNotes).mockResolvedValue([
+      localNote,
+      { ...localNote, id: "temp-unsynced" },
+      { ...localNote, id: "note-1" },
+    ]);
+
+    await persistWorkspaceSnapshot({
+      folders: [],
+      notes: [{ ...localNote, id: "note-1" }],
+      cursor: "cursor-3",
+      server_time: "2024-01-03T00:00:00.000Z",
+      resync_required: true,
+    });
+
+    expect(notesDB.deleteNote).toHaveBeenCalledTimes(1);
+    expect(notesDB.deleteNote).toHaveBeenCalledWith("note-purged");
+    expect(getWorkspaceCursor()).toBe("cursor-3");
+  });
+
   it("incremental: only writes entities in applied[], updates cursor, leaves others untouched", async () => {
     const applied: WorkspaceAppliedChange[] = [
       {
@@ -185,6 +251,68 @@ describe("workspaceSync", () => {
     expect(getWorkspaceCursor()).toBe("cursor-del");
   });
 
+  it("merges a delta snapshot without dropping entities outside the batch", () => {
+    const snapshot = {
+      folders: [
+        buildFolder({ id: "folder-deleted", deleted_at: "2024-01-02T00:00:00.000Z" }),
+      ],
+      notes: [
+        buildNote({
+          id: "note-edited",
+          content: "After",
+          version: 2,
+          updated_at: "2024-01-02T00:00:00.000Z",
+        }),
+        buildNote({ id: "note-created", content: "Created" }),
+        buildNote({
+          id: "note-deleted",
+          version: 2,
+          deleted_at: "2024-01-02T00:00:00.000Z",
+        }),
+      ],
+      cursor: "cursor-2",
+      server_time: "2024-01-02T00:00:00.000Z",
+    };
+    const currentNotes = [
+      buildNote({ id: "note-untouched", content: "Untouched", snippet: "Untouched" }),
+      buildNote({ id: "note-edited", content: "Before", snippet: "Before" }),
+      buildNote({ id: "note-deleted" }),
+      buildNote({ id: "temp-note-1", content: "Created" }),
+    ];
+    const currentFolders = [
+      buildFolder({ id: "folder-kept" }),
+      buildFolder({ id: "folder-deleted" }),
+    ];
+
+    const notes = mergeSnapshotNotes(currentNotes, snapshot);
+    const folders = mergeSnapshotFolders(currentFolders, snapshot);
+
+    expect(notes.map((note) => note.id)).toEqual([
+      "note-untouched",
+      "note-edited",
+      "note-created",
+    ]);
+    expect(notes.find((note) => note.id === "note-edited")?.snippet).toBe("After");
+    expect(folders.map((folder) => folder.id)).toEqual(["folder-kept"]);
+  });
+
+  it("asks the snapshot handler to replace state after a full refresh", async () => {
+    const snapshot = {
+      folders: [],
+      notes: [buildNote()],
+      cursor: "cursor-4",
+      server_time: "2024-01-02T00:00:00.000Z",
+    };
+    const onSnapshotSynced = vi.fn();
+
+    await refreshWorkspaceSnapshot(
+      { getWorkspaceSnapshot: vi.fn().mockResolvedValue(snapshot) },
+      { onSnapshotSynced }
+    );
+
+    expect(onSnapshotSynced).toHaveBeenCalledWith(snapshot, { replace: true });
+  });
+
   it("reuses a stored device id and includes the latest cursor", () => {
     window.localStorage.setItem("notes-workspace-device-id", "device-1");
     window.localStorage.setItem("notes-workspace-cursor", "cursor-3");
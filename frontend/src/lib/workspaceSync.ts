@@ -6,6 +6,7 @@
  * - persistWorkspaceSnapshot: 全スナップショットを IndexedDB に保存
  * - persistWorkspaceSnapshotIncremental: 差分のみを IndexedDB に反映
  * - getWorkspaceSyncRequestMetadata: 同期 API リクエスト用メタデータを返す
+ * - mergeSnapshotFolders / mergeSnapshotNotes: 差分スナップショットを表示中の一覧へマージする
  * - refreshWorkspaceSnapshot: サーバーから最新スナップショットを再取得して保存
  * - isConflictApiError: 409 競合エラーか判定する
  *
@@ -13,13 +14,22 @@
  */
 import { notesDB } from "@/lib/indexedDB";
 import { ApiError } from "@/lib/api";
+import { reconcileFoldersDelta, reconcileNotesDelta } from "@/lib/merge";
 import type { Folder, Note, WorkspaceAppliedChange, WorkspaceSnapshotResponse } from "@/types";
 
 const WORKSPACE_CURSOR_STORAGE_KEY = "notes-workspace-cursor";
 const WORKSPACE_DEVICE_ID_STORAGE_KEY = "notes-workspace-device-id";
 
+/**
+ * onSnapshotSynced に渡す反映方法。replace はローカル一覧をスナップショットで置き換える
+ * （競合時の全件再取得など、サーバーの状態を正とする場合）。
+ */
+export interface SnapshotSyncMode {
+  replace?: boolean;
+}
+
 interface SnapshotSyncOptions {
-  onSnapshotSynced: (snapshot: WorkspaceSnapshotResponse) => void;
+  onSnapshotSynced: (snapshot: WorkspaceSnapshotResponse, mode?: SnapshotSyncMode) => void;
 }
 
 /**
@@ -63,6 +73,42 @@ export function getActiveNotes(snapshot: WorkspaceSnapshotResponse): Note[] {
   return snapshot.notes.filter((note) => !isDeletedEntity(note)).map(withSnippet);
 }
 
+/**
+ * 同期が完了した temp エンティティかを判定する。サーバー ID の実体がスナップショットで届くため、
+ * マージ時には一覧から除く。
+ */
+function isTempEntity(entity: { id: string }): boolean {
+  return entity.id.startsWith("temp-");
+}
+
+/**
+ * 変更 API が返す差分スナップショットのフォルダを表示中の一覧へマージする。
+ * 差分に含まれないフォルダは保持し、tombstone は除去する。
+ */
+export function mergeSnapshotFolders(
+  current: Folder[],
+  snapshot: WorkspaceSnapshotResponse
+): Folder[] {
+  return reconcileFoldersDelta(
+    current.filter((folder) => !isTempEntity(folder)),
+    snapshot.folders
+  );
+}
+
+/**
+ * 変更 API が返す差分スナップショットのノートを表示中の一覧へマージし、snippet を付与する。
+ * 差分に含まれないノートは保持し、tombstone は除去する。
+ */
+export function mergeSnapshotNotes(
+  current: Note[],
+  snapshot: WorkspaceSnapshotResponse
+): Note[] {
+  return reconcileNotesDelta(
+    current.filter((note) => !isTempEntity(note)),
+    snapshot.notes.map((note) => (isDeletedEntity(note) ? note : withSnippet(note)))
+  );
+}
+
 /**
  * 適用済み変更に含まれるエンティティのみを IndexedDB に差分反映する。
  * 全件保存より高速で、ノート編集のたびに呼ばれる増分同期処理に使用する。
@@ -105,6 +151,8 @@ export async function persistWorkspaceSnapshotIncremental(
  * スナップショット全体を IndexedDB に保存する。
  * アクティブなエンティティを一括保存した後、論理削除済みのものを個別削除する。
  * オフライン復帰後の全量同期や初回ロード時に使用する。
+ * resync_required の場合は、スナップショットに含まれないローカルのエンティティ
+ * （サーバーで tombstone ごと物理削除済み）も削除する。
  */
 export async function persistWorkspaceSnapshot(
   snapshot: WorkspaceSnapshotResponse
@@ -112,6 +160,10 @@ export async function persistWorkspaceSnapshot(
   const activeFolders = getActiveFolders(snapshot);
   const activeNotes = getActiveNotes(snapshot);
 
+  if (snapshot.resync_required) {
+    await removeEntitiesMissingFromSnapshot(snapshot);
+  }
+
   await notesDB.saveFolders(activeFolders);
   await notesDB.saveNotes(activeNotes);
 
@@ -127,6 +179,30 @@ export async function persistWorkspaceSnapshot(
   setWorkspaceCursor(snapshot.cursor);
 }
 
+/**
+ * スナップショットに含まれないローカルのフォルダ・ノートを IndexedDB から削除する。
+ * 未同期の temp エンティティは保持する。
+ */
+async function removeEntitiesMissingFromSnapshot(
+  snapshot: WorkspaceSnapshotResponse
+): Promise<void> {
+  const serverFolderIds = new Set(snapshot.folders.map((folder) => folder.id));
+  const serverNoteIds = new Set(snapshot.notes.map((note) => note.id));
+  const [localFolders, localNotes] = await Promise.all([
+    notesDB.getAllFolders(),
+    notesDB.getAllNotes(),
+  ]);
+
+  await Promise.all([
+    ...localFolders
+      .filter((folder) => !folder.id.startsWith("temp-") && !serverFolderIds.has(folder.id))
+      .map((folder) => notesDB.deleteFolder(folder.id)),
+    ...localNotes
+      .filter((note) => !note.id.startsWith("temp-") && !serverNoteIds.has(note.id))
+      .map((note) => notesDB.deleteNote(note.id)),
+  ]);
+}
+
 /**
  * localStorage からワークスペースカーソルを取得する。
  * カーソルは増分同期の起点として API に渡す。
@@ -194,12 +270,13 @@ export function isAuthApiError(error: unknown): error is ApiError {
 /**
  * サーバーから最新のワークスペーススナップショットを取得し、IndexedDB に保存して返す。
  * 競合エラー（409）発生時にローカル状態をサーバーの真実で上書きするために使用する。
+ * 全件スナップショットのため、onSnapshotSynced には replace を指定して渡す。
  */
 export async function refreshWorkspaceSnapshot(apiClient: {
   getWorkspaceSnapshot: () => Promise<WorkspaceSnapshotResponse>;
 }, options: SnapshotSyncOptions): Promise<WorkspaceSnapshotResponse> {
   const snapshot = await apiClient.getWorkspaceSnapshot();
   await persistWorkspaceSnapshot(snapshot);
-  options.onSnapshotSynced(snapshot);
+  options.onSnapshotSynced(snapshot, { replace: true });
   return snapshot;
 }
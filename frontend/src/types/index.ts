@@ -63,11 +63,25 @@ export interface WorkspaceSnapshotResponse {
   notes: Note[];
   cursor: string;
   server_time: string;
+  /** page_size 指定時のみ。null になるまで続きのページを取得する。 */
+  next_page_token?: string | null;
+  /**
+   * since が古すぎて差分を返せず、全件を返した場合に true。
+   * スナップショットに含まれないローカルのエンティティはサーバーで物理削除済み。
+   */
+  resync_required?: boolean;
 }
 
 export type WorkspaceEntityType = "folder" | "note";
 export type WorkspaceOperationType = "create" | "update" | "delete";
 
+/** 本文の置換操作。offset / delete は expected_version 時点の本文上の UTF-16 コード単位。 */
+export interface ContentPatchOperation {
+  offset: number;
+  delete?: number;
+  insert?: string;
+}
+
 /** サーバーへ送信する単一の変更操作。entity/operation の組み合わせで CRUD を表現する。 */
 export interface WorkspaceChangeRequest {
   entity: WorkspaceEntityType;
@@ -76,11 +90,18 @@ export interface WorkspaceChangeRequest {
   client_mutation_id?: string;
   expected_version?: number;
   payload?: Record<string, unknown>;
+  /** ノート update 専用。content の代わりに差分を送る（expected_version 必須）。 */
+  content_patch?: ContentPatchOperation[];
 }
 
 export interface WorkspaceChangesRequest {
   device_id?: string;
   base_cursor?: string;
+  /**
+   * "delta"（既定）は base_cursor 以降の差分のみ、"full" は全件スナップショットを返す。
+   * 差分は onSnapshotSynced（applySnapshot）がローカル状態へマージする。
+   */
+  response_mode?: "delta" | "full";
   changes: WorkspaceChangeRequest[];
 }
 
@@ -71,3 +71,28 @@ resource "aws_lambda_event_source_mapping" "ai_edit_jobs" {
     maximum_concurrency = 5
   }
 }
+
+# EventBridge Rule - Daily workspace compaction at 3:00 AM JST (18:00 UTC)
+resource "aws_cloudwatch_event_rule" "workspace_compaction_schedule" {
+  name                = "${var.project_name}-workspace-compaction-${terraform.workspace}"
+  description         = "Daily purge of expired workspace tombstones and applied mutations"
+  schedule_expression = "cron(0 18 * * ? *)"
+
+  tags = {
+    Name = "${var.project_name}-workspace-compaction-${terraform.workspace}"
+  }
+}
+
+resource "aws_cloudwatch_event_target" "workspace_compaction" {
+  rule      = aws_cloudwatch_event_rule.workspace_compaction_schedule.name
+  target_id = "workspace-compaction-worker"
+  arn       = aws_lambda_function.ai_edit_worker.arn
+}
+
+resource "aws_lambda_permission" "workspace_compaction_eventbridge" {
+  statement_id  = "AllowWorkspaceCompactionSchedule"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.ai_edit_worker.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.workspace_compaction_schedule.arn
+}
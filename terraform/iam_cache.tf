@@ -9,7 +9,8 @@ resource "aws_iam_role_policy" "cache_access" {
         Effect = "Allow"
         Action = [
           "s3:GetObject",
-          "s3:PutObject"
+          "s3:PutObject",
+          "s3:AbortMultipartUpload"
         ]
         Resource = [
           "${aws_s3_bucket.cache.arn}/*"
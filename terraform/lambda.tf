@@ -30,6 +30,7 @@ locals {
       ])
       ENVIRONMENT               = terraform.workspace
       CACHE_BUCKET_NAME         = aws_s3_bucket.cache.bucket
+      EXPORT_BUCKET_NAME        = aws_s3_bucket.cache.bucket
       IMAGE_BUCKET_NAME         = aws_s3_bucket.images.bucket
       AI_EDIT_JOB_TOPIC_ARN     = aws_sns_topic.ai_edit_jobs.arn
       CDN_DOMAIN                = local.current_env.domain_name
@@ -21,6 +21,38 @@ resource "aws_s3_bucket_lifecycle_configuration" "cache" {
       days = 30
     }
   }
+
+  # Asynchronous note exports are only downloaded once via a presigned URL.
+  rule {
+    id     = "expire-note-exports"
+    status = "Enabled"
+
+    filter {
+      prefix = "exports/"
+    }
+
+    expiration {
+      days = 1
+    }
+
+    abort_incomplete_multipart_upload {
+      days_after_initiation = 1
+    }
+  }
+
+  # Uploaded import archives are only read once by the worker.
+  rule {
+    id     = "expire-note-imports"
+    status = "Enabled"
+
+    filter {
+      prefix = "imports/"
+    }
+
+    expiration {
+      days = 1
+    }
+  }
 }
 
 resource "aws_s3_bucket_public_access_block" "cache" {